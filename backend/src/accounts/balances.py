@@ -0,0 +1,201 @@
+"""Set-based account balance updates.
+
+A Plaid ``/accounts/balance/get`` response carries the balances of every
+account of an item. They are applied in one transaction with a fixed number
+of statements however many accounts there are: the new balances are bound
+once as a ``VALUES`` list, the current balances are read by joining it to
+``accounts``, every matched account is updated with one ``UPDATE ... FROM``,
+and history rows for the balances that actually changed are appended with a
+single multi-row INSERT.
+"""
+from dataclasses import dataclass
+from datetime import datetime
+from decimal import Decimal
+from typing import Any, Dict, List, Optional, Sequence
+from uuid import uuid4
+
+from sqlalchemy import JSON, Numeric, String, column, func, insert, select, update, values
+
+from src.accounts.models import Account, AccountBalanceHistory
+
+CENTS = Decimal("0.01")
+
+
+def _amount(value: Any) -> Optional[Decimal]:
+    if value is None:
+        return None
+    return Decimal(str(value)).quantize(CENTS)
+
+
+@dataclass
+class BalanceUpdate:
+    """New balances of the account identified by ``key``."""
+    key: str
+    current_balance: Optional[Decimal]
+    available_balance: Optional[Decimal] = None
+    credit_limit: Optional[Decimal] = None
+    iso_currency_code: Optional[str] = None
+    balance_data: Optional[Dict[str, Any]] = None
+
+    @classmethod
+    def from_plaid(cls, account: Dict[str, Any]) -> "BalanceUpdate":
+        """Update from one account of a Plaid balance response."""
+        balances = dict(account.get("balances") or {})
+        return cls(
+            key=account["account_id"],
+            current_balance=_amount(balances.get("current")),
+            available_balance=_amount(balances.get("available")),
+            credit_limit=_amount(balances.get("limit")),
+            iso_currency_code=balances.get("iso_currency_code"),
+            balance_data=balances
+        )
+
+
+@dataclass
+class BalanceChange:
+    """An account's balances before and after an update."""
+    account_id: str
+    user_id: str
+    key: str
+    previous_balance: Optional[Decimal]
+    current_balance: Optional[Decimal]
+    previous_available: Optional[Decimal]
+    available_balance: Optional[Decimal]
+    credit_limit: Optional[Decimal]
+    changed: bool
+
+    @property
+    def change_amount(self) -> Decimal:
+        return (self.current_balance or Decimal("0")) - (self.previous_balance or Decimal("0"))
+
+
+def balances_values(updates: Sequence[BalanceUpdate]):
+    """The updates as a ``balances`` CTE over a VALUES list."""
+    return values(
+        column("key", String),
+        column("current_balance", Numeric(15, 2)),
+        column("available_balance", Numeric(15, 2)),
+        column("credit_limit", Numeric(15, 2)),
+        column("iso_currency_code", String),
+        column("balance_data", JSON(none_as_null=True)),
+        name="balances"
+    ).data([
+        (
+            balance.key,
+            balance.current_balance,
+            balance.available_balance,
+            balance.credit_limit,
+            balance.iso_currency_code,
+            balance.balance_data
+        )
+        for balance in updates
+    ]).cte("balances")
+
+
+async def apply_balance_updates(
+    session,
+    updates: Sequence[BalanceUpdate],
+    key_column=Account.plaid_account_id,
+    source: str = "plaid",
+    recorded_at: Optional[datetime] = None
+) -> List[BalanceChange]:
+    """Apply ``updates`` in ``session`` without committing.
+
+    ``key_column`` is the ``Account`` column the update keys refer to. Keys
+    that match no account are ignored, and a missing credit limit or balance
+    payload keeps the stored one. A missing available balance clears the
+    stored one for Plaid updates, which report every balance, and keeps it
+    for other sources. A history row is appended only for accounts whose
+    current, available or credit limit balance changed.
+    """
+    # Last update of a key wins, as it would with one call per account
+    latest = {balance.key: balance for balance in updates}
+    if not latest:
+        return []
+
+    recorded_at = recorded_at or datetime.utcnow()
+    keep_available = source != "plaid"
+    balances = balances_values(list(latest.values()))
+    join = key_column == balances.c.key
+
+    rows = (await session.execute(
+        select(
+            Account.id,
+            Account.user_id,
+            key_column,
+            Account.current_balance,
+            Account.available_balance,
+            Account.credit_limit,
+            Account.iso_currency_code
+        )
+        .add_cte(balances)
+        .join_from(balances, Account, join)
+    )).all()
+    if not rows:
+        return []
+
+    changes = []
+    currencies = {}
+    for account_id, user_id, key, current, available, limit, currency in rows:
+        balance = latest[key]
+        currencies[account_id] = balance.iso_currency_code or currency or "USD"
+        new_available = balance.available_balance
+        if new_available is None and keep_available:
+            new_available = _amount(available)
+        changes.append(BalanceChange(
+            account_id=account_id,
+            user_id=user_id,
+            key=key,
+            previous_balance=current,
+            current_balance=balance.current_balance,
+            previous_available=available,
+            available_balance=new_available,
+            credit_limit=limit if balance.credit_limit is None else balance.credit_limit,
+            changed=(
+                _amount(current) != balance.current_balance
+                or _amount(available) != new_available
+                or (balance.credit_limit is not None and _amount(limit) != balance.credit_limit)
+            )
+        ))
+
+    now = datetime.utcnow()
+    columns = {
+        "current_balance": balances.c.current_balance,
+        "available_balance": (
+            func.coalesce(balances.c.available_balance, Account.available_balance)
+            if keep_available else balances.c.available_balance
+        ),
+        "credit_limit": func.coalesce(balances.c.credit_limit, Account.credit_limit),
+        "balance_data": func.coalesce(balances.c.balance_data, Account.balance_data),
+        "updated_at": now
+    }
+    if source == "plaid":
+        columns["last_sync_at"] = now
+
+    await session.execute(
+        update(Account)
+        .add_cte(balances)
+        .where(join)
+        .values(**columns)
+        .execution_options(synchronize_session=False)
+    )
+
+    history = [
+        {
+            "id": str(uuid4()),
+            "account_id": change.account_id,
+            "current_balance": change.current_balance,
+            "available_balance": change.available_balance,
+            "credit_limit": change.credit_limit,
+            "balance_data": latest[change.key].balance_data or {},
+            "iso_currency_code": currencies[change.account_id],
+            "recorded_at": recorded_at,
+            "source": source
+        }
+        for change in changes
+        if change.changed and change.current_balance is not None
+    ]
+    if history:
+        await session.execute(insert(AccountBalanceHistory).values(history))
+
+    return changes
@@ -1,7 +1,7 @@
 """Account models for tenant database."""
 from sqlalchemy.orm import Mapped, mapped_column, relationship
-from sqlalchemy import String, DateTime, Boolean, JSON, Numeric, ForeignKey, Index, Text
-from datetime import datetime
+from sqlalchemy import String, Date, DateTime, Boolean, JSON, Numeric, ForeignKey, Index, Text
+from datetime import date, datetime
 from typing import Dict, Any, Optional, TYPE_CHECKING
 from decimal import Decimal
 
@@ -120,6 +120,36 @@ class AccountBalanceHistory(TenantBase):
     )
 
 
+class AccountBalanceRollup(TenantBase):
+    """Daily or monthly summary of an account's balance history.
+    
+    Raw history rows past their retention are folded into daily rollups, and
+    daily rollups into monthly ones, by the balance history downsampler.
+    """
+    __tablename__ = "account_balance_rollups"
+    
+    account_id: Mapped[str] = mapped_column(String(36), ForeignKey("accounts.id"), primary_key=True)
+    resolution: Mapped[str] = mapped_column(String(10), primary_key=True)  # day, month
+    period_start: Mapped[date] = mapped_column(Date, primary_key=True)
+    
+    # Balance summary
+    open_balance: Mapped[Decimal] = mapped_column(Numeric(15, 2))
+    close_balance: Mapped[Decimal] = mapped_column(Numeric(15, 2))
+    min_balance: Mapped[Decimal] = mapped_column(Numeric(15, 2))
+    max_balance: Mapped[Decimal] = mapped_column(Numeric(15, 2))
+    balance_total: Mapped[Decimal] = mapped_column(Numeric(18, 2))  # Sum of samples, for averages
+    sample_count: Mapped[int] = mapped_column(default=0)
+    
+    # First and last sample folded in
+    opened_at: Mapped[datetime] = mapped_column(DateTime)
+    closed_at: Mapped[datetime] = mapped_column(DateTime)
+    
+    # Indexes
+    __table_args__ = (
+        Index("idx_account_balance_rollups_closed_at", "account_id", "closed_at"),
+    )
+
+
 class AccountCategory(TenantBase):
     """Custom account categories and tags."""
     __tablename__ = "account_categories"
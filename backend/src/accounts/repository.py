@@ -5,7 +5,9 @@ from decimal import Decimal
 from sqlalchemy import select, func, and_, or_, desc, update, delete
 
 from src.shared.repository import UserScopedRepository
+from src.accounts.balances import BalanceChange, BalanceUpdate, apply_balance_updates
 from src.accounts.models import Account, AccountBalanceHistory
+from src.accounts.rollups import BalanceHistoryDownsampler, balance_trend_query, net_worth_query, user_accounts
 from src.accounts.schemas import AccountCreate, AccountUpdate
 from src.exceptions import DatabaseError
 
@@ -20,6 +22,24 @@ class AccountRepository(UserScopedRepository[Account, AccountCreate, AccountUpda
         """Get account by Plaid account ID."""
         return await self.get_by_field("plaid_account_id", plaid_account_id)
     
+    async def get_linked_plaid_items(self) -> List[Dict[str, str]]:
+        """Get each distinct Plaid item linked in this tenant with its owning user."""
+        async with await self.get_session() as session:
+            try:
+                query = (
+                    select(self.model.plaid_item_id, func.min(self.model.user_id))
+                    .where(self.model.plaid_item_id.is_not(None))
+                    .group_by(self.model.plaid_item_id)
+                )
+                result = await session.execute(query)
+                return [
+                    {"plaid_item_id": item_id, "user_id": user_id}
+                    for item_id, user_id in result.all()
+                ]
+                
+            except Exception as e:
+                raise DatabaseError(f"Failed to get linked Plaid items: {str(e)}")
+    
     async def get_accounts_by_institution(
         self, 
         user_id: str, 
@@ -112,48 +132,55 @@ class AccountRepository(UserScopedRepository[Account, AccountCreate, AccountUpda
         available_balance: Optional[Decimal] = None,
         balance_date: Optional[datetime] = None
     ) -> Optional[Account]:
-        """Update account balance and create history record."""
+        """Update account balance and create history record if it changed."""
         async with await self.get_session() as session:
             try:
-                account = await self.get_by_id(account_id)
-                if not account:
-                    return None
-                
-                old_balance = account.current_balance
-                balance_date = balance_date or datetime.utcnow()
-                
-                # Update account balance
-                account.current_balance = new_balance
-                if available_balance is not None:
-                    account.available_balance = available_balance
-                account.updated_at = datetime.utcnow()
-                
-                # Create balance history record
-                change_amount = new_balance - (old_balance or Decimal('0'))
-                change_percentage = None
-                if old_balance and old_balance != 0:
-                    change_percentage = (change_amount / abs(old_balance)) * 100
-                
-                balance_history = AccountBalanceHistory(
-                    account_id=account_id,
-                    balance=new_balance,
-                    available_balance=available_balance,
-                    credit_used=(account.credit_limit - available_balance) if account.credit_limit and available_balance else None,
-                    balance_date=balance_date,
-                    change_amount=change_amount,
-                    change_percentage=change_percentage,
-                    source="manual_update"  # Could be "plaid_sync", "manual_update", etc.
+                changes = await apply_balance_updates(
+                    session,
+                    [BalanceUpdate(
+                        key=account_id,
+                        current_balance=new_balance,
+                        available_balance=available_balance
+                    )],
+                    key_column=self.model.id,
+                    source="manual",
+                    recorded_at=balance_date
                 )
+                if not changes:
+                    return None
                 
-                session.add(balance_history)
                 await session.commit()
-                await session.refresh(account)
-                
-                return account
+                return await session.get(self.model, account_id)
                 
             except Exception as e:
                 await session.rollback()
                 raise DatabaseError(f"Failed to update account balance: {str(e)}")
+    
+    async def bulk_update_balances(
+        self,
+        accounts: List[Dict[str, Any]],
+        source: str = "plaid",
+        recorded_at: Optional[datetime] = None
+    ) -> List[BalanceChange]:
+        """Apply the balances of a Plaid balance response to the matching accounts.
+        
+        All accounts are updated in one transaction with one UPDATE, and one
+        history row is appended per account whose balances changed.
+        """
+        async with await self.get_session() as session:
+            try:
+                changes = await apply_balance_updates(
+                    session,
+                    [BalanceUpdate.from_plaid(account) for account in accounts],
+                    source=source,
+                    recorded_at=recorded_at
+                )
+                await session.commit()
+                return changes
+                
+            except Exception as e:
+                await session.rollback()
+                raise DatabaseError(f"Failed to update account balances: {str(e)}")
 
 
 class AccountBalanceHistoryRepository(UserScopedRepository[AccountBalanceHistory, None, None]):
@@ -189,62 +216,120 @@ class AccountBalanceHistoryRepository(UserScopedRepository[AccountBalanceHistory
         async with await self.get_session() as session:
             try:
                 cutoff_date = datetime.utcnow() - timedelta(days=period_days)
+                result = await session.execute(balance_trend_query([account_id], cutoff_date))
                 
-                # Get balance history for the period
-                history = await self.get_account_history(account_id, period_days)
-                
-                if not history:
-                    return {
-                        "account_id": account_id,
-                        "period": f"{period_days}d",
-                        "start_balance": Decimal('0'),
-                        "end_balance": Decimal('0'),
-                        "change_amount": Decimal('0'),
-                        "change_percentage": Decimal('0'),
-                        "average_balance": Decimal('0'),
-                        "highest_balance": Decimal('0'),
-                        "lowest_balance": Decimal('0'),
-                        "data_points": []
-                    }
+                return _balance_trend(account_id, period_days, result.all())
                 
-                # Sort by date (oldest first)
-                history.sort(key=lambda x: x.balance_date)
+            except Exception as e:
+                raise DatabaseError(f"Failed to get balance trend: {str(e)}")
+    
+    async def get_balance_trends_for_user(
+        self,
+        user_id: str,
+        period_days: int = 30
+    ) -> List[Dict[str, Any]]:
+        """Get balance trends of all a user's active accounts in one query."""
+        async with await self.get_session() as session:
+            try:
+                cutoff_date = datetime.utcnow() - timedelta(days=period_days)
+                result = await session.execute(balance_trend_query(user_accounts(user_id), cutoff_date))
                 
-                start_balance = history[0].balance
-                end_balance = history[-1].balance
-                change_amount = end_balance - start_balance
-                change_percentage = Decimal('0')
+                rows_by_account: Dict[str, list] = {}
+                for row in result.all():
+                    rows_by_account.setdefault(row.account_id, []).append(row)
                 
-                if start_balance != 0:
-                    change_percentage = (change_amount / abs(start_balance)) * 100
+                return [
+                    _balance_trend(account_id, period_days, rows)
+                    for account_id, rows in rows_by_account.items()
+                ]
                 
-                # Calculate statistics
-                balances = [h.balance for h in history]
-                average_balance = sum(balances) / len(balances)
-                highest_balance = max(balances)
-                lowest_balance = min(balances)
+            except Exception as e:
+                raise DatabaseError(f"Failed to get balance trends: {str(e)}")
+    
+    async def get_net_worth_history(
+        self,
+        user_id: str,
+        start_date: date,
+        end_date: date,
+        resolution: str = "day"
+    ) -> List[Dict[str, Any]]:
+        """Get a user's net worth per day or month across all active accounts."""
+        async with await self.get_session() as session:
+            try:
+                result = await session.execute(net_worth_query(user_id, start_date, end_date, resolution))
                 
-                # Create data points for charting
-                data_points = [
+                return [
                     {
-                        "date": h.balance_date.date().isoformat(),
-                        "balance": float(h.balance)
+                        "period_start": date.fromisoformat(row.bucket),
+                        "net_worth": _cents(row.net_worth),
+                        "assets": _cents(row.assets),
+                        "liabilities": _cents(row.liabilities),
+                        "accounts": row.accounts
                     }
-                    for h in history
+                    for row in result.all()
                 ]
                 
-                return {
-                    "account_id": account_id,
-                    "period": f"{period_days}d",
-                    "start_balance": start_balance,
-                    "end_balance": end_balance,
-                    "change_amount": change_amount,
-                    "change_percentage": change_percentage,
-                    "average_balance": average_balance,
-                    "highest_balance": highest_balance,
-                    "lowest_balance": lowest_balance,
-                    "data_points": data_points
-                }
+            except Exception as e:
+                raise DatabaseError(f"Failed to get net worth history: {str(e)}")
+    
+    async def downsample(self, today: Optional[date] = None) -> Dict[str, int]:
+        """Fold balance history past its retention into daily and monthly rollups."""
+        async with await self.get_session() as session:
+            try:
+                folded = await BalanceHistoryDownsampler(session).downsample(today)
+                await session.commit()
+                return folded
                 
             except Exception as e:
-                raise DatabaseError(f"Failed to get balance trend: {str(e)}")
\ No newline at end of file
+                await session.rollback()
+                raise DatabaseError(f"Failed to downsample balance history: {str(e)}")
+
+
+def _cents(value) -> Decimal:
+    return Decimal(str(value or 0)).quantize(Decimal("0.01"))
+
+
+def _balance_trend(account_id: str, period_days: int, rows) -> Dict[str, Any]:
+    """Trend response from the daily rows of ``balance_trend_query`` for one account."""
+    if not rows:
+        return {
+            "account_id": account_id,
+            "period": f"{period_days}d",
+            "start_balance": Decimal('0'),
+            "end_balance": Decimal('0'),
+            "change_amount": Decimal('0'),
+            "change_percentage": Decimal('0'),
+            "average_balance": Decimal('0'),
+            "highest_balance": Decimal('0'),
+            "lowest_balance": Decimal('0'),
+            "data_points": []
+        }
+    
+    trend = rows[0]
+    start_balance = _cents(trend.start_balance)
+    end_balance = _cents(trend.end_balance)
+    change_amount = end_balance - start_balance
+    change_percentage = Decimal('0')
+    
+    if start_balance != 0:
+        change_percentage = (change_amount / abs(start_balance) * 100).quantize(Decimal("0.01"))
+    
+    return {
+        "account_id": account_id,
+        "period": f"{period_days}d",
+        "start_balance": start_balance,
+        "end_balance": end_balance,
+        "change_amount": change_amount,
+        "change_percentage": change_percentage,
+        "average_balance": _cents(trend.average_balance),
+        "highest_balance": _cents(trend.highest_balance),
+        "lowest_balance": _cents(trend.lowest_balance),
+        # Daily closing balances for charting
+        "data_points": [
+            {
+                "date": row.day,
+                "balance": float(row.close)
+            }
+            for row in rows
+        ]
+    }
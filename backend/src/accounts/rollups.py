@@ -0,0 +1,379 @@
+"""Tiered account balance history and SQL-side balance series.
+
+Every sync appends a balance history row, so history grows by one row per
+account every 30 minutes. Raw rows are kept for
+``ACCOUNT_BALANCE_RAW_RETENTION_DAYS`` and then folded into daily rollups
+(open, close, min, max, sum and count of the samples); daily rollups are kept
+for ``ACCOUNT_BALANCE_DAILY_RETENTION_DAYS`` and then folded into monthly
+rollups, which are kept. Folding is an upsert followed by deleting the folded
+rows in the same transaction, so running it again changes nothing.
+
+Readers see the three tiers as one series of balance points. Trends and net
+worth are computed from it in one statement each: trends per account with
+window functions, and net worth by carrying every account's last known
+balance forward over a day or month calendar and summing per bucket.
+
+The tenant databases are SQLite (libSQL), and the statements use its date
+functions and upsert syntax.
+"""
+from dataclasses import dataclass
+from datetime import date, datetime, time, timedelta
+from typing import Dict, Optional
+
+from sqlalchemy import and_, case, func, literal, select, true, union_all
+from sqlalchemy.dialects.sqlite import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.accounts.models import Account, AccountBalanceHistory, AccountBalanceRollup
+from src.config import settings
+
+# Core tables, so maintenance statements never depend on ORM mapper setup
+_accounts = Account.__table__
+_history = AccountBalanceHistory.__table__
+_rollups = AccountBalanceRollup.__table__
+
+DAY = "day"
+MONTH = "month"
+RESOLUTIONS = (DAY, MONTH)
+
+# Account types whose balance is owed rather than held
+LIABILITY_TYPES = ("credit", "loan")
+
+
+def bucket_of(column, resolution: str):
+    """SQL expression of the ``resolution`` bucket (as ``YYYY-MM-DD``) a timestamp or date falls in."""
+    if resolution == MONTH:
+        return func.strftime("%Y-%m-01", column)
+    return func.date(column)
+
+
+def bucket_start(value: date, resolution: str) -> date:
+    return value.replace(day=1) if resolution == MONTH else value
+
+
+def next_bucket(value: date, resolution: str) -> date:
+    if resolution == MONTH:
+        return (value.replace(day=1) + timedelta(days=32)).replace(day=1)
+    return value + timedelta(days=1)
+
+
+@dataclass
+class BalanceRetentionPolicy:
+    """How long each tier of balance history is kept before it is folded."""
+    raw_days: int
+    daily_days: int
+
+    @classmethod
+    def from_settings(cls) -> "BalanceRetentionPolicy":
+        return cls(
+            raw_days=settings.ACCOUNT_BALANCE_RAW_RETENTION_DAYS,
+            daily_days=settings.ACCOUNT_BALANCE_DAILY_RETENTION_DAYS
+        )
+
+    def raw_cutoff(self, today: date) -> datetime:
+        """Raw rows before this instant are folded; only whole days are."""
+        return datetime.combine(today - timedelta(days=self.raw_days), time.min)
+
+    def daily_cutoff(self, today: date) -> date:
+        """Daily rollups before this date are folded; only whole months are."""
+        return (today - timedelta(days=self.daily_days)).replace(day=1)
+
+
+def balance_points(account_ids=None):
+    """All tiers of history as one series of ``(account_id, opened_at, closed_at, open, close, low, high, total, samples)``.
+
+    ``account_ids`` is an optional column or subquery restricting the accounts.
+    """
+    raw = select(
+        _history.c.account_id,
+        _history.c.recorded_at.label("opened_at"),
+        _history.c.recorded_at.label("closed_at"),
+        _history.c.current_balance.label("open"),
+        _history.c.current_balance.label("close"),
+        _history.c.current_balance.label("low"),
+        _history.c.current_balance.label("high"),
+        _history.c.current_balance.label("total"),
+        literal(1).label("samples")
+    )
+    rolled = select(
+        _rollups.c.account_id,
+        _rollups.c.opened_at,
+        _rollups.c.closed_at,
+        _rollups.c.open_balance,
+        _rollups.c.close_balance,
+        _rollups.c.min_balance,
+        _rollups.c.max_balance,
+        _rollups.c.balance_total,
+        _rollups.c.sample_count
+    )
+    if account_ids is not None:
+        raw = raw.where(_history.c.account_id.in_(account_ids))
+        rolled = rolled.where(_rollups.c.account_id.in_(account_ids))
+    return union_all(raw, rolled).subquery("points")
+
+
+def user_accounts(user_id: str):
+    """IDs of the user's active accounts."""
+    return select(_accounts.c.id).where(_accounts.c.user_id == user_id, _accounts.c.is_active.is_(True))
+
+
+def balance_trend_query(account_ids, since: datetime):
+    """Daily balances of ``account_ids`` since ``since``, each row carrying its account's trend.
+
+    ``account_ids`` is a list of IDs or a subquery such as ``user_accounts``.
+    Columns: account_id, day, open, close, low, high, average of the day, and
+    the account's start_balance, end_balance, highest_balance, lowest_balance
+    and average_balance over the whole period.
+    """
+    points = balance_points(account_ids)
+    day = bucket_of(points.c.closed_at, DAY)
+    in_day = [points.c.account_id, day]
+
+    ranked = (
+        select(
+            points.c.account_id,
+            day.label("day"),
+            func.first_value(points.c.open).over(partition_by=in_day, order_by=points.c.opened_at).label("open"),
+            func.first_value(points.c.close).over(partition_by=in_day, order_by=points.c.closed_at.desc()).label("close"),
+            points.c.low,
+            points.c.high,
+            points.c.total,
+            points.c.samples
+        )
+        .where(points.c.closed_at >= since)
+        .subquery("ranked")
+    )
+    daily = (
+        select(
+            ranked.c.account_id,
+            ranked.c.day,
+            func.min(ranked.c.open).label("open"),
+            func.min(ranked.c.close).label("close"),
+            func.min(ranked.c.low).label("low"),
+            func.max(ranked.c.high).label("high"),
+            func.sum(ranked.c.total).label("total"),
+            func.sum(ranked.c.samples).label("samples")
+        )
+        .group_by(ranked.c.account_id, ranked.c.day)
+        .subquery("daily")
+    )
+    account = [daily.c.account_id]
+    return (
+        select(
+            daily.c.account_id,
+            daily.c.day,
+            daily.c.open,
+            daily.c.close,
+            daily.c.low,
+            daily.c.high,
+            (daily.c.total / daily.c.samples).label("average"),
+            func.first_value(daily.c.open).over(partition_by=account, order_by=daily.c.day).label("start_balance"),
+            func.first_value(daily.c.close).over(partition_by=account, order_by=daily.c.day.desc()).label("end_balance"),
+            func.max(daily.c.high).over(partition_by=account).label("highest_balance"),
+            func.min(daily.c.low).over(partition_by=account).label("lowest_balance"),
+            (
+                func.sum(daily.c.total).over(partition_by=account)
+                / func.sum(daily.c.samples).over(partition_by=account)
+            ).label("average_balance")
+        )
+        .order_by(daily.c.account_id, daily.c.day)
+    )
+
+
+def net_worth_query(user_id: str, start: date, end: date, resolution: str = DAY):
+    """Net worth of the user's active accounts per day or month from ``start`` to ``end``.
+
+    Each account contributes its last balance at or before the end of each
+    bucket, including balances recorded before ``start``; credit and loan
+    balances count as liabilities. Columns: bucket, net_worth, assets,
+    liabilities, accounts (the number with a known balance).
+    """
+    first = bucket_start(start, resolution)
+    last = bucket_start(end, resolution)
+    step = "+1 month" if resolution == MONTH else "+1 day"
+
+    buckets = select(literal(first.isoformat()).label("bucket")).cte("buckets", recursive=True)
+    following = func.date(buckets.c.bucket, step)
+    buckets = buckets.union_all(select(following).where(following <= last.isoformat()))
+
+    accounts = (
+        select(
+            _accounts.c.id.label("account_id"),
+            _accounts.c.type.in_(LIABILITY_TYPES).label("is_liability")
+        )
+        .where(_accounts.c.user_id == user_id, _accounts.c.is_active.is_(True))
+        .cte("user_accounts")
+    )
+
+    # Last balance per account and bucket; earlier balances seed the first bucket
+    points = balance_points(select(accounts.c.account_id))
+    bucket = func.max(bucket_of(points.c.closed_at, resolution), first.isoformat())
+    ranked = (
+        select(
+            points.c.account_id,
+            bucket.label("bucket"),
+            points.c.close,
+            func.row_number().over(
+                partition_by=[points.c.account_id, bucket], order_by=points.c.closed_at.desc()
+            ).label("position")
+        )
+        .where(points.c.closed_at < datetime.combine(next_bucket(last, resolution), time.min))
+        .subquery("ranked")
+    )
+    closes = select(ranked.c.account_id, ranked.c.bucket, ranked.c.close).where(ranked.c.position == 1).subquery("closes")
+
+    # Every account in every bucket, with runs of empty buckets numbered after the last known balance
+    grid = (
+        select(
+            buckets.c.bucket,
+            accounts.c.account_id,
+            accounts.c.is_liability,
+            closes.c.close,
+            func.count(closes.c.close).over(
+                partition_by=accounts.c.account_id, order_by=buckets.c.bucket
+            ).label("run")
+        )
+        .select_from(buckets.join(accounts, true()))
+        .outerjoin(closes, and_(closes.c.account_id == accounts.c.account_id, closes.c.bucket == buckets.c.bucket))
+        .subquery("grid")
+    )
+    carried = func.first_value(grid.c.close).over(
+        partition_by=[grid.c.account_id, grid.c.run], order_by=grid.c.bucket
+    )
+    balances = (
+        select(
+            grid.c.bucket,
+            case((grid.c.is_liability, -func.abs(carried)), else_=carried).label("balance")
+        )
+        .subquery("balances")
+    )
+    return (
+        select(
+            balances.c.bucket,
+            func.coalesce(func.sum(balances.c.balance), 0).label("net_worth"),
+            func.coalesce(func.sum(case((balances.c.balance > 0, balances.c.balance))), 0).label("assets"),
+            func.coalesce(func.sum(case((balances.c.balance < 0, -balances.c.balance))), 0).label("liabilities"),
+            func.count(balances.c.balance).label("accounts")
+        )
+        .group_by(balances.c.bucket)
+        .order_by(balances.c.bucket)
+    )
+
+
+class BalanceHistoryDownsampler:
+    """Folds balance history into daily and monthly rollups.
+
+    Statements run on the caller's session and are committed by the caller.
+    """
+
+    def __init__(self, session: AsyncSession, policy: Optional[BalanceRetentionPolicy] = None):
+        self.session = session
+        self.policy = policy or BalanceRetentionPolicy.from_settings()
+
+    async def downsample(self, today: Optional[date] = None) -> Dict[str, int]:
+        """Fold every tier past its retention; returns the rows folded per tier."""
+        today = today or datetime.utcnow().date()
+        return {
+            DAY: await self._fold_raw(self.policy.raw_cutoff(today)),
+            MONTH: await self._fold_daily(self.policy.daily_cutoff(today))
+        }
+
+    async def _fold_raw(self, cutoff: datetime) -> int:
+        day = bucket_of(_history.c.recorded_at, DAY)
+        source = (
+            select(
+                _history.c.account_id,
+                day.label("period_start"),
+                _history.c.current_balance.label("open"),
+                _history.c.current_balance.label("close"),
+                _history.c.current_balance.label("low"),
+                _history.c.current_balance.label("high"),
+                _history.c.current_balance.label("total"),
+                literal(1).label("samples"),
+                _history.c.recorded_at.label("opened_at"),
+                _history.c.recorded_at.label("closed_at")
+            )
+            .where(_history.c.recorded_at < cutoff)
+        )
+        folded = await self._fold(source, DAY)
+        if folded:
+            await self.session.execute(_history.delete().where(_history.c.recorded_at < cutoff))
+        return folded
+
+    async def _fold_daily(self, cutoff: date) -> int:
+        source = (
+            select(
+                _rollups.c.account_id,
+                bucket_of(_rollups.c.period_start, MONTH).label("period_start"),
+                _rollups.c.open_balance.label("open"),
+                _rollups.c.close_balance.label("close"),
+                _rollups.c.min_balance.label("low"),
+                _rollups.c.max_balance.label("high"),
+                _rollups.c.balance_total.label("total"),
+                _rollups.c.sample_count.label("samples"),
+                _rollups.c.opened_at,
+                _rollups.c.closed_at
+            )
+            .where(_rollups.c.resolution == DAY, _rollups.c.period_start < cutoff)
+        )
+        folded = await self._fold(source, MONTH)
+        if folded:
+            await self.session.execute(
+                _rollups.delete().where(_rollups.c.resolution == DAY, _rollups.c.period_start < cutoff)
+            )
+        return folded
+
+    async def _fold(self, source, resolution: str) -> int:
+        """Upsert ``source`` samples grouped by account and period into ``resolution`` rollups."""
+        samples = source.subquery("samples")
+        period = [samples.c.account_id, samples.c.period_start]
+        ranked = select(
+            samples,
+            func.first_value(samples.c.open).over(partition_by=period, order_by=samples.c.opened_at).label("first_open"),
+            func.first_value(samples.c.close).over(partition_by=period, order_by=samples.c.closed_at.desc()).label("last_close")
+        ).subquery("ranked")
+        grouped = (
+            select(
+                ranked.c.account_id,
+                literal(resolution).label("resolution"),
+                ranked.c.period_start,
+                func.min(ranked.c.first_open),
+                func.min(ranked.c.last_close),
+                func.min(ranked.c.low),
+                func.max(ranked.c.high),
+                func.sum(ranked.c.total),
+                func.sum(ranked.c.samples),
+                func.min(ranked.c.opened_at),
+                func.max(ranked.c.closed_at)
+            )
+            .group_by(ranked.c.account_id, ranked.c.period_start)
+        )
+
+        statement = insert(_rollups).from_select(
+            [
+                "account_id", "resolution", "period_start", "open_balance", "close_balance", "min_balance",
+                "max_balance", "balance_total", "sample_count", "opened_at", "closed_at"
+            ],
+            grouped
+        )
+        excluded = statement.excluded
+        result = await self.session.execute(statement.on_conflict_do_update(
+            index_elements=["account_id", "resolution", "period_start"],
+            set_={
+                "open_balance": case(
+                    (excluded.opened_at < _rollups.c.opened_at, excluded.open_balance),
+                    else_=_rollups.c.open_balance
+                ),
+                "close_balance": case(
+                    (excluded.closed_at > _rollups.c.closed_at, excluded.close_balance),
+                    else_=_rollups.c.close_balance
+                ),
+                "min_balance": func.min(_rollups.c.min_balance, excluded.min_balance),
+                "max_balance": func.max(_rollups.c.max_balance, excluded.max_balance),
+                "balance_total": _rollups.c.balance_total + excluded.balance_total,
+                "sample_count": _rollups.c.sample_count + excluded.sample_count,
+                "opened_at": func.min(_rollups.c.opened_at, excluded.opened_at),
+                "closed_at": func.max(_rollups.c.closed_at, excluded.closed_at)
+            }
+        ))
+        return result.rowcount or 0
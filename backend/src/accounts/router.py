@@ -1,12 +1,13 @@
 """Account API router."""
-from typing import Optional
+from typing import List, Optional
 from fastapi import APIRouter, Depends, HTTPException, Query, Path
 
 from src.accounts.service import AccountService
 from src.accounts.schemas import (
     AccountCreate, AccountUpdate, AccountResponse, AccountListResponse,
     AccountSummaryResponse, AccountBalanceTrendResponse, AccountBalanceUpdate,
-    AccountConnectionStatus, AccountBalanceHistoryResponse, AccountType
+    AccountConnectionStatus, AccountBalanceHistoryResponse, AccountType,
+    NetWorthHistoryResponse, NetWorthResolution
 )
 from src.auth.dependencies import get_current_active_user
 from src.exceptions import NotFoundError, ValidationError
@@ -58,6 +59,25 @@ async def get_account_summary(
     return await account_service.get_account_summary(current_user["user_id"])
 
 
+@router.get("/balance/trends", response_model=List[AccountBalanceTrendResponse])
+async def get_balance_trends(
+    period_days: int = Query(30, ge=7, le=365, description="Analysis period in days"),
+    current_user: dict = Depends(get_current_active_user)
+):
+    """Get balance trends of all the current user's accounts."""
+    return await account_service.get_balance_trends(current_user["user_id"], period_days)
+
+
+@router.get("/net-worth/history", response_model=NetWorthHistoryResponse)
+async def get_net_worth_history(
+    days: int = Query(365, ge=1, le=3650, description="Number of days of history to retrieve"),
+    resolution: NetWorthResolution = Query(NetWorthResolution.DAY, description="Bucket size of the series"),
+    current_user: dict = Depends(get_current_active_user)
+):
+    """Get the current user's net worth over time."""
+    return await account_service.get_net_worth_history(current_user["user_id"], days, resolution)
+
+
 @router.get("/{account_id}", response_model=AccountResponse)
 async def get_account(
     account_id: str = Path(..., description="Account ID"),
@@ -1,7 +1,7 @@
 """Account domain Pydantic schemas."""
 from pydantic import BaseModel, Field, ConfigDict
 from typing import Optional, Dict, Any, List
-from datetime import datetime
+from datetime import date, datetime
 from decimal import Decimal
 from enum import Enum
 
@@ -284,6 +284,53 @@ class AccountBalanceTrendResponse(BaseModel):
     )
 
 
+class NetWorthResolution(str, Enum):
+    """Bucket size of a net worth series."""
+    DAY = "day"
+    MONTH = "month"
+
+
+class NetWorthPoint(BaseModel):
+    """Net worth at the end of one day or month."""
+    period_start: date = Field(..., description="Start of the day or month")
+    net_worth: Decimal = Field(..., description="Assets minus liabilities")
+    assets: Decimal = Field(..., description="Total of asset account balances")
+    liabilities: Decimal = Field(..., description="Total owed on credit and loan accounts")
+    accounts: int = Field(..., description="Number of accounts with a known balance")
+
+
+class NetWorthHistoryResponse(BaseModel):
+    """Schema for net worth over time across a user's accounts."""
+    resolution: NetWorthResolution = Field(..., description="Bucket size of the series")
+    start_date: date = Field(..., description="First day of the series")
+    end_date: date = Field(..., description="Last day of the series")
+    start_net_worth: Decimal = Field(..., description="Net worth at the start of the series")
+    end_net_worth: Decimal = Field(..., description="Net worth at the end of the series")
+    change_amount: Decimal = Field(..., description="Change in net worth over the series")
+    points: List[NetWorthPoint] = Field(default_factory=list, description="Net worth per bucket")
+    
+    model_config = ConfigDict(
+        json_schema_extra={
+            "example": {
+                "resolution": "month",
+                "start_date": "2024-01-01",
+                "end_date": "2024-03-31",
+                "start_net_worth": "12000.00",
+                "end_net_worth": "13500.00",
+                "change_amount": "1500.00",
+                "points": [
+                    {"period_start": "2024-01-01", "net_worth": "12000.00", "assets": "14000.00",
+                     "liabilities": "2000.00", "accounts": 3},
+                    {"period_start": "2024-02-01", "net_worth": "12800.00", "assets": "14500.00",
+                     "liabilities": "1700.00", "accounts": 3},
+                    {"period_start": "2024-03-01", "net_worth": "13500.00", "assets": "15000.00",
+                     "liabilities": "1500.00", "accounts": 3}
+                ]
+            }
+        }
+    )
+
+
 class AccountConnectionStatus(BaseModel):
     """Schema for account connection status."""
     account_id: str = Field(..., description="Account ID")
@@ -1,13 +1,15 @@
 """Account service for business logic."""
 from typing import Optional, List, Dict, Any
 from decimal import Decimal
-from datetime import datetime
+from datetime import datetime, timedelta
 
+from src.accounts.balances import BalanceChange
 from src.accounts.repository import AccountRepository, AccountBalanceHistoryRepository
 from src.accounts.schemas import (
     AccountCreate, AccountUpdate, AccountResponse, AccountListResponse,
     AccountSummaryResponse, AccountBalanceTrendResponse, AccountBalanceUpdate,
-    AccountConnectionStatus, AccountBalanceHistoryResponse
+    AccountConnectionStatus, AccountBalanceHistoryResponse, NetWorthHistoryResponse,
+    NetWorthResolution
 )
 from src.exceptions import NotFoundError, ValidationError
 from src.tenant.context import get_tenant_context
@@ -135,6 +137,13 @@ class AccountService:
         
         return AccountResponse.model_validate(updated_account)
     
+    async def sync_plaid_balances(self, plaid_accounts: List[Dict[str, Any]]) -> List[BalanceChange]:
+        """Apply the balances of a Plaid balance response to the matching accounts."""
+        if not plaid_accounts:
+            return []
+        
+        return await self.account_repo.bulk_update_balances(plaid_accounts, source="plaid")
+    
     async def get_account_summary(self, user_id: str) -> AccountSummaryResponse:
         """Get account summary for user."""
         summary = await self.account_repo.get_user_account_summary(user_id)
@@ -173,6 +182,47 @@ class AccountService:
         
         return AccountBalanceTrendResponse(**trend)
     
+    async def get_balance_trends(
+        self, 
+        user_id: str, 
+        period_days: int = 30
+    ) -> List[AccountBalanceTrendResponse]:
+        """Get balance trends of all the user's active accounts."""
+        trends = await self.balance_history_repo.get_balance_trends_for_user(user_id, period_days)
+        
+        return [AccountBalanceTrendResponse(**trend) for trend in trends]
+    
+    async def get_net_worth_history(
+        self,
+        user_id: str,
+        days: int = 365,
+        resolution: NetWorthResolution = NetWorthResolution.DAY
+    ) -> NetWorthHistoryResponse:
+        """Get the user's net worth over time from balance history and its rollups."""
+        end_date = datetime.utcnow().date()
+        start_date = end_date - timedelta(days=days - 1)
+        
+        points = await self.balance_history_repo.get_net_worth_history(
+            user_id, start_date, end_date, resolution.value
+        )
+        
+        start_net_worth = points[0]["net_worth"] if points else Decimal('0')
+        end_net_worth = points[-1]["net_worth"] if points else Decimal('0')
+        
+        return NetWorthHistoryResponse(
+            resolution=resolution,
+            start_date=start_date,
+            end_date=end_date,
+            start_net_worth=start_net_worth,
+            end_net_worth=end_net_worth,
+            change_amount=end_net_worth - start_net_worth,
+            points=points
+        )
+    
+    async def downsample_balance_history(self) -> Dict[str, int]:
+        """Fold balance history past its retention into daily and monthly rollups."""
+        return await self.balance_history_repo.downsample()
+    
     async def get_accounts_by_institution(
         self, 
         user_id: str, 
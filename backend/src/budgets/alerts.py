@@ -0,0 +1,274 @@
+"""Budget threshold alert evaluation.
+
+Alerts are derived from spending changes (previous and new spent amount of a
+budget or budget category), so evaluation costs O(changed budgets) and only
+fires when a threshold is crossed upward. Each crossing has an idempotent key
+(budget, scope, alert type, budget period); alert rows are inserted in one
+statement that skips keys already recorded, and only newly recorded alerts are
+notified, in one batched fan-out.
+"""
+from dataclasses import dataclass
+from datetime import date
+from decimal import Decimal
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Sequence
+from uuid import uuid4
+
+import structlog
+from sqlalchemy import select
+from sqlalchemy.dialects.sqlite import insert
+
+from src.budgets.models import AlertType, Budget, BudgetAlert, BudgetCategory
+from src.exceptions import DatabaseError
+
+logger = structlog.get_logger(__name__)
+
+ALERT_TEMPLATE = "budget_alert"
+
+ALERT_TITLES = {
+    AlertType.WARNING: "Budget Warning",
+    AlertType.CRITICAL: "Budget Critical",
+    AlertType.EXCEEDED: "Budget Exceeded",
+}
+
+# Higher is more severe; only the most severe new alert per budget scope is notified
+ALERT_SEVERITY = {
+    AlertType.WARNING: 1,
+    AlertType.CRITICAL: 2,
+    AlertType.EXCEEDED: 3,
+}
+
+
+@dataclass
+class SpendingChange:
+    """Spent amount of a budget, or one of its categories, before and after a change."""
+    budget_id: str
+    user_id: str
+    budget_name: str
+    period_start: date
+    limit_amount: Decimal
+    previous_amount: Decimal
+    new_amount: Decimal
+    warning_threshold: Decimal
+    critical_threshold: Decimal
+    category_id: Optional[str] = None
+    category_name: Optional[str] = None
+
+    @classmethod
+    def for_budget(cls, budget: Budget, new_amount: Decimal) -> "SpendingChange":
+        return cls(
+            budget_id=budget.id,
+            user_id=budget.user_id,
+            budget_name=budget.name,
+            period_start=budget.start_date,
+            limit_amount=Decimal(budget.total_amount),
+            previous_amount=Decimal(budget.spent_amount or 0),
+            new_amount=Decimal(new_amount),
+            warning_threshold=Decimal(budget.warning_threshold),
+            critical_threshold=Decimal(budget.critical_threshold)
+        )
+
+    @classmethod
+    def for_category(cls, budget: Budget, category: BudgetCategory, new_amount: Decimal) -> "SpendingChange":
+        change = cls.for_budget(budget, new_amount)
+        change.category_id = category.id
+        change.category_name = category.category_name
+        change.limit_amount = Decimal(category.allocated_amount)
+        change.previous_amount = Decimal(category.spent_amount or 0)
+        return change
+
+    @property
+    def utilization(self) -> Decimal:
+        if self.limit_amount == 0:
+            return Decimal(0)
+        return (self.new_amount / self.limit_amount) * 100
+
+
+@dataclass
+class ThresholdCrossing:
+    """A spending change that crossed an alert threshold."""
+    change: SpendingChange
+    alert_type: AlertType
+    threshold: Optional[Decimal] = None
+
+    @property
+    def alert_key(self) -> str:
+        change = self.change
+        scope = change.category_id or "budget"
+        return f"{change.budget_id}:{scope}:{self.alert_type.value}:{change.period_start.isoformat()}"
+
+    @property
+    def title(self) -> str:
+        return ALERT_TITLES[self.alert_type]
+
+    @property
+    def message(self) -> str:
+        change = self.change
+        subject = f"Budget '{change.budget_name}'"
+        if change.category_name:
+            subject = f"Category '{change.category_name}' in budget '{change.budget_name}'"
+
+        if self.alert_type == AlertType.EXCEEDED:
+            return f"{subject} has been exceeded by {change.new_amount - change.limit_amount:.2f}"
+        return f"{subject} has reached {change.utilization:.1f}% utilization"
+
+    def to_alert_row(self) -> Dict[str, Any]:
+        return {
+            "id": str(uuid4()),
+            "budget_id": self.change.budget_id,
+            "alert_type": self.alert_type,
+            "title": self.title,
+            "message": self.message,
+            "threshold_percentage": self.threshold,
+            "amount_at_alert": self.change.new_amount,
+            "category_id": self.change.category_id,
+            "alert_key": self.alert_key,
+            "is_read": False,
+            "is_dismissed": False
+        }
+
+
+def detect_crossings(changes: Sequence[SpendingChange]) -> List[ThresholdCrossing]:
+    """Find thresholds crossed upward by each change.
+
+    Budgets alert at their warning and critical percentages and when exceeded;
+    categories alert when they exceed their allocation.
+    """
+    crossings: List[ThresholdCrossing] = []
+
+    for change in changes:
+        previous, new, limit = change.previous_amount, change.new_amount, change.limit_amount
+        if new <= previous:
+            continue
+
+        if change.category_id is None:
+            for alert_type, threshold in (
+                (AlertType.WARNING, change.warning_threshold),
+                (AlertType.CRITICAL, change.critical_threshold),
+            ):
+                level = limit * threshold / 100
+                if previous < level <= new:
+                    crossings.append(ThresholdCrossing(change, alert_type, threshold))
+
+        if previous <= limit < new:
+            crossings.append(ThresholdCrossing(change, AlertType.EXCEEDED))
+
+    return crossings
+
+
+async def _tenant_session():
+    from src.tenant.context import get_tenant_context
+    from src.tenant.manager import tenant_db_manager
+
+    return await tenant_db_manager.get_tenant_session(get_tenant_context())
+
+
+async def _enqueue_alert_emails(tenant_id: str, recipients: List[Dict[str, Any]]) -> None:
+    from src.services.background.tasks import send_batch_notification_emails
+
+    send_batch_notification_emails.delay(tenant_id, ALERT_TEMPLATE, recipients)
+
+
+class BudgetAlertEvaluator:
+    """Records and notifies budget threshold crossings."""
+
+    def __init__(self,
+                 session_factory: Optional[Callable] = None,
+                 notifier: Optional[Callable[[str, List[Dict[str, Any]]], Awaitable[None]]] = None):
+        self.session_factory = session_factory or _tenant_session
+        self.notifier = notifier or _enqueue_alert_emails
+
+    async def evaluate(self, changes: Sequence[SpendingChange], tenant_id: Optional[str] = None) -> List[ThresholdCrossing]:
+        """Record and notify the crossings in a set of changes, in a transaction of its own."""
+        if not changes:
+            return []
+
+        async with await self.session_factory() as session:
+            try:
+                created = await self.record_alerts(session, changes)
+                await session.commit()
+            except Exception as e:
+                await session.rollback()
+                raise DatabaseError(f"Failed to record budget alerts: {str(e)}")
+
+        await self.notify(created, tenant_id)
+        return created
+
+    async def record_alerts(self, session, changes: Sequence[SpendingChange]) -> List[ThresholdCrossing]:
+        """Insert alert rows for new crossings within the caller's transaction.
+
+        Returns only the crossings whose keys were not already recorded.
+        """
+        crossings = detect_crossings(changes)
+        if not crossings:
+            return []
+
+        statement = (
+            insert(BudgetAlert)
+            .values([crossing.to_alert_row() for crossing in crossings])
+            .on_conflict_do_nothing(index_elements=["alert_key"])
+            .returning(BudgetAlert.alert_key)
+        )
+        result = await session.execute(statement)
+        recorded = set(result.scalars().all())
+
+        return [crossing for crossing in crossings if crossing.alert_key in recorded]
+
+    async def notify(self, crossings: Sequence[ThresholdCrossing], tenant_id: Optional[str] = None) -> int:
+        """Send one alert email per budget scope, all in a single batch.
+
+        Failures are logged rather than raised: the alerts are already recorded.
+        """
+        if not crossings:
+            return 0
+
+        # Most severe crossing per budget/category
+        latest: Dict[tuple, ThresholdCrossing] = {}
+        for crossing in crossings:
+            scope = (crossing.change.budget_id, crossing.change.category_id)
+            current = latest.get(scope)
+            if current is None or ALERT_SEVERITY[crossing.alert_type] > ALERT_SEVERITY[current.alert_type]:
+                latest[scope] = crossing
+
+        try:
+            if tenant_id is None:
+                from src.tenant.context import require_tenant_context
+                tenant_id = require_tenant_context().tenant_id
+
+            users = await self._load_recipients({crossing.change.user_id for crossing in latest.values()})
+            recipients = [
+                {
+                    "to": users[crossing.change.user_id]["email"],
+                    "data": {
+                        "user_name": users[crossing.change.user_id]["name"],
+                        "title": crossing.title,
+                        "message": crossing.message,
+                        "budget_name": crossing.change.budget_name,
+                        "spent_amount": float(crossing.change.new_amount),
+                        "limit_amount": float(crossing.change.limit_amount),
+                        "utilization": float(crossing.change.utilization)
+                    }
+                }
+                for crossing in latest.values()
+                if crossing.change.user_id in users
+            ]
+
+            if recipients:
+                await self.notifier(tenant_id, recipients)
+            return len(recipients)
+
+        except Exception as e:
+            logger.error("Budget alert notification failed", alerts=len(latest), error=str(e))
+            return 0
+
+    async def _load_recipients(self, user_ids: set) -> Dict[str, Dict[str, str]]:
+        from src.users.models import User
+
+        async with await self.session_factory() as session:
+            result = await session.execute(
+                select(User.id, User.email, User.name).where(User.id.in_(user_ids))
+            )
+            return {
+                user_id: {"email": email, "name": name}
+                for user_id, email, name in result.all()
+                if email
+            }
@@ -0,0 +1,212 @@
+"""Budget analytics for the dashboard.
+
+All budget- and category-level metrics are computed by one statement: the
+budget counts and totals are conditional aggregates over the user's budgets,
+and the category extremes are picked from a window-ranked CTE of the active
+budgets' categories by scalar subqueries in the same SELECT, as are the
+totals of the two most recently ended budget periods the spending trend is
+derived from. The result is cached per user and dropped by every write that
+can change it.
+"""
+from datetime import date
+from decimal import Decimal
+from typing import Any, Dict, Optional
+
+from sqlalchemy import Float, and_, case, cast, func, select
+
+from src.budgets.models import Budget, BudgetCategory, BudgetStatus
+from src.config import settings
+
+CACHE_NAMESPACE = "budgets"
+CACHE_OPERATION = "budget_analytics"
+
+# Utilization change, in percentage points, between periods that counts as a trend
+TREND_THRESHOLD = Decimal(5)
+
+
+def _active_sum(column):
+    return func.coalesce(func.sum(case((Budget.status == BudgetStatus.ACTIVE, column))), 0)
+
+
+def _active_count(condition):
+    return func.count(case((and_(Budget.status == BudgetStatus.ACTIVE, condition), 1)))
+
+
+def budget_analytics_query(user_id: str, today: Optional[date] = None):
+    """Dashboard metrics for one user's budgets in a single round trip.
+
+    Totals, utilization and threshold counts cover active budgets only. A
+    budget is over threshold once it reaches its warning percentage, over
+    budget once spending exceeds its total. The most overspent category is the
+    one furthest past its allocation; the best performing one has the lowest
+    spent/allocated ratio. Spent and budgeted totals of the budgets that ended
+    most recently before ``today`` and of those that ended before them feed
+    the spending trend.
+    """
+    today = today or date.today()
+    overspend = BudgetCategory.spent_amount - BudgetCategory.allocated_amount
+    utilization = cast(BudgetCategory.spent_amount, Float) / BudgetCategory.allocated_amount
+
+    ranked = (
+        select(
+            BudgetCategory.category_name.label("category_name"),
+            overspend.label("overspend"),
+            func.row_number().over(
+                order_by=(overspend.desc(), BudgetCategory.category_name)
+            ).label("overspend_rank"),
+            func.row_number().over(
+                order_by=(utilization.asc(), BudgetCategory.category_name)
+            ).label("performance_rank")
+        )
+        .join(Budget, Budget.id == BudgetCategory.budget_id)
+        .where(
+            Budget.user_id == user_id,
+            Budget.status == BudgetStatus.ACTIVE,
+            BudgetCategory.allocated_amount > 0
+        )
+        .cte("ranked_categories")
+    )
+
+    most_overspent = (
+        select(ranked.c.category_name)
+        .where(ranked.c.overspend_rank == 1, ranked.c.overspend > 0)
+        .scalar_subquery()
+    )
+    best_performing = (
+        select(ranked.c.category_name)
+        .where(ranked.c.performance_rank == 1)
+        .scalar_subquery()
+    )
+
+    ended = (
+        select(
+            Budget.spent_amount.label("spent_amount"),
+            Budget.total_amount.label("total_amount"),
+            func.dense_rank().over(order_by=Budget.end_date.desc()).label("period_rank")
+        )
+        .where(Budget.user_id == user_id, Budget.end_date < today)
+        .cte("ended_periods")
+    )
+
+    def period_total(column, rank):
+        return (
+            select(func.sum(column))
+            .where(ended.c.period_rank == rank)
+            .scalar_subquery()
+        )
+
+    return (
+        select(
+            func.count(Budget.id).label("total_budgets"),
+            _active_count(True).label("active_budgets"),
+            _active_sum(Budget.total_amount).label("total_budgeted_amount"),
+            _active_sum(Budget.spent_amount).label("total_spent_amount"),
+            _active_sum(Budget.remaining_amount).label("total_remaining_amount"),
+            _active_count(
+                Budget.spent_amount * 100 >= Budget.total_amount * Budget.warning_threshold
+            ).label("budgets_over_threshold"),
+            _active_count(Budget.spent_amount > Budget.total_amount).label("budgets_over_budget"),
+            most_overspent.label("most_overspent_category"),
+            best_performing.label("best_performing_category"),
+            period_total(ended.c.spent_amount, 1).label("last_period_spent"),
+            period_total(ended.c.total_amount, 1).label("last_period_budgeted"),
+            period_total(ended.c.spent_amount, 2).label("previous_period_spent"),
+            period_total(ended.c.total_amount, 2).label("previous_period_budgeted")
+        )
+        .where(Budget.user_id == user_id)
+    )
+
+
+def analytics_from_row(row) -> Dict[str, Any]:
+    """Shape a ``budget_analytics_query`` row into the analytics payload."""
+    analytics = dict(row._mapping)
+    for key in ("total_budgeted_amount", "total_spent_amount", "total_remaining_amount"):
+        analytics[key] = Decimal(str(analytics[key] or 0))
+
+    analytics["average_utilization"] = Decimal(0)
+    if analytics["total_budgeted_amount"] > 0:
+        analytics["average_utilization"] = (
+            analytics["total_spent_amount"] / analytics["total_budgeted_amount"]
+        ) * 100
+
+    last = _utilization(analytics.pop("last_period_spent"), analytics.pop("last_period_budgeted"))
+    previous = _utilization(analytics.pop("previous_period_spent"), analytics.pop("previous_period_budgeted"))
+    analytics["spending_trend"] = spending_trend(last, previous)
+
+    return analytics
+
+
+def _utilization(spent, budgeted) -> Optional[Decimal]:
+    if not budgeted:
+        return None
+    return Decimal(str(spent or 0)) / Decimal(str(budgeted)) * 100
+
+
+def spending_trend(last: Optional[Decimal], previous: Optional[Decimal]) -> str:
+    """Trend from the utilization of the last two ended periods.
+
+    ``increasing`` or ``decreasing`` once utilization moved by at least
+    ``TREND_THRESHOLD`` points, ``stable`` otherwise or without two periods.
+    """
+    if last is None or previous is None:
+        return "stable"
+    if last - previous >= TREND_THRESHOLD:
+        return "increasing"
+    if previous - last >= TREND_THRESHOLD:
+        return "decreasing"
+    return "stable"
+
+
+class BudgetAnalyticsCache:
+    """Per-user cache of budget analytics, scoped to the current tenant.
+
+    Without a tenant context reads miss and writes are skipped, so callers
+    always fall back to the query.
+    """
+
+    def __init__(self, cache_service=None, ttl: Optional[int] = None):
+        self.cache_service = cache_service
+        self.ttl = ttl or settings.BUDGET_ANALYTICS_CACHE_TTL_SECONDS
+
+    def _get_cache_service(self):
+        if self.cache_service is None:
+            from src.services.redis.cache import CacheService
+            self.cache_service = CacheService()
+        return self.cache_service
+
+    @staticmethod
+    def _tenant_id() -> Optional[str]:
+        from src.tenant.context import get_tenant_context
+
+        context = get_tenant_context()
+        return context.tenant_id if context else None
+
+    @staticmethod
+    def _key(user_id: str) -> str:
+        from src.services.redis.cache import cache_key_for_user
+
+        return cache_key_for_user(user_id, CACHE_OPERATION)
+
+    async def get(self, user_id: str) -> Optional[Dict[str, Any]]:
+        tenant_id = self._tenant_id()
+        if tenant_id is None:
+            return None
+        return await self._get_cache_service().get(tenant_id, self._key(user_id), namespace=CACHE_NAMESPACE)
+
+    async def set(self, user_id: str, analytics: Dict[str, Any]) -> None:
+        tenant_id = self._tenant_id()
+        if tenant_id is None:
+            return
+        await self._get_cache_service().set(
+            tenant_id, self._key(user_id), analytics, ttl=self.ttl, namespace=CACHE_NAMESPACE
+        )
+
+    async def invalidate(self, *user_ids: str) -> None:
+        """Drop the cached analytics of the given users."""
+        tenant_id = self._tenant_id()
+        if tenant_id is None:
+            return
+
+        cache_service = self._get_cache_service()
+        for user_id in set(filter(None, user_ids)):
+            await cache_service.delete(tenant_id, self._key(user_id), namespace=CACHE_NAMESPACE)
@@ -0,0 +1,129 @@
+"""Transactional bulk creation of budgets with their categories.
+
+Budgets and categories are built client-side with every column the response
+needs (ids, derived amounts, timestamps), added to one session with
+``add_all`` and written by a single flush and commit. Nothing is read back:
+the returned objects are complete, and tenant sessions do not expire them on
+commit.
+"""
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from decimal import Decimal
+from typing import Any, Callable, Dict, List, Optional, Sequence
+from uuid import uuid4
+
+import structlog
+
+from src.budgets.models import Budget, BudgetCategory, BudgetStatus
+from src.exceptions import DatabaseError
+
+logger = structlog.get_logger(__name__)
+
+_BUDGET_FIELDS = set(Budget.__table__.columns.keys())
+_CATEGORY_FIELDS = set(BudgetCategory.__table__.columns.keys())
+
+
+@dataclass
+class BudgetDraft:
+    """A budget to create: its column values and its categories' column values."""
+    user_id: str
+    created_by: str
+    fields: Dict[str, Any]
+    categories: List[Dict[str, Any]] = field(default_factory=list)
+
+    @classmethod
+    def from_schema(cls, budget_data, user_id: str, created_by: str) -> "BudgetDraft":
+        """Draft from a create schema carrying its category schemas."""
+        return cls(
+            user_id=user_id,
+            created_by=created_by,
+            fields=budget_data.model_dump(exclude={"categories"}),
+            categories=[
+                category.model_dump() if hasattr(category, "model_dump") else dict(category)
+                for category in budget_data.categories or []
+            ]
+        )
+
+
+def build_budget(draft: BudgetDraft, now: Optional[datetime] = None) -> Budget:
+    """Fully populated budget and category rows for a draft.
+
+    Keys that are not columns (schema-only settings) are ignored.
+    """
+    now = now or datetime.now(timezone.utc)
+    values = {key: value for key, value in draft.fields.items() if key in _BUDGET_FIELDS}
+    total_amount = Decimal(values["total_amount"])
+    spent_amount = Decimal(values.get("spent_amount") or 0)
+
+    values.update(
+        id=values.get("id") or str(uuid4()),
+        user_id=draft.user_id,
+        created_by=draft.created_by,
+        total_amount=total_amount,
+        spent_amount=spent_amount,
+        remaining_amount=total_amount - spent_amount,
+        status=values.get("status") or BudgetStatus.ACTIVE,
+        created_at=now,
+        updated_at=now
+    )
+    budget = Budget(**values, alerts=[])
+
+    for category_fields in draft.categories:
+        category_values = {key: value for key, value in category_fields.items() if key in _CATEGORY_FIELDS}
+        allocated_amount = Decimal(category_values["allocated_amount"])
+        category_spent = Decimal(category_values.get("spent_amount") or 0)
+
+        category_values.update(
+            id=category_values.get("id") or str(uuid4()),
+            budget_id=budget.id,
+            allocated_amount=allocated_amount,
+            spent_amount=category_spent,
+            remaining_amount=allocated_amount - category_spent,
+            is_essential=category_values.get("is_essential") or False,
+            priority=category_values.get("priority") or 1,
+            created_at=now,
+            updated_at=now
+        )
+        budget.categories.append(BudgetCategory(**category_values))
+
+    return budget
+
+
+async def _tenant_session():
+    from src.tenant.context import get_tenant_context
+    from src.tenant.manager import tenant_db_manager
+
+    return await tenant_db_manager.get_tenant_session(get_tenant_context())
+
+
+class BudgetBulkWriter:
+    """Creates many budgets, with their categories, in one transaction."""
+
+    def __init__(self, session_factory: Optional[Callable] = None):
+        self.session_factory = session_factory or _tenant_session
+
+    async def create_budgets(self, drafts: Sequence[BudgetDraft]) -> List[Budget]:
+        """Create budgets in a transaction of their own."""
+        if not drafts:
+            return []
+
+        async with await self.session_factory() as session:
+            try:
+                budgets = await self.add_budgets(session, drafts)
+                await session.commit()
+            except Exception as e:
+                await session.rollback()
+                logger.error("Bulk budget creation failed", budgets=len(drafts), error=str(e))
+                raise DatabaseError(f"Failed to create budgets: {str(e)}")
+
+        logger.info("Created budgets in bulk", budgets=len(budgets))
+        return budgets
+
+    @staticmethod
+    async def add_budgets(session, drafts: Sequence[BudgetDraft]) -> List[Budget]:
+        """Add budgets within the caller's transaction and flush them once."""
+        now = datetime.now(timezone.utc)
+        budgets = [build_budget(draft, now) for draft in drafts]
+        session.add_all(budgets)
+        await session.flush()
+        return budgets
@@ -68,6 +68,10 @@ class Budget(TenantBase):
     user_id: Mapped[str] = mapped_column(String(36), nullable=False, index=True)
     created_by: Mapped[str] = mapped_column(String(36), nullable=False)
     
+    # Spending sync watermark: created_at of the newest transaction applied
+    # (naive UTC, like transactions.created_at). NULL means the next sync is a full recompute.
+    spending_watermark: Mapped[Optional[datetime]] = mapped_column(DateTime)
+    
     # Timestamps
     created_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True),
@@ -232,6 +236,9 @@ class BudgetAlert(TenantBase):
     amount_at_alert: Mapped[Decimal] = mapped_column(Numeric(15, 2), nullable=False)
     category_id: Mapped[Optional[str]] = mapped_column(String(36))  # If alert is for specific category
     
+    # Idempotency key for threshold crossings: budget, scope, alert type and period
+    alert_key: Mapped[Optional[str]] = mapped_column(String(200), unique=True)
+    
     # Status
     is_read: Mapped[bool] = mapped_column(Boolean, default=False, nullable=False)
     is_dismissed: Mapped[bool] = mapped_column(Boolean, default=False, nullable=False)
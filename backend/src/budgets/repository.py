@@ -6,6 +6,7 @@ from sqlalchemy import select, update, delete, and_, or_, func
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from src.shared.repository import UserScopedRepository
+from src.budgets.analytics import analytics_from_row, budget_analytics_query
 from src.budgets.models import (
     Budget, BudgetCategory, BudgetAlert, BudgetTemplate, BudgetTemplateCategory,
     BudgetStatus, AlertType
@@ -126,62 +127,11 @@ class BudgetRepository(UserScopedRepository[Budget, BudgetCreate, BudgetUpdate])
                 raise DatabaseError(f"Failed to update spent amount: {str(e)}")
     
     async def get_budget_analytics(self, user_id: str) -> Dict[str, Any]:
-        """Get budget analytics for user."""
+        """Get budget analytics for user in a single query."""
         async with await self.get_session() as session:
             try:
-                # Total budgets
-                total_budgets_query = (
-                    select(func.count(Budget.id))
-                    .where(Budget.user_id == user_id)
-                )
-                total_budgets = await session.scalar(total_budgets_query) or 0
-                
-                # Active budgets
-                active_budgets_query = (
-                    select(func.count(Budget.id))
-                    .where(
-                        and_(
-                            Budget.user_id == user_id,
-                            Budget.status == BudgetStatus.ACTIVE
-                        )
-                    )
-                )
-                active_budgets = await session.scalar(active_budgets_query) or 0
-                
-                # Amount totals
-                amounts_query = (
-                    select(
-                        func.sum(Budget.total_amount),
-                        func.sum(Budget.spent_amount),
-                        func.sum(Budget.remaining_amount)
-                    )
-                    .where(
-                        and_(
-                            Budget.user_id == user_id,
-                            Budget.status == BudgetStatus.ACTIVE
-                        )
-                    )
-                )
-                amounts_result = await session.execute(amounts_query)
-                amounts = amounts_result.first()
-                
-                total_budgeted = amounts[0] or Decimal(0)
-                total_spent = amounts[1] or Decimal(0)
-                total_remaining = amounts[2] or Decimal(0)
-                
-                # Average utilization
-                avg_utilization = Decimal(0)
-                if total_budgeted > 0:
-                    avg_utilization = (total_spent / total_budgeted) * 100
-                
-                return {
-                    "total_budgets": total_budgets,
-                    "active_budgets": active_budgets,
-                    "total_budgeted_amount": total_budgeted,
-                    "total_spent_amount": total_spent,
-                    "total_remaining_amount": total_remaining,
-                    "average_utilization": avg_utilization
-                }
+                result = await session.execute(budget_analytics_query(user_id))
+                return analytics_from_row(result.one())
                 
             except Exception as e:
                 raise DatabaseError(f"Failed to get budget analytics: {str(e)}")
@@ -0,0 +1,204 @@
+"""Recurring budget rollover.
+
+At each period boundary, every active recurring budget whose period has ended
+is closed and its next-period budget created with the same categories. With
+``auto_rollover`` the unused amount is carried into the new budget's total.
+Due budgets are processed in batches, each one transaction: a bulk insert of
+the successors and a single status UPDATE of their predecessors, so re-runs
+never create a period twice.
+"""
+import calendar
+from dataclasses import dataclass, field
+from datetime import date, timedelta
+from decimal import Decimal
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+import structlog
+from sqlalchemy import select, update
+from sqlalchemy.orm import aliased
+
+from src.budgets.bulk import BudgetBulkWriter, BudgetDraft
+from src.budgets.models import Budget, BudgetCategory, BudgetPeriod, BudgetStatus
+from src.exceptions import DatabaseError
+
+logger = structlog.get_logger(__name__)
+
+DEFAULT_BATCH_SIZE = 500
+
+_CARRIED_BUDGET_FIELDS = (
+    "name", "description", "period_type", "is_recurring", "auto_rollover",
+    "warning_threshold", "critical_threshold",
+)
+_CARRIED_CATEGORY_FIELDS = ("category_name", "category_id", "allocated_amount", "is_essential", "priority")
+
+_PERIOD_MONTHS = {
+    BudgetPeriod.MONTHLY: 1,
+    BudgetPeriod.QUARTERLY: 3,
+    BudgetPeriod.YEARLY: 12,
+}
+
+
+def _add_months(day: date, months: int) -> date:
+    month_index = day.month - 1 + months
+    year, month = day.year + month_index // 12, month_index % 12 + 1
+    return date(year, month, min(day.day, calendar.monthrange(year, month)[1]))
+
+
+def next_period(budget: Budget) -> Tuple[date, date]:
+    """Start and end dates of the period following a budget's."""
+    start_date = budget.end_date + timedelta(days=1)
+    if budget.period_type == BudgetPeriod.WEEKLY:
+        return start_date, start_date + timedelta(days=6)
+    return start_date, _add_months(start_date, _PERIOD_MONTHS[budget.period_type]) - timedelta(days=1)
+
+
+def build_successor(budget: Budget, categories: Sequence[BudgetCategory]) -> BudgetDraft:
+    """Draft of the next-period budget for a recurring budget."""
+    start_date, end_date = next_period(budget)
+    fields = {name: getattr(budget, name) for name in _CARRIED_BUDGET_FIELDS}
+
+    total_amount = Decimal(budget.total_amount)
+    if budget.auto_rollover:
+        total_amount += max(Decimal(budget.remaining_amount or 0), Decimal(0))
+
+    fields.update(total_amount=total_amount, start_date=start_date, end_date=end_date)
+
+    return BudgetDraft(
+        user_id=budget.user_id,
+        created_by=budget.created_by,
+        fields=fields,
+        categories=[
+            {name: getattr(category, name) for name in _CARRIED_CATEGORY_FIELDS}
+            for category in categories
+        ]
+    )
+
+
+@dataclass
+class BudgetRolloverResult:
+    """Outcome of a rollover run."""
+    budgets_rolled_over: int = 0
+    amount_carried: Decimal = Decimal(0)
+    created_budget_ids: List[str] = field(default_factory=list)
+    user_ids: List[str] = field(default_factory=list)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "budgets_rolled_over": self.budgets_rolled_over,
+            "amount_carried": float(self.amount_carried),
+            "users": len(self.user_ids)
+        }
+
+
+async def _tenant_session():
+    from src.tenant.context import get_tenant_context
+    from src.tenant.manager import tenant_db_manager
+
+    return await tenant_db_manager.get_tenant_session(get_tenant_context())
+
+
+class BudgetRolloverEngine:
+    """Creates next-period budgets for the current tenant's recurring budgets."""
+
+    def __init__(self,
+                 session_factory: Optional[Callable] = None,
+                 analytics_cache=None,
+                 batch_size: int = DEFAULT_BATCH_SIZE):
+        self.session_factory = session_factory or _tenant_session
+        self.analytics_cache = analytics_cache
+        self.batch_size = batch_size
+
+    async def rollover_due(self, as_of: Optional[date] = None) -> BudgetRolloverResult:
+        """Roll over every recurring budget whose period ended before ``as_of``."""
+        as_of = as_of or date.today()
+        result = BudgetRolloverResult()
+        user_ids = set()
+
+        while True:
+            batch = await self._rollover_batch(as_of)
+            if not batch:
+                break
+
+            for predecessor, successor in batch:
+                result.budgets_rolled_over += 1
+                result.amount_carried += successor.total_amount - predecessor.total_amount
+                result.created_budget_ids.append(successor.id)
+                user_ids.add(successor.user_id)
+
+            if len(batch) < self.batch_size:
+                break
+
+        result.user_ids = sorted(user_ids)
+        if result.user_ids and self.analytics_cache is not None:
+            await self.analytics_cache.invalidate(*result.user_ids)
+
+        logger.info("Recurring budgets rolled over", as_of=as_of.isoformat(), **result.to_dict())
+        return result
+
+    async def _rollover_batch(self, as_of: date) -> List[Tuple[Budget, Budget]]:
+        async with await self.session_factory() as session:
+            try:
+                due = await self._load_due(session, as_of)
+                if not due:
+                    return []
+
+                predecessors = list(due.keys())
+                successors = await BudgetBulkWriter.add_budgets(
+                    session, [build_successor(budget, due[budget]) for budget in predecessors]
+                )
+
+                await session.execute(
+                    update(Budget)
+                    .where(Budget.id.in_([budget.id for budget in predecessors]))
+                    .values(status=BudgetStatus.COMPLETED)
+                    .execution_options(synchronize_session=False)
+                )
+                await session.commit()
+
+            except Exception as e:
+                await session.rollback()
+                logger.error("Budget rollover failed", as_of=as_of.isoformat(), error=str(e))
+                raise DatabaseError(f"Failed to roll over budgets: {str(e)}")
+
+        return list(zip(predecessors, successors, strict=True))
+
+    async def _load_due(self, session, as_of: date) -> Dict[Budget, List[BudgetCategory]]:
+        """Ended, active recurring budgets without a next-period budget yet, with their categories."""
+        successor = aliased(Budget)
+        has_successor = (
+            select(successor.id)
+            .where(
+                successor.user_id == Budget.user_id,
+                successor.name == Budget.name,
+                successor.period_type == Budget.period_type,
+                successor.start_date > Budget.end_date
+            )
+            .exists()
+        )
+        due_ids = (
+            select(Budget.id)
+            .where(
+                Budget.is_recurring.is_(True),
+                Budget.status == BudgetStatus.ACTIVE,
+                Budget.end_date < as_of,
+                ~has_successor
+            )
+            .order_by(Budget.end_date, Budget.id)
+            .limit(self.batch_size)
+            .scalar_subquery()
+        )
+        query = (
+            select(Budget, BudgetCategory)
+            .outerjoin(BudgetCategory, BudgetCategory.budget_id == Budget.id)
+            .where(Budget.id.in_(due_ids))
+            .order_by(Budget.end_date, Budget.id, BudgetCategory.priority)
+        )
+        result = await session.execute(query)
+
+        due: Dict[Budget, List[BudgetCategory]] = {}
+        for budget, category in result.all():
+            categories = due.setdefault(budget, [])
+            if category is not None:
+                categories.append(category)
+
+        return due
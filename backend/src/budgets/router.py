@@ -261,20 +261,17 @@ async def delete_budget_category(
 @router.post("/{budget_id}/sync", response_model=Budget)
 async def sync_budget_spending(
     budget_id: str,
-    force_sync: bool = Query(False, description="Force sync even if recently synced"),
+    force_sync: bool = Query(False, description="Recompute from all transactions instead of applying new ones"),
     current_user: dict = Depends(get_current_user),
     budget_service: BudgetService = Depends()
 ):
     """Sync budget spending with actual transactions."""
     try:
-        # Get budget and sync spending amounts
-        budget = await budget_service.get_budget(budget_id, current_user["sub"])
-        if not budget:
-            raise HTTPException(status_code=404, detail="Budget not found")
-        
-        # TODO: Implement actual transaction sync logic
-        # For now, return the existing budget
-        return budget
+        return await budget_service.sync_budget_spending(
+            budget_id=budget_id,
+            user_id=current_user["sub"],
+            full=force_sync
+        )
         
     except NotFoundError as e:
         raise HTTPException(status_code=404, detail=str(e))
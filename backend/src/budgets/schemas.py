@@ -291,6 +291,39 @@ class BudgetSummaryResponse(BaseModel):
     )
 
 
+class BudgetAnalytics(BaseModel):
+    """Schema for dashboard budget analytics."""
+    total_budgets: int = Field(..., description="Total number of budgets")
+    active_budgets: int = Field(..., description="Number of active budgets")
+    total_budgeted_amount: Decimal = Field(..., description="Total budgeted across active budgets")
+    total_spent_amount: Decimal = Field(..., description="Total spent across active budgets")
+    total_remaining_amount: Decimal = Field(..., description="Total remaining across active budgets")
+    average_utilization: Decimal = Field(..., description="Spent as a percentage of budgeted")
+    budgets_over_threshold: int = Field(..., description="Active budgets at or above their warning threshold")
+    budgets_over_budget: int = Field(..., description="Active budgets spent beyond their total")
+    most_overspent_category: Optional[str] = Field(None, description="Category furthest over its allocation")
+    best_performing_category: Optional[str] = Field(None, description="Category with the lowest utilization")
+    spending_trend: str = Field(..., description="Utilization trend over the last two ended periods: increasing, decreasing or stable")
+    
+    model_config = ConfigDict(
+        json_schema_extra={
+            "example": {
+                "total_budgets": 3,
+                "active_budgets": 2,
+                "total_budgeted_amount": "5000.00",
+                "total_spent_amount": "4100.00",
+                "total_remaining_amount": "900.00",
+                "average_utilization": "82.00",
+                "budgets_over_threshold": 1,
+                "budgets_over_budget": 0,
+                "most_overspent_category": "Food & Dining",
+                "best_performing_category": "Transportation",
+                "spending_trend": "stable"
+            }
+        }
+    )
+
+
 class BudgetAnalysisResponse(BaseModel):
     """Schema for budget analysis responses."""
     budget_id: str = Field(..., description="Budget ID")
@@ -3,7 +3,6 @@ import logging
 from typing import Optional, List, Dict, Any
 from datetime import datetime, date, timedelta
 from decimal import Decimal
-from uuid import uuid4
 
 from src.budgets.repository import (
     BudgetRepository, BudgetCategoryRepository, BudgetAlertRepository,
@@ -15,7 +14,12 @@ from src.budgets.schemas import (
     BudgetTemplateCreate, BudgetTemplateUpdate, BudgetTemplate,
     BudgetAnalytics, CreateBudgetFromTemplate
 )
-from src.budgets.models import BudgetStatus, AlertType, BudgetPeriod
+from src.budgets.models import BudgetStatus, BudgetPeriod
+from src.budgets.alerts import BudgetAlertEvaluator, SpendingChange
+from src.budgets.analytics import BudgetAnalyticsCache
+from src.budgets.bulk import BudgetBulkWriter, BudgetDraft
+from src.budgets.rollover import BudgetRolloverEngine, BudgetRolloverResult
+from src.budgets.sync import BudgetSyncEngine, BudgetSyncResult
 from src.exceptions import NotFoundError, ValidationError, DatabaseError, BusinessLogicError
 
 logger = logging.getLogger(__name__)
@@ -30,46 +34,45 @@ class BudgetService:
         self.alert_repo = BudgetAlertRepository()
         self.template_repo = BudgetTemplateRepository()
         self.template_category_repo = BudgetTemplateCategoryRepository()
+        self.alert_evaluator = BudgetAlertEvaluator()
+        self.sync_engine = BudgetSyncEngine(alert_evaluator=self.alert_evaluator)
+        self.analytics_cache = BudgetAnalyticsCache()
+        self.bulk_writer = BudgetBulkWriter()
+        self.rollover_engine = BudgetRolloverEngine(analytics_cache=self.analytics_cache)
     
     async def create_budget(self, budget_data: BudgetCreate, user_id: str, created_by: str) -> Budget:
         """Create a new budget with categories."""
+        budgets = await self.create_budgets([budget_data], user_id, created_by)
+        return budgets[0]
+    
+    async def create_budgets(
+        self,
+        budgets_data: List[BudgetCreate],
+        user_id: str,
+        created_by: str
+    ) -> List[Budget]:
+        """Create budgets with their categories in a single transaction."""
         try:
             # Validate category allocations
-            if budget_data.categories:
-                total_allocated = sum(cat.allocated_amount for cat in budget_data.categories)
-                if total_allocated > budget_data.total_amount:
-                    raise ValidationError("Total category allocations exceed budget total")
-            
-            # Create budget
-            budget_dict = budget_data.model_dump(exclude={"categories"})
-            budget = await self.budget_repo.create_for_user(
-                BudgetCreate(**budget_dict),
-                user_id=user_id,
-                created_by=created_by
-            )
-            
-            # Create categories if provided
-            if budget_data.categories:
-                for category_data in budget_data.categories:
-                    category_dict = category_data.model_dump()
-                    category_dict["remaining_amount"] = category_data.allocated_amount
-                    
-                    await self.category_repo.create(
-                        BudgetCategoryCreate(**category_dict),
-                        budget_id=budget.id
-                    )
+            for budget_data in budgets_data:
+                if budget_data.categories:
+                    total_allocated = sum(cat.allocated_amount for cat in budget_data.categories)
+                    if total_allocated > budget_data.total_amount:
+                        raise ValidationError("Total category allocations exceed budget total")
             
-            # Load full budget with relationships
-            full_budget = await self.budget_repo.get_by_id(
-                budget.id, 
-                load_relationships=["categories", "alerts"]
-            )
+            budgets = await self.bulk_writer.create_budgets([
+                BudgetDraft.from_schema(budget_data, user_id, created_by)
+                for budget_data in budgets_data
+            ])
+            await self.analytics_cache.invalidate(user_id)
             
-            logger.info("Created budget", budget_id=budget.id, user_id=user_id)
-            return Budget.model_validate(full_budget)
+            logger.info(f"Created {len(budgets)} budgets for user {user_id}: {[budget.id for budget in budgets]}")
+            return [Budget.model_validate(budget) for budget in budgets]
             
+        except ValidationError:
+            raise
         except Exception as e:
-            logger.error("Failed to create budget", user_id=user_id, error=str(e))
+            logger.error(f"Failed to create budgets for user {user_id}: {e}")
             raise DatabaseError(f"Failed to create budget: {str(e)}")
     
     async def get_budget(self, budget_id: str, user_id: str) -> Optional[Budget]:
@@ -107,6 +110,8 @@ class BudgetService:
         if not updated_budget:
             return None
         
+        await self.analytics_cache.invalidate(user_id)
+        
         # Load full budget with relationships
         full_budget = await self.budget_repo.get_by_id(
             budget_id,
@@ -124,18 +129,25 @@ class BudgetService:
         
         # Soft delete by setting status to inactive
         await self.budget_repo.update(budget_id, BudgetUpdate(status=BudgetStatus.INACTIVE))
+        await self.analytics_cache.invalidate(user_id)
         
         logger.info("Deleted budget", budget_id=budget_id, user_id=user_id)
         return True
     
     async def update_budget_spending(self, budget_id: str, new_spent_amount: Decimal) -> Optional[Budget]:
-        """Update budget spent amount and check for alerts."""
+        """Update budget spent amount and alert on any thresholds it crosses."""
+        previous_budget = await self.budget_repo.get_by_id(budget_id)
+        if not previous_budget:
+            return None
+        
         budget = await self.budget_repo.update_spent_amount(budget_id, new_spent_amount)
         if not budget:
             return None
         
-        # Check for alert thresholds
-        await self._check_and_create_alerts(budget)
+        await self.analytics_cache.invalidate(previous_budget.user_id)
+        
+        # Only thresholds crossed by this change alert, once per budget period
+        await self.alert_evaluator.evaluate([SpendingChange.for_budget(previous_budget, new_spent_amount)])
         
         # Load full budget with relationships
         full_budget = await self.budget_repo.get_by_id(
@@ -145,18 +157,43 @@ class BudgetService:
         
         return Budget.model_validate(full_budget)
     
+    async def sync_budget_spending(self, budget_id: str, user_id: str, full: bool = False) -> Budget:
+        """Sync a budget's spent amounts with its transactions.
+        
+        Re-sums the budget if it has transactions added since the last sync,
+        or unconditionally when ``full`` is set.
+        """
+        budget = await self.budget_repo.get_by_id_for_user(budget_id, user_id)
+        if not budget:
+            raise NotFoundError("Budget not found")
+        
+        await self.sync_engine.sync_budgets([budget_id], full=full)
+        await self.analytics_cache.invalidate(user_id)
+        
+        # Load full budget with relationships
+        full_budget = await self.budget_repo.get_by_id(
+            budget_id,
+            load_relationships=["categories", "alerts"]
+        )
+        return Budget.model_validate(full_budget)
+    
+    async def sync_user_budgets(self, user_ids: List[str], full: bool = False) -> BudgetSyncResult:
+        """Sync all active budgets of the given users, e.g. after transaction ingestion."""
+        result = await self.sync_engine.sync_user_budgets(user_ids, full=full)
+        if result.updated_budget_ids:
+            await self.analytics_cache.invalidate(*user_ids)
+        return result
+    
+    async def rollover_recurring_budgets(self, as_of: Optional[date] = None) -> BudgetRolloverResult:
+        """Create next-period budgets for every recurring budget whose period has ended."""
+        return await self.rollover_engine.rollover_due(as_of)
+    
     async def get_budget_analytics(self, user_id: str) -> BudgetAnalytics:
-        """Get budget analytics for user."""
-        analytics_data = await self.budget_repo.get_budget_analytics(user_id)
-        
-        # Add additional computed metrics
-        analytics_data.update({
-            "budgets_over_threshold": 0,  # TODO: Calculate from actual data
-            "budgets_over_budget": 0,     # TODO: Calculate from actual data
-            "most_overspent_category": None,  # TODO: Calculate from category data
-            "best_performing_category": None, # TODO: Calculate from category data
-            "spending_trend": "stable"    # TODO: Calculate from historical data
-        })
+        """Get budget analytics for user, cached until their budgets change."""
+        analytics_data = await self.analytics_cache.get(user_id)
+        if analytics_data is None:
+            analytics_data = await self.budget_repo.get_budget_analytics(user_id)
+            await self.analytics_cache.set(user_id, analytics_data)
         
         return BudgetAnalytics(**analytics_data)
     
@@ -187,6 +224,7 @@ class BudgetService:
             BudgetCategoryCreate(**category_dict),
             budget_id=budget_id
         )
+        await self.analytics_cache.invalidate(user_id)
         
         logger.info("Added category to budget", budget_id=budget_id, category_id=category.id)
         return BudgetCategory.model_validate(category)
@@ -208,6 +246,7 @@ class BudgetService:
             raise NotFoundError("Budget not found")
         
         updated_category = await self.category_repo.update(category_id, category_data)
+        await self.analytics_cache.invalidate(user_id)
         return BudgetCategory.model_validate(updated_category) if updated_category else None
     
     async def delete_category(self, category_id: str, user_id: str) -> bool:
@@ -223,6 +262,7 @@ class BudgetService:
         
         success = await self.category_repo.delete(category_id)
         if success:
+            await self.analytics_cache.invalidate(user_id)
             logger.info("Deleted budget category", category_id=category_id)
         
         return success
@@ -359,65 +399,6 @@ class BudgetService:
         return await self.alert_repo.dismiss_alert(alert_id)
     
     # Private helper methods
-    async def _check_and_create_alerts(self, budget) -> None:
-        """Check budget thresholds and create alerts if needed."""
-        utilization = budget.utilization_percentage
-        
-        # Check warning threshold
-        if utilization >= budget.warning_threshold and not budget.is_warning_threshold_reached:
-            await self._create_alert(
-                budget.id,
-                AlertType.WARNING,
-                "Budget Warning",
-                f"Budget '{budget.name}' has reached {utilization:.1f}% utilization",
-                budget.warning_threshold,
-                budget.spent_amount
-            )
-        
-        # Check critical threshold
-        if utilization >= budget.critical_threshold and not budget.is_critical_threshold_reached:
-            await self._create_alert(
-                budget.id,
-                AlertType.CRITICAL,
-                "Budget Critical",
-                f"Budget '{budget.name}' has reached {utilization:.1f}% utilization",
-                budget.critical_threshold,
-                budget.spent_amount
-            )
-        
-        # Check if over budget
-        if budget.is_over_budget:
-            await self._create_alert(
-                budget.id,
-                AlertType.EXCEEDED,
-                "Budget Exceeded",
-                f"Budget '{budget.name}' has been exceeded by {budget.spent_amount - budget.total_amount}",
-                None,
-                budget.spent_amount
-            )
-    
-    async def _create_alert(
-        self,
-        budget_id: str,
-        alert_type: AlertType,
-        title: str,
-        message: str,
-        threshold_percentage: Optional[Decimal],
-        amount_at_alert: Decimal
-    ) -> None:
-        """Create budget alert."""
-        alert_data = {
-            "id": str(uuid4()),
-            "budget_id": budget_id,
-            "alert_type": alert_type,
-            "title": title,
-            "message": message,
-            "threshold_percentage": threshold_percentage,
-            "amount_at_alert": amount_at_alert
-        }
-        
-        await self.alert_repo.create(alert_data)
-    
     def _calculate_end_date(self, start_date: date, period_type: BudgetPeriod) -> date:
         """Calculate end date based on period type."""
         if period_type == BudgetPeriod.WEEKLY:
@@ -0,0 +1,366 @@
+"""Budget spending sync engine.
+
+Budget and category spent amounts are derived from the user's transactions in
+the budget's date window. A sync reads every affected total in one grouped
+query and writes them back with batched (executemany) UPDATEs, in a single
+transaction. Totals are always re-summed rather than added to the stored
+amounts, so running a sync twice never counts a transaction twice, and each
+transaction counts toward at most one category of a budget. A budget's total
+is the sum of its categories; spending in none of them is not counted.
+
+Each budget keeps a watermark: the ``created_at`` of the newest transaction it
+has counted. ``created_at`` is set when a row is built, not when it commits,
+so a transaction can become visible after a newer one was already synced.
+Incremental syncs therefore re-sum every budget with a transaction created
+after its watermark minus ``BUDGET_SYNC_OVERLAP_SECONDS``, which picks up such
+late commits, and leave all other budgets untouched. Budgets without a
+watermark, or a forced sync, are always re-summed. Edits to older
+transactions (re-categorization, hiding, deletes) are invisible to an
+incremental sync, so manual transaction writes request a full sync of the
+user's budgets.
+
+The before/after amounts of every updated budget and category feed the alert
+evaluator in the same transaction, so threshold alerts are recorded exactly
+when the spending that crossed them is.
+"""
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from decimal import Decimal
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+import structlog
+from sqlalchemy import (
+    DateTime,
+    String,
+    and_,
+    bindparam,
+    column,
+    exists,
+    func,
+    or_,
+    select,
+    update,
+    values,
+)
+
+from src.budgets.alerts import BudgetAlertEvaluator, SpendingChange
+from src.budgets.models import Budget, BudgetCategory, BudgetStatus
+from src.config import settings
+from src.exceptions import DatabaseError
+
+logger = structlog.get_logger(__name__)
+
+_budgets = Budget.__table__
+_categories = BudgetCategory.__table__
+
+# Batched UPDATE statements, executed once per sync with a list of parameter sets.
+# Bind names must not collide with column names.
+_SET_CATEGORY_SPENT = (
+    update(_categories)
+    .where(_categories.c.id == bindparam("b_id"))
+    .values(
+        spent_amount=bindparam("b_amount"),
+        remaining_amount=_categories.c.allocated_amount - bindparam("b_amount"),
+        updated_at=func.now()
+    )
+)
+_SET_BUDGET_SPENT = (
+    update(_budgets)
+    .where(_budgets.c.id == bindparam("b_id"))
+    .values(
+        spent_amount=bindparam("b_amount"),
+        remaining_amount=_budgets.c.total_amount - bindparam("b_amount"),
+        spending_watermark=bindparam("b_watermark"),
+        updated_at=func.now()
+    )
+)
+
+@dataclass
+class SyncTarget:
+    """A budget to sync, with its categories, as loaded before the sync."""
+    budget: Budget
+    categories: List[BudgetCategory] = field(default_factory=list)
+
+    @property
+    def budget_id(self) -> str:
+        return self.budget.id
+
+    @property
+    def watermark(self) -> Optional[datetime]:
+        return self.budget.spending_watermark
+
+
+@dataclass
+class SyncPlan:
+    """Parameter sets for the batched UPDATE statements."""
+    set_categories: List[Dict[str, Any]] = field(default_factory=list)
+    set_budgets: List[Dict[str, Any]] = field(default_factory=list)
+
+    @property
+    def budget_ids(self) -> List[str]:
+        return [params["b_id"] for params in self.set_budgets]
+
+
+@dataclass
+class BudgetSyncResult:
+    """Outcome of a sync run."""
+    budgets_checked: int = 0
+    full_syncs: int = 0
+    incremental_syncs: int = 0
+    categories_updated: int = 0
+    alerts_created: int = 0
+    updated_budget_ids: List[str] = field(default_factory=list)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "budgets_checked": self.budgets_checked,
+            "full_syncs": self.full_syncs,
+            "incremental_syncs": self.incremental_syncs,
+            "categories_updated": self.categories_updated,
+            "alerts_created": self.alerts_created,
+            "budgets_updated": len(self.updated_budget_ids)
+        }
+
+
+def build_sync_plan(
+    targets: Sequence[SyncTarget],
+    rows: Iterable[Tuple[str, Optional[str], Any, Optional[datetime]]],
+    budget_ids: Optional[Iterable[str]] = None
+) -> SyncPlan:
+    """Turn grouped ``(budget_id, category_id, amount, newest_created_at)`` rows into UPDATE parameters.
+
+    Every target in ``budget_ids`` (all targets when ``None``) is re-summed,
+    zero-filling the budget and categories without spending. Other targets
+    are left as they are. A budget's total is the sum of its categories, so
+    rows without a category only move the watermark.
+    """
+    budget_totals: Dict[str, Decimal] = {}
+    category_totals: Dict[str, Decimal] = {}
+    newest: Dict[str, datetime] = {}
+
+    for budget_id, category_id, amount, newest_created_at in rows:
+        amount = Decimal(str(amount or 0))
+        if category_id:
+            budget_totals[budget_id] = budget_totals.get(budget_id, Decimal(0)) + amount
+            category_totals[category_id] = category_totals.get(category_id, Decimal(0)) + amount
+        if newest_created_at and (budget_id not in newest or newest_created_at > newest[budget_id]):
+            newest[budget_id] = newest_created_at
+
+    resummed = None if budget_ids is None else set(budget_ids)
+    plan = SyncPlan()
+    for target in targets:
+        if resummed is not None and target.budget_id not in resummed:
+            continue
+
+        plan.set_budgets.append({
+            "b_id": target.budget_id,
+            "b_amount": budget_totals.get(target.budget_id, Decimal(0)),
+            "b_watermark": max(filter(None, (target.watermark, newest.get(target.budget_id))), default=None)
+        })
+        plan.set_categories.extend(
+            {"b_id": category.id, "b_amount": category_totals.get(category.id, Decimal(0))}
+            for category in target.categories
+        )
+
+    return plan
+
+
+def plan_changes(targets: Sequence[SyncTarget], plan: SyncPlan) -> List[SpendingChange]:
+    """Before/after spent amounts for every budget and category a plan modifies."""
+    amounts = {params["b_id"]: params["b_amount"] for params in plan.set_budgets + plan.set_categories}
+
+    changes: List[SpendingChange] = []
+    for target in targets:
+        budget = target.budget
+        amount = amounts.get(budget.id)
+        if amount is not None and amount != budget.spent_amount:
+            changes.append(SpendingChange.for_budget(budget, amount))
+
+        for category in target.categories:
+            amount = amounts.get(category.id)
+            if amount is not None and amount != category.spent_amount:
+                changes.append(SpendingChange.for_category(budget, category, amount))
+
+    return changes
+
+
+async def _tenant_session():
+    from src.tenant.context import get_tenant_context
+    from src.tenant.manager import tenant_db_manager
+
+    return await tenant_db_manager.get_tenant_session(get_tenant_context())
+
+
+class BudgetSyncEngine:
+    """Recomputes budget spending from transactions for the current tenant."""
+
+    def __init__(self,
+                 session_factory: Optional[Callable] = None,
+                 alert_evaluator: Optional[BudgetAlertEvaluator] = None,
+                 overlap: Optional[timedelta] = None):
+        self.session_factory = session_factory or _tenant_session
+        self.alert_evaluator = alert_evaluator or BudgetAlertEvaluator(session_factory=self.session_factory)
+        self.overlap = overlap if overlap is not None else timedelta(seconds=settings.BUDGET_SYNC_OVERLAP_SECONDS)
+
+    async def sync_budgets(self, budget_ids: List[str], full: bool = False) -> BudgetSyncResult:
+        """Sync specific budgets, whatever their status."""
+        if not budget_ids:
+            return BudgetSyncResult()
+        return await self._sync(Budget.id.in_(budget_ids), full)
+
+    async def sync_user_budgets(self, user_ids: List[str], full: bool = False) -> BudgetSyncResult:
+        """Sync all active budgets owned by the given users."""
+        if not user_ids:
+            return BudgetSyncResult()
+        return await self._sync(
+            and_(Budget.user_id.in_(user_ids), Budget.status == BudgetStatus.ACTIVE),
+            full
+        )
+
+    async def _sync(self, criteria, full: bool) -> BudgetSyncResult:
+        async with await self.session_factory() as session:
+            try:
+                targets = await self._load_targets(session, criteria)
+                if not targets:
+                    return BudgetSyncResult()
+
+                if full:
+                    budget_ids = [target.budget_id for target in targets]
+                else:
+                    budget_ids = (await session.execute(self._changed_budgets_query(targets))).scalars().all()
+
+                rows = await session.execute(self._spending_query(budget_ids)) if budget_ids else None
+                plan = build_sync_plan(targets, rows.all() if rows else [], budget_ids)
+
+                for statement, params in (
+                    (_SET_CATEGORY_SPENT, plan.set_categories),
+                    (_SET_BUDGET_SPENT, plan.set_budgets),
+                ):
+                    if params:
+                        await session.execute(statement, params)
+
+                alerts = await self.alert_evaluator.record_alerts(session, plan_changes(targets, plan))
+
+                await session.commit()
+
+            except Exception as e:
+                await session.rollback()
+                logger.error("Budget spending sync failed", full=full, error=str(e))
+                raise DatabaseError(f"Failed to sync budget spending: {str(e)}")
+
+        resummed = set(plan.budget_ids)
+        full_syncs = sum(
+            1 for target in targets
+            if target.budget_id in resummed and (full or target.watermark is None)
+        )
+        result = BudgetSyncResult(
+            budgets_checked=len(targets),
+            full_syncs=full_syncs,
+            incremental_syncs=len(plan.set_budgets) - full_syncs,
+            categories_updated=len(plan.set_categories),
+            alerts_created=len(alerts),
+            updated_budget_ids=plan.budget_ids
+        )
+        logger.info("Budget spending synced", full=full, **result.to_dict())
+
+        await self.alert_evaluator.notify(alerts)
+        return result
+
+    @staticmethod
+    async def _load_targets(session, criteria) -> List[SyncTarget]:
+        query = (
+            select(Budget, BudgetCategory)
+            .outerjoin(BudgetCategory, BudgetCategory.budget_id == Budget.id)
+            .where(criteria)
+        )
+        result = await session.execute(query)
+
+        targets: Dict[str, SyncTarget] = {}
+        for budget, category in result.all():
+            target = targets.setdefault(budget.id, SyncTarget(budget))
+            if category is not None:
+                target.categories.append(category)
+
+        return list(targets.values())
+
+    @staticmethod
+    def _spending_filter(Transaction):
+        """Transactions that count as spending for a budget."""
+        return and_(
+            Transaction.user_id == Budget.user_id,
+            Transaction.date >= Budget.start_date,
+            Transaction.date <= Budget.end_date,
+            Transaction.amount > 0,  # Positive amounts are spending
+            Transaction.is_transfer.is_(False),
+            Transaction.is_hidden.is_(False),
+            Transaction.is_split.is_(False),  # Split parents are counted through their children
+        )
+
+    def _changed_budgets_query(self, targets: Sequence[SyncTarget]):
+        """Ids of the targets to re-sum in an incremental sync.
+
+        A budget is re-summed when it has no watermark or has spending created
+        after its watermark minus the overlap, the window in which a late
+        commit can still appear behind rows that were already counted.
+        """
+        from src.transactions.models import Transaction
+
+        cutoffs = values(
+            column("budget_id", String),
+            column("since", DateTime),
+            name="sync_cutoffs"
+        ).data([
+            (target.budget_id, target.watermark - self.overlap if target.watermark else None)
+            for target in targets
+        ]).cte("sync_cutoffs")
+
+        recent_spending = exists().where(
+            self._spending_filter(Transaction),
+            Transaction.created_at > cutoffs.c.since
+        )
+
+        return (
+            select(Budget.id)
+            .add_cte(cutoffs)
+            .join_from(cutoffs, Budget, Budget.id == cutoffs.c.budget_id)
+            .where(or_(cutoffs.c.since.is_(None), recent_spending))
+        )
+
+    @classmethod
+    def _spending_query(cls, budget_ids: Sequence[str]):
+        """Spending per (budget, budget category) in one grouped query.
+
+        Each transaction is assigned to a single matching category, so budget
+        totals count it once even when several categories match its name.
+        Spending matching none of the budget's categories comes back with a
+        NULL category; it advances the watermark but is not counted.
+        """
+        from src.transactions.models import Transaction
+
+        effective_category = func.lower(func.coalesce(Transaction.custom_category, Transaction.plaid_category))
+        category_id = (
+            select(func.min(BudgetCategory.id))
+            .where(
+                BudgetCategory.budget_id == Budget.id,
+                or_(
+                    func.lower(BudgetCategory.category_name) == effective_category,
+                    func.lower(BudgetCategory.category_id) == effective_category
+                )
+            )
+            .correlate(Budget, Transaction)
+            .scalar_subquery()
+            .label("budget_category_id")
+        )
+
+        return (
+            select(
+                Budget.id,
+                category_id,
+                func.sum(Transaction.amount),
+                func.max(Transaction.created_at)
+            )
+            .select_from(Budget)
+            .join(Transaction, cls._spending_filter(Transaction))
+            .where(Budget.id.in_(budget_ids))
+            .group_by(Budget.id, category_id)
+        )
@@ -61,11 +61,16 @@ class Settings(BaseSettings):
     PLAID_ENV: str = "sandbox"
     PLAID_PRODUCTS: str = "transactions,accounts,identity"
     PLAID_COUNTRY_CODES: str = "US"
+    PLAID_ITEM_ROUTE_CACHE_TTL_SECONDS: int = 86400
+    PLAID_ITEM_ROUTE_NEGATIVE_TTL_SECONDS: int = 60
     
     # Stripe Configuration
     STRIPE_SECRET_KEY: str
     STRIPE_PUBLISHABLE_KEY: str
     STRIPE_WEBHOOK_SECRET: str
+    STRIPE_HTTP_POOL_SIZE: int = 10
+    STRIPE_CATALOG_CACHE_TTL_SECONDS: int = 3600
+    STRIPE_OBJECT_CACHE_TTL_SECONDS: int = 300
     
     # Redis
     REDIS_URL: str = "redis://localhost:6379"
@@ -77,6 +82,7 @@ class Settings(BaseSettings):
     # Monitoring
     SENTRY_DSN: Optional[str] = None
     PROMETHEUS_METRICS_ENABLED: bool = True
+    PERFORMANCE_HISTORY_PATH: str = "./performance_history.db"
     
     # Email
     SMTP_HOST: str = "smtp.gmail.com"
@@ -87,6 +93,12 @@ class Settings(BaseSettings):
     SMTP_USE_SSL: bool = False
     EMAIL_FROM_ADDRESS: str = "noreply@faithfulfinances.com"
     EMAIL_FROM_NAME: str = "Faithful Finances"
+    SMTP_POOL_SIZE: int = 5
+    SMTP_POOL_MAX_IDLE_SECONDS: int = 60
+    SMTP_MAX_MESSAGES_PER_CONNECTION: int = 100
+    EMAIL_BATCH_PER_DOMAIN_CONCURRENCY: int = 2
+    EMAIL_TEMPLATE_DIR: Optional[str] = None
+    EMAIL_TEMPLATE_AUTO_RELOAD: Optional[bool] = None
     
     # Environment
     ENVIRONMENT: str = "development"
@@ -127,6 +139,25 @@ class Settings(BaseSettings):
     CELERY_BROKER_URL: str = "redis://localhost:6379/0"
     CELERY_RESULT_BACKEND: str = "redis://localhost:6379/0"
     
+    # Webhook Inbox
+    WEBHOOK_DEDUPE_TTL_SECONDS: int = 259200  # Stripe retries for up to 3 days
+    WEBHOOK_BATCH_SIZE: int = 50
+    WEBHOOK_LOCK_TTL_SECONDS: int = 120
+    WEBHOOK_RECOVERY_GRACE_SECONDS: int = 600
+    
+    # Account balance history
+    ACCOUNT_BALANCE_RAW_RETENTION_DAYS: int = 90  # Per-sync rows, then daily rollups
+    ACCOUNT_BALANCE_DAILY_RETENTION_DAYS: int = 730  # Daily rollups, then monthly rollups
+    
+    # Budgets
+    BUDGET_ANALYTICS_CACHE_TTL_SECONDS: int = 300
+    BUDGET_SYNC_OVERLAP_SECONDS: int = 3600  # Late-commit window re-summed by incremental syncs
+    
+    # Families
+    FAMILY_DASHBOARD_CACHE_TTL_SECONDS: int = 300
+    FAMILY_PERMISSION_CACHE_TTL_SECONDS: int = 300
+    FAMILY_PERMISSION_LOCAL_TTL_SECONDS: float = 5.0
+    
     # API Documentation
     DOCS_URL: Optional[str] = "/docs"
     REDOC_URL: Optional[str] = "/redoc"
@@ -77,7 +77,7 @@ async def init_databases():
         # Test global database connection
         async with global_engine.begin() as conn:
             # Import global models to ensure they're registered
-            from src.tenant.models import TenantRegistry, TenantUser  # noqa: F401
+            from src.tenant.models import TenantRegistry, TenantUser, PlaidItemRoute  # noqa: F401
             
             # Create tables if needed (for development)
             if settings.DEBUG:
@@ -1,5 +1,5 @@
 """Custom exception classes."""
-from typing import Any, Dict, Optional
+from typing import Any, Dict, List, Optional
 from fastapi import HTTPException, status
 
 
@@ -97,6 +97,28 @@ class RedisError(ExternalServiceError):
         super().__init__("redis", message, details)
 
 
+class EmailError(ExternalServiceError):
+    """Raised when email delivery fails."""
+    
+    def __init__(self, message: str, details: Optional[Dict[str, Any]] = None):
+        super().__init__("email", message, details)
+
+
+class EmailTemplateError(EmailError):
+    """Raised when an email template cannot be loaded or rendered."""
+    
+    def __init__(
+        self,
+        message: str,
+        template_name: Optional[str] = None,
+        missing_variables: Optional[List[str]] = None,
+        details: Optional[Dict[str, Any]] = None
+    ):
+        self.template_name = template_name
+        self.missing_variables = missing_variables or []
+        super().__init__(message, details)
+
+
 class BusinessLogicError(BaseCustomException):
     """Raised when business logic validation fails."""
     pass
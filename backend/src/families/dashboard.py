@@ -0,0 +1,445 @@
+"""Family dashboard aggregation.
+
+The dashboard is built from five independent read-only statements: member
+month-to-date spending (members left-joined to their transactions and
+grouped), the pending invitation and approval counts (scalar subqueries of
+one SELECT), the approvals expiring soon, the recent activity feed (a UNION
+ALL of spending requests, approval decisions and joins), and the shared
+budgets and goals (a UNION ALL read with their JSON configuration). With a
+session factory each statement runs in its own session, concurrently;
+otherwise they run in turn on the caller's session.
+
+The payload is the same for every member, so it is cached per family and
+dropped by member, invitation, approval and transaction writes. Fields the
+viewer may not see are removed by ``dashboard_for_viewer`` after the cache.
+"""
+import asyncio
+from datetime import datetime, timedelta
+from decimal import Decimal, InvalidOperation
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+from sqlalchemy import and_, desc, func, literal, null, select, union_all
+
+from src.config import settings
+from src.families.models import (
+    FamilyBudget,
+    FamilyInvitation,
+    FamilyMember,
+    FamilySavingsGoal,
+    SpendingApprovalRequest
+)
+from src.families.permissions import FamilyAccess, FamilyPermission
+
+CACHE_NAMESPACE = "families"
+CACHE_OPERATION = "dashboard"
+
+RECENT_ACTIVITY_LIMIT = 20
+UPCOMING_APPROVAL_LIMIT = 20
+UPCOMING_APPROVAL_WINDOW = timedelta(hours=24)
+# Activity only shown to members who may approve spending
+SPENDING_ACTIVITY_TYPES = ("spending_request", "spending_decision")
+
+
+async def _tenant_session():
+    from src.tenant.context import get_tenant_context
+    from src.tenant.manager import tenant_db_manager
+
+    return await tenant_db_manager.get_tenant_session(get_tenant_context())
+
+
+def tenant_session_factory() -> Optional[Callable]:
+    """Session factory for the current tenant, or None outside a tenant context."""
+    from src.tenant.context import get_tenant_context
+
+    return _tenant_session if get_tenant_context() else None
+
+
+def member_spending_query(family_id: str, since: datetime):
+    """Spending of each active member since ``since``, members without any included.
+
+    Spending follows the budget sync rules: positive amounts that are not
+    transfers, hidden, or split parents.
+    """
+    from src.transactions.models import Transaction
+
+    return (
+        select(
+            FamilyMember.id.label("member_id"),
+            FamilyMember.user_id.label("user_id"),
+            FamilyMember.name.label("name"),
+            FamilyMember.role.label("role"),
+            FamilyMember.spending_limit.label("spending_limit"),
+            func.coalesce(func.sum(Transaction.amount), 0).label("spent"),
+            func.count(Transaction.id).label("transaction_count")
+        )
+        .outerjoin(
+            Transaction,
+            and_(
+                Transaction.user_id == FamilyMember.user_id,
+                Transaction.amount > 0,
+                Transaction.is_transfer.is_(False),
+                Transaction.is_hidden.is_(False),
+                Transaction.is_split.is_(False),
+                Transaction.date >= since.date()
+            )
+        )
+        .where(FamilyMember.family_id == family_id, FamilyMember.status == "active")
+        .group_by(
+            FamilyMember.id,
+            FamilyMember.user_id,
+            FamilyMember.name,
+            FamilyMember.role,
+            FamilyMember.spending_limit,
+            FamilyMember.joined_at
+        )
+        .order_by(FamilyMember.joined_at, FamilyMember.id)
+    )
+
+
+def pending_counts_query(family_id: str, now: datetime):
+    """Unexpired pending invitations and approval requests in one row."""
+    pending_invitations = (
+        select(func.count(FamilyInvitation.id))
+        .where(
+            FamilyInvitation.family_id == family_id,
+            FamilyInvitation.status == "pending",
+            FamilyInvitation.expires_at > now
+        )
+        .scalar_subquery()
+    )
+    pending_approvals = (
+        select(func.count(SpendingApprovalRequest.id))
+        .where(
+            SpendingApprovalRequest.family_id == family_id,
+            SpendingApprovalRequest.status == "pending",
+            SpendingApprovalRequest.expires_at > now
+        )
+        .scalar_subquery()
+    )
+
+    return select(
+        pending_invitations.label("pending_invitations"),
+        pending_approvals.label("pending_approvals")
+    )
+
+
+def upcoming_approvals_query(family_id: str, now: datetime, limit: int = UPCOMING_APPROVAL_LIMIT):
+    """Pending approval requests expiring within the next day, soonest first."""
+    return (
+        select(*SpendingApprovalRequest.__table__.columns)
+        .where(
+            SpendingApprovalRequest.family_id == family_id,
+            SpendingApprovalRequest.status == "pending",
+            SpendingApprovalRequest.expires_at > now,
+            SpendingApprovalRequest.expires_at <= now + UPCOMING_APPROVAL_WINDOW
+        )
+        .order_by(SpendingApprovalRequest.expires_at)
+        .limit(limit)
+    )
+
+
+def recent_activity_query(family_id: str, limit: int = RECENT_ACTIVITY_LIMIT):
+    """Latest spending requests, approval decisions and member joins, newest first."""
+    requests = (
+        select(
+            literal("spending_request").label("type"),
+            FamilyMember.name.label("member"),
+            SpendingApprovalRequest.amount.label("amount"),
+            SpendingApprovalRequest.description.label("description"),
+            SpendingApprovalRequest.status.label("detail"),
+            SpendingApprovalRequest.created_at.label("timestamp")
+        )
+        .join(FamilyMember, FamilyMember.id == SpendingApprovalRequest.member_id)
+        .where(SpendingApprovalRequest.family_id == family_id)
+    )
+    decisions = (
+        select(
+            literal("spending_decision"),
+            FamilyMember.name,
+            SpendingApprovalRequest.amount,
+            SpendingApprovalRequest.description,
+            SpendingApprovalRequest.status,
+            SpendingApprovalRequest.approved_at
+        )
+        .join(FamilyMember, FamilyMember.id == SpendingApprovalRequest.member_id)
+        .where(
+            SpendingApprovalRequest.family_id == family_id,
+            SpendingApprovalRequest.approved_at.is_not(None)
+        )
+    )
+    joins = (
+        select(
+            literal("member_joined"),
+            FamilyMember.name,
+            null(),
+            null(),
+            FamilyMember.role,
+            FamilyMember.joined_at
+        )
+        .where(FamilyMember.family_id == family_id, FamilyMember.status == "active")
+    )
+
+    activity = union_all(requests, decisions, joins).subquery("activity")
+    return (
+        select(activity)
+        .order_by(desc(activity.c.timestamp))
+        .limit(limit)
+    )
+
+
+def shared_plans_query(family_id: str):
+    """Active shared budgets and savings goals with their configuration."""
+    budgets = select(
+        literal("budget").label("kind"),
+        FamilyBudget.id.label("id"),
+        FamilyBudget.name.label("name"),
+        FamilyBudget.budget_data.label("data")
+    ).where(FamilyBudget.family_id == family_id, FamilyBudget.is_active.is_(True))
+    goals = select(
+        literal("goal"),
+        FamilySavingsGoal.id,
+        FamilySavingsGoal.name,
+        FamilySavingsGoal.goal_data
+    ).where(FamilySavingsGoal.family_id == family_id, FamilySavingsGoal.is_active.is_(True))
+
+    plans = union_all(budgets, goals).subquery("plans")
+    return select(plans).order_by(plans.c.kind, plans.c.name)
+
+
+def _decimal(value: Any) -> Optional[Decimal]:
+    if value is None:
+        return None
+    try:
+        return Decimal(str(value))
+    except (InvalidOperation, ValueError):
+        return None
+
+
+def _plan_status(kind: str, data: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+    """Progress of a shared plan from its JSON configuration.
+
+    Budgets compare ``spent_amount`` with ``total_amount``; goals compare
+    ``current_amount`` with ``target_amount``. A plan without a positive
+    target is reported as ``unconfigured``.
+    """
+    data = data or {}
+    if kind == "budget":
+        target, current = _decimal(data.get("total_amount")), _decimal(data.get("spent_amount")) or Decimal(0)
+    else:
+        target, current = _decimal(data.get("target_amount")), _decimal(data.get("current_amount")) or Decimal(0)
+
+    if not target or target <= 0:
+        return {"target_amount": target, "current_amount": current, "progress": None, "status": "unconfigured"}
+
+    progress = current / target * 100
+    if kind == "budget":
+        status = "over_budget" if current > target else "on_track"
+    else:
+        status = "completed" if current >= target else "in_progress"
+    return {"target_amount": target, "current_amount": current, "progress": progress, "status": status}
+
+
+def dashboard_from_rows(family_id: str,
+                        spending_rows: Sequence,
+                        counts_row,
+                        approval_rows: Sequence,
+                        activity_rows: Sequence,
+                        plan_rows: Sequence) -> Dict[str, Any]:
+    """Shape the aggregator's result rows into the cached dashboard payload."""
+    member_spending = []
+    for row in spending_rows:
+        spent = _decimal(row.spent) or Decimal(0)
+        member_spending.append({
+            "member_id": row.member_id,
+            "user_id": row.user_id,
+            "name": row.name,
+            "role": row.role,
+            "spent": spent,
+            "transaction_count": row.transaction_count,
+            "spending_limit": row.spending_limit,
+            "over_limit": row.spending_limit is not None and spent > row.spending_limit
+        })
+
+    recent_activities = [
+        {
+            "type": row.type,
+            "member": row.member,
+            "amount": str(_decimal(row.amount)) if row.amount is not None else None,
+            "description": row.description,
+            "detail": row.detail,
+            "timestamp": row.timestamp.isoformat() if row.timestamp else None
+        }
+        for row in activity_rows
+    ]
+
+    shared_plans = [
+        {"kind": row.kind, "id": row.id, "name": row.name, **_plan_status(row.kind, row.data)}
+        for row in plan_rows
+    ]
+
+    return {
+        "family_id": family_id,
+        "member_count": len(member_spending),
+        "pending_invitations": counts_row.pending_invitations if counts_row else 0,
+        "pending_approvals": counts_row.pending_approvals if counts_row else 0,
+        "shared_budgets": sum(1 for plan in shared_plans if plan["kind"] == "budget"),
+        "shared_goals": sum(1 for plan in shared_plans if plan["kind"] == "goal"),
+        "total_family_spending": sum((member["spent"] for member in member_spending), Decimal(0)),
+        "member_spending": member_spending,
+        "recent_activities": recent_activities,
+        "upcoming_approvals": [dict(row._mapping) for row in approval_rows],
+        "shared_plans": shared_plans
+    }
+
+
+def dashboard_for_viewer(dashboard: Dict[str, Any], access: FamilyAccess, user_id: str) -> Dict[str, Any]:
+    """Remove what the viewer may not see from a cached dashboard.
+
+    Invitations are visible to the administrator only, approvals (including
+    spending request and decision activity) to the administrator and members
+    allowed to approve spending.
+    """
+    visible = dict(dashboard)
+    if not access.is_administrator(user_id):
+        visible["pending_invitations"] = 0
+    if not access.can(user_id, FamilyPermission.APPROVE_SPENDING):
+        visible["pending_approvals"] = 0
+        visible["upcoming_approvals"] = []
+        visible["recent_activities"] = [
+            activity for activity in dashboard.get("recent_activities", [])
+            if activity["type"] not in SPENDING_ACTIVITY_TYPES
+        ]
+    return visible
+
+
+class FamilyDashboardAggregator:
+    """Computes a family's dashboard in a fixed number of statements."""
+
+    def __init__(self, session=None, session_factory: Optional[Callable] = None,
+                 recent_activity_limit: int = RECENT_ACTIVITY_LIMIT,
+                 upcoming_approval_limit: int = UPCOMING_APPROVAL_LIMIT):
+        if session is None and session_factory is None:
+            raise ValueError("A session or a session factory is required")
+        self.session = session
+        self.session_factory = session_factory
+        self.recent_activity_limit = recent_activity_limit
+        self.upcoming_approval_limit = upcoming_approval_limit
+
+    async def build(self, family_id: str, now: Optional[datetime] = None) -> Dict[str, Any]:
+        """Dashboard payload of a family; spending covers the current month."""
+        now = now or datetime.utcnow()
+        month_start = now.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+        queries = [
+            member_spending_query(family_id, month_start),
+            pending_counts_query(family_id, now),
+            upcoming_approvals_query(family_id, now, self.upcoming_approval_limit),
+            recent_activity_query(family_id, self.recent_activity_limit),
+            shared_plans_query(family_id)
+        ]
+
+        if self.session_factory is not None:
+            results = await asyncio.gather(*(self._fetch_in_own_session(query) for query in queries))
+        else:
+            results = [await self._fetch(self.session, query) for query in queries]
+
+        spending_rows, counts_rows, approval_rows, activity_rows, plan_rows = results
+        return dashboard_from_rows(
+            family_id,
+            spending_rows,
+            counts_rows[0] if counts_rows else None,
+            approval_rows,
+            activity_rows,
+            plan_rows
+        )
+
+    @staticmethod
+    async def _fetch(session, query) -> List:
+        result = await session.execute(query)
+        return result.all()
+
+    async def _fetch_in_own_session(self, query) -> List:
+        session = await self.session_factory()
+        try:
+            return await self._fetch(session, query)
+        finally:
+            await session.close()
+
+
+class FamilyDashboardCache:
+    """Per-family cache of dashboard payloads, scoped to the current tenant.
+
+    Without a tenant context reads miss and writes are skipped, so callers
+    always fall back to the aggregator.
+    """
+
+    def __init__(self, cache_service=None, ttl: Optional[int] = None,
+                 session_factory: Optional[Callable] = None):
+        self.cache_service = cache_service
+        self.ttl = ttl or settings.FAMILY_DASHBOARD_CACHE_TTL_SECONDS
+        self.session_factory = session_factory
+
+    def _get_cache_service(self):
+        if self.cache_service is None:
+            from src.services.redis.cache import CacheService
+            self.cache_service = CacheService()
+        return self.cache_service
+
+    @staticmethod
+    def _tenant_id() -> Optional[str]:
+        from src.tenant.context import get_tenant_context
+
+        context = get_tenant_context()
+        return context.tenant_id if context else None
+
+    @staticmethod
+    def _key(family_id: str) -> str:
+        from src.services.redis.cache import cache_key_for_family
+
+        return cache_key_for_family(family_id, CACHE_OPERATION)
+
+    async def get(self, family_id: str) -> Optional[Dict[str, Any]]:
+        tenant_id = self._tenant_id()
+        if tenant_id is None:
+            return None
+        return await self._get_cache_service().get(tenant_id, self._key(family_id), namespace=CACHE_NAMESPACE)
+
+    async def set(self, family_id: str, dashboard: Dict[str, Any]) -> None:
+        tenant_id = self._tenant_id()
+        if tenant_id is None:
+            return
+        await self._get_cache_service().set(
+            tenant_id, self._key(family_id), dashboard, ttl=self.ttl, namespace=CACHE_NAMESPACE
+        )
+
+    async def invalidate(self, *family_ids: str) -> None:
+        """Drop the cached dashboards of the given families."""
+        tenant_id = self._tenant_id()
+        if tenant_id is None:
+            return
+
+        cache_service = self._get_cache_service()
+        for family_id in set(filter(None, family_ids)):
+            await cache_service.delete(tenant_id, self._key(family_id), namespace=CACHE_NAMESPACE)
+
+    async def invalidate_for_users(self, *user_ids: str, session=None) -> None:
+        """Drop the dashboards of every family the given users belong to.
+
+        Used by transaction writes, which know the user but not the family.
+        The families are looked up in ``session`` or, without one, in a
+        session of the current tenant.
+        """
+        user_ids = set(filter(None, user_ids))
+        if not user_ids or self._tenant_id() is None:
+            return
+
+        query = select(FamilyMember.family_id).where(FamilyMember.user_id.in_(user_ids)).distinct()
+        if session is not None:
+            family_ids = (await session.execute(query)).scalars().all()
+        else:
+            session = await (self.session_factory or _tenant_session)()
+            try:
+                family_ids = (await session.execute(query)).scalars().all()
+            finally:
+                await session.close()
+
+        await self.invalidate(*family_ids)
@@ -0,0 +1,235 @@
+"""Compiled family permission index.
+
+Authorization checks used to look up the caller's ``FamilyMember`` row and
+often the ``Family`` row as well on every call. The index compiles a family's
+active members into ``user_id -> (role, permission bits)`` with one statement
+and serves it from a short-lived in-process cache, then from Redis. Member,
+invitation and family writes invalidate both layers. Other processes notice
+an invalidation when their in-process entry expires, so the local TTL bounds
+how long a revoked permission can still be used there.
+"""
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from enum import IntFlag
+from typing import Any, Dict, Optional, Tuple
+
+from sqlalchemy import and_, select
+
+from src.config import settings
+from src.families.models import Family, FamilyMember
+
+CACHE_NAMESPACE = "families"
+CACHE_OPERATION = "permissions"
+
+
+class FamilyPermission(IntFlag):
+    """Member permissions, stored as ``can_*`` flags in ``FamilyMember.permissions``."""
+    VIEW_BUDGETS = 1
+    EDIT_BUDGETS = 2
+    CREATE_GOALS = 4
+    INVITE_MEMBERS = 8
+    MANAGE_MEMBERS = 16
+    APPROVE_SPENDING = 32
+
+
+PERMISSION_FLAGS = {
+    "can_view_budgets": FamilyPermission.VIEW_BUDGETS,
+    "can_edit_budgets": FamilyPermission.EDIT_BUDGETS,
+    "can_create_goals": FamilyPermission.CREATE_GOALS,
+    "can_invite_members": FamilyPermission.INVITE_MEMBERS,
+    "can_manage_members": FamilyPermission.MANAGE_MEMBERS,
+    "can_approve_spending": FamilyPermission.APPROVE_SPENDING,
+}
+
+
+def compile_permissions(permissions: Optional[Dict[str, Any]]) -> int:
+    """Permission bits of a member's ``permissions`` JSON; unknown keys are ignored."""
+    bits = 0
+    for key, flag in PERMISSION_FLAGS.items():
+        if (permissions or {}).get(key, False):
+            bits |= flag
+    return bits
+
+
+@dataclass(frozen=True)
+class MemberAccess:
+    """An active member's role and compiled permissions."""
+    member_id: str
+    user_id: str
+    role: str
+    permissions: int = 0
+
+    def has(self, permission: FamilyPermission) -> bool:
+        return self.role == "administrator" or (self.permissions & permission) == permission
+
+
+@dataclass
+class FamilyAccess:
+    """Permission index of one family."""
+    family_id: str
+    administrator_id: str
+    members: Dict[str, MemberAccess] = field(default_factory=dict)
+
+    def member(self, user_id: str) -> Optional[MemberAccess]:
+        return self.members.get(user_id)
+
+    def is_member(self, user_id: str) -> bool:
+        return user_id in self.members
+
+    def is_administrator(self, user_id: str) -> bool:
+        return user_id == self.administrator_id
+
+    def can(self, user_id: str, permission: FamilyPermission) -> bool:
+        """Whether the user may act; the family administrator always may."""
+        if self.is_administrator(user_id):
+            return True
+        member = self.members.get(user_id)
+        return member is not None and member.has(permission)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "family_id": self.family_id,
+            "administrator_id": self.administrator_id,
+            "members": [
+                [member.member_id, member.user_id, member.role, member.permissions]
+                for member in self.members.values()
+            ]
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "FamilyAccess":
+        members = (MemberAccess(*fields) for fields in data["members"])
+        return cls(
+            family_id=data["family_id"],
+            administrator_id=data["administrator_id"],
+            members={member.user_id: member for member in members}
+        )
+
+
+def family_access_query(family_id: str):
+    """The family's administrator and active members in one statement."""
+    return (
+        select(
+            Family.administrator_id,
+            FamilyMember.id,
+            FamilyMember.user_id,
+            FamilyMember.role,
+            FamilyMember.permissions
+        )
+        .outerjoin(
+            FamilyMember,
+            and_(FamilyMember.family_id == Family.id, FamilyMember.status == "active")
+        )
+        .where(Family.id == family_id)
+    )
+
+
+async def load_family_access(session, family_id: str) -> Optional[FamilyAccess]:
+    """Compile the permission index of a family, or None if it does not exist."""
+    rows = (await session.execute(family_access_query(family_id))).all()
+    if not rows:
+        return None
+
+    access = FamilyAccess(family_id=family_id, administrator_id=rows[0][0])
+    for _, member_id, user_id, role, permissions in rows:
+        if member_id is not None:
+            access.members[user_id] = MemberAccess(member_id, user_id, role, compile_permissions(permissions))
+    return access
+
+
+class FamilyPermissionCache:
+    """Two-level cache of family permission indexes, scoped to the current tenant.
+
+    Without a tenant context nothing is cached and every lookup runs the query.
+    """
+
+    def __init__(self,
+                 cache_service=None,
+                 ttl: Optional[int] = None,
+                 local_ttl: Optional[float] = None,
+                 max_local_entries: int = 1024):
+        self.cache_service = cache_service
+        self.ttl = ttl or settings.FAMILY_PERMISSION_CACHE_TTL_SECONDS
+        self.local_ttl = settings.FAMILY_PERMISSION_LOCAL_TTL_SECONDS if local_ttl is None else local_ttl
+        self.max_local_entries = max_local_entries
+        self._local: "OrderedDict[Tuple[str, str], Tuple[float, FamilyAccess]]" = OrderedDict()
+
+    def _get_cache_service(self):
+        if self.cache_service is None:
+            from src.services.redis.cache import CacheService
+            self.cache_service = CacheService()
+        return self.cache_service
+
+    @staticmethod
+    def _tenant_id() -> Optional[str]:
+        from src.tenant.context import get_tenant_context
+
+        context = get_tenant_context()
+        return context.tenant_id if context else None
+
+    @staticmethod
+    def _key(family_id: str) -> str:
+        from src.services.redis.cache import cache_key_for_family
+
+        return cache_key_for_family(family_id, CACHE_OPERATION)
+
+    async def get(self, session, family_id: str) -> Optional[FamilyAccess]:
+        """Permission index of a family, loaded with ``session`` on a miss."""
+        tenant_id = self._tenant_id()
+        if tenant_id is None:
+            return await load_family_access(session, family_id)
+
+        local_key = (tenant_id, family_id)
+        entry = self._local.get(local_key)
+        if entry is not None and entry[0] > time.monotonic():
+            self._local.move_to_end(local_key)
+            return entry[1]
+
+        cache_service = self._get_cache_service()
+        cached = await cache_service.get(tenant_id, self._key(family_id), namespace=CACHE_NAMESPACE)
+        if cached is not None:
+            access = FamilyAccess.from_dict(cached)
+        else:
+            access = await load_family_access(session, family_id)
+            if access is None:
+                return None
+            await cache_service.set(
+                tenant_id, self._key(family_id), access.to_dict(), ttl=self.ttl, namespace=CACHE_NAMESPACE
+            )
+
+        self._remember(local_key, access)
+        return access
+
+    def _remember(self, local_key: Tuple[str, str], access: FamilyAccess) -> None:
+        if self.local_ttl <= 0:
+            return
+        self._local[local_key] = (time.monotonic() + self.local_ttl, access)
+        self._local.move_to_end(local_key)
+        while len(self._local) > self.max_local_entries:
+            self._local.popitem(last=False)
+
+    async def invalidate(self, *family_ids: str) -> None:
+        """Drop the permission indexes of the given families."""
+        tenant_id = self._tenant_id()
+        if tenant_id is None:
+            return
+
+        cache_service = self._get_cache_service()
+        for family_id in set(filter(None, family_ids)):
+            self._local.pop((tenant_id, family_id), None)
+            await cache_service.delete(tenant_id, self._key(family_id), namespace=CACHE_NAMESPACE)
+
+
+# Shared by all requests of the process, so the in-process layer is effective
+_family_permission_cache: Optional[FamilyPermissionCache] = None
+
+
+def get_family_permission_cache() -> FamilyPermissionCache:
+    """Get or create the process-wide family permission cache."""
+    global _family_permission_cache
+
+    if _family_permission_cache is None:
+        _family_permission_cache = FamilyPermissionCache()
+
+    return _family_permission_cache
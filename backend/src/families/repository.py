@@ -15,6 +15,7 @@ from src.families.models import (
     FamilySavingsGoal,
     SpendingApprovalRequest
 )
+from src.families.permissions import FamilyPermission, FamilyPermissionCache, get_family_permission_cache
 from src.families.schemas import (
     FamilyCreate,
     FamilyUpdate,
@@ -30,8 +31,9 @@ from src.families.schemas import (
 class FamilyRepository(UserScopedRepository[Family]):
     """Repository for family operations."""
     
-    def __init__(self, session: AsyncSession):
+    def __init__(self, session: AsyncSession, permissions: Optional[FamilyPermissionCache] = None):
         super().__init__(session, Family)
+        self.permissions = permissions or get_family_permission_cache()
     
     async def create_family(
         self,
@@ -99,17 +101,8 @@ class FamilyRepository(UserScopedRepository[Family]):
         user_id: str
     ) -> Optional[Family]:
         """Get family with all members (only if user is a member)."""
-        # First check if user is a member
-        member_query = select(FamilyMember).where(
-            and_(
-                FamilyMember.family_id == family_id,
-                FamilyMember.user_id == user_id,
-                FamilyMember.status == "active"
-            )
-        )
-        
-        member_result = await self.session.execute(member_query)
-        if not member_result.scalar_one_or_none():
+        access = await self.permissions.get(self.session, family_id)
+        if not access or not access.is_member(user_id):
             return None
         
         # Get family with relationships
@@ -155,14 +148,16 @@ class FamilyRepository(UserScopedRepository[Family]):
         
         await self.session.delete(family)
         await self.session.commit()
+        await self.permissions.invalidate(family_id)
         return True
 
 
 class FamilyMemberRepository:
     """Repository for family member operations."""
     
-    def __init__(self, session: AsyncSession):
+    def __init__(self, session: AsyncSession, permissions: Optional[FamilyPermissionCache] = None):
         self.session = session
+        self.permissions = permissions or get_family_permission_cache()
     
     async def get_by_id(self, member_id: str) -> Optional[FamilyMember]:
         """Get member by ID."""
@@ -177,17 +172,8 @@ class FamilyMemberRepository:
         include_inactive: bool = False
     ) -> List[FamilyMember]:
         """Get all members of a family (if user is a member)."""
-        # First verify user is a member
-        verification_query = select(FamilyMember).where(
-            and_(
-                FamilyMember.family_id == family_id,
-                FamilyMember.user_id == user_id,
-                FamilyMember.status == "active"
-            )
-        )
-        
-        verification_result = await self.session.execute(verification_query)
-        if not verification_result.scalar_one_or_none():
+        access = await self.permissions.get(self.session, family_id)
+        if not access or not access.is_member(user_id):
             return []
         
         # Get all members
@@ -209,15 +195,11 @@ class FamilyMemberRepository:
     ) -> Optional[FamilyMember]:
         """Add member to family (requires administrator permission)."""
         # Verify user can add members
-        admin_query = select(Family).where(
-            and_(
-                Family.id == family_id,
-                Family.administrator_id == added_by_user_id
-            )
-        )
+        access = await self.permissions.get(self.session, family_id)
+        if not access or not access.is_administrator(added_by_user_id):
+            return None
         
-        admin_result = await self.session.execute(admin_query)
-        family = admin_result.scalar_one_or_none()
+        family = await self.session.get(Family, family_id)
         if not family:
             return None
         
@@ -239,6 +221,7 @@ class FamilyMemberRepository:
         
         await self.session.commit()
         await self.session.refresh(member)
+        await self.permissions.invalidate(family_id)
         return member
     
     async def update_member(
@@ -253,11 +236,8 @@ class FamilyMemberRepository:
             return None
         
         # Verify user can update member (administrator or self)
-        family_query = select(Family).where(Family.id == member.family_id)
-        family_result = await self.session.execute(family_query)
-        family = family_result.scalar_one_or_none()
-        
-        if not family or (family.administrator_id != updated_by_user_id and member.user_id != updated_by_user_id):
+        access = await self.permissions.get(self.session, member.family_id)
+        if not access or (not access.is_administrator(updated_by_user_id) and member.user_id != updated_by_user_id):
             return None
         
         update_dict = member_data.model_dump(exclude_unset=True)
@@ -266,6 +246,7 @@ class FamilyMemberRepository:
         
         await self.session.commit()
         await self.session.refresh(member)
+        await self.permissions.invalidate(member.family_id)
         return member
     
     async def remove_member(
@@ -279,11 +260,8 @@ class FamilyMemberRepository:
             return False
         
         # Verify user can remove member (administrator or self)
-        family_query = select(Family).where(Family.id == member.family_id)
-        family_result = await self.session.execute(family_query)
-        family = family_result.scalar_one_or_none()
-        
-        if not family or (family.administrator_id != removed_by_user_id and member.user_id != removed_by_user_id):
+        access = await self.permissions.get(self.session, member.family_id)
+        if not access or (not access.is_administrator(removed_by_user_id) and member.user_id != removed_by_user_id):
             return False
         
         # Cannot remove administrator
@@ -293,17 +271,21 @@ class FamilyMemberRepository:
         await self.session.delete(member)
         
         # Update family member count
-        family.current_member_count -= 1
+        family = await self.session.get(Family, member.family_id)
+        if family:
+            family.current_member_count -= 1
         
         await self.session.commit()
+        await self.permissions.invalidate(member.family_id)
         return True
 
 
 class FamilyInvitationRepository:
     """Repository for family invitation operations."""
     
-    def __init__(self, session: AsyncSession):
+    def __init__(self, session: AsyncSession, permissions: Optional[FamilyPermissionCache] = None):
         self.session = session
+        self.permissions = permissions or get_family_permission_cache()
     
     async def create_invitation(
         self,
@@ -348,15 +330,8 @@ class FamilyInvitationRepository:
     ) -> List[FamilyInvitation]:
         """Get invitations for a family."""
         # Verify user can view invitations (administrator)
-        family_query = select(Family).where(
-            and_(
-                Family.id == family_id,
-                Family.administrator_id == user_id
-            )
-        )
-        
-        family_result = await self.session.execute(family_query)
-        if not family_result.scalar_one_or_none():
+        access = await self.permissions.get(self.session, family_id)
+        if not access or not access.is_administrator(user_id):
             return []
         
         query = select(FamilyInvitation).where(FamilyInvitation.family_id == family_id)
@@ -412,6 +387,7 @@ class FamilyInvitationRepository:
         
         await self.session.commit()
         await self.session.refresh(member)
+        await self.permissions.invalidate(invitation.family_id)
         return member
     
     async def cancel_invitation(
@@ -435,8 +411,9 @@ class FamilyInvitationRepository:
 class SpendingApprovalRepository:
     """Repository for spending approval operations."""
     
-    def __init__(self, session: AsyncSession):
+    def __init__(self, session: AsyncSession, permissions: Optional[FamilyPermissionCache] = None):
         self.session = session
+        self.permissions = permissions or get_family_permission_cache()
     
     async def create_approval_request(
         self,
@@ -466,27 +443,9 @@ class SpendingApprovalRepository:
     ) -> List[SpendingApprovalRequest]:
         """Get pending approval requests for family."""
         # Verify user can view approvals (administrator or member with approval permissions)
-        member_query = select(FamilyMember).where(
-            and_(
-                FamilyMember.family_id == family_id,
-                FamilyMember.user_id == user_id,
-                FamilyMember.status == "active"
-            )
-        )
-        
-        member_result = await self.session.execute(member_query)
-        member = member_result.scalar_one_or_none()
-        
-        if not member:
-            return []
-        
-        # Check if user can approve spending
-        family_query = select(Family).where(Family.id == family_id)
-        family_result = await self.session.execute(family_query)
-        family = family_result.scalar_one_or_none()
-        
-        if not family or (family.administrator_id != user_id and 
-                         not member.permissions.get("can_approve_spending", False)):
+        access = await self.permissions.get(self.session, family_id)
+        if (not access or not access.is_member(user_id)
+                or not access.can(user_id, FamilyPermission.APPROVE_SPENDING)):
             return []
         
         query = select(SpendingApprovalRequest).where(
@@ -518,25 +477,9 @@ class SpendingApprovalRepository:
             return None
         
         # Verify user can approve
-        family_query = select(Family).where(Family.id == request.family_id)
-        family_result = await self.session.execute(family_query)
-        family = family_result.scalar_one_or_none()
-        
-        if not family or family.administrator_id != approver_id:
-            # Check if user has approval permissions
-            member_query = select(FamilyMember).where(
-                and_(
-                    FamilyMember.family_id == request.family_id,
-                    FamilyMember.user_id == approver_id,
-                    FamilyMember.status == "active"
-                )
-            )
-            
-            member_result = await self.session.execute(member_query)
-            member = member_result.scalar_one_or_none()
-            
-            if not member or not member.permissions.get("can_approve_spending", False):
-                return None
+        access = await self.permissions.get(self.session, request.family_id)
+        if not access or not access.can(approver_id, FamilyPermission.APPROVE_SPENDING):
+            return None
         
         # Update request
         request.status = decision.decision
@@ -457,6 +457,29 @@ class FamilyListResponse(BaseModel):
     )
 
 
+class FamilyMemberSpending(BaseModel):
+    """Schema for a member's spending on the family dashboard."""
+    member_id: str = Field(..., description="Family member ID")
+    user_id: str = Field(..., description="Member user ID")
+    name: str = Field(..., description="Member name")
+    role: str = Field(..., description="Member role")
+    spent: Decimal = Field(..., description="Member spending this month")
+    transaction_count: int = Field(..., description="Number of spending transactions this month")
+    spending_limit: Optional[Decimal] = Field(None, description="Member spending limit")
+    over_limit: bool = Field(default=False, description="Whether spending exceeds the limit")
+
+
+class FamilySharedPlanStatus(BaseModel):
+    """Schema for the status of a shared budget or savings goal."""
+    kind: str = Field(..., description="Plan kind: budget or goal")
+    id: str = Field(..., description="Budget or goal ID")
+    name: str = Field(..., description="Plan name")
+    target_amount: Optional[Decimal] = Field(None, description="Budget total or goal target")
+    current_amount: Decimal = Field(..., description="Amount spent or saved so far")
+    progress: Optional[Decimal] = Field(None, description="Current amount as a percentage of the target")
+    status: str = Field(..., description="on_track, over_budget, in_progress, completed or unconfigured")
+
+
 class FamilyDashboardResponse(BaseModel):
     """Schema for family dashboard responses."""
     family_id: str = Field(..., description="Family ID")
@@ -468,6 +491,8 @@ class FamilyDashboardResponse(BaseModel):
     total_family_spending: Decimal = Field(..., description="Total family spending this month")
     recent_activities: List[Dict[str, Any]] = Field(..., description="Recent family activities")
     upcoming_approvals: List[SpendingApprovalRequestResponse] = Field(..., description="Upcoming approval deadlines")
+    member_spending: List[FamilyMemberSpending] = Field(default_factory=list, description="Spending per member this month")
+    shared_plans: List[FamilySharedPlanStatus] = Field(default_factory=list, description="Shared budget and goal status")
     
     model_config = ConfigDict(
         json_schema_extra={
@@ -485,10 +510,34 @@ class FamilyDashboardResponse(BaseModel):
                         "member": "Jane Smith",
                         "amount": "75.00",
                         "description": "Video game purchase",
+                        "detail": "pending",
                         "timestamp": "2024-01-15T10:00:00Z"
                     }
                 ],
-                "upcoming_approvals": []
+                "upcoming_approvals": [],
+                "member_spending": [
+                    {
+                        "member_id": "123e4567-e89b-12d3-a456-426614174017",
+                        "user_id": "123e4567-e89b-12d3-a456-426614174002",
+                        "name": "Jane Smith",
+                        "role": "spouse",
+                        "spent": "1250.00",
+                        "transaction_count": 18,
+                        "spending_limit": "1000.00",
+                        "over_limit": True
+                    }
+                ],
+                "shared_plans": [
+                    {
+                        "kind": "budget",
+                        "id": "123e4567-e89b-12d3-a456-426614174019",
+                        "name": "Family Monthly Budget",
+                        "target_amount": "4000.00",
+                        "current_amount": "1500.00",
+                        "progress": "37.5",
+                        "status": "on_track"
+                    }
+                ]
             }
         }
     )
\ No newline at end of file
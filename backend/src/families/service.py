@@ -1,6 +1,6 @@
 """Families service for business logic."""
 from typing import List, Optional, Dict, Any
-from datetime import datetime, timedelta
+from datetime import datetime
 from decimal import Decimal
 import secrets
 import string
@@ -14,6 +14,13 @@ from src.families.repository import (
     FamilyInvitationRepository,
     SpendingApprovalRepository
 )
+from src.families.dashboard import (
+    FamilyDashboardAggregator,
+    FamilyDashboardCache,
+    dashboard_for_viewer,
+    tenant_session_factory
+)
+from src.families.permissions import PERMISSION_FLAGS, get_family_permission_cache
 from src.families.models import (
     Family,
     FamilyMember,
@@ -39,10 +46,12 @@ class FamilyService:
     
     def __init__(self, session: AsyncSession = Depends(get_db_session)):
         self.session = session
-        self.family_repo = FamilyRepository(session)
-        self.member_repo = FamilyMemberRepository(session)
-        self.invitation_repo = FamilyInvitationRepository(session)
-        self.approval_repo = SpendingApprovalRepository(session)
+        self.permissions = get_family_permission_cache()
+        self.family_repo = FamilyRepository(session, self.permissions)
+        self.member_repo = FamilyMemberRepository(session, self.permissions)
+        self.invitation_repo = FamilyInvitationRepository(session, self.permissions)
+        self.approval_repo = SpendingApprovalRepository(session, self.permissions)
+        self.dashboard_cache = FamilyDashboardCache()
     
     # Family operations
     async def create_family(
@@ -98,7 +107,10 @@ class FamilyService:
         user_id: str
     ) -> bool:
         """Delete family (only by administrator)."""
-        return await self.family_repo.delete_family(family_id, user_id)
+        deleted = await self.family_repo.delete_family(family_id, user_id)
+        if deleted:
+            await self.dashboard_cache.invalidate(family_id)
+        return deleted
     
     # Member operations
     async def get_family_members(
@@ -127,7 +139,10 @@ class FamilyService:
         if member_data.requires_approval_over and member_data.requires_approval_over < 0:
             raise ValidationError("Approval threshold cannot be negative")
         
-        return await self.member_repo.add_member_to_family(family_id, member_data, added_by_user_id)
+        member = await self.member_repo.add_member_to_family(family_id, member_data, added_by_user_id)
+        if member:
+            await self.dashboard_cache.invalidate(family_id)
+        return member
     
     async def update_family_member(
         self,
@@ -146,7 +161,10 @@ class FamilyService:
         if member_data.requires_approval_over is not None and member_data.requires_approval_over < 0:
             raise ValidationError("Approval threshold cannot be negative")
         
-        return await self.member_repo.update_member(member_id, member_data, updated_by_user_id)
+        member = await self.member_repo.update_member(member_id, member_data, updated_by_user_id)
+        if member:
+            await self.dashboard_cache.invalidate(member.family_id)
+        return member
     
     async def remove_family_member(
         self,
@@ -154,7 +172,13 @@ class FamilyService:
         removed_by_user_id: str
     ) -> bool:
         """Remove member from family."""
-        return await self.member_repo.remove_member(member_id, removed_by_user_id)
+        member = await self.member_repo.get_by_id(member_id)
+        family_id = member.family_id if member else None
+        
+        removed = await self.member_repo.remove_member(member_id, removed_by_user_id)
+        if removed:
+            await self.dashboard_cache.invalidate(family_id)
+        return removed
     
     # Invitation operations
     async def create_invitation(
@@ -171,9 +195,11 @@ class FamilyService:
         # Generate secure invitation token
         token = self._generate_invitation_token()
         
-        return await self.invitation_repo.create_invitation(
+        invitation = await self.invitation_repo.create_invitation(
             family_id, invitation_data, inviter_id, token
         )
+        await self.dashboard_cache.invalidate(family_id)
+        return invitation
     
     async def get_family_invitations(
         self,
@@ -194,6 +220,7 @@ class FamilyService:
         if not member:
             raise ValidationError("Invalid or expired invitation")
         
+        await self.dashboard_cache.invalidate(member.family_id)
         return member
     
     async def get_invitation_by_token(
@@ -218,7 +245,16 @@ class FamilyService:
         user_id: str
     ) -> bool:
         """Cancel invitation."""
-        return await self.invitation_repo.cancel_invitation(invitation_id, user_id)
+        from sqlalchemy import select
+        
+        family_id = await self.session.scalar(
+            select(FamilyInvitation.family_id).where(FamilyInvitation.id == invitation_id)
+        )
+        
+        cancelled = await self.invitation_repo.cancel_invitation(invitation_id, user_id)
+        if cancelled:
+            await self.dashboard_cache.invalidate(family_id)
+        return cancelled
     
     # Spending approval operations
     async def create_spending_request(
@@ -238,7 +274,9 @@ class FamilyService:
         if request_data.expires_in_hours < 1 or request_data.expires_in_hours > 168:
             raise ValidationError("Request expiration must be between 1 hour and 1 week")
         
-        return await self.approval_repo.create_approval_request(family_id, member_id, request_data)
+        request = await self.approval_repo.create_approval_request(family_id, member_id, request_data)
+        await self.dashboard_cache.invalidate(family_id)
+        return request
     
     async def get_pending_approvals(
         self,
@@ -258,7 +296,10 @@ class FamilyService:
         if decision.decision not in ["approved", "denied"]:
             raise ValidationError("Decision must be 'approved' or 'denied'")
         
-        return await self.approval_repo.process_approval_decision(request_id, decision, approver_id)
+        request = await self.approval_repo.process_approval_decision(request_id, decision, approver_id)
+        if request:
+            await self.dashboard_cache.invalidate(request.family_id)
+        return request
     
     async def get_member_spending_requests(
         self,
@@ -274,45 +315,18 @@ class FamilyService:
         family_id: str,
         user_id: str
     ) -> FamilyDashboardResponse:
-        """Get family dashboard data."""
-        family = await self.get_family(family_id, user_id)
-        if not family:
+        """Get family dashboard data, cached until the family's data changes."""
+        access = await self.permissions.get(self.session, family_id)
+        if not access or not access.is_member(user_id):
             raise NotFoundError("Family not found")
         
-        # Get dashboard data
-        members = await self.get_family_members(family_id, user_id)
-        invitations = await self.get_family_invitations(family_id, user_id)
-        pending_approvals = await self.get_pending_approvals(family_id, user_id)
-        
-        # Calculate metrics
-        pending_invitations_count = len([inv for inv in invitations if inv.status == "pending"])
-        
-        # Mock data for now - would be calculated from actual transactions
-        total_spending = Decimal("2500.00")
-        
-        recent_activities = [
-            {
-                "type": "spending_request",
-                "member": "Jane Smith",
-                "amount": "75.00",
-                "description": "Video game purchase",
-                "timestamp": datetime.utcnow().isoformat()
-            }
-        ]
-        
-        upcoming_approvals = [req for req in pending_approvals if req.expires_at <= datetime.utcnow() + timedelta(hours=24)]
-        
-        return FamilyDashboardResponse(
-            family_id=family_id,
-            member_count=len(members),
-            pending_invitations=pending_invitations_count,
-            pending_approvals=len(pending_approvals),
-            shared_budgets=len(family.shared_budgets),
-            shared_goals=len(family.shared_goals),
-            total_family_spending=total_spending,
-            recent_activities=recent_activities,
-            upcoming_approvals=upcoming_approvals
-        )
+        dashboard = await self.dashboard_cache.get(family_id)
+        if dashboard is None:
+            aggregator = FamilyDashboardAggregator(self.session, tenant_session_factory())
+            dashboard = await aggregator.build(family_id)
+            await self.dashboard_cache.set(family_id, dashboard)
+        
+        return FamilyDashboardResponse(**dashboard_for_viewer(dashboard, access, user_id))
     
     # Helper methods
     def _generate_invitation_token(self) -> str:
@@ -327,17 +341,18 @@ class FamilyService:
         required_permission: str
     ) -> bool:
         """Check if user has required permission in family."""
-        members = await self.member_repo.get_family_members(family_id, user_id)
-        user_member = next((m for m in members if m.user_id == user_id), None)
+        access = await self.permissions.get(self.session, family_id)
+        member = access.member(user_id) if access else None
         
-        if not user_member:
+        if not member:
             return False
         
         # Administrator has all permissions
-        if user_member.role == "administrator":
+        if member.role == "administrator":
             return True
         
-        return user_member.permissions.get(required_permission, False)
+        permission = PERMISSION_FLAGS.get(required_permission)
+        return permission is not None and member.has(permission)
     
     async def _validate_spending_request(
         self,
@@ -0,0 +1,270 @@
+"""Atomic goal contribution accounting.
+
+Contributions never read a goal's balance into Python. One transaction
+increments every affected goal with ``current_amount = current_amount + amount``
+(completing goals that reach their target) and reads the new balances back
+with RETURNING, inserts the contribution rows, and completes every automatic
+milestone the new balances reached with a single set-based UPDATE. Concurrent
+contributions to the same goal therefore serialize in the database instead of
+overwriting each other.
+"""
+from dataclasses import dataclass, field
+from datetime import date
+from decimal import Decimal
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+from uuid import uuid4
+
+import structlog
+from sqlalchemy import case, func, insert, literal, select, tuple_, update
+
+from src.exceptions import DatabaseError, ValidationError
+from src.goals.models import Goal, GoalContribution, GoalMilestone, GoalStatus, MilestoneStatus
+
+logger = structlog.get_logger(__name__)
+
+
+@dataclass
+class ContributionRequest:
+    """A contribution to record against a goal owned by ``user_id``."""
+    goal_id: str
+    user_id: str
+    amount: Decimal
+    contribution_date: Optional[date] = None
+    description: Optional[str] = None
+    source_type: str = "manual"
+    source_account_id: Optional[str] = None
+    transaction_id: Optional[str] = None
+    is_recurring: bool = False
+    recurring_frequency: Optional[str] = None
+
+    @classmethod
+    def from_schema(cls, goal_id: str, user_id: str, data) -> "ContributionRequest":
+        """Request from a ``GoalContributionCreate``."""
+        return cls(
+            goal_id=goal_id,
+            user_id=user_id,
+            amount=data.amount,
+            contribution_date=data.contribution_date,
+            description=data.notes,
+            source_type=data.source_type,
+            source_account_id=data.source_account_id,
+            transaction_id=data.transaction_id
+        )
+
+    def to_row(self) -> Dict[str, Any]:
+        return {
+            "id": str(uuid4()),
+            "goal_id": self.goal_id,
+            "amount": self.amount,
+            "contribution_date": self.contribution_date or date.today(),
+            "description": self.description,
+            "source_type": self.source_type,
+            "source_account_id": self.source_account_id,
+            "transaction_id": self.transaction_id,
+            "is_recurring": self.is_recurring,
+            "recurring_frequency": self.recurring_frequency
+        }
+
+
+@dataclass
+class GoalBalance:
+    """A goal's balance after a batch was applied."""
+    goal_id: str
+    current_amount: Decimal
+    status: GoalStatus
+    completed: bool = False
+    user_id: Optional[str] = None
+
+
+@dataclass
+class ContributionBatchResult:
+    """Outcome of applying a batch of contributions."""
+    contributions: List[GoalContribution] = field(default_factory=list)
+    balances: Dict[str, GoalBalance] = field(default_factory=dict)
+    completed_milestone_ids: List[str] = field(default_factory=list)
+    skipped_goal_ids: List[str] = field(default_factory=list)
+
+    @property
+    def completed_goal_ids(self) -> List[str]:
+        return [goal_id for goal_id, balance in self.balances.items() if balance.completed]
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "contributions_recorded": len(self.contributions),
+            "goals_updated": len(self.balances),
+            "goals_completed": len(self.completed_goal_ids),
+            "milestones_completed": len(self.completed_milestone_ids),
+            "goals_skipped": len(self.skipped_goal_ids)
+        }
+
+
+def sum_by_goal(requests: Sequence[ContributionRequest]) -> Dict[Tuple[str, str], Decimal]:
+    """Total amount per (goal, owner), so a goal appearing several times is incremented once."""
+    totals: Dict[Tuple[str, str], Decimal] = {}
+    for request in requests:
+        if request.amount <= 0:
+            raise ValidationError("Contribution amount must be positive")
+        key = (request.goal_id, request.user_id)
+        totals[key] = totals.get(key, Decimal(0)) + Decimal(request.amount)
+    return totals
+
+
+async def _tenant_session():
+    from src.tenant.context import get_tenant_context
+    from src.tenant.manager import tenant_db_manager
+
+    return await tenant_db_manager.get_tenant_session(get_tenant_context())
+
+
+class GoalContributionLedger:
+    """Records goal contributions for the current tenant."""
+
+    def __init__(self, session_factory: Optional[Callable] = None):
+        self.session_factory = session_factory or _tenant_session
+
+    async def contribute(
+        self,
+        request: ContributionRequest,
+        before_commit: Optional[Callable[[ContributionBatchResult], Any]] = None
+    ) -> ContributionBatchResult:
+        """Record a single contribution atomically."""
+        return await self.contribute_many([request], before_commit)
+
+    async def contribute_many(
+        self,
+        requests: Sequence[ContributionRequest],
+        before_commit: Optional[Callable[[ContributionBatchResult], Any]] = None
+    ) -> ContributionBatchResult:
+        """Record many contributions, across many goals, in one transaction.
+
+        Contributions to goals that do not exist or do not belong to the
+        request's user are skipped and reported, not recorded.
+        ``before_commit`` is called with the outcome while the transaction is
+        still open; if it raises, nothing is recorded.
+        """
+        if not requests:
+            return ContributionBatchResult()
+
+        totals = sum_by_goal(requests)
+
+        async with await self.session_factory() as session:
+            try:
+                balances = await self._increment_goals(session, totals)
+                accepted = [
+                    request for request in requests
+                    if (request.goal_id, request.user_id) in balances
+                ]
+
+                contributions = []
+                if accepted:
+                    result = await session.scalars(
+                        insert(GoalContribution).returning(GoalContribution),
+                        [request.to_row() for request in accepted]
+                    )
+                    contributions = list(result.all())
+
+                milestone_ids = await self._complete_milestones(
+                    session, [goal_id for goal_id, _ in balances]
+                )
+                result = ContributionBatchResult(
+                    contributions=contributions,
+                    balances={balance.goal_id: balance for balance in balances.values()},
+                    completed_milestone_ids=milestone_ids,
+                    skipped_goal_ids=sorted({goal_id for goal_id, _ in set(totals) - set(balances)})
+                )
+                if before_commit is not None:
+                    before_commit(result)
+                await session.commit()
+
+            except Exception as e:
+                await session.rollback()
+                logger.error("Goal contributions failed", contributions=len(requests), error=str(e))
+                raise DatabaseError(f"Failed to record contributions: {str(e)}")
+
+        logger.info("Goal contributions recorded", **result.to_dict())
+        return result
+
+    async def complete_reached_milestones(self, goal_ids: Sequence[str]) -> List[str]:
+        """Complete the pending automatic milestones the goals' balances already reach."""
+        async with await self.session_factory() as session:
+            try:
+                milestone_ids = await self._complete_milestones(session, list(goal_ids))
+                await session.commit()
+                return milestone_ids
+            except Exception as e:
+                await session.rollback()
+                raise DatabaseError(f"Failed to complete milestones: {str(e)}")
+
+    @staticmethod
+    async def _increment_goals(
+        session, totals: Dict[Tuple[str, str], Decimal]
+    ) -> Dict[Tuple[str, str], GoalBalance]:
+        """Add each goal's total in one UPDATE, completing goals that reach their target.
+
+        Only goals owned by the requesting user match, so the returned keys
+        are exactly the (goal, owner) pairs that were applied.
+        """
+        amount = case(
+            *[((Goal.id == goal_id) & (Goal.user_id == user_id), total)
+              for (goal_id, user_id), total in totals.items()],
+            else_=0
+        )
+        completes = (Goal.current_amount + amount >= Goal.target_amount) & (Goal.status == GoalStatus.ACTIVE)
+
+        statement = (
+            update(Goal)
+            .where(tuple_(Goal.id, Goal.user_id).in_(sorted(totals)))
+            .values(
+                current_amount=Goal.current_amount + amount,
+                status=case((completes, literal(GoalStatus.COMPLETED, Goal.status.type)), else_=Goal.status),
+                completed_at=case((completes, func.now()), else_=Goal.completed_at),
+                updated_at=func.now()
+            )
+            .returning(Goal.id, Goal.user_id, Goal.current_amount, Goal.status, Goal.target_amount)
+            .execution_options(synchronize_session=False)
+        )
+        result = await session.execute(statement)
+
+        balances = {}
+        for goal_id, user_id, current_amount, status, target_amount in result.all():
+            current_amount = Decimal(str(current_amount))
+            previous_amount = current_amount - totals[(goal_id, user_id)]
+            balances[(goal_id, user_id)] = GoalBalance(
+                goal_id=goal_id,
+                current_amount=current_amount,
+                status=status,
+                completed=status == GoalStatus.COMPLETED and previous_amount < Decimal(str(target_amount)),
+                user_id=user_id
+            )
+        return balances
+
+    @staticmethod
+    async def _complete_milestones(session, goal_ids: List[str]) -> List[str]:
+        """Complete every pending automatic milestone the goals' new balances reached."""
+        if not goal_ids:
+            return []
+
+        goal_amount = (
+            select(Goal.current_amount)
+            .where(Goal.id == GoalMilestone.goal_id)
+            .scalar_subquery()
+        )
+        statement = (
+            update(GoalMilestone)
+            .where(
+                GoalMilestone.goal_id.in_(goal_ids),
+                GoalMilestone.is_automatic.is_(True),
+                GoalMilestone.status == MilestoneStatus.PENDING,
+                GoalMilestone.target_amount <= goal_amount
+            )
+            .values(
+                status=MilestoneStatus.COMPLETED,
+                completed_at=func.now(),
+                actual_amount=goal_amount,
+                updated_at=func.now()
+            )
+            .returning(GoalMilestone.id)
+            .execution_options(synchronize_session=False)
+        )
+        result = await session.execute(statement)
+        return list(result.scalars().all())
@@ -0,0 +1,549 @@
+"""Vectorized goal projections and cached goal insights.
+
+Goals are projected together rather than one at a time: a single query loads
+every goal of one or more users with its daily contribution totals over the
+trailing window, NumPy lays those out as a goals x days matrix, and the
+contribution rate, projected completion date, on-track status and insight
+triggers are computed as array operations over all goals at once.
+
+Insights are upserted into ``goal_insights`` keyed by (goal, insight type),
+so read and dismissed state survives a refresh; insights that no longer apply
+are deleted by the same refresh. Every refresh also records the time it ran
+for each user in ``goal_insight_refreshes``, including users whose goals
+produced no insights. A nightly job refreshes every user, and a user who has
+never been refreshed is refreshed on first read.
+"""
+import math
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta
+from decimal import Decimal
+from typing import Any, Callable, Dict, List, Optional, Sequence
+from uuid import uuid4
+
+import numpy as np
+import structlog
+from sqlalchemy import case, delete, func, or_, select, update
+from sqlalchemy.dialects.sqlite import insert
+
+from src.exceptions import DatabaseError
+from src.goals.models import Goal, GoalContribution, GoalInsight, GoalInsightRefresh, GoalStatus
+from src.goals.projections import TRAILING_WINDOW_DAYS
+
+logger = structlog.get_logger(__name__)
+
+DAYS_PER_MONTH = 30
+DEFAULT_USER_BATCH_SIZE = 200
+INSIGHT_TTL = timedelta(days=2)
+
+# Projections based on fewer contribution days than this get reduced confidence
+CONFIDENT_CONTRIBUTION_DAYS = 6
+
+# Contributions in the recent half of the window below this share of the
+# earlier half count as slowing down
+SLOWDOWN_RATIO = 0.5
+
+PRIORITY_ORDER = {"high": 0, "medium": 1, "low": 2}
+
+
+@dataclass
+class ProjectionFrame:
+    """Projection figures for a set of goals, one array element per goal."""
+    goal_ids: List[str]
+    user_ids: List[str]
+    names: List[str]
+    target: np.ndarray
+    current: np.ndarray
+    remaining: np.ndarray
+    days_left: np.ndarray            # NaN for goals without a target date
+    window_total: np.ndarray
+    contribution_count: np.ndarray
+    contribution_days: np.ndarray
+    earlier_total: np.ndarray
+    recent_total: np.ndarray
+    monthly_rate: np.ndarray
+    months_to_completion: np.ndarray  # inf when nothing is being contributed
+    required_monthly: np.ndarray      # NaN for goals without a target date
+    is_on_track: np.ndarray
+    is_behind_schedule: np.ndarray
+    completion_probability: np.ndarray
+    progress: np.ndarray
+    confidence: np.ndarray
+    today: date
+
+    def __len__(self) -> int:
+        return len(self.goal_ids)
+
+
+@dataclass
+class GoalProjection:
+    """Projection of one goal, as exposed to the service."""
+    goal_id: str
+    user_id: str
+    monthly_rate: Decimal
+    window_total: Decimal
+    contribution_count: int
+    progress_percentage: Decimal
+    months_to_completion: Optional[float]
+    projected_completion: Optional[date]
+    required_monthly: Optional[Decimal]
+    is_on_track: bool
+    is_behind_schedule: bool
+    completion_probability: float
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "monthly_rate": float(self.monthly_rate),
+            "window_total": float(self.window_total),
+            "contribution_count": self.contribution_count,
+            "progress_percentage": float(self.progress_percentage),
+            "months_to_completion": self.months_to_completion,
+            "projected_completion": self.projected_completion.isoformat() if self.projected_completion else None,
+            "required_monthly": float(self.required_monthly) if self.required_monthly is not None else None,
+            "is_on_track": self.is_on_track,
+            "completion_probability": self.completion_probability
+        }
+
+
+@dataclass
+class GoalInsightRefreshResult:
+    """Outcome of refreshing stored insights."""
+    users: int = 0
+    goals: int = 0
+    insights: int = 0
+    removed: int = 0
+
+    def add(self, other: "GoalInsightRefreshResult") -> None:
+        self.users += other.users
+        self.goals += other.goals
+        self.insights += other.insights
+        self.removed += other.removed
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {"users": self.users, "goals": self.goals, "insights": self.insights, "removed": self.removed}
+
+
+def _money(value: float) -> Decimal:
+    return Decimal(str(round(float(value), 2))).quantize(Decimal("0.01"))
+
+
+def build_frame(rows: Sequence, today: date, window_days: int = TRAILING_WINDOW_DAYS) -> ProjectionFrame:
+    """Project every goal in ``rows`` at once.
+
+    ``rows`` are goal columns outer-joined to daily contribution totals, as
+    returned by ``GoalInsightEngine.load_rows``: one row per goal and
+    contribution day, or a single row with no day for goals without
+    contributions in the window.
+    """
+    window_start = today - timedelta(days=window_days - 1)
+    index: Dict[str, int] = {}
+    goals = []
+    cells = []
+    for row in rows:
+        position = index.get(row.id)
+        if position is None:
+            position = index[row.id] = len(goals)
+            goals.append(row)
+        if row.day is not None:
+            cells.append((position, (row.day - window_start).days, float(row.amount), row.contributions))
+
+    count = len(goals)
+    daily = np.zeros((count, window_days))
+    contribution_count = np.zeros(count, dtype=int)
+    if cells:
+        positions, offsets, amounts, counts = (np.array(column) for column in zip(*cells))
+        np.add.at(daily, (positions, offsets), amounts)
+        np.add.at(contribution_count, positions, counts)
+
+    target = np.array([float(goal.target_amount) for goal in goals], dtype=float)
+    current = np.array([float(goal.current_amount or 0) for goal in goals], dtype=float)
+    days_left = np.array(
+        [(goal.target_date - today).days if goal.target_date else np.nan for goal in goals], dtype=float
+    )
+
+    remaining = np.maximum(target - current, 0)
+    window_total = daily.sum(axis=1)
+    half = window_days // 2
+    earlier_total = daily[:, :half].sum(axis=1)
+    recent_total = daily[:, half:].sum(axis=1)
+    contribution_days = (daily > 0).sum(axis=1)
+    monthly_rate = window_total / (window_days / DAYS_PER_MONTH)
+
+    has_deadline = ~np.isnan(days_left)
+    months_left = np.maximum(days_left, 0) / DAYS_PER_MONTH
+    done = remaining <= 0
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        months_to_completion = np.where(done, 0.0, np.where(monthly_rate > 0, remaining / monthly_rate, np.inf))
+        required_monthly = np.where(
+            has_deadline, remaining / np.maximum(months_left, 1 / DAYS_PER_MONTH), np.nan
+        )
+        deadline_probability = np.clip(np.nan_to_num(monthly_rate / required_monthly, nan=0.0), 0, 1)
+        progress = np.where(target > 0, np.minimum(current / target, 1) * 100, 0.0)
+
+    reaches_by_deadline = months_to_completion <= months_left
+    is_on_track = done | np.where(has_deadline, reaches_by_deadline, monthly_rate > 0)
+    completion_probability = np.where(
+        done, 1.0, np.where(has_deadline, deadline_probability, (monthly_rate > 0).astype(float))
+    )
+
+    return ProjectionFrame(
+        goal_ids=[goal.id for goal in goals],
+        user_ids=[goal.user_id for goal in goals],
+        names=[goal.name for goal in goals],
+        target=target,
+        current=current,
+        remaining=remaining,
+        days_left=days_left,
+        window_total=window_total,
+        contribution_count=contribution_count,
+        contribution_days=contribution_days,
+        earlier_total=earlier_total,
+        recent_total=recent_total,
+        monthly_rate=monthly_rate,
+        months_to_completion=months_to_completion,
+        required_monthly=required_monthly,
+        is_on_track=is_on_track,
+        is_behind_schedule=has_deadline & ~is_on_track,
+        completion_probability=completion_probability,
+        progress=progress,
+        confidence=np.minimum(contribution_days / CONFIDENT_CONTRIBUTION_DAYS, 1) * 100,
+        today=today
+    )
+
+
+def projections_from_frame(frame: ProjectionFrame) -> List[GoalProjection]:
+    """Per-goal projections of a frame."""
+    projections = []
+    for i in range(len(frame)):
+        months = float(frame.months_to_completion[i])
+        finite = math.isfinite(months)
+        required = frame.required_monthly[i]
+        projections.append(GoalProjection(
+            goal_id=frame.goal_ids[i],
+            user_id=frame.user_ids[i],
+            monthly_rate=_money(frame.monthly_rate[i]),
+            window_total=_money(frame.window_total[i]),
+            contribution_count=int(frame.contribution_count[i]),
+            progress_percentage=_money(frame.progress[i]),
+            months_to_completion=round(months, 1) if finite else None,
+            projected_completion=(
+                frame.today + timedelta(days=math.ceil(months * DAYS_PER_MONTH)) if finite else None
+            ),
+            required_monthly=None if np.isnan(required) else _money(required),
+            is_on_track=bool(frame.is_on_track[i]),
+            is_behind_schedule=bool(frame.is_behind_schedule[i]),
+            completion_probability=round(float(frame.completion_probability[i]), 2)
+        ))
+    return projections
+
+
+def insight_rows(frame: ProjectionFrame, refreshed_at: datetime, window_days: int = TRAILING_WINDOW_DAYS) -> List[Dict[str, Any]]:
+    """Insight rows for every goal in a frame, selected with vectorized rules."""
+    open_goal = frame.remaining > 0
+    has_deadline = ~np.isnan(frame.days_left)
+    with np.errstate(invalid="ignore"):
+        past_due = open_goal & has_deadline & (frame.days_left < 0)
+        months_spare = frame.days_left / DAYS_PER_MONTH - frame.months_to_completion
+
+    rules = [
+        ("past_due", past_due),
+        ("behind_schedule", frame.is_behind_schedule & ~past_due),
+        ("stalled", open_goal & (frame.monthly_rate == 0)),
+        ("slowing_down", open_goal & (frame.recent_total > 0)
+         & (frame.recent_total < frame.earlier_total * SLOWDOWN_RATIO)),
+        ("ahead_of_schedule", open_goal & has_deadline & (months_spare >= 1)),
+        ("almost_there", open_goal & (frame.progress >= 90)),
+    ]
+
+    projections = projections_from_frame(frame)
+    rows = []
+    for insight_type, mask in rules:
+        for i in np.flatnonzero(mask):
+            content = _render(insight_type, frame, projections[i], int(i), window_days)
+            rows.append({
+                "id": str(uuid4()),
+                "goal_id": frame.goal_ids[i],
+                "user_id": frame.user_ids[i],
+                "insight_type": insight_type,
+                "confidence_score": (
+                    Decimal(100) if insight_type in ("past_due", "stalled", "almost_there")
+                    else _money(frame.confidence[i])
+                ),
+                "projection": projections[i].to_dict(),
+                "refreshed_at": refreshed_at,
+                "expires_at": refreshed_at + INSIGHT_TTL,
+                **content
+            })
+    return rows
+
+
+def _render(insight_type: str, frame: ProjectionFrame, projection: GoalProjection,
+            i: int, window_days: int) -> Dict[str, Any]:
+    name = frame.names[i]
+    rate = f"${projection.monthly_rate:,.2f}"
+    remaining = f"${_money(frame.remaining[i]):,.2f}"
+
+    if insight_type == "past_due":
+        return {
+            "title": f"Target Date Passed: {name}",
+            "message": f"The target date for {name} has passed with {remaining} still to save.",
+            "priority": "high",
+            "suggested_actions": ["Set a new target date", "Increase monthly contribution"],
+            "is_actionable": True
+        }
+    if insight_type == "behind_schedule":
+        required = f"${projection.required_monthly:,.2f}"
+        return {
+            "title": f"Behind Schedule: {name}",
+            "message": (
+                f"At {rate} a month, {name} will miss its target date. "
+                f"Saving {required} a month would get you there on time."
+            ),
+            "priority": "high" if frame.days_left[i] <= 90 else "medium",
+            "suggested_actions": [f"Increase monthly contribution to {required}", "Enable auto-save"],
+            "is_actionable": True
+        }
+    if insight_type == "stalled":
+        return {
+            "title": f"No Recent Contributions: {name}",
+            "message": f"Nothing has been added to {name} in the last {window_days} days.",
+            "priority": "medium",
+            "suggested_actions": ["Make a contribution", "Enable auto-save"],
+            "is_actionable": True
+        }
+    if insight_type == "slowing_down":
+        return {
+            "title": f"Contributions Slowing: {name}",
+            "message": f"You have been adding less to {name} lately than earlier in the last {window_days} days.",
+            "priority": "low",
+            "suggested_actions": ["Review spending to find extra funds"],
+            "is_actionable": True
+        }
+    if insight_type == "ahead_of_schedule":
+        return {
+            "title": f"Ahead of Schedule: {name}",
+            "message": f"At {rate} a month you should reach {name} by {projection.projected_completion:%B %d, %Y}.",
+            "priority": "low",
+            "suggested_actions": [],
+            "is_actionable": False
+        }
+    return {
+        "title": f"Almost There: {name}",
+        "message": f"You're {projection.progress_percentage}% of the way to {name}; {remaining} to go.",
+        "priority": "low",
+        "suggested_actions": [],
+        "is_actionable": False
+    }
+
+
+async def _tenant_session():
+    from src.tenant.context import get_tenant_context
+    from src.tenant.manager import tenant_db_manager
+
+    return await tenant_db_manager.get_tenant_session(get_tenant_context())
+
+
+class GoalInsightEngine:
+    """Projects goals and maintains the insights table for the current tenant."""
+
+    def __init__(self,
+                 session_factory: Optional[Callable] = None,
+                 window_days: int = TRAILING_WINDOW_DAYS,
+                 user_batch_size: int = DEFAULT_USER_BATCH_SIZE):
+        self.session_factory = session_factory or _tenant_session
+        self.window_days = window_days
+        self.user_batch_size = user_batch_size
+
+    async def project_user(
+        self,
+        user_id: str,
+        goal_id: Optional[str] = None,
+        window_days: Optional[int] = None,
+        today: Optional[date] = None
+    ) -> List[GoalProjection]:
+        """Projections of a user's active goals, or of one goal in any status."""
+        today = today or date.today()
+        window_days = window_days or self.window_days
+        async with await self.session_factory() as session:
+            try:
+                rows = await self.load_rows(session, [user_id], today, window_days, goal_id=goal_id)
+            except Exception as e:
+                raise DatabaseError(f"Failed to project goals: {str(e)}")
+        return projections_from_frame(build_frame(rows, today, window_days))
+
+    async def load_rows(self, session, user_ids: Sequence[str], today: date, window_days: int,
+                        goal_id: Optional[str] = None) -> List:
+        """Goals of ``user_ids`` joined to their daily contribution totals, in one query."""
+        window_start = today - timedelta(days=window_days - 1)
+        goal_filter = [Goal.user_id.in_(user_ids)]
+        if goal_id is not None:
+            goal_filter.append(Goal.id == goal_id)
+        else:
+            goal_filter.append(Goal.status == GoalStatus.ACTIVE)
+
+        daily = (
+            select(
+                GoalContribution.goal_id,
+                GoalContribution.contribution_date.label("day"),
+                func.sum(GoalContribution.amount).label("amount"),
+                func.count(GoalContribution.id).label("contributions")
+            )
+            .where(
+                GoalContribution.goal_id.in_(select(Goal.id).where(*goal_filter)),
+                GoalContribution.contribution_date.between(window_start, today)
+            )
+            .group_by(GoalContribution.goal_id, GoalContribution.contribution_date)
+            .subquery("daily_contributions")
+        )
+        query = (
+            select(
+                Goal.id, Goal.user_id, Goal.name, Goal.target_amount, Goal.current_amount, Goal.target_date,
+                daily.c.day, daily.c.amount, daily.c.contributions
+            )
+            .outerjoin(daily, daily.c.goal_id == Goal.id)
+            .where(*goal_filter)
+            .order_by(Goal.user_id, Goal.created_at, Goal.id)
+        )
+        result = await session.execute(query)
+        return result.all()
+
+    async def refresh_users(self, user_ids: Sequence[str], today: Optional[date] = None) -> GoalInsightRefreshResult:
+        """Recompute and store insights for ``user_ids`` in one transaction."""
+        today = today or date.today()
+        refreshed_at = datetime.utcnow()
+
+        async with await self.session_factory() as session:
+            try:
+                rows = await self.load_rows(session, user_ids, today, self.window_days)
+                frame = build_frame(rows, today, self.window_days)
+                insights = insight_rows(frame, refreshed_at, self.window_days)
+
+                if insights:
+                    statement = insert(GoalInsight).values(insights)
+                    await session.execute(statement.on_conflict_do_update(
+                        index_elements=["goal_id", "insight_type"],
+                        set_={
+                            name: statement.excluded[name]
+                            for name in (
+                                "user_id", "title", "message", "priority", "confidence_score",
+                                "suggested_actions", "projection", "is_actionable", "refreshed_at", "expires_at"
+                            )
+                        }
+                    ))
+
+                removed = await session.execute(
+                    delete(GoalInsight)
+                    .where(GoalInsight.user_id.in_(user_ids), GoalInsight.refreshed_at < refreshed_at)
+                    .execution_options(synchronize_session=False)
+                )
+
+                if user_ids:
+                    marker = insert(GoalInsightRefresh).values([
+                        {"user_id": user_id, "refreshed_at": refreshed_at} for user_id in user_ids
+                    ])
+                    await session.execute(marker.on_conflict_do_update(
+                        index_elements=["user_id"],
+                        set_={"refreshed_at": marker.excluded.refreshed_at}
+                    ))
+                await session.commit()
+
+            except Exception as e:
+                await session.rollback()
+                logger.error("Goal insight refresh failed", users=len(user_ids), error=str(e))
+                raise DatabaseError(f"Failed to refresh goal insights: {str(e)}")
+
+        return GoalInsightRefreshResult(
+            users=len(user_ids), goals=len(frame), insights=len(insights), removed=removed.rowcount or 0
+        )
+
+    async def refresh_all(self, today: Optional[date] = None) -> GoalInsightRefreshResult:
+        """Refresh insights for every user with active goals, a batch of users at a time."""
+        result = GoalInsightRefreshResult()
+        after = ""
+        while True:
+            user_ids = await self._next_users(after)
+            if not user_ids:
+                break
+            result.add(await self.refresh_users(user_ids, today))
+            after = user_ids[-1]
+            if len(user_ids) < self.user_batch_size:
+                break
+
+        logger.info("Goal insights refreshed", **result.to_dict())
+        return result
+
+    async def get_insights(self, user_id: str, unread_only: bool = False, limit: int = 10) -> List[GoalInsight]:
+        """Stored, undismissed insights, most urgent first; computed on first read."""
+        insights = await self._read_insights(user_id, unread_only, limit)
+        if not insights and not await self._was_refreshed(user_id):
+            await self.refresh_users([user_id])
+            insights = await self._read_insights(user_id, unread_only, limit)
+        return insights
+
+    async def mark_read(self, insight_id: str, user_id: str) -> bool:
+        """Mark an insight read; False if the user has no such insight."""
+        return await self._set_flag(insight_id, user_id, is_read=True)
+
+    async def dismiss(self, insight_id: str, user_id: str) -> bool:
+        """Dismiss an insight until the next refresh no longer produces it."""
+        return await self._set_flag(insight_id, user_id, is_dismissed=True)
+
+    async def _set_flag(self, insight_id: str, user_id: str, **values) -> bool:
+        async with await self.session_factory() as session:
+            try:
+                result = await session.execute(
+                    update(GoalInsight)
+                    .where(GoalInsight.id == insight_id, GoalInsight.user_id == user_id)
+                    .values(**values)
+                    .execution_options(synchronize_session=False)
+                )
+                await session.commit()
+                return result.rowcount > 0
+            except Exception as e:
+                await session.rollback()
+                raise DatabaseError(f"Failed to update goal insight: {str(e)}")
+
+    async def _read_insights(self, user_id: str, unread_only: bool, limit: int) -> List[GoalInsight]:
+        priority_rank = case(PRIORITY_ORDER, value=GoalInsight.priority, else_=len(PRIORITY_ORDER))
+        query = (
+            select(GoalInsight)
+            .where(
+                GoalInsight.user_id == user_id,
+                GoalInsight.is_dismissed.is_(False),
+                or_(GoalInsight.expires_at.is_(None), GoalInsight.expires_at > datetime.utcnow())
+            )
+            .order_by(priority_rank, GoalInsight.refreshed_at.desc(), GoalInsight.id)
+            .limit(limit)
+        )
+        if unread_only:
+            query = query.where(GoalInsight.is_read.is_(False))
+
+        async with await self.session_factory() as session:
+            try:
+                result = await session.execute(query)
+                return list(result.scalars().all())
+            except Exception as e:
+                raise DatabaseError(f"Failed to get goal insights: {str(e)}")
+
+    async def _was_refreshed(self, user_id: str) -> bool:
+        async with await self.session_factory() as session:
+            try:
+                return await session.scalar(
+                    select(GoalInsightRefresh.user_id).where(GoalInsightRefresh.user_id == user_id)
+                ) is not None
+            except Exception as e:
+                raise DatabaseError(f"Failed to get goal insights: {str(e)}")
+
+    async def _next_users(self, after: str) -> List[str]:
+        async with await self.session_factory() as session:
+            try:
+                result = await session.execute(
+                    select(Goal.user_id)
+                    .where(Goal.status == GoalStatus.ACTIVE, Goal.user_id > after)
+                    .group_by(Goal.user_id)
+                    .order_by(Goal.user_id)
+                    .limit(self.user_batch_size)
+                )
+                return list(result.scalars().all())
+            except Exception as e:
+                raise DatabaseError(f"Failed to list users with goals: {str(e)}")
@@ -1,8 +1,10 @@
 """Financial goals and milestone tracking models."""
 from datetime import datetime, date
-from typing import Optional
+from typing import Any, Dict, List, Optional
 from decimal import Decimal
-from sqlalchemy import String, Boolean, DateTime, Date, Numeric, Text, ForeignKey, Enum as SQLEnum
+from sqlalchemy import (
+    String, Boolean, DateTime, Date, Numeric, Text, ForeignKey, Index, JSON, UniqueConstraint, Enum as SQLEnum
+)
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from sqlalchemy.sql import func
 import enum
@@ -296,10 +298,79 @@ class GoalContribution(TenantBase):
     # Relationships
     goal: Mapped["Goal"] = relationship("Goal", back_populates="contributions")
     
+    # Keyset pagination and per-goal stats read contributions newest-first per goal
+    __table_args__ = (
+        Index("idx_goal_contributions_goal_date", "goal_id", "contribution_date", "id"),
+    )
+    
     def __repr__(self):
         return f"<GoalContribution(id={self.id}, amount={self.amount}, goal_id={self.goal_id})>"
 
 
+class GoalInsight(TenantBase):
+    """Precomputed goal insight, refreshed by the projection engine."""
+    
+    __tablename__ = "goal_insights"
+    
+    # Primary key
+    id: Mapped[str] = mapped_column(String(36), primary_key=True)
+    
+    # References
+    goal_id: Mapped[str] = mapped_column(
+        String(36),
+        ForeignKey("goals.id", ondelete="CASCADE"),
+        nullable=False
+    )
+    user_id: Mapped[str] = mapped_column(String(36), nullable=False)
+    
+    # Insight content
+    insight_type: Mapped[str] = mapped_column(String(50), nullable=False)  # behind_schedule, stalled, etc.
+    title: Mapped[str] = mapped_column(String(200), nullable=False)
+    message: Mapped[str] = mapped_column(Text, nullable=False)
+    priority: Mapped[str] = mapped_column(String(20), default="medium", nullable=False)
+    confidence_score: Mapped[Optional[Decimal]] = mapped_column(Numeric(5, 2))
+    suggested_actions: Mapped[List[str]] = mapped_column(JSON, default=list)
+    projection: Mapped[Dict[str, Any]] = mapped_column(JSON, default=dict)  # Figures the insight was derived from
+    
+    # State
+    is_read: Mapped[bool] = mapped_column(Boolean, default=False, nullable=False)
+    is_dismissed: Mapped[bool] = mapped_column(Boolean, default=False, nullable=False)
+    is_actionable: Mapped[bool] = mapped_column(Boolean, default=True, nullable=False)
+    
+    # Timestamps
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        server_default=func.now(),
+        nullable=False
+    )
+    refreshed_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
+    expires_at: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True))
+    
+    # One row per goal and insight type, so refreshes keep read/dismissed state
+    __table_args__ = (
+        UniqueConstraint("goal_id", "insight_type", name="uq_goal_insights_goal_type"),
+        Index("idx_goal_insights_user", "user_id", "is_dismissed", "priority"),
+    )
+    
+    def __repr__(self):
+        return f"<GoalInsight(id={self.id}, goal_id={self.goal_id}, insight_type={self.insight_type})>"
+
+
+class GoalInsightRefresh(TenantBase):
+    """When a user's goal insights were last computed, even if none applied."""
+    
+    __tablename__ = "goal_insight_refreshes"
+    
+    # Primary key
+    user_id: Mapped[str] = mapped_column(String(36), primary_key=True)
+    
+    # Timestamps
+    refreshed_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
+    
+    def __repr__(self):
+        return f"<GoalInsightRefresh(user_id={self.user_id}, refreshed_at={self.refreshed_at})>"
+
+
 class GoalCategory(TenantBase):
     """Custom goal categories for organization."""
     
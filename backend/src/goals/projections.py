@@ -0,0 +1,215 @@
+"""Goal list projections and keyset-paginated contributions.
+
+Goal lists carry aggregated contribution stats computed in SQL (one grouped
+subquery joined to the page of goals), so rendering progress never loads the
+contributions themselves. Contributions are read in pages ordered by
+``(contribution_date, id)`` descending, continuing from an opaque cursor
+rather than an offset.
+"""
+import base64
+from dataclasses import dataclass, field
+from datetime import date, timedelta
+from decimal import Decimal
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+from sqlalchemy import and_, case, desc, func, or_, select
+
+from src.exceptions import DatabaseError, ValidationError
+from src.goals.models import Goal, GoalContribution
+
+TRAILING_WINDOW_DAYS = 90
+
+# Relationships that may be eager-loaded on request with ``expand=``
+EXPANDABLE_RELATIONSHIPS = ("milestones", "contributions")
+
+_ORDERABLE_COLUMNS = {"created_at", "updated_at", "target_date", "name", "priority"}
+
+
+def parse_expand(expand: Optional[Sequence[str]]) -> List[str]:
+    """Validate requested expansions, accepting repeated or comma-separated values."""
+    requested = []
+    for value in expand or []:
+        requested.extend(part.strip() for part in value.split(",") if part.strip())
+
+    unknown = sorted(set(requested) - set(EXPANDABLE_RELATIONSHIPS))
+    if unknown:
+        raise ValidationError(
+            f"Cannot expand {', '.join(unknown)}; expected one of: {', '.join(EXPANDABLE_RELATIONSHIPS)}"
+        )
+    return [name for name in EXPANDABLE_RELATIONSHIPS if name in requested]
+
+
+def encode_cursor(contribution_date: date, contribution_id: str) -> str:
+    raw = f"{contribution_date.isoformat()}|{contribution_id}".encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[date, str]:
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode("utf-8")
+        day, contribution_id = raw.split("|", 1)
+        return date.fromisoformat(day), contribution_id
+    except Exception:
+        raise ValidationError("Invalid contribution cursor")
+
+
+def contribution_stats_subquery(goal_ids, today: Optional[date] = None):
+    """Per-goal contribution count, total, last date and trailing-window figures.
+
+    Only contributions of ``goal_ids``, a list of ids or a subquery selecting
+    them, are aggregated.
+    """
+    cutoff = (today or date.today()) - timedelta(days=TRAILING_WINDOW_DAYS)
+    recent_amount = case((GoalContribution.contribution_date >= cutoff, GoalContribution.amount))
+
+    return (
+        select(
+            GoalContribution.goal_id.label("goal_id"),
+            func.count(GoalContribution.id).label("contribution_count"),
+            func.sum(GoalContribution.amount).label("total_contributed"),
+            func.max(GoalContribution.contribution_date).label("last_contribution_date"),
+            func.sum(recent_amount).label("contributed_90d"),
+            func.avg(recent_amount).label("average_contribution_90d")
+        )
+        .where(GoalContribution.goal_id.in_(goal_ids))
+        .group_by(GoalContribution.goal_id)
+        .subquery("contribution_stats")
+    )
+
+
+def _decimal(value: Any) -> Decimal:
+    return Decimal(str(value)) if value is not None else Decimal(0)
+
+
+def stats_from_row(row) -> Dict[str, Any]:
+    """Contribution stats of a projected goal row; goals without contributions get zeros."""
+    return {
+        "contribution_count": row.contribution_count or 0,
+        "total_contributed": _decimal(row.total_contributed),
+        "last_contribution_date": row.last_contribution_date,
+        "contributed_90d": _decimal(row.contributed_90d),
+        "average_contribution_90d": _decimal(row.average_contribution_90d).quantize(Decimal("0.01"))
+    }
+
+
+@dataclass
+class ContributionPage:
+    """One page of contributions and the cursor to continue from."""
+    contributions: List[GoalContribution] = field(default_factory=list)
+    next_cursor: Optional[str] = None
+
+    @property
+    def has_more(self) -> bool:
+        return self.next_cursor is not None
+
+
+async def _tenant_session():
+    from src.tenant.context import get_tenant_context
+    from src.tenant.manager import tenant_db_manager
+
+    return await tenant_db_manager.get_tenant_session(get_tenant_context())
+
+
+class GoalProjectionReader:
+    """Read-side queries for goal lists and contribution history."""
+
+    def __init__(self, session_factory: Optional[Callable] = None):
+        self.session_factory = session_factory or _tenant_session
+
+    async def list_goals(
+        self,
+        user_id: str,
+        filters: Optional[Dict[str, Any]] = None,
+        offset: int = 0,
+        limit: int = 10,
+        order_by: str = "-created_at",
+        goal_id: Optional[str] = None
+    ) -> List[Tuple[Goal, Dict[str, Any]]]:
+        """Goals with their contribution stats, without loading any relationship."""
+        criteria = [Goal.user_id == user_id, *self._filter_criteria(filters or {})]
+        if goal_id is not None:
+            criteria.append(Goal.id == goal_id)
+        ordering = (self._order(order_by), Goal.id)
+
+        # Aggregate only the contributions of the requested page of goals
+        page_ids = select(Goal.id).where(*criteria).order_by(*ordering).offset(offset).limit(limit)
+        stats = contribution_stats_subquery(page_ids)
+        query = (
+            select(
+                Goal,
+                stats.c.contribution_count,
+                stats.c.total_contributed,
+                stats.c.last_contribution_date,
+                stats.c.contributed_90d,
+                stats.c.average_contribution_90d
+            )
+            .outerjoin(stats, stats.c.goal_id == Goal.id)
+            .where(*criteria)
+            .order_by(*ordering)
+            .offset(offset)
+            .limit(limit)
+        )
+
+        async with await self.session_factory() as session:
+            try:
+                result = await session.execute(query)
+                return [(row[0], stats_from_row(row)) for row in result.all()]
+            except Exception as e:
+                raise DatabaseError(f"Failed to list goals: {str(e)}")
+
+    async def get_goal(self, goal_id: str, user_id: str) -> Optional[Tuple[Goal, Dict[str, Any]]]:
+        """One goal with its contribution stats."""
+        rows = await self.list_goals(user_id, goal_id=goal_id, limit=1)
+        return rows[0] if rows else None
+
+    async def contributions_page(
+        self,
+        goal_id: str,
+        limit: int = 50,
+        cursor: Optional[str] = None
+    ) -> ContributionPage:
+        """Newest-first contributions after ``cursor``, using the goal/date ordering."""
+        query = (
+            select(GoalContribution)
+            .where(GoalContribution.goal_id == goal_id)
+            .order_by(desc(GoalContribution.contribution_date), desc(GoalContribution.id))
+            .limit(limit + 1)
+        )
+        if cursor:
+            after_date, after_id = decode_cursor(cursor)
+            query = query.where(or_(
+                GoalContribution.contribution_date < after_date,
+                and_(GoalContribution.contribution_date == after_date, GoalContribution.id < after_id)
+            ))
+
+        async with await self.session_factory() as session:
+            try:
+                result = await session.execute(query)
+                contributions = list(result.scalars().all())
+            except Exception as e:
+                raise DatabaseError(f"Failed to get contributions: {str(e)}")
+
+        page = ContributionPage(contributions=contributions[:limit])
+        if len(contributions) > limit:
+            last = page.contributions[-1]
+            page.next_cursor = encode_cursor(last.contribution_date, last.id)
+        return page
+
+    @staticmethod
+    def _filter_criteria(filters: Dict[str, Any]) -> list:
+        criteria = []
+        if filters.get("status"):
+            criteria.append(Goal.status == filters["status"])
+        if filters.get("goal_type"):
+            criteria.append(Goal.goal_type == filters["goal_type"])
+        if filters.get("name_ilike"):
+            criteria.append(Goal.name.ilike(filters["name_ilike"]))
+        return criteria
+
+    @staticmethod
+    def _order(order_by: str):
+        column_name = order_by.lstrip("-")
+        if column_name not in _ORDERABLE_COLUMNS:
+            raise ValidationError(f"Cannot order goals by {column_name}")
+        column = getattr(Goal, column_name)
+        return column.desc() if order_by.startswith("-") else column.asc()
@@ -9,8 +9,10 @@ from src.goals.schemas import (
     SavingsGoalResponse, SavingsGoalCreate, SavingsGoalUpdate, GoalListResponse,
     GoalSummaryResponse, GoalAnalysisResponse, GoalContributionResponse,
     GoalContributionCreate, GoalMilestoneResponse, GoalMilestoneCreate,
-    GoalInsightResponse
+    GoalInsightResponse, SavingsGoalExpandedResponse, GoalContributionPageResponse,
+    GoalContributionBatchCreate, GoalContributionBatchResponse
 )
+from src.goals.contributions import ContributionRequest
 from src.auth.dependencies import get_current_user
 from src.exceptions import NotFoundError, ValidationError, BusinessLogicError
 
@@ -18,13 +20,14 @@ router = APIRouter()
 
 
 # Goal CRUD operations
-@router.get("/", response_model=List[SavingsGoalResponse])
+@router.get("/", response_model=List[SavingsGoalExpandedResponse])
 async def get_goals(
     page: int = Query(1, ge=1, description="Page number"),
     per_page: int = Query(10, ge=1, le=100, description="Items per page"),
     status: Optional[str] = Query(None, description="Filter by goal status"),
     goal_type: Optional[str] = Query(None, description="Filter by goal type"),
     search: Optional[str] = Query(None, description="Search goals by name"),
+    expand: Optional[List[str]] = Query(None, description="Relationships to include: milestones, contributions"),
     current_user: dict = Depends(get_current_user),
     goal_service: GoalService = Depends()
 ):
@@ -42,7 +45,8 @@ async def get_goals(
             user_id=current_user["sub"],
             page=page,
             per_page=per_page,
-            filters=filters
+            filters=filters,
+            expand=expand
         )
         return goals_data
         
@@ -52,19 +56,22 @@ async def get_goals(
         raise HTTPException(status_code=500, detail=f"Failed to get goals: {str(e)}")
 
 
-@router.get("/{goal_id}", response_model=SavingsGoalResponse)
+@router.get("/{goal_id}", response_model=SavingsGoalExpandedResponse)
 async def get_goal(
     goal_id: str,
+    expand: Optional[List[str]] = Query(None, description="Relationships to include: milestones, contributions"),
     current_user: dict = Depends(get_current_user),
     goal_service: GoalService = Depends()
 ):
     """Get specific goal by ID."""
     try:
-        goal = await goal_service.get_goal(goal_id, current_user["sub"])
+        goal = await goal_service.get_goal(goal_id, current_user["sub"], expand=expand)
         return goal
         
     except NotFoundError as e:
         raise HTTPException(status_code=404, detail=str(e))
+    except ValidationError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to get goal: {str(e)}")
 
@@ -154,6 +161,28 @@ async def get_goal_contributions(
         raise HTTPException(status_code=500, detail=f"Failed to get contributions: {str(e)}")
 
 
+@router.get("/{goal_id}/contributions/page", response_model=GoalContributionPageResponse)
+async def get_goal_contributions_page(
+    goal_id: str,
+    limit: int = Query(50, ge=1, le=100, description="Contributions per page"),
+    cursor: Optional[str] = Query(None, description="Cursor from the previous page"),
+    current_user: dict = Depends(get_current_user),
+    goal_service: GoalService = Depends()
+):
+    """Get contributions for a goal, newest first, one keyset page at a time."""
+    try:
+        return await goal_service.get_goal_contributions_page(
+            goal_id, current_user["sub"], limit, cursor
+        )
+        
+    except NotFoundError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    except ValidationError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Failed to get contributions: {str(e)}")
+
+
 @router.post("/{goal_id}/contributions", response_model=GoalContributionResponse, status_code=status.HTTP_201_CREATED)
 async def create_goal_contribution(
     goal_id: str,
@@ -178,6 +207,25 @@ async def create_goal_contribution(
         raise HTTPException(status_code=500, detail=f"Failed to create contribution: {str(e)}")
 
 
+@router.post("/contributions/batch", response_model=GoalContributionBatchResponse, status_code=status.HTTP_201_CREATED)
+async def create_goal_contributions_batch(
+    batch: GoalContributionBatchCreate,
+    current_user: dict = Depends(get_current_user),
+    goal_service: GoalService = Depends()
+):
+    """Add contributions to several goals in one transaction."""
+    try:
+        return await goal_service.create_contributions_batch([
+            ContributionRequest.from_schema(item.goal_id, current_user["sub"], item)
+            for item in batch.contributions
+        ])
+        
+    except ValidationError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Failed to create contributions: {str(e)}")
+
+
 # Goal milestones
 @router.get("/{goal_id}/milestones", response_model=List[GoalMilestoneResponse])
 async def get_goal_milestones(
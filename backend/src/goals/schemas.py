@@ -108,6 +108,15 @@ class SavingsGoalUpdate(BaseModel):
     )
 
 
+class GoalContributionStats(BaseModel):
+    """Aggregated contribution figures for a goal, computed in the database."""
+    contribution_count: int = Field(..., description="Number of contributions")
+    total_contributed: Decimal = Field(..., description="Sum of all contributions")
+    last_contribution_date: Optional[date] = Field(None, description="Date of the latest contribution")
+    contributed_90d: Decimal = Field(..., description="Sum of contributions in the last 90 days")
+    average_contribution_90d: Decimal = Field(..., description="Average contribution in the last 90 days")
+
+
 class SavingsGoalResponse(SavingsGoalBase):
     """Schema for savings goal responses."""
     id: str = Field(..., description="Goal unique identifier")
@@ -126,6 +135,7 @@ class SavingsGoalResponse(SavingsGoalBase):
     days_remaining: Optional[int] = Field(None, description="Days remaining to target date")
     projected_completion_date: Optional[date] = Field(None, description="Projected completion date")
     monthly_contribution_needed: Optional[Decimal] = Field(None, description="Monthly contribution needed")
+    contribution_stats: Optional[GoalContributionStats] = Field(None, description="Aggregated contribution stats")
     created_at: datetime = Field(..., description="Goal creation timestamp")
     updated_at: datetime = Field(..., description="Goal last update timestamp")
     
@@ -154,6 +164,13 @@ class SavingsGoalResponse(SavingsGoalBase):
                 "days_remaining": 180,
                 "projected_completion_date": "2024-11-15",
                 "monthly_contribution_needed": "1250.00",
+                "contribution_stats": {
+                    "contribution_count": 15,
+                    "total_contributed": "7500.00",
+                    "last_contribution_date": "2024-01-15",
+                    "contributed_90d": "1500.00",
+                    "average_contribution_90d": "500.00"
+                },
                 "is_active": True,
                 "created_at": "2024-01-01T00:00:00Z",
                 "updated_at": "2024-01-15T12:00:00Z"
@@ -286,6 +303,39 @@ class GoalMilestoneResponse(GoalMilestoneBase):
     )
 
 
+class SavingsGoalExpandedResponse(SavingsGoalResponse):
+    """Schema for goal responses with relationships included via ``expand=``."""
+    milestones: Optional[List[GoalMilestoneResponse]] = Field(None, description="Goal milestones, when expanded")
+    contributions: Optional[List[GoalContributionResponse]] = Field(None, description="All goal contributions, when expanded")
+
+
+class GoalContributionBatchItem(GoalContributionCreate):
+    """A contribution within a batch, naming its goal."""
+    goal_id: str = Field(..., description="Goal to contribute to")
+
+
+class GoalContributionBatchCreate(BaseModel):
+    """Schema for contributing to many goals at once."""
+    contributions: List[GoalContributionBatchItem] = Field(
+        ..., min_length=1, max_length=500, description="Contributions to record"
+    )
+
+
+class GoalContributionBatchResponse(BaseModel):
+    """Schema for the outcome of a contribution batch."""
+    contributions: List[GoalContributionResponse] = Field(..., description="Recorded contributions")
+    completed_goal_ids: List[str] = Field(default_factory=list, description="Goals completed by this batch")
+    completed_milestone_ids: List[str] = Field(default_factory=list, description="Milestones completed by this batch")
+    skipped_goal_ids: List[str] = Field(default_factory=list, description="Goals not found for the user")
+
+
+class GoalContributionPageResponse(BaseModel):
+    """Schema for keyset-paginated goal contributions."""
+    contributions: List[GoalContributionResponse] = Field(..., description="Contributions, newest first")
+    next_cursor: Optional[str] = Field(None, description="Cursor for the next page")
+    has_more: bool = Field(..., description="Whether more contributions follow")
+
+
 class GoalListResponse(BaseModel):
     """Schema for paginated goal list responses."""
     goals: List[SavingsGoalResponse] = Field(..., description="List of goals")
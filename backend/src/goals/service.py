@@ -1,9 +1,8 @@
 """Goal management service with comprehensive business logic."""
 import structlog
 from typing import Optional, List, Dict, Any
-from datetime import datetime, date, timedelta
+from datetime import datetime, date
 from decimal import Decimal
-from uuid import uuid4
 
 from src.goals.repository import (
     GoalRepository, GoalMilestoneRepository, GoalContributionRepository,
@@ -13,9 +12,13 @@ from src.goals.schemas import (
     SavingsGoalCreate, SavingsGoalUpdate, SavingsGoalResponse, GoalListResponse,
     GoalSummaryResponse, GoalAnalysisResponse, GoalContributionResponse,
     GoalContributionCreate, GoalMilestoneResponse, GoalMilestoneCreate,
-    GoalInsightResponse
+    GoalInsightResponse, GoalContributionStats, SavingsGoalExpandedResponse,
+    GoalContributionPageResponse, GoalContributionBatchResponse
 )
 from src.goals.models import GoalStatus, GoalType, MilestoneStatus
+from src.goals.contributions import ContributionRequest, GoalContributionLedger
+from src.goals.insights import GoalInsightEngine, GoalInsightRefreshResult, GoalProjection
+from src.goals.projections import GoalProjectionReader, parse_expand
 from src.exceptions import NotFoundError, ValidationError, DatabaseError, BusinessLogicError
 
 logger = structlog.get_logger(__name__)
@@ -30,6 +33,9 @@ class GoalService:
         self.contribution_repo = GoalContributionRepository()
         self.category_repo = GoalCategoryRepository()
         self.template_repo = GoalTemplateRepository()
+        self.projection_reader = GoalProjectionReader()
+        self.contribution_ledger = GoalContributionLedger()
+        self.insight_engine = GoalInsightEngine()
     
     # Core CRUD operations
     async def get_goals(
@@ -37,10 +43,17 @@ class GoalService:
         user_id: str, 
         page: int = 1, 
         per_page: int = 10,
-        filters: Optional[Dict[str, Any]] = None
+        filters: Optional[Dict[str, Any]] = None,
+        expand: Optional[List[str]] = None
     ) -> List[SavingsGoalResponse]:
-        """Get goals with pagination and filtering."""
+        """Get goals with pagination and filtering.
+        
+        Goals carry aggregated contribution stats; milestones and contributions
+        are only loaded when requested with ``expand``.
+        """
         try:
+            relationships = parse_expand(expand)
+            
             # Apply filters
             query_filters = {}
             if filters:
@@ -51,36 +64,61 @@ class GoalService:
                 if "name_contains" in filters:
                     query_filters["name_ilike"] = f"%{filters['name_contains']}%"
             
-            # Get goals with pagination
-            goals = await self.goal_repo.get_multi_for_user(
+            if relationships:
+                goals = await self.goal_repo.get_multi_for_user(
+                    user_id=user_id,
+                    filters=query_filters,
+                    offset=(page - 1) * per_page,
+                    limit=per_page,
+                    order_by="-created_at",
+                    load_relationships=relationships
+                )
+                return [self._expanded_goal_response(goal, relationships) for goal in goals]
+            
+            # Get goals with contribution stats, without loading relationships
+            rows = await self.projection_reader.list_goals(
                 user_id=user_id,
                 filters=query_filters,
                 offset=(page - 1) * per_page,
                 limit=per_page,
-                order_by="-created_at",
-                load_relationships=["milestones", "contributions"]
+                order_by="-created_at"
             )
+            return [self._goal_response(goal, stats) for goal, stats in rows]
             
-            return [SavingsGoalResponse.model_validate(goal) for goal in goals]
-            
+        except ValidationError:
+            raise
         except Exception as e:
             logger.error("Failed to get goals", user_id=user_id, error=str(e))
             raise BusinessLogicError(f"Failed to get goals: {str(e)}")
     
-    async def get_goal(self, goal_id: str, user_id: str) -> SavingsGoalResponse:
+    async def get_goal(
+        self,
+        goal_id: str,
+        user_id: str,
+        expand: Optional[List[str]] = None
+    ) -> SavingsGoalResponse:
         """Get specific goal by ID."""
         try:
-            goal = await self.goal_repo.get_by_id_for_user(
-                goal_id,
-                user_id,
-                load_relationships=["milestones", "contributions"]
-            )
-            if not goal:
+            relationships = parse_expand(expand)
+            
+            if relationships:
+                goal = await self.goal_repo.get_by_id_for_user(
+                    goal_id,
+                    user_id,
+                    load_relationships=relationships
+                )
+                if not goal:
+                    raise NotFoundError("Goal not found")
+                
+                return self._expanded_goal_response(goal, relationships)
+            
+            row = await self.projection_reader.get_goal(goal_id, user_id)
+            if not row:
                 raise NotFoundError("Goal not found")
             
-            return SavingsGoalResponse.model_validate(goal)
+            return self._goal_response(*row)
             
-        except NotFoundError:
+        except (ValidationError, NotFoundError):
             raise
         except Exception as e:
             logger.error("Failed to get goal", goal_id=goal_id, error=str(e))
@@ -216,17 +254,32 @@ class GoalService:
         user_id: str, 
         limit: int = 50
     ) -> List[GoalContributionResponse]:
-        """Get contributions for a specific goal."""
+        """Get the most recent contributions for a specific goal."""
+        page = await self.get_goal_contributions_page(goal_id, user_id, limit)
+        return page.contributions
+    
+    async def get_goal_contributions_page(
+        self,
+        goal_id: str,
+        user_id: str,
+        limit: int = 50,
+        cursor: Optional[str] = None
+    ) -> GoalContributionPageResponse:
+        """Get a page of contributions for a goal, newest first, continuing from ``cursor``."""
         try:
             # Verify goal belongs to user
             goal = await self.goal_repo.get_by_id_for_user(goal_id, user_id)
             if not goal:
                 raise NotFoundError("Goal not found")
             
-            contributions = await self.contribution_repo.get_contributions_for_goal(goal_id, limit)
-            return [GoalContributionResponse.model_validate(c) for c in contributions]
+            page = await self.projection_reader.contributions_page(goal_id, limit, cursor)
+            return GoalContributionPageResponse(
+                contributions=[self._contribution_response(c, user_id) for c in page.contributions],
+                next_cursor=page.next_cursor,
+                has_more=page.has_more
+            )
             
-        except NotFoundError:
+        except (ValidationError, NotFoundError):
             raise
         except Exception as e:
             logger.error("Failed to get contributions", goal_id=goal_id, error=str(e))
@@ -238,49 +291,37 @@ class GoalService:
         user_id: str, 
         contribution_data: GoalContributionCreate
     ) -> GoalContributionResponse:
-        """Add a contribution to a goal."""
+        """Add a contribution to a goal.
+        
+        The goal balance is incremented in the database, so concurrent
+        contributions to the same goal are never lost.
+        """
         try:
-            # Verify goal exists and belongs to user
-            goal = await self.goal_repo.get_by_id_for_user(goal_id, user_id)
-            if not goal:
-                raise NotFoundError("Goal not found")
-            
             if contribution_data.amount <= 0:
                 raise ValidationError("Contribution amount must be positive")
             
-            # Create contribution
-            contribution_dict = contribution_data.model_dump()
-            contribution_dict["goal_id"] = goal_id
-            contribution_dict["contribution_date"] = datetime.utcnow().date()
-            contribution_dict["created_at"] = datetime.utcnow()
-            
-            contribution = await self.contribution_repo.create(contribution_dict)
-            
-            # Update goal amounts
-            new_current = goal.current_amount + contribution_data.amount
-            new_remaining = goal.target_amount - new_current
+            response = None
             
-            # Check if goal is completed
-            status = GoalStatus.COMPLETED if new_remaining <= 0 else goal.status
-            completed_at = datetime.utcnow() if status == GoalStatus.COMPLETED else None
+            def respond(result):
+                # Built before the ledger commits, so an invalid response records nothing
+                nonlocal response
+                if result.contributions:
+                    response = self._contribution_response(result.contributions[0], user_id)
             
-            await self.goal_repo.update(goal_id, {
-                "current_amount": new_current,
-                "remaining_amount": max(new_remaining, Decimal("0")),
-                "status": status,
-                "completed_at": completed_at,
-                "updated_at": datetime.utcnow()
-            })
-            
-            # Check and complete milestones
-            await self._check_and_complete_milestones(goal_id, new_current)
+            result = await self.contribution_ledger.contribute(
+                ContributionRequest.from_schema(goal_id, user_id, contribution_data), respond
+            )
+            if response is None:
+                raise NotFoundError("Goal not found")
             
             logger.info("Added contribution to goal", 
                        goal_id=goal_id, 
                        amount=contribution_data.amount,
-                       user_id=user_id)
+                       user_id=user_id,
+                       goal_completed=goal_id in result.completed_goal_ids,
+                       milestones_completed=len(result.completed_milestone_ids))
             
-            return GoalContributionResponse.model_validate(contribution)
+            return response
             
         except (ValidationError, NotFoundError) as e:
             raise e
@@ -288,6 +329,40 @@ class GoalService:
             logger.error("Failed to create contribution", goal_id=goal_id, error=str(e))
             raise BusinessLogicError(f"Failed to create contribution: {str(e)}")
     
+    async def create_contributions_batch(
+        self,
+        requests: List[ContributionRequest]
+    ) -> GoalContributionBatchResponse:
+        """Add contributions to many goals in one transaction.
+        
+        Used by auto-save jobs as well as the batch endpoint; contributions to
+        goals that do not belong to the requesting user are skipped.
+        """
+        try:
+            response = None
+            
+            def respond(result):
+                # Built before the ledger commits, so a retry after a failed response cannot double-apply
+                nonlocal response
+                response = GoalContributionBatchResponse(
+                    contributions=[
+                        self._contribution_response(c, result.balances[c.goal_id].user_id)
+                        for c in result.contributions
+                    ],
+                    completed_goal_ids=result.completed_goal_ids,
+                    completed_milestone_ids=result.completed_milestone_ids,
+                    skipped_goal_ids=result.skipped_goal_ids
+                )
+            
+            await self.contribution_ledger.contribute_many(requests, respond)
+            return response
+            
+        except ValidationError:
+            raise
+        except Exception as e:
+            logger.error("Failed to create contributions", count=len(requests), error=str(e))
+            raise BusinessLogicError(f"Failed to create contributions: {str(e)}")
+    
     # Milestone management
     async def get_goal_milestones(self, goal_id: str, user_id: str) -> List[GoalMilestoneResponse]:
         """Get milestones for a specific goal."""
@@ -486,6 +561,9 @@ class GoalService:
             # Get goals due soon
             goals_due_soon = await self.goal_repo.get_goals_due_soon(user_id, days=30)
             
+            # Project all active goals at once for schedule status
+            projections = await self.insight_engine.project_user(user_id)
+            
             return GoalSummaryResponse(
                 total_goals=analytics["total_goals"],
                 active_goals=analytics["active_goals"],
@@ -497,8 +575,8 @@ class GoalService:
                 average_monthly_contribution=analytics["average_monthly_contribution"],
                 completion_rate=completion_rate,
                 goals_due_soon=len(goals_due_soon),
-                on_track_goals=0,  # TODO: Calculate
-                behind_schedule_goals=0  # TODO: Calculate
+                on_track_goals=sum(1 for p in projections if p.is_on_track),
+                behind_schedule_goals=sum(1 for p in projections if p.is_behind_schedule)
             )
             
         except Exception as e:
@@ -513,45 +591,30 @@ class GoalService:
     ) -> GoalAnalysisResponse:
         """Get detailed goal analysis."""
         try:
-            goal = await self.goal_repo.get_by_id_for_user(goal_id, user_id)
-            if not goal:
-                raise NotFoundError("Goal not found")
-            
-            # Calculate analysis metrics
-            progress_percentage = 0
-            if goal.target_amount > 0:
-                progress_percentage = (goal.current_amount / goal.target_amount) * 100
-            
-            # Get contributions for analysis period
-            end_date = date.today()
-            start_date = end_date - timedelta(days=analysis_period)
-            contributions = await self.contribution_repo.get_contributions_by_date_range(
-                goal_id, start_date, end_date
+            projections = await self.insight_engine.project_user(
+                user_id, goal_id=goal_id, window_days=analysis_period
             )
-            
-            # Calculate trends
-            total_period_contributions = sum(c.amount for c in contributions)
-            avg_monthly_contribution = total_period_contributions / (analysis_period / 30)
-            
-            # Projection
-            remaining_needed = goal.target_amount - goal.current_amount
-            months_to_completion = None
-            if avg_monthly_contribution > 0:
-                months_to_completion = float(remaining_needed / avg_monthly_contribution)
+            if not projections:
+                raise NotFoundError("Goal not found")
+            projection = projections[0]
             
             return GoalAnalysisResponse(
                 goal_id=goal_id,
-                current_progress=float(progress_percentage),
-                monthly_average=float(avg_monthly_contribution),
-                projected_completion_months=months_to_completion,
-                total_contributions_period=float(total_period_contributions),
-                contribution_frequency=len(contributions),
-                is_on_track=avg_monthly_contribution >= (goal.monthly_contribution or 0),
-                recommendations=[
-                    "Consider increasing monthly contributions to stay on track"
-                    if avg_monthly_contribution < (goal.monthly_contribution or 0)
-                    else "Great progress! You're on track to meet your goal"
-                ]
+                # Share of the pace needed to finish on time that is being saved
+                performance_score=Decimal(str(round(projection.completion_probability * 100, 2))),
+                velocity=projection.monthly_rate,
+                projected_completion=projection.projected_completion,
+                completion_probability=Decimal(str(projection.completion_probability)),
+                insights=self._analysis_insights(projection, analysis_period),
+                contribution_patterns={
+                    "average_monthly": projection.monthly_rate,
+                    "total_in_period": projection.window_total,
+                    "contribution_count": projection.contribution_count,
+                    "period_days": analysis_period,
+                    "progress_percentage": projection.progress_percentage,
+                    "months_to_completion": projection.months_to_completion
+                },
+                recommendations=self._analysis_recommendations(projection)
             )
             
         except NotFoundError:
@@ -560,6 +623,44 @@ class GoalService:
             logger.error("Failed to get goal analysis", goal_id=goal_id, error=str(e))
             raise BusinessLogicError(f"Failed to get analysis: {str(e)}")
     
+    @staticmethod
+    def _analysis_insights(projection: GoalProjection, analysis_period: int) -> List[str]:
+        """Plain-language observations about a goal projection."""
+        insights = [
+            f"{projection.contribution_count} contributions totalling "
+            f"${projection.window_total:,.2f} in the last {analysis_period} days"
+        ]
+        if projection.is_on_track:
+            insights.append("You're on track to meet this goal")
+        elif projection.is_behind_schedule:
+            insights.append("At the current pace this goal will miss its target date")
+        if projection.projected_completion:
+            insights.append(f"Projected to complete by {projection.projected_completion:%B %d, %Y}")
+        elif projection.monthly_rate == 0:
+            insights.append("No contributions in this period, so no completion date can be projected")
+        return insights
+    
+    @staticmethod
+    def _analysis_recommendations(projection: GoalProjection) -> List[Dict[str, Any]]:
+        """Improvement recommendations for a goal projection."""
+        if projection.monthly_rate == 0:
+            return [{
+                "type": "start_contributing",
+                "suggestion": "Make a contribution or enable auto-save to get this goal moving",
+                "impact": "progress"
+            }]
+        if not projection.is_on_track and projection.required_monthly is not None:
+            return [{
+                "type": "contribution_increase",
+                "suggestion": f"Increase monthly contribution to ${projection.required_monthly:,.2f} to finish on time",
+                "impact": "on_time_completion"
+            }]
+        return [{
+            "type": "maintain",
+            "suggestion": "Keep your current contributions to stay on track",
+            "impact": "on_time_completion"
+        }]
+    
     # Insights and recommendations
     async def get_goal_insights(
         self, 
@@ -569,46 +670,8 @@ class GoalService:
     ) -> List[GoalInsightResponse]:
         """Get goal insights and recommendations for user."""
         try:
-            insights = []
-            
-            # Get user's active goals
-            active_goals = await self.goal_repo.get_active_goals_for_user(user_id)
-            
-            for goal in active_goals[:limit]:
-                # Calculate progress
-                progress = 0
-                if goal.target_amount > 0:
-                    progress = (goal.current_amount / goal.target_amount) * 100
-                
-                # Generate insights based on progress and timeline
-                insight_type = "progress"
-                title = f"Goal Progress Update: {goal.name}"
-                message = f"You're {progress:.1f}% towards your {goal.name} goal"
-                
-                if progress < 25 and goal.target_date:
-                    days_remaining = (goal.target_date - date.today()).days
-                    if days_remaining < 30:
-                        insight_type = "warning"
-                        title = f"Goal Deadline Approaching: {goal.name}"
-                        message = f"Your {goal.name} goal is due in {days_remaining} days. Consider increasing contributions."
-                
-                insights.append(GoalInsightResponse(
-                    id=str(uuid4()),
-                    goal_id=goal.id,
-                    insight_type=insight_type,
-                    title=title,
-                    message=message,
-                    priority="medium",
-                    is_read=False,
-                    created_at=datetime.utcnow(),
-                    action_required=progress < 50,
-                    recommended_actions=[
-                        "Increase monthly contribution",
-                        "Review spending to find extra funds"
-                    ] if progress < 50 else []
-                ))
-            
-            return insights[:limit]
+            insights = await self.insight_engine.get_insights(user_id, unread_only, limit)
+            return [GoalInsightResponse.model_validate(insight) for insight in insights]
             
         except Exception as e:
             logger.error("Failed to get goal insights", user_id=user_id, error=str(e))
@@ -617,9 +680,7 @@ class GoalService:
     async def mark_insight_as_read(self, insight_id: str, user_id: str) -> bool:
         """Mark goal insight as read."""
         try:
-            # TODO: Implement insight storage and reading
-            # For now, return True as a placeholder
-            return True
+            return await self.insight_engine.mark_read(insight_id, user_id)
             
         except Exception as e:
             logger.error("Failed to mark insight as read", insight_id=insight_id, error=str(e))
@@ -628,14 +689,21 @@ class GoalService:
     async def dismiss_insight(self, insight_id: str, user_id: str) -> bool:
         """Dismiss a goal insight."""
         try:
-            # TODO: Implement insight dismissal
-            # For now, return True as a placeholder
-            return True
+            return await self.insight_engine.dismiss(insight_id, user_id)
             
         except Exception as e:
             logger.error("Failed to dismiss insight", insight_id=insight_id, error=str(e))
             raise BusinessLogicError(f"Failed to dismiss insight: {str(e)}")
     
+    async def refresh_goal_insights(self) -> GoalInsightRefreshResult:
+        """Recompute stored insights for every user with active goals."""
+        try:
+            return await self.insight_engine.refresh_all()
+            
+        except Exception as e:
+            logger.error("Failed to refresh goal insights", error=str(e))
+            raise BusinessLogicError(f"Failed to refresh insights: {str(e)}")
+    
     # Utility methods
     async def get_goal_category_suggestions(self, user_id: str) -> List[str]:
         """Get goal category suggestions."""
@@ -847,7 +915,7 @@ class GoalService:
             })
             
             # Recalculate milestones
-            await self._check_and_complete_milestones(goal_id, total_contributions)
+            await self.contribution_ledger.complete_reached_milestones([goal_id])
             
             # Return updated goal
             updated_goal = await self.goal_repo.get_by_id(
@@ -864,19 +932,35 @@ class GoalService:
             raise BusinessLogicError(f"Failed to recalculate: {str(e)}")
     
     # Private helper methods
-    async def _check_and_complete_milestones(self, goal_id: str, current_amount: Decimal) -> None:
-        """Check if any milestones should be auto-completed."""
-        try:
-            milestones = await self.milestone_repo.get_milestones_for_goal(goal_id)
-            
-            for milestone in milestones:
-                if (milestone.is_automatic and 
-                    milestone.status == MilestoneStatus.PENDING and
-                    current_amount >= milestone.target_amount):
-                    
-                    await self.milestone_repo.complete_milestone(milestone.id, current_amount)
-                    logger.info("Auto-completed milestone", 
-                              milestone_id=milestone.id, 
-                              goal_id=goal_id)
-        except Exception as e:
-            logger.warning("Failed to check milestones", goal_id=goal_id, error=str(e))
\ No newline at end of file
+    @staticmethod
+    def _goal_response(goal, stats: Dict[str, Any]) -> SavingsGoalResponse:
+        """Goal response with its aggregated contribution stats."""
+        response = SavingsGoalResponse.model_validate(goal)
+        response.contribution_stats = GoalContributionStats(**stats)
+        return response
+    
+    @staticmethod
+    def _contribution_response(contribution, user_id: str) -> GoalContributionResponse:
+        """Contribution response; contributions are owned by their goal's user."""
+        return GoalContributionResponse(
+            id=contribution.id,
+            goal_id=contribution.goal_id,
+            user_id=user_id,
+            amount=contribution.amount,
+            contribution_date=contribution.contribution_date,
+            source_type=contribution.source_type,
+            notes=contribution.description,
+            source_account_id=contribution.source_account_id,
+            transaction_id=contribution.transaction_id,
+            created_at=contribution.created_at
+        )
+    
+    @staticmethod
+    def _expanded_goal_response(goal, relationships: List[str]) -> SavingsGoalExpandedResponse:
+        """Goal response including the eager-loaded relationships that were requested."""
+        data = SavingsGoalResponse.model_validate(goal).model_dump()
+        if "milestones" in relationships:
+            data["milestones"] = [GoalMilestoneResponse.model_validate(m) for m in goal.milestones]
+        if "contributions" in relationships:
+            data["contributions"] = [GoalService._contribution_response(c, goal.user_id) for c in goal.contributions]
+        return SavingsGoalExpandedResponse(**data)
@@ -75,18 +75,50 @@ async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
     redis_client = await get_redis_client()
     logger.info("Redis connection pool initialized")
     
+    # Compile email templates once up front
+    from src.services.email.template_engine import get_template_engine
+    template_count = get_template_engine().preload()
+    logger.info("Email templates compiled", count=template_count)
+    
     # Initialize background task queues
     from src.services.background import get_celery_app
     celery_app = get_celery_app()
     logger.info("Celery application initialized")
     
-    # Start performance monitoring
-    from src.performance.monitoring import PerformanceMonitor
-    from src.performance.metrics import global_metrics
-    performance_monitor = PerformanceMonitor(global_metrics)
+    # Start performance monitoring, feeding the monitor the API reports from
+    from src.performance.endpoints import performance_monitor
+    from src.performance.metrics import DatabaseProfiler, global_metrics
     
-    # Start monitoring as background task (don't await to avoid blocking)
+    # Time every query and attribute it to the request that ran it
+    DatabaseProfiler(global_metrics)
+    
+    # Sample system resources and pool usage off the event loop
     import asyncio
+    from src.database import global_engine
+    from src.tenant.manager import tenant_db_manager
+    from src.services.plaid.client import get_plaid_pool_stats
+    from src.performance.sampler import SystemSampler, sqlalchemy_pool_stats
+    system_sampler = SystemSampler(global_metrics, interval_seconds=5.0)
+    system_sampler.register_pool("database.global", lambda: sqlalchemy_pool_stats(global_engine))
+    system_sampler.register_pool("database.tenants", lambda: {
+        tenant_id: sqlalchemy_pool_stats(engine)
+        for tenant_id, engine in tenant_db_manager.get_engines().items()
+    })
+    system_sampler.register_pool("redis", redis_client.get_pool_stats)
+    system_sampler.register_pool("http.plaid", get_plaid_pool_stats)
+    system_sampler.start(asyncio.get_running_loop())
+    
+    # Persist per-minute rollups for long-range reports
+    from src.performance.endpoints import performance_history
+    from src.performance.history import HistoryRecorder
+    history_recorder = HistoryRecorder(global_metrics.rollups, performance_history)
+    history_recorder.start()
+    
+    # Detect and attribute callbacks that block the event loop
+    from src.performance.endpoints import event_loop_watchdog
+    event_loop_watchdog.start()
+    
+    # Start monitoring as background task (don't await to avoid blocking)
     asyncio.create_task(performance_monitor.start_monitoring())
     logger.info("Performance monitoring started")
     
@@ -95,10 +127,20 @@ async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
     # Shutdown
     logger.info("Shutting down Faithful Finances API")
     
+    await event_loop_watchdog.stop()
+    system_sampler.stop()
+    history_recorder.stop()
+    performance_history.close()
+    
     # Close Redis connections
     await close_redis_client()
     logger.info("Redis connections closed")
     
+    # Close pooled SMTP connections
+    from src.services.email.client import close_email_service
+    await close_email_service()
+    logger.info("Email connections closed")
+    
     # Background tasks will be handled by Celery worker shutdown
     logger.info("External services shutdown completed")
 
@@ -8,19 +8,26 @@ metrics, reports, and monitoring data.
 import asyncio
 from typing import Optional, Dict, Any
 from datetime import datetime, timedelta
+from dataclasses import asdict
 from fastapi import APIRouter, HTTPException, Query, Depends
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, PlainTextResponse
 
 from .metrics import global_metrics
 from .monitoring import PerformanceMonitor, PerformanceThresholds
+from .event_loop import EventLoopWatchdog
+from .history import PerformanceHistoryStore, RESOLUTIONS, ALL_ENDPOINTS
+from .profiler import SamplingProfiler, ProfilerBusyError, MAX_DURATION_SECONDS, MAX_RATE_HZ
 from .reports import PerformanceReporter, PerformanceAnalyzer, export_report_to_json
 from ..auth.dependencies import get_current_user
 from ..config import settings
 
 # Initialize performance monitoring components
 performance_monitor = PerformanceMonitor(global_metrics)
-performance_reporter = PerformanceReporter(global_metrics, performance_monitor)
-performance_analyzer = PerformanceAnalyzer(global_metrics)
+performance_history = PerformanceHistoryStore(settings.PERFORMANCE_HISTORY_PATH)
+performance_reporter = PerformanceReporter(global_metrics, performance_monitor, history=performance_history)
+performance_analyzer = PerformanceAnalyzer(global_metrics, history=performance_history)
+event_loop_watchdog = EventLoopWatchdog(performance_monitor)
+sampling_profiler = SamplingProfiler(event_loop_watchdog)
 
 router = APIRouter(prefix="/performance", tags=["Performance Monitoring"])
 
@@ -91,6 +98,96 @@ async def get_current_metrics(
         raise HTTPException(status_code=500, detail=f"Error retrieving metrics: {str(e)}")
 
 
+@router.get("/system")
+async def get_system_history(
+    minutes: int = Query(15, ge=1, le=240, description="Time window in minutes"),
+    current_user: dict = Depends(require_admin_user)
+):
+    """Get sampled system resource, event loop, GC and pool usage history."""
+    try:
+        snapshots = global_metrics.get_recent_system_metrics(minutes)
+        lags = [s.event_loop_lag_ms for s in snapshots]
+        
+        return {
+            "timestamp": datetime.utcnow().isoformat(),
+            "time_window_minutes": minutes,
+            "sample_count": len(snapshots),
+            "summary": {
+                "max_cpu_percent": max((s.cpu_percent for s in snapshots), default=0.0),
+                "max_rss_mb": max((s.rss_mb for s in snapshots), default=0.0),
+                "max_open_fds": max((s.open_fds for s in snapshots), default=0),
+                "p95_event_loop_lag_ms": _percentile(lags, 95) if lags else 0.0,
+                "max_event_loop_lag_ms": max(lags, default=0.0),
+                "gc_pause_ms": sum(s.gc_pause_ms for s in snapshots)
+            },
+            "samples": [asdict(s) | {"timestamp": s.timestamp.isoformat()} for s in snapshots]
+        }
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Error retrieving system history: {str(e)}")
+
+
+@router.get("/history")
+async def get_performance_history(
+    hours: int = Query(24, ge=1, le=24 * 400, description="Time window in hours"),
+    resolution: Optional[str] = Query(None, regex="^(minute|hour|day)$", description="Bucket size; chosen from the window when omitted"),
+    endpoint: Optional[str] = Query(None, description="Endpoint such as 'GET /api/v1/accounts'; all endpoints when omitted"),
+    current_user: dict = Depends(require_admin_user)
+):
+    """Get persisted request, database and system rollups over days or weeks."""
+    try:
+        end = datetime.utcnow()
+        start = end - timedelta(hours=hours)
+        resolution = resolution or performance_history.choose_resolution(start, end)
+        key = endpoint or ALL_ENDPOINTS
+        
+        series = await asyncio.to_thread(performance_history.series, start, end, resolution, key)
+        summary = await asyncio.to_thread(performance_history.summary, start, end, key)
+        
+        return {
+            "timestamp": end.isoformat(),
+            "time_window_hours": hours,
+            "resolution": resolution,
+            "bucket_seconds": RESOLUTIONS[resolution],
+            "endpoint": endpoint,
+            "summary": summary.to_dict() | {"timestamp": start.isoformat()},
+            "series": [rollup.to_dict() for rollup in series]
+        }
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Error retrieving performance history: {str(e)}")
+
+
+@router.get("/event-loop")
+async def get_event_loop_health(
+    limit: int = Query(10, ge=1, le=100, description="Number of blocking events to return"),
+    include_stacks: bool = Query(False, description="Include captured stacks"),
+    current_user: dict = Depends(require_admin_user)
+):
+    """Get event loop lag statistics and recent blocking callbacks."""
+    try:
+        events = list(event_loop_watchdog.blocked_events)[-limit:]
+        return {
+            "timestamp": datetime.utcnow().isoformat(),
+            "running": event_loop_watchdog.running,
+            "lag": event_loop_watchdog.get_lag_statistics(),
+            "blocked_events": [
+                {
+                    "duration_ms": e.duration_ms,
+                    "timestamp": e.timestamp.isoformat(),
+                    "endpoint": e.endpoint,
+                    "tenant_id": e.tenant_id,
+                    "request_id": e.request_id,
+                    "task": e.task,
+                    "coroutine": e.coroutine,
+                    "location": e.stack[-1] if e.stack else None,
+                    **({"stack": e.stack} if include_stacks else {})
+                }
+                for e in reversed(events)
+            ]
+        }
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Error retrieving event loop health: {str(e)}")
+
+
 @router.get("/endpoints")
 async def get_endpoint_statistics(
     endpoint: Optional[str] = Query(None, description="Specific endpoint to analyze"),
@@ -159,7 +256,9 @@ async def get_endpoint_statistics(
 @router.get("/database")
 async def get_database_metrics(
     minutes: int = Query(10, ge=1, le=60, description="Time window in minutes"),
-    include_slow_queries: bool = Query(True, description="Include slow query details")
+    include_slow_queries: bool = Query(True, description="Include slow query details"),
+    top_n: int = Query(10, ge=1, le=50, description="Number of N+1 offenders to return"),
+    current_user: dict = Depends(require_admin_user)
 ):
     """Get database performance metrics."""
     try:
@@ -204,7 +303,13 @@ async def get_database_metrics(
                 "slow_queries_count": len(slow_queries),
                 "tables_accessed": len(table_stats)
             },
-            "table_statistics": table_analysis
+            "table_statistics": table_analysis,
+            "request_queries": _request_query_summary(global_metrics.get_recent_requests(minutes)),
+            "n_plus_one_offenders": global_metrics.get_query_offenders(
+                minutes,
+                top_n,
+                min_repeats=performance_monitor.thresholds.max_repeated_queries_per_request + 1
+            )
         }
         
         if include_slow_queries and slow_queries:
@@ -224,6 +329,69 @@ async def get_database_metrics(
         raise HTTPException(status_code=500, detail=f"Error retrieving database metrics: {str(e)}")
 
 
+@router.get("/database/statements")
+async def get_statement_statistics(
+    tenant_id: Optional[str] = Query(None, description="Tenant to report on; all tenants when omitted"),
+    sort_by: str = Query("total_time", regex="^(total_time|mean_time|max_time|calls|rows)$", description="Sort order"),
+    limit: int = Query(20, ge=1, le=100, description="Number of statements to return"),
+    current_user: dict = Depends(require_admin_user)
+):
+    """Get pg_stat_statements-style statistics per normalized statement."""
+    try:
+        response = global_metrics.statements.get_statements(tenant_id, sort_by, limit)
+        response["timestamp"] = datetime.utcnow().isoformat()
+        response["tenants"] = global_metrics.statements.tenants()
+        return response
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Error retrieving statement statistics: {str(e)}")
+
+
+@router.get("/database/slow-queries")
+async def get_slow_query_log(
+    tenant_id: Optional[str] = Query(None, description="Tenant to report on; all tenants when omitted"),
+    limit: int = Query(20, ge=1, le=100, description="Number of queries to return"),
+    current_user: dict = Depends(require_admin_user)
+):
+    """Get the slowest logged query executions."""
+    try:
+        slow_queries = global_metrics.statements.get_slow_queries(tenant_id, limit)
+        return {
+            "timestamp": datetime.utcnow().isoformat(),
+            "tenant_id": tenant_id,
+            "threshold_ms": global_metrics.statements.slow_threshold_ms,
+            "slow_queries": [
+                {
+                    "query": q.query,
+                    "fingerprint": q.fingerprint,
+                    "duration_ms": q.duration_ms,
+                    "tenant_id": q.tenant_id,
+                    "table": q.table,
+                    "operation": q.operation,
+                    "endpoint": q.endpoint,
+                    "request_id": q.request_id,
+                    "timestamp": q.timestamp.isoformat()
+                }
+                for q in slow_queries
+            ]
+        }
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Error retrieving slow query log: {str(e)}")
+
+
+@router.delete("/database/statements")
+async def reset_statement_statistics(
+    tenant_id: Optional[str] = Query(None, description="Tenant to reset; all tenants when omitted"),
+    current_user: dict = Depends(require_admin_user)
+):
+    """Reset statement statistics and the slow query log."""
+    global_metrics.statements.reset(tenant_id)
+    return {
+        "message": "Statement statistics reset",
+        "tenant_id": tenant_id,
+        "timestamp": datetime.utcnow().isoformat()
+    }
+
+
 @router.get("/alerts")
 async def get_performance_alerts(
     hours: int = Query(1, ge=1, le=48, description="Time window in hours"),
@@ -283,9 +451,35 @@ async def trigger_performance_analysis(current_user: dict = Depends(require_admi
         raise HTTPException(status_code=500, detail=f"Error running performance analysis: {str(e)}")
 
 
+@router.post("/profile")
+async def run_sampling_profiler(
+    seconds: float = Query(10.0, gt=0, le=MAX_DURATION_SECONDS, description="Sampling duration in seconds"),
+    rate_hz: int = Query(100, ge=1, le=MAX_RATE_HZ, description="Samples per second"),
+    route: Optional[str] = Query(None, description="Only keep event loop samples of requests matching this route"),
+    tenant_id: Optional[str] = Query(None, description="Only keep event loop samples of this tenant's requests"),
+    include_idle: bool = Query(False, description="Keep samples of threads waiting on I/O or locks"),
+    format: str = Query("json", regex="^(json|collapsed)$", description="Output format"),
+    current_user: dict = Depends(require_admin_user)
+):
+    """Sample all threads' stacks and return collapsed (flamegraph) stacks."""
+    try:
+        # Sampling runs in a worker thread so the event loop keeps serving requests
+        result = await asyncio.to_thread(
+            sampling_profiler.profile, seconds, rate_hz, route, tenant_id, include_idle
+        )
+    except ProfilerBusyError as e:
+        raise HTTPException(status_code=409, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Error running profiler: {str(e)}")
+    
+    if format == "collapsed":
+        return PlainTextResponse(result.collapsed())
+    return result.to_dict()
+
+
 @router.get("/report")
 async def generate_performance_report(
-    hours: int = Query(24, ge=1, le=168, description="Report time window in hours"),
+    hours: int = Query(24, ge=1, le=840, description="Report time window in hours"),
     format: str = Query("json", regex="^(json|summary)$", description="Report format"),
     current_user: dict = Depends(require_admin_user)
 ):
@@ -343,7 +537,7 @@ async def analyze_specific_endpoint(
 @router.get("/compare")
 async def compare_performance_periods(
     recent_hours: int = Query(1, ge=1, le=48, description="Recent period in hours"),
-    historical_hours: int = Query(24, ge=1, le=168, description="Historical period in hours"),
+    historical_hours: int = Query(24, ge=1, le=840, description="Historical period in hours"),
     current_user: dict = Depends(require_admin_user)
 ):
     """Compare performance between two time periods."""
@@ -374,7 +568,8 @@ async def get_performance_config(current_user: dict = Depends(require_admin_user
                 "max_queries_per_request": performance_monitor.thresholds.max_queries_per_request,
                 "max_cpu_percent": performance_monitor.thresholds.max_cpu_percent,
                 "max_memory_percent": performance_monitor.thresholds.max_memory_percent,
-                "max_concurrent_requests": performance_monitor.thresholds.max_concurrent_requests
+                "max_concurrent_requests": performance_monitor.thresholds.max_concurrent_requests,
+                "max_event_loop_lag_ms": performance_monitor.thresholds.max_event_loop_lag_ms
             },
             "analysis_intervals": {
                 "analysis_window_minutes": performance_monitor.thresholds.analysis_window_minutes,
@@ -416,6 +611,23 @@ def _calculate_performance_score(health: Dict[str, Any], alerts: Dict[str, Any])
     return max(0, int(score))
 
 
+def _request_query_summary(requests: list) -> Dict[str, Any]:
+    """Per-request query counts and time for recent requests."""
+    if not requests:
+        return {"request_count": 0}
+    
+    counts = [r.query_count for r in requests]
+    times = [r.query_time_ms for r in requests]
+    return {
+        "request_count": len(requests),
+        "avg_queries_per_request": sum(counts) / len(counts),
+        "p95_queries_per_request": _percentile(counts, 95),
+        "max_queries_per_request": max(counts),
+        "avg_query_time_ms": sum(times) / len(times),
+        "requests_with_repeated_queries": sum(1 for r in requests if r.repeated_queries)
+    }
+
+
 def _percentile(data: list, percentile: int) -> float:
     """Calculate percentile of data."""
     if not data:
@@ -0,0 +1,223 @@
+"""
+Event loop health monitoring.
+
+This module measures event loop scheduling lag continuously and detects
+callbacks that block the loop. A heartbeat task on the loop records how
+late each of its wake-ups is; a watchdog thread notices when the heartbeat
+is overdue and samples the loop thread's stack and running task while the
+loop is still blocked. Blocks are attributed to the request being handled
+and reported to the PerformanceMonitor as EVENT_LOOP_BLOCKED alerts.
+"""
+
+import sys
+import time
+import asyncio
+import logging
+import threading
+import traceback
+import weakref
+from typing import Dict, List, Optional, Any
+from datetime import datetime
+from dataclasses import dataclass, field
+from collections import Counter, deque
+
+from .metrics import RequestQueryTracker, get_request_query_tracker, _request_queries
+from .monitoring import PerformanceMonitor
+
+logger = logging.getLogger(__name__)
+
+# Frames kept per captured stack, innermost last
+MAX_STACK_DEPTH = 30
+
+
+@dataclass
+class BlockedLoopEvent:
+    """One period during which the event loop could not run callbacks."""
+    duration_ms: float
+    timestamp: datetime
+    stack: List[str] = field(default_factory=list)
+    task: Optional[str] = None
+    coroutine: Optional[str] = None
+    endpoint: Optional[str] = None
+    tenant_id: Optional[str] = None
+    request_id: Optional[str] = None
+    samples: int = 0
+
+
+@dataclass
+class _Capture:
+    """Watchdog samples taken while one heartbeat was overdue."""
+    expected_beat: float
+    stacks: Counter = field(default_factory=Counter)
+    task: Optional[str] = None
+    coroutine: Optional[str] = None
+    tracker: Optional[RequestQueryTracker] = None
+
+
+class EventLoopWatchdog:
+    """Measures loop lag and captures whatever is blocking the loop."""
+
+    def __init__(self, monitor: PerformanceMonitor, threshold_ms: Optional[float] = None,
+                 heartbeat_interval_ms: float = 50.0, history: int = 100):
+        self.monitor = monitor
+        self.threshold_ms = threshold_ms or monitor.thresholds.max_event_loop_lag_ms
+        self.heartbeat_interval = heartbeat_interval_ms / 1000
+        # Sample a few times per threshold so a block is caught while it lasts
+        self.check_interval = min(self.heartbeat_interval, self.threshold_ms / 4000)
+
+        self.lags_ms: deque = deque(maxlen=1200)
+        self.blocked_events: deque = deque(maxlen=history)
+
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._loop_thread_id: Optional[int] = None
+        self._heartbeat: Optional[asyncio.Task] = None
+        self._thread: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+        self._expected_beat: Optional[float] = None
+        self._capture: Optional[_Capture] = None
+        self._previous_task_factory = None
+
+        # Request tracker active when each task was created
+        self._task_requests: "weakref.WeakKeyDictionary[asyncio.Task, RequestQueryTracker]" = \
+            weakref.WeakKeyDictionary()
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self) -> None:
+        """Start watching the running event loop."""
+        if self.running:
+            return
+
+        self._loop = asyncio.get_running_loop()
+        self._loop_thread_id = threading.get_ident()
+        self._previous_task_factory = self._loop.get_task_factory()
+        self._loop.set_task_factory(self._task_factory)
+
+        self._stop.clear()
+        self._expected_beat = time.perf_counter() + self.heartbeat_interval
+        self._heartbeat = self._loop.create_task(self._run_heartbeat())
+        self._thread = threading.Thread(target=self._run_watchdog, name="event-loop-watchdog", daemon=True)
+        self._thread.start()
+        logger.info(f"Event loop watchdog started with {self.threshold_ms}ms threshold")
+
+    async def stop(self) -> None:
+        """Stop watching and restore the loop's task factory."""
+        self._stop.set()
+        if self._heartbeat:
+            self._heartbeat.cancel()
+            try:
+                await self._heartbeat
+            except asyncio.CancelledError:
+                pass
+            self._heartbeat = None
+        if self._thread:
+            self._thread.join(timeout=1)
+            self._thread = None
+        if self._loop and self._loop.get_task_factory() == self._task_factory:
+            self._loop.set_task_factory(self._previous_task_factory)
+
+    @property
+    def loop_thread_id(self) -> Optional[int]:
+        return self._loop_thread_id
+
+    def current_request(self) -> Optional[RequestQueryTracker]:
+        """Request of the task running on the loop; safe to call from any thread."""
+        if self._loop is None:
+            return None
+        task = asyncio.current_task(self._loop)
+        return self._task_requests.get(task) if task is not None else None
+
+    def get_lag_statistics(self) -> Dict[str, Any]:
+        """Summary of recent scheduling lag."""
+        lags = sorted(self.lags_ms)
+        if not lags:
+            return {"samples": 0}
+
+        return {
+            "samples": len(lags),
+            "avg_ms": sum(lags) / len(lags),
+            "p50_ms": lags[len(lags) // 2],
+            "p99_ms": lags[min(len(lags) - 1, int(len(lags) * 0.99))],
+            "max_ms": lags[-1],
+            "blocked_count": len(self.blocked_events),
+            "threshold_ms": self.threshold_ms
+        }
+
+    def _task_factory(self, loop, coro, **kwargs):
+        if self._previous_task_factory is not None:
+            task = self._previous_task_factory(loop, coro, **kwargs)
+        else:
+            task = asyncio.Task(coro, loop=loop, **kwargs)
+
+        context = kwargs.get("context")
+        tracker = context.get(_request_queries) if context is not None else get_request_query_tracker()
+        if tracker is not None:
+            self._task_requests[task] = tracker
+        return task
+
+    async def _run_heartbeat(self) -> None:
+        while not self._stop.is_set():
+            expected = time.perf_counter() + self.heartbeat_interval
+            self._expected_beat = expected
+            await asyncio.sleep(self.heartbeat_interval)
+
+            lag_ms = max(0.0, (time.perf_counter() - expected) * 1000)
+            self.lags_ms.append(lag_ms)
+            if lag_ms >= self.threshold_ms:
+                self._report_block(expected, lag_ms)
+
+    def _run_watchdog(self) -> None:
+        while not self._stop.wait(self.check_interval):
+            try:
+                expected = self._expected_beat
+                if expected is None:
+                    continue
+                overdue_ms = (time.perf_counter() - expected) * 1000
+                if overdue_ms >= self.threshold_ms:
+                    self._sample_blocked_loop(expected)
+            except Exception as e:
+                logger.error(f"Error in event loop watchdog: {e}")
+
+    def _sample_blocked_loop(self, expected_beat: float) -> None:
+        """Record the loop thread's stack and task; runs on the watchdog thread."""
+        capture = self._capture
+        if capture is None or capture.expected_beat != expected_beat:
+            capture = _Capture(expected_beat=expected_beat)
+            task = asyncio.current_task(self._loop)
+            if task is not None:
+                coro = task.get_coro()
+                capture.task = task.get_name()
+                capture.coroutine = getattr(coro, "__qualname__", repr(coro))
+                capture.tracker = self._task_requests.get(task)
+            self._capture = capture
+
+        frame = sys._current_frames().get(self._loop_thread_id)
+        if frame is not None:
+            # Source lines are not looked up, so sampling does no file I/O
+            summary = traceback.StackSummary.extract(
+                traceback.walk_stack(frame), limit=MAX_STACK_DEPTH, lookup_lines=False
+            )
+            stack = tuple(f"{entry.filename}:{entry.lineno} {entry.name}" for entry in reversed(summary))
+            capture.stacks[stack] += 1
+
+    def _report_block(self, expected_beat: float, lag_ms: float) -> None:
+        """Turn a late heartbeat into an alert; runs on the loop."""
+        capture = self._capture if self._capture and self._capture.expected_beat == expected_beat else None
+        self._capture = None
+
+        event = BlockedLoopEvent(duration_ms=lag_ms, timestamp=datetime.utcnow())
+        if capture:
+            event.task = capture.task
+            event.coroutine = capture.coroutine
+            event.samples = sum(capture.stacks.values())
+            if capture.stacks:
+                event.stack = list(capture.stacks.most_common(1)[0][0])
+            if capture.tracker:
+                event.endpoint = capture.tracker.label
+                event.tenant_id = capture.tracker.tenant_id
+                event.request_id = capture.tracker.request_id
+
+        self.blocked_events.append(event)
+        self.monitor.record_event_loop_block(event)
@@ -0,0 +1,513 @@
+"""
+Persisted performance history.
+
+This module keeps long-range performance history in a SQLite time-series
+store. Requests, queries and system snapshots are aggregated in memory
+into per-minute rollups and written once each minute closes. Minute
+rollups are downsampled into hourly and daily rollups inside SQLite, and
+every resolution has its own retention, so a report over days or weeks
+reads a few hundred pre-aggregated rows instead of raw samples.
+"""
+
+import time
+import sqlite3
+import logging
+import threading
+from typing import Dict, List, Optional, Any, Tuple
+from datetime import datetime, timedelta, timezone
+from dataclasses import dataclass, field
+from bisect import bisect_left
+
+from .statements import LATENCY_BUCKETS_MS
+
+logger = logging.getLogger(__name__)
+
+# Bucket widths in seconds, finest first
+RESOLUTIONS: Dict[str, int] = {"minute": 60, "hour": 3600, "day": 86400}
+
+# Endpoint key of the rollup that aggregates every endpoint and carries
+# the database and system series
+ALL_ENDPOINTS = "*"
+
+# Requests to endpoints beyond a bucket's limit are pooled under this key
+OTHER_ENDPOINT = "<other>"
+
+# Minute rollups still open this long after their minute ends accept late requests
+FLUSH_DELAY_SECONDS = 5
+
+# Coarser rollups are built once the finer buckets of their period have settled
+DOWNSAMPLE_DELAY_SECONDS = 300
+
+# Queries slower than this count toward a bucket's slow queries
+SLOW_QUERY_MS = 500.0
+
+HISTOGRAM_COLUMNS = [f"h{index}" for index in range(len(LATENCY_BUCKETS_MS) + 1)]
+
+# Columns summed when rollups are merged; the remaining ones keep their maximum
+SUM_COLUMNS = [
+    "request_count", "error_count", "total_ms", "query_count", "query_time_ms",
+    "db_query_count", "db_time_ms", "slow_query_count",
+    "system_samples", "cpu_percent_sum", "memory_percent_sum",
+] + HISTOGRAM_COLUMNS
+MAX_COLUMNS = ["max_ms", "max_rss_mb", "max_event_loop_lag_ms"]
+VALUE_COLUMNS = SUM_COLUMNS + MAX_COLUMNS
+
+_SCHEMA = f"""
+CREATE TABLE IF NOT EXISTS performance_rollups (
+    resolution INTEGER NOT NULL,
+    bucket INTEGER NOT NULL,
+    endpoint TEXT NOT NULL,
+    {", ".join(f"{column} REAL NOT NULL DEFAULT 0" for column in VALUE_COLUMNS)},
+    PRIMARY KEY (resolution, bucket, endpoint)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS performance_rollup_watermarks (
+    resolution INTEGER PRIMARY KEY,
+    downsampled_until INTEGER NOT NULL
+);
+"""
+
+_UPSERT_ASSIGNMENTS = ", ".join(
+    [f"{column} = {column} + excluded.{column}" for column in SUM_COLUMNS]
+    + [f"{column} = MAX({column}, excluded.{column})" for column in MAX_COLUMNS]
+)
+
+_AGGREGATES = ", ".join(
+    [f"SUM({column})" for column in SUM_COLUMNS] + [f"MAX({column})" for column in MAX_COLUMNS]
+)
+
+
+def _epoch(timestamp: datetime) -> int:
+    """Seconds since the epoch of a naive UTC or aware timestamp."""
+    if timestamp.tzinfo is None:
+        timestamp = timestamp.replace(tzinfo=timezone.utc)
+    return int(timestamp.timestamp())
+
+
+def _from_epoch(seconds: int) -> datetime:
+    return datetime.fromtimestamp(seconds, tz=timezone.utc).replace(tzinfo=None)
+
+
+@dataclass
+class RetentionPolicy:
+    """How long rollups of each resolution are kept."""
+    minute: timedelta = timedelta(days=2)
+    hour: timedelta = timedelta(days=35)
+    day: timedelta = timedelta(days=400)
+
+    def for_resolution(self, resolution: str) -> timedelta:
+        return getattr(self, resolution)
+
+
+@dataclass
+class Rollup:
+    """Aggregated performance of one endpoint, or all of them, over one bucket."""
+    bucket: int
+    endpoint: str
+    request_count: int = 0
+    error_count: int = 0
+    total_ms: float = 0.0
+    max_ms: float = 0.0
+    query_count: int = 0
+    query_time_ms: float = 0.0
+    db_query_count: int = 0
+    db_time_ms: float = 0.0
+    slow_query_count: int = 0
+    system_samples: int = 0
+    cpu_percent_sum: float = 0.0
+    memory_percent_sum: float = 0.0
+    max_rss_mb: float = 0.0
+    max_event_loop_lag_ms: float = 0.0
+    histogram: List[int] = field(default_factory=lambda: [0] * len(HISTOGRAM_COLUMNS))
+
+    @classmethod
+    def from_row(cls, bucket: int, endpoint: str, values: Tuple) -> "Rollup":
+        """Build a rollup from values in ``VALUE_COLUMNS`` order."""
+        named = dict(zip(VALUE_COLUMNS, (value or 0 for value in values)))
+        rollup = cls(bucket=bucket, endpoint=endpoint)
+        for column in VALUE_COLUMNS:
+            if column not in HISTOGRAM_COLUMNS:
+                # Values are stored as REAL; counters are read back as integers
+                value = named[column]
+                setattr(rollup, column, int(value) if isinstance(getattr(rollup, column), int) else value)
+        rollup.histogram = [int(named[column]) for column in HISTOGRAM_COLUMNS]
+        return rollup
+
+    def values(self) -> List[float]:
+        """Values in ``VALUE_COLUMNS`` order."""
+        histogram = dict(zip(HISTOGRAM_COLUMNS, self.histogram))
+        return [histogram[column] if column in histogram else getattr(self, column) for column in VALUE_COLUMNS]
+
+    def merge(self, other: "Rollup") -> None:
+        """Add another rollup's values to this one."""
+        for column in SUM_COLUMNS:
+            if column not in HISTOGRAM_COLUMNS:
+                setattr(self, column, getattr(self, column) + getattr(other, column))
+        for column in MAX_COLUMNS:
+            setattr(self, column, max(getattr(self, column), getattr(other, column)))
+        self.histogram = [mine + theirs for mine, theirs in zip(self.histogram, other.histogram)]
+
+    def add_request(self, duration_ms: float, is_error: bool, query_count: int, query_time_ms: float) -> None:
+        self.request_count += 1
+        self.error_count += int(is_error)
+        self.total_ms += duration_ms
+        self.max_ms = max(self.max_ms, duration_ms)
+        self.query_count += query_count
+        self.query_time_ms += query_time_ms
+        self.histogram[bisect_left(LATENCY_BUCKETS_MS, duration_ms)] += 1
+
+    def percentile(self, percentile: float) -> float:
+        """Approximate percentile: the upper bound of its histogram bucket, capped at the maximum."""
+        total = sum(self.histogram)
+        if not total:
+            return 0.0
+
+        rank = total * percentile / 100
+        seen = 0
+        for index, count in enumerate(self.histogram):
+            seen += count
+            if seen >= rank and count:
+                bound = LATENCY_BUCKETS_MS[index] if index < len(LATENCY_BUCKETS_MS) else self.max_ms
+                return float(min(bound, self.max_ms))
+        return float(self.max_ms)
+
+    def to_dict(self) -> Dict[str, Any]:
+        requests = self.request_count
+        data = {
+            "timestamp": _from_epoch(self.bucket).isoformat(),
+            "request_count": int(requests),
+            "error_count": int(self.error_count),
+            "error_rate_percent": self.error_count / requests * 100 if requests else 0.0,
+            "avg_duration_ms": self.total_ms / requests if requests else 0.0,
+            "p50_duration_ms": self.percentile(50),
+            "p95_duration_ms": self.percentile(95),
+            "p99_duration_ms": self.percentile(99),
+            "max_duration_ms": self.max_ms,
+            "total_query_count": int(self.query_count),
+            "avg_queries_per_request": self.query_count / requests if requests else 0.0,
+        }
+        if self.endpoint == ALL_ENDPOINTS:
+            samples = self.system_samples
+            data.update({
+                "database_queries": int(self.db_query_count),
+                "avg_query_duration_ms": self.db_time_ms / self.db_query_count if self.db_query_count else 0.0,
+                "slow_queries_count": int(self.slow_query_count),
+                "avg_cpu_percent": self.cpu_percent_sum / samples if samples else None,
+                "avg_memory_percent": self.memory_percent_sum / samples if samples else None,
+                "max_rss_mb": self.max_rss_mb if samples else None,
+                "max_event_loop_lag_ms": self.max_event_loop_lag_ms if samples else None,
+            })
+        return data
+
+
+class RollupAggregator:
+    """Per-minute rollups of live metrics, waiting to be written."""
+
+    def __init__(self, max_endpoints_per_bucket: int = 200, max_buckets: int = 120):
+        self.max_endpoints_per_bucket = max_endpoints_per_bucket
+        self.max_buckets = max_buckets
+        self._lock = threading.Lock()
+        self._buckets: Dict[int, Dict[str, Rollup]] = {}
+
+    def _rollup(self, bucket: int, endpoint: str) -> Rollup:
+        rollups = self._buckets.get(bucket)
+        if rollups is None:
+            # Without a recorder draining them, only the latest minutes are kept
+            if len(self._buckets) >= self.max_buckets:
+                del self._buckets[min(self._buckets)]
+            rollups = self._buckets[bucket] = {}
+        rollup = rollups.get(endpoint)
+        if rollup is None:
+            # The "*" rollup and the overflow rollup do not count toward the limit
+            if endpoint != ALL_ENDPOINTS and len(rollups) > self.max_endpoints_per_bucket:
+                endpoint = OTHER_ENDPOINT
+                rollup = rollups.get(endpoint)
+            if rollup is None:
+                rollup = rollups[endpoint] = Rollup(bucket=bucket, endpoint=endpoint)
+        return rollup
+
+    def add_request(self, metric) -> None:
+        """Count a RequestMetrics in its minute."""
+        bucket = _epoch(metric.timestamp) // 60 * 60
+        endpoint = metric.endpoint or f"{metric.method} {metric.path}"
+        is_error = metric.status_code >= 400
+        with self._lock:
+            for key in (ALL_ENDPOINTS, endpoint):
+                self._rollup(bucket, key).add_request(
+                    metric.duration_ms, is_error, metric.query_count, metric.query_time_ms
+                )
+
+    def add_query(self, metric) -> None:
+        """Count a DatabaseMetrics in its minute."""
+        bucket = _epoch(metric.timestamp) // 60 * 60
+        with self._lock:
+            rollup = self._rollup(bucket, ALL_ENDPOINTS)
+            rollup.db_query_count += 1
+            rollup.db_time_ms += metric.duration_ms
+            rollup.slow_query_count += int(metric.duration_ms > SLOW_QUERY_MS)
+
+    def add_system(self, metric) -> None:
+        """Fold a SystemMetrics snapshot into its minute."""
+        bucket = _epoch(metric.timestamp) // 60 * 60
+        with self._lock:
+            rollup = self._rollup(bucket, ALL_ENDPOINTS)
+            rollup.system_samples += 1
+            rollup.cpu_percent_sum += metric.cpu_percent
+            rollup.memory_percent_sum += metric.memory_percent
+            rollup.max_rss_mb = max(rollup.max_rss_mb, metric.rss_mb)
+            rollup.max_event_loop_lag_ms = max(rollup.max_event_loop_lag_ms, metric.event_loop_lag_ms)
+
+    def drain(self, before: Optional[int] = None) -> List[Rollup]:
+        """Remove and return the rollups of minutes that started before ``before``."""
+        with self._lock:
+            if before is None:
+                closed = list(self._buckets)
+            else:
+                closed = [bucket for bucket in self._buckets if bucket < before]
+            return [rollup for bucket in closed for rollup in self._buckets.pop(bucket).values()]
+
+
+class PerformanceHistoryStore:
+    """SQLite store of minute, hourly and daily rollups.
+
+    Writes are additive upserts, so several processes can share one
+    database file and a minute that is flushed twice is merged rather
+    than overwritten. Downsampling runs as ``INSERT ... SELECT ... GROUP
+    BY`` over finished periods and records a watermark per resolution.
+    Reads combine each resolution's rollups with the finer rollups that
+    have not been downsampled yet, so recent data is never missing.
+    """
+
+    def __init__(self, path: str = ":memory:", retention: Optional[RetentionPolicy] = None):
+        self.path = path
+        self.retention = retention or RetentionPolicy()
+        self._lock = threading.Lock()
+        self._connection: Optional[sqlite3.Connection] = None
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._connection is None:
+            connection = sqlite3.connect(self.path, timeout=5.0, check_same_thread=False)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            connection.executescript(_SCHEMA)
+            self._connection = connection
+        return self._connection
+
+    def close(self) -> None:
+        with self._lock:
+            if self._connection is not None:
+                self._connection.close()
+                self._connection = None
+
+    def write(self, rollups: List[Rollup]) -> int:
+        """Add minute rollups to the store."""
+        if not rollups:
+            return 0
+
+        sql = (
+            f"INSERT INTO performance_rollups (resolution, bucket, endpoint, {', '.join(VALUE_COLUMNS)}) "
+            f"VALUES (?, ?, ?, {', '.join('?' for _ in VALUE_COLUMNS)}) "
+            f"ON CONFLICT (resolution, bucket, endpoint) DO UPDATE SET {_UPSERT_ASSIGNMENTS}"
+        )
+        rows = [(RESOLUTIONS["minute"], rollup.bucket, rollup.endpoint, *rollup.values()) for rollup in rollups]
+        with self._lock:
+            connection = self._connect()
+            with connection:
+                connection.executemany(sql, rows)
+        return len(rows)
+
+    def downsample(self, now: Optional[datetime] = None) -> Dict[str, int]:
+        """Fold settled minute rollups into hours and settled hours into days."""
+        now_epoch = _epoch(now or datetime.utcnow()) - DOWNSAMPLE_DELAY_SECONDS
+        folded = {}
+        names = list(RESOLUTIONS)
+        with self._lock:
+            connection = self._connect()
+            for fine, coarse in zip(names, names[1:]):
+                fine_width, coarse_width = RESOLUTIONS[fine], RESOLUTIONS[coarse]
+                until = now_epoch // coarse_width * coarse_width
+                start = self._watermark(connection, fine_width)
+                if start is None:
+                    first = connection.execute(
+                        "SELECT MIN(bucket) FROM performance_rollups WHERE resolution = ?", (fine_width,)
+                    ).fetchone()[0]
+                    if first is None:
+                        continue
+                    start = int(first) // coarse_width * coarse_width
+                if start >= until:
+                    continue
+
+                with connection:
+                    cursor = connection.execute(
+                        f"INSERT INTO performance_rollups (resolution, bucket, endpoint, {', '.join(VALUE_COLUMNS)}) "
+                        f"SELECT ?, bucket - bucket % ?, endpoint, {_AGGREGATES} FROM performance_rollups "
+                        f"WHERE resolution = ? AND bucket >= ? AND bucket < ? "
+                        f"GROUP BY bucket - bucket % ?, endpoint "
+                        f"ON CONFLICT (resolution, bucket, endpoint) DO UPDATE SET {_UPSERT_ASSIGNMENTS}",
+                        (coarse_width, coarse_width, fine_width, start, until, coarse_width)
+                    )
+                    connection.execute(
+                        "INSERT INTO performance_rollup_watermarks (resolution, downsampled_until) VALUES (?, ?) "
+                        "ON CONFLICT (resolution) DO UPDATE SET downsampled_until = excluded.downsampled_until",
+                        (fine_width, until)
+                    )
+                folded[coarse] = cursor.rowcount
+        return folded
+
+    def apply_retention(self, now: Optional[datetime] = None) -> int:
+        """Delete rollups past their resolution's retention; undownsampled ones are kept."""
+        now_epoch = _epoch(now or datetime.utcnow())
+        deleted = 0
+        names = list(RESOLUTIONS)
+        with self._lock:
+            connection = self._connect()
+            with connection:
+                for index, name in enumerate(names):
+                    width = RESOLUTIONS[name]
+                    cutoff = now_epoch - int(self.retention.for_resolution(name).total_seconds())
+                    if index < len(names) - 1:
+                        cutoff = min(cutoff, self._watermark(connection, width) or 0)
+                    deleted += connection.execute(
+                        "DELETE FROM performance_rollups WHERE resolution = ? AND bucket < ?", (width, cutoff)
+                    ).rowcount
+        return deleted
+
+    def choose_resolution(self, start: datetime, end: datetime, now: Optional[datetime] = None) -> str:
+        """Finest resolution that still covers ``start`` and keeps the series short."""
+        span = end - start
+        age = (now or datetime.utcnow()) - start
+        if span <= timedelta(hours=6) and age <= self.retention.minute:
+            return "minute"
+        if span <= timedelta(days=14) and age <= self.retention.hour:
+            return "hour"
+        return "day"
+
+    def series(self, start: datetime, end: datetime, resolution: Optional[str] = None,
+               endpoint: str = ALL_ENDPOINTS) -> List[Rollup]:
+        """Rollups per bucket of ``resolution`` between ``start`` and ``end``, oldest first."""
+        resolution = resolution or self.choose_resolution(start, end)
+        width = RESOLUTIONS[resolution]
+        group = f"bucket - bucket % {width}"
+        sql, params = self._union(resolution, start, end, endpoint=endpoint)
+        with self._lock:
+            rows = self._connect().execute(
+                f"SELECT {group} AS grouped, {_AGGREGATES} FROM ({sql}) GROUP BY grouped ORDER BY grouped", params
+            ).fetchall()
+        return [Rollup.from_row(row[0], endpoint, row[1:]) for row in rows]
+
+    def summary(self, start: datetime, end: datetime, endpoint: str = ALL_ENDPOINTS) -> Rollup:
+        """One rollup over the whole period."""
+        sql, params = self._union(self.choose_resolution(start, end), start, end, endpoint=endpoint)
+        with self._lock:
+            row = self._connect().execute(f"SELECT {_AGGREGATES} FROM ({sql})", params).fetchone()
+        return Rollup.from_row(_epoch(start), endpoint, row)
+
+    def endpoint_summaries(self, start: datetime, end: datetime) -> List[Rollup]:
+        """One rollup per endpoint over the whole period."""
+        sql, params = self._union(self.choose_resolution(start, end), start, end, endpoint=None)
+        with self._lock:
+            rows = self._connect().execute(
+                f"SELECT endpoint, {_AGGREGATES} FROM ({sql}) WHERE endpoint != ? GROUP BY endpoint",
+                (*params, ALL_ENDPOINTS)
+            ).fetchall()
+        return [Rollup.from_row(_epoch(start), row[0], row[1:]) for row in rows]
+
+    def _union(self, resolution: str, start: datetime, end: datetime,
+               endpoint: Optional[str]) -> Tuple[str, List[Any]]:
+        """Rows covering the period: ``resolution`` rollups plus finer ones not yet folded into it.
+
+        The start is aligned down to a ``resolution`` bucket. Must be called
+        without holding the lock; watermarks are read here.
+        """
+        start_epoch = _epoch(start) // RESOLUTIONS[resolution] * RESOLUTIONS[resolution]
+        end_epoch = _epoch(end)
+        names = list(RESOLUTIONS)
+        levels = names[:names.index(resolution) + 1]
+
+        with self._lock:
+            connection = self._connect()
+            watermarks = {name: self._watermark(connection, RESOLUTIONS[name]) or 0 for name in levels[:-1]}
+
+        parts, params = [], []
+        for index, name in enumerate(levels):
+            # A level holds what the finer level has been folded into it up to,
+            # and its own rollups are only read from where it was folded onwards
+            lower = max(start_epoch, watermarks[name]) if name in watermarks else start_epoch
+            upper = min(end_epoch, watermarks[levels[index - 1]]) if index else end_epoch
+            if lower >= upper:
+                continue
+            condition = "resolution = ? AND bucket >= ? AND bucket < ?"
+            parts.append(f"SELECT * FROM performance_rollups WHERE {condition}"
+                         + (" AND endpoint = ?" if endpoint is not None else ""))
+            params.extend([RESOLUTIONS[name], lower, upper])
+            if endpoint is not None:
+                params.append(endpoint)
+
+        if not parts:
+            return "SELECT * FROM performance_rollups WHERE 0", []
+        return " UNION ALL ".join(parts), params
+
+    @staticmethod
+    def _watermark(connection: sqlite3.Connection, width: int) -> Optional[int]:
+        row = connection.execute(
+            "SELECT downsampled_until FROM performance_rollup_watermarks WHERE resolution = ?", (width,)
+        ).fetchone()
+        return row[0] if row else None
+
+
+class HistoryRecorder:
+    """Flushes closed minutes to the store and maintains it, on a daemon thread."""
+
+    def __init__(self, aggregator: RollupAggregator, store: PerformanceHistoryStore,
+                 interval_seconds: float = 60.0, maintenance_interval_seconds: float = 900.0):
+        self.aggregator = aggregator
+        self.store = store
+        self.interval_seconds = interval_seconds
+        self.maintenance_interval_seconds = maintenance_interval_seconds
+
+        self._thread: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+        self._last_maintenance = 0.0
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self) -> None:
+        if self.running:
+            return
+
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="performance-history", daemon=True)
+        self._thread.start()
+        logger.info(f"Performance history recorder started, writing to {self.store.path}")
+
+    def stop(self) -> None:
+        """Stop the thread and write everything still held in memory."""
+        self._stop.set()
+        if self._thread:
+            self._thread.join(timeout=5)
+            self._thread = None
+        try:
+            self.flush(final=True)
+        except Exception as e:
+            logger.error(f"Error flushing performance history: {e}")
+
+    def flush(self, final: bool = False) -> int:
+        """Write closed minutes, or every minute when ``final``."""
+        before = None if final else (int(time.time()) - FLUSH_DELAY_SECONDS) // 60 * 60
+        return self.store.write(self.aggregator.drain(before))
+
+    def maintain(self, now: Optional[datetime] = None) -> None:
+        """Downsample and apply retention."""
+        self.store.downsample(now)
+        self.store.apply_retention(now)
+        self._last_maintenance = time.monotonic()
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval_seconds):
+            try:
+                self.flush()
+                if time.monotonic() - self._last_maintenance >= self.maintenance_interval_seconds:
+                    self.maintain()
+            except Exception as e:
+                logger.error(f"Error recording performance history: {e}")
@@ -14,13 +14,82 @@ from datetime import datetime, timedelta
 from dataclasses import dataclass, field
 from collections import defaultdict, deque
 from contextlib import asynccontextmanager
+from contextvars import ContextVar
+from uuid import uuid4
 import functools
 import threading
 from sqlalchemy import event
 from sqlalchemy.engine import Engine
 
+from src.performance.statements import (
+    StatementStatsStore,
+    normalize_statement,
+    statement_operation,
+    statement_table
+)
+from src.performance.history import RollupAggregator
+
 logger = logging.getLogger(__name__)
 
+# System snapshots older than this are not reported as current health
+SYSTEM_SNAPSHOT_MAX_AGE = timedelta(seconds=30)
+
+# Distinct statements tracked per request; further ones only count toward totals
+MAX_FINGERPRINTS_PER_REQUEST = 200
+
+
+def fingerprint_statement(statement: str) -> str:
+    """Stable key for a SQL statement, independent of its formatting and parameters."""
+    return normalize_statement(statement)
+
+
+@dataclass
+class QueryStats:
+    """Executions of one statement fingerprint."""
+    count: int = 0
+    total_ms: float = 0.0
+
+
+class RequestQueryTracker:
+    """Database queries executed while handling one request."""
+    
+    def __init__(self, tenant_id: Optional[str] = None, label: Optional[str] = None):
+        self.request_id = uuid4().hex
+        self.tenant_id = tenant_id
+        self.label = label
+        self.query_count = 0
+        self.query_time_ms = 0.0
+        self.fingerprints: Dict[str, QueryStats] = {}
+    
+    def record(self, fingerprint: str, duration_ms: float) -> None:
+        """Count one executed statement."""
+        self.query_count += 1
+        self.query_time_ms += duration_ms
+        
+        stats = self.fingerprints.get(fingerprint)
+        if stats is None:
+            if len(self.fingerprints) >= MAX_FINGERPRINTS_PER_REQUEST:
+                return
+            stats = self.fingerprints[fingerprint] = QueryStats()
+        stats.count += 1
+        stats.total_ms += duration_ms
+    
+    def repeated(self, min_count: int = 2) -> Dict[str, QueryStats]:
+        """Fingerprints executed at least ``min_count`` times in this request."""
+        return {fp: stats for fp, stats in self.fingerprints.items() if stats.count >= min_count}
+
+
+# Query tracker of the request being handled, set by RequestTimer
+_request_queries: ContextVar[Optional[RequestQueryTracker]] = ContextVar(
+    'request_queries',
+    default=None
+)
+
+
+def get_request_query_tracker() -> Optional[RequestQueryTracker]:
+    """Get the query tracker of the current request, if any."""
+    return _request_queries.get()
+
 
 @dataclass
 class RequestMetrics:
@@ -37,6 +106,7 @@ class RequestMetrics:
     query_time_ms: float = 0.0
     memory_delta_mb: float = 0.0
     cpu_usage_percent: float = 0.0
+    repeated_queries: Dict[str, QueryStats] = field(default_factory=dict)
 
 
 @dataclass
@@ -50,6 +120,9 @@ class DatabaseMetrics:
     operation: str = "SELECT"  # SELECT, INSERT, UPDATE, DELETE
     rows_affected: int = 0
     connection_time_ms: float = 0.0
+    fingerprint: Optional[str] = None
+    request_id: Optional[str] = None
+    endpoint: Optional[str] = None
 
 
 @dataclass
@@ -62,6 +135,41 @@ class SystemMetrics:
     disk_usage_percent: float
     active_connections: int = 0
     request_rate: float = 0.0
+    process_cpu_percent: float = 0.0
+    rss_mb: float = 0.0
+    open_fds: int = 0
+    thread_count: int = 0
+    event_loop_lag_ms: float = 0.0
+    gc_collections: int = 0
+    gc_pause_ms: float = 0.0
+    gc_max_pause_ms: float = 0.0
+    pools: Dict[str, Any] = field(default_factory=dict)
+
+
+class SlidingWindowCounter:
+    """Event count over a sliding window of one-second buckets."""
+    
+    def __init__(self, window_seconds: int = 60):
+        self.window_seconds = window_seconds
+        self._counts = [0] * window_seconds
+        self._seconds = [0] * window_seconds
+    
+    def add(self, now: Optional[float] = None) -> None:
+        """Count one event."""
+        second = int(time.monotonic() if now is None else now)
+        index = second % self.window_seconds
+        if self._seconds[index] != second:
+            self._seconds[index] = second
+            self._counts[index] = 0
+        self._counts[index] += 1
+    
+    def count(self, now: Optional[float] = None) -> int:
+        """Events within the window."""
+        second = int(time.monotonic() if now is None else now)
+        return sum(
+            count for count, bucket in zip(self._counts, self._seconds)
+            if second - bucket < self.window_seconds
+        )
 
 
 class PerformanceMetrics:
@@ -76,12 +184,14 @@ class PerformanceMetrics:
         
         # Aggregated statistics
         self.endpoint_stats: Dict[str, List[float]] = defaultdict(list)
-        self.slow_queries: List[DatabaseMetrics] = []
+        self.statements = StatementStatsStore(slow_log_size=100, slow_threshold_ms=100.0)
+        self.rollups = RollupAggregator()
         self.error_counts: Dict[int, int] = defaultdict(int)
         
         # Real-time counters
         self.active_requests = 0
         self.total_requests = 0
+        self.requests_last_minute = SlidingWindowCounter(60)
         self.last_cleanup = datetime.utcnow()
     
     def add_request_metric(self, metric: RequestMetrics) -> None:
@@ -91,31 +201,45 @@ class PerformanceMetrics:
             self.endpoint_stats[f"{metric.method} {metric.path}"].append(metric.duration_ms)
             self.error_counts[metric.status_code] += 1
             self.total_requests += 1
+            self.requests_last_minute.add()
             
             # Clean up old endpoint stats periodically
             if datetime.utcnow() - self.last_cleanup > timedelta(hours=1):
                 self._cleanup_endpoint_stats()
+        
+        # Per-minute rollups for the persisted history
+        self.rollups.add_request(metric)
     
     def add_database_metric(self, metric: DatabaseMetrics) -> None:
         """Add a database metric."""
         with self._lock:
             self.database_metrics.append(metric)
-            
-            # Track slow queries (> 100ms)
-            if metric.duration_ms > 100:
-                self.slow_queries.append(metric)
-                # Keep only the 100 slowest queries
-                if len(self.slow_queries) > 100:
-                    self.slow_queries = sorted(
-                        self.slow_queries, 
-                        key=lambda x: x.duration_ms, 
-                        reverse=True
-                    )[:100]
+        self.rollups.add_query(metric)
+        
+        # Per-statement statistics and the slow query log (> 100ms)
+        self.statements.record(
+            metric.fingerprint or normalize_statement(metric.query),
+            metric.duration_ms,
+            tenant_id=metric.tenant_id,
+            operation=metric.operation,
+            table=metric.table,
+            rows=metric.rows_affected,
+            query=metric.query,
+            timestamp=metric.timestamp,
+            request_id=metric.request_id,
+            endpoint=metric.endpoint
+        )
+    
+    @property
+    def slow_queries(self) -> List[Any]:
+        """The 100 slowest queries across tenants, slowest first."""
+        return self.statements.get_slow_queries(limit=100)
     
     def add_system_metric(self, metric: SystemMetrics) -> None:
         """Add a system metric."""
         with self._lock:
             self.system_metrics.append(metric)
+        self.rollups.add_system(metric)
     
     def get_recent_requests(self, minutes: int = 5) -> List[RequestMetrics]:
         """Get requests from the last N minutes."""
@@ -147,26 +271,95 @@ class PerformanceMetrics:
                 "p99_ms": self._percentile(durations, 99)
             }
     
+    def get_query_offenders(self, minutes: int = 10, top_n: int = 10,
+                            min_repeats: int = 2) -> List[Dict[str, Any]]:
+        """Route and statement pairs most often repeated within single requests."""
+        offenders: Dict[tuple, Dict[str, Any]] = {}
+        for request in self.get_recent_requests(minutes):
+            endpoint = request.endpoint or f"{request.method} {request.path}"
+            for fingerprint, stats in request.repeated_queries.items():
+                if stats.count < min_repeats:
+                    continue
+                entry = offenders.setdefault((endpoint, fingerprint), {
+                    "endpoint": endpoint,
+                    "fingerprint": fingerprint,
+                    "requests": 0,
+                    "total_executions": 0,
+                    "max_per_request": 0,
+                    "total_time_ms": 0.0
+                })
+                entry["requests"] += 1
+                entry["total_executions"] += stats.count
+                entry["max_per_request"] = max(entry["max_per_request"], stats.count)
+                entry["total_time_ms"] += stats.total_ms
+        
+        ranked = sorted(
+            offenders.values(),
+            key=lambda x: (x["total_executions"], x["total_time_ms"]),
+            reverse=True
+        )
+        return ranked[:top_n]
+    
+    def get_recent_system_metrics(self, minutes: int = 5) -> List[SystemMetrics]:
+        """Get system snapshots from the last N minutes."""
+        cutoff = datetime.utcnow() - timedelta(minutes=minutes)
+        with self._lock:
+            return [m for m in self.system_metrics if m.timestamp > cutoff]
+    
+    def get_latest_system_metric(self) -> Optional[SystemMetrics]:
+        """Get the newest system snapshot if it is still current."""
+        latest = self.system_metrics[-1] if self.system_metrics else None
+        if latest and datetime.utcnow() - latest.timestamp <= SYSTEM_SNAPSHOT_MAX_AGE:
+            return latest
+        return None
+    
+    def request_rate(self) -> int:
+        """Requests completed in the last minute."""
+        with self._lock:
+            return self.requests_last_minute.count()
+    
     def get_system_health(self) -> Dict[str, Any]:
-        """Get current system health metrics."""
+        """Get current system health metrics.
+        
+        Reads the latest background sample when one is current, and takes
+        a non-blocking reading otherwise.
+        """
         try:
-            cpu_percent = psutil.cpu_percent(interval=0.1)
-            memory = psutil.virtual_memory()
-            disk = psutil.disk_usage('/')
-            
-            # Get recent request rate
-            recent_requests = self.get_recent_requests(1)  # Last minute
-            request_rate = len(recent_requests)
+            snapshot = self.get_latest_system_metric()
+            if snapshot:
+                health = {
+                    "cpu_percent": snapshot.cpu_percent,
+                    "memory_percent": snapshot.memory_percent,
+                    "memory_used_mb": snapshot.memory_used_mb,
+                    "disk_usage_percent": snapshot.disk_usage_percent,
+                    "process_cpu_percent": snapshot.process_cpu_percent,
+                    "rss_mb": snapshot.rss_mb,
+                    "open_fds": snapshot.open_fds,
+                    "thread_count": snapshot.thread_count,
+                    "event_loop_lag_ms": snapshot.event_loop_lag_ms,
+                    "gc_collections": snapshot.gc_collections,
+                    "gc_pause_ms": snapshot.gc_pause_ms,
+                    "pools": snapshot.pools,
+                    "sampled": True,
+                    "sampled_at": snapshot.timestamp.isoformat()
+                }
+            else:
+                memory = psutil.virtual_memory()
+                health = {
+                    "cpu_percent": psutil.cpu_percent(interval=None),
+                    "memory_percent": memory.percent,
+                    "memory_used_mb": memory.used / 1024 / 1024,
+                    "disk_usage_percent": psutil.disk_usage('/').percent,
+                    # CPU is measured since whichever caller read it last
+                    "sampled": False
+                }
             
-            return {
-                "cpu_percent": cpu_percent,
-                "memory_percent": memory.percent,
-                "memory_used_mb": memory.used / 1024 / 1024,
-                "disk_usage_percent": disk.percent,
+            health.update({
                 "active_requests": self.active_requests,
-                "request_rate_per_minute": request_rate,
+                "request_rate_per_minute": self.request_rate(),
                 "total_requests": self.total_requests
-            }
+            })
+            return health
         except Exception as e:
             logger.error(f"Error getting system health: {e}")
             return {}
@@ -191,7 +384,8 @@ class RequestTimer:
     """Context manager for timing requests."""
     
     def __init__(self, metrics: PerformanceMetrics, path: str, method: str, 
-                 tenant_id: Optional[str] = None, user_id: Optional[str] = None):
+                 tenant_id: Optional[str] = None, user_id: Optional[str] = None,
+                 endpoint: Optional[str] = None):
         self.metrics = metrics
         self.path = path
         self.method = method
@@ -200,11 +394,38 @@ class RequestTimer:
         self.start_time = 0.0
         self.start_memory = 0.0
         self.start_cpu = 0.0
-        self.query_count = 0
-        self.query_time = 0.0
+        self.queries = RequestQueryTracker(tenant_id=tenant_id, label=f"{method} {path}")
+        self._queries_token = None
+        self.endpoint = endpoint
+    
+    @property
+    def endpoint(self) -> Optional[str]:
+        """Route template of the request, e.g. ``GET /api/families/{family_id}``."""
+        return self._endpoint
+    
+    @endpoint.setter
+    def endpoint(self, endpoint: Optional[str]) -> None:
+        # Queries and loop blocks are grouped by the tracker label, so keep it on the template too
+        self._endpoint = endpoint
+        if endpoint:
+            self.queries.label = endpoint
+    
+    @property
+    def query_count(self) -> int:
+        return self.queries.query_count
+    
+    @property
+    def query_time(self) -> float:
+        return self.queries.query_time_ms
+    
+    @property
+    def duration_ms(self) -> float:
+        """Time since the request started."""
+        return (time.perf_counter() - self.start_time) * 1000
     
     def __enter__(self):
         self.start_time = time.perf_counter()
+        self._queries_token = _request_queries.set(self.queries)
         try:
             process = psutil.Process()
             self.start_memory = process.memory_info().rss / 1024 / 1024  # MB
@@ -217,7 +438,10 @@ class RequestTimer:
         return self
     
     def __exit__(self, exc_type, exc_val, exc_tb):
-        duration_ms = (time.perf_counter() - self.start_time) * 1000
+        duration_ms = self.duration_ms
+        if self._queries_token is not None:
+            _request_queries.reset(self._queries_token)
+            self._queries_token = None
         
         # Calculate resource usage
         memory_delta = 0.0
@@ -241,10 +465,12 @@ class RequestTimer:
             timestamp=datetime.utcnow(),
             tenant_id=self.tenant_id,
             user_id=self.user_id,
+            endpoint=self.endpoint,
             query_count=self.query_count,
             query_time_ms=self.query_time,
             memory_delta_mb=memory_delta,
-            cpu_usage_percent=cpu_usage
+            cpu_usage_percent=cpu_usage,
+            repeated_queries=self.queries.repeated()
         )
         
         self.metrics.add_request_metric(metric)
@@ -252,8 +478,8 @@ class RequestTimer:
     
     def add_query_metrics(self, count: int, duration_ms: float):
         """Add database query metrics to this request."""
-        self.query_count += count
-        self.query_time += duration_ms
+        self.queries.query_count += count
+        self.queries.query_time_ms += duration_ms
 
 
 class DatabaseProfiler:
@@ -276,45 +502,35 @@ class DatabaseProfiler:
             if hasattr(context, '_query_start_time'):
                 duration_ms = (time.perf_counter() - context._query_start_time) * 1000
                 
-                # Extract operation type
-                operation = statement.strip().split()[0].upper() if statement else "UNKNOWN"
+                # Literals are stripped, so parameters never reach the metrics
+                fingerprint = fingerprint_statement(statement)
+                operation = statement_operation(fingerprint)
+                table = statement_table(fingerprint)
                 
-                # Extract table name (basic extraction)
-                table = self._extract_table_name(statement)
+                # Attribute the query to the request being handled, once per execution
+                tracker = get_request_query_tracker()
+                if tracker and not getattr(context, '_request_query_recorded', False):
+                    context._request_query_recorded = True
+                    tracker.record(fingerprint, duration_ms)
                 
                 metric = DatabaseMetrics(
-                    query=statement[:500],  # Truncate long queries
+                    query=fingerprint[:500],  # Truncate long queries
                     duration_ms=duration_ms,
                     timestamp=datetime.utcnow(),
+                    tenant_id=tracker.tenant_id if tracker else None,
                     table=table,
                     operation=operation,
-                    rows_affected=cursor.rowcount if hasattr(cursor, 'rowcount') else 0
+                    rows_affected=cursor.rowcount if hasattr(cursor, 'rowcount') else 0,
+                    fingerprint=fingerprint,
+                    request_id=tracker.request_id if tracker else None,
+                    endpoint=tracker.label if tracker else None
                 )
                 
                 self.metrics.add_database_metric(metric)
     
     def _extract_table_name(self, statement: str) -> Optional[str]:
         """Extract table name from SQL statement."""
-        if not statement:
-            return None
-        
-        statement = statement.upper().strip()
-        
-        # Simple table extraction patterns
-        patterns = [
-            r'FROM\s+(\w+)',
-            r'INSERT\s+INTO\s+(\w+)',
-            r'UPDATE\s+(\w+)',
-            r'DELETE\s+FROM\s+(\w+)'
-        ]
-        
-        import re
-        for pattern in patterns:
-            match = re.search(pattern, statement)
-            if match:
-                return match.group(1).lower()
-        
-        return None
+        return statement_table(statement)
     
     @asynccontextmanager
     async def profile_query(self, query: str, tenant_id: Optional[str] = None):
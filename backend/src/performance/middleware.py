@@ -10,6 +10,7 @@ import logging
 from typing import Callable, Optional
 from fastapi import Request, Response
 from starlette.middleware.base import BaseHTTPMiddleware
+from starlette.routing import Match
 from starlette.types import ASGIApp
 
 from .metrics import global_metrics, RequestTimer
@@ -38,6 +39,20 @@ class PerformanceMiddleware(BaseHTTPMiddleware):
             "/robots.txt"
         ]
     
+    @staticmethod
+    def _route_endpoint(request: Request) -> Optional[str]:
+        """``METHOD /route/{template}`` of the route that will handle the request.
+        
+        Resolved before the request is handled, so the queries it runs are
+        attributed to the template as well.
+        """
+        for route in request.app.router.routes:
+            match, _ = route.matches(request.scope)
+            if match == Match.FULL:
+                path = getattr(route, "path", None)
+                return f"{request.method} {path}" if path else None
+        return None
+    
     async def dispatch(self, request: Request, call_next: Callable) -> Response:
         """Process request and track performance metrics."""
         if not self.enabled:
@@ -65,13 +80,14 @@ class PerformanceMiddleware(BaseHTTPMiddleware):
         except:
             pass
         
-        # Track request performance
+        # Track request performance, attributed to the route template rather than the raw path
         with RequestTimer(
             metrics=global_metrics,
             path=request.url.path,
             method=request.method,
             tenant_id=tenant_id,
-            user_id=user_id
+            user_id=user_id,
+            endpoint=self._route_endpoint(request)
         ) as timer:
             try:
                 response = await call_next(request)
@@ -29,6 +29,7 @@ class BottleneckType(Enum):
     HIGH_DISK = "high_disk"
     CONCURRENT_REQUESTS = "concurrent_requests"
     QUERY_N_PLUS_ONE = "query_n_plus_one"
+    EVENT_LOOP_BLOCKED = "event_loop_blocked"
 
 
 @dataclass
@@ -54,12 +55,14 @@ class PerformanceThresholds:
     # Database thresholds
     max_query_time_ms: float = 500.0
     max_queries_per_request: int = 10
+    max_repeated_queries_per_request: int = 5  # Same statement within one request (N+1)
     
     # System thresholds
     max_cpu_percent: float = 80.0
     max_memory_percent: float = 85.0
     max_disk_percent: float = 90.0
     max_concurrent_requests: int = 100
+    max_event_loop_lag_ms: float = 100.0  # A single callback holding the loop this long
     
     # Time windows for analysis
     analysis_window_minutes: int = 5
@@ -256,8 +259,8 @@ class PerformanceMonitor:
         try:
             health = self.metrics.get_system_health()
             
-            # Check CPU usage
-            if health.get("cpu_percent", 0) > self.thresholds.max_cpu_percent:
+            # Check CPU usage; unsampled readings cover an unknown interval
+            if health.get("sampled", True) and health.get("cpu_percent", 0) > self.thresholds.max_cpu_percent:
                 alerts.append(BottleneckAlert(
                     type=BottleneckType.HIGH_CPU,
                     severity="critical" if health["cpu_percent"] > 90 else "high",
@@ -374,43 +377,83 @@ class PerformanceMonitor:
         return alerts
     
     async def _detect_n_plus_one_queries(self, db_metrics: List[DatabaseMetrics], alerts: List[BottleneckAlert]):
-        """Detect N+1 query patterns."""
-        # Group queries by time windows (1 second windows)
-        time_windows = defaultdict(list)
-        
+        """Detect N+1 query patterns.
+        
+        A pattern is the same statement fingerprint executed more than
+        ``max_repeated_queries_per_request`` times within a single request.
+        Queries run outside a request are not considered.
+        """
+        # Count each fingerprint per request
+        per_request = defaultdict(list)
         for metric in db_metrics:
-            window = int(metric.timestamp.timestamp())
-            time_windows[window].append(metric)
-        
-        for window, queries in time_windows.items():
-            if len(queries) > self.thresholds.max_queries_per_request:
-                # Check for similar queries (potential N+1)
-                query_patterns = defaultdict(list)
-                for query in queries:
-                    # Simple pattern matching - group by table and operation
-                    pattern = f"{query.operation}:{query.table}"
-                    query_patterns[pattern].append(query)
-                
-                for pattern, pattern_queries in query_patterns.items():
-                    if len(pattern_queries) > 5:  # More than 5 similar queries
-                        alerts.append(BottleneckAlert(
-                            type=BottleneckType.QUERY_N_PLUS_ONE,
-                            severity="medium",
-                            message=f"Potential N+1 query pattern detected",
-                            details={
-                                "pattern": pattern,
-                                "query_count": len(pattern_queries),
-                                "time_window": window,
-                                "avg_duration_ms": statistics.mean([q.duration_ms for q in pattern_queries])
-                            },
-                            timestamp=datetime.utcnow(),
-                            suggested_actions=[
-                                "Use eager loading/joins",
-                                "Implement query batching",
-                                "Add query result caching",
-                                "Review ORM relationships"
-                            ]
-                        ))
+            if metric.request_id and metric.fingerprint:
+                per_request[(metric.request_id, metric.fingerprint)].append(metric)
+        
+        # Combine offending requests by endpoint and fingerprint
+        patterns = defaultdict(list)
+        for (request_id, fingerprint), queries in per_request.items():
+            if len(queries) > self.thresholds.max_repeated_queries_per_request:
+                patterns[(queries[0].endpoint, fingerprint)].append(queries)
+        
+        for (endpoint, fingerprint), requests in patterns.items():
+            counts = [len(queries) for queries in requests]
+            durations = [q.duration_ms for queries in requests for q in queries]
+            alerts.append(BottleneckAlert(
+                type=BottleneckType.QUERY_N_PLUS_ONE,
+                severity="high" if max(counts) > self.thresholds.max_queries_per_request * 5 else "medium",
+                message=f"N+1 query pattern detected",
+                details={
+                    "endpoint": endpoint,
+                    "fingerprint": fingerprint[:200],
+                    "table": requests[0][0].table,
+                    "affected_requests": len(requests),
+                    "max_executions_per_request": max(counts),
+                    "avg_duration_ms": statistics.mean(durations)
+                },
+                timestamp=datetime.utcnow(),
+                affected_endpoints=[endpoint] if endpoint else [],
+                suggested_actions=[
+                    "Use eager loading/joins",
+                    "Implement query batching",
+                    "Add query result caching",
+                    "Review ORM relationships"
+                ]
+            ))
+    
+    def record_event_loop_block(self, event) -> BottleneckAlert:
+        """Raise an alert for a callback that blocked the event loop."""
+        if event.duration_ms > 1000:
+            severity = "critical"
+        elif event.duration_ms > 500:
+            severity = "high"
+        else:
+            severity = "medium"
+        
+        alert = BottleneckAlert(
+            type=BottleneckType.EVENT_LOOP_BLOCKED,
+            severity=severity,
+            message=f"Event loop blocked for {event.duration_ms:.0f}ms",
+            details={
+                "blocked_ms": event.duration_ms,
+                "threshold_ms": self.thresholds.max_event_loop_lag_ms,
+                "task": event.task,
+                "coroutine": event.coroutine,
+                "tenant_id": event.tenant_id,
+                "request_id": event.request_id,
+                "stack": event.stack,
+                "stack_samples": event.samples
+            },
+            timestamp=event.timestamp,
+            affected_endpoints=[event.endpoint] if event.endpoint else [],
+            suggested_actions=[
+                "Move blocking SDK calls to a thread with asyncio.to_thread or run_in_threadpool",
+                "Run CPU-heavy work such as password hashing in an executor",
+                "Replace blocking waits with their async equivalents",
+                "Split long loops so they yield to the event loop"
+            ]
+        )
+        self._add_alert(alert)
+        return alert
     
     def _add_alert(self, alert: BottleneckAlert):
         """Add an alert to the alert list."""
@@ -0,0 +1,211 @@
+"""
+Statistical sampling profiler.
+
+This module samples the Python stacks of every thread at a fixed rate and
+aggregates them into collapsed stacks, the input format of flamegraph
+tools. Sampling runs on its own thread and only reads frame objects, so
+the profiled code is never instrumented. Rate, duration and the number
+of distinct stacks are capped, and only one profile runs at a time.
+"""
+
+import os
+import sys
+import time
+import logging
+import threading
+from typing import Dict, List, Optional, Any, Tuple
+from datetime import datetime
+from dataclasses import dataclass, field
+from collections import Counter
+
+from .event_loop import EventLoopWatchdog
+
+logger = logging.getLogger(__name__)
+
+MAX_DURATION_SECONDS = 60
+MAX_RATE_HZ = 250
+MAX_STACK_DEPTH = 64
+MAX_DISTINCT_STACKS = 10000
+TRUNCATED_STACK = ("[truncated]",)
+
+# Leaf frames of threads that are waiting rather than running
+IDLE_FRAMES = frozenset({
+    ("selectors.py", "select"),
+    ("threading.py", "wait"),
+    ("thread.py", "_worker"),
+})
+
+
+class ProfilerBusyError(Exception):
+    """Raised when a profile is requested while another one is running."""
+
+
+@dataclass
+class ProfileResult:
+    """Aggregated samples of one profiling run."""
+    started_at: datetime
+    duration_seconds: float
+    rate_hz: int
+    route: Optional[str] = None
+    tenant_id: Optional[str] = None
+    ticks: int = 0
+    samples: int = 0
+    idle_samples: int = 0
+    filtered_samples: int = 0
+    sampling_time_ms: float = 0.0
+    stacks: Counter = field(default_factory=Counter)
+
+    @property
+    def overhead_percent(self) -> float:
+        """Share of wall time the sampler thread spent sampling."""
+        if not self.duration_seconds:
+            return 0.0
+        return self.sampling_time_ms / (self.duration_seconds * 1000) * 100
+
+    def collapsed(self) -> str:
+        """Stacks as ``root;...;leaf count`` lines, heaviest first."""
+        return "\n".join(f"{';'.join(stack)} {count}" for stack, count in self.stacks.most_common())
+
+    def top_functions(self, limit: int = 20) -> List[Dict[str, Any]]:
+        """Functions by samples spent in them (self) and under them (total)."""
+        self_counts: Counter = Counter()
+        total_counts: Counter = Counter()
+        for stack, count in self.stacks.items():
+            self_counts[stack[-1]] += count
+            for frame in set(stack[1:]):
+                total_counts[frame] += count
+
+        return [
+            {
+                "function": frame,
+                "self_samples": self_counts[frame],
+                "total_samples": total,
+                "total_percent": round(total / self.samples * 100, 2) if self.samples else 0.0
+            }
+            for frame, total in total_counts.most_common(limit)
+        ]
+
+    def to_dict(self, top_n: int = 20) -> Dict[str, Any]:
+        return {
+            "started_at": self.started_at.isoformat(),
+            "duration_seconds": round(self.duration_seconds, 3),
+            "rate_hz": self.rate_hz,
+            "route": self.route,
+            "tenant_id": self.tenant_id,
+            "ticks": self.ticks,
+            "samples": self.samples,
+            "idle_samples": self.idle_samples,
+            "filtered_samples": self.filtered_samples,
+            "distinct_stacks": len(self.stacks),
+            "overhead_percent": round(self.overhead_percent, 3),
+            "top_functions": self.top_functions(top_n),
+            "collapsed": self.collapsed()
+        }
+
+
+class SamplingProfiler:
+    """Samples all threads' stacks for a bounded period.
+
+    Samples from the event loop thread are attributed to the request whose
+    task is running, using the watchdog's task registry. Route and tenant
+    filters therefore only keep event loop samples. The sampler needs the
+    GIL, so a thread that blocks in I/O often is mostly seen in its I/O
+    wait rather than in the Python code between waits.
+    """
+
+    def __init__(self, watchdog: Optional[EventLoopWatchdog] = None):
+        self.watchdog = watchdog
+        self._lock = threading.Lock()
+        self._labels: Dict[Any, str] = {}
+
+    @property
+    def running(self) -> bool:
+        return self._lock.locked()
+
+    def profile(self, seconds: float = 10.0, rate_hz: int = 100, route: Optional[str] = None,
+                tenant_id: Optional[str] = None, include_idle: bool = False) -> ProfileResult:
+        """Sample for ``seconds``; blocks the calling thread, never the event loop."""
+        if not self._lock.acquire(blocking=False):
+            raise ProfilerBusyError("A profile is already running")
+
+        try:
+            seconds = min(max(seconds, 0.1), MAX_DURATION_SECONDS)
+            rate_hz = min(max(int(rate_hz), 1), MAX_RATE_HZ)
+            result = ProfileResult(
+                started_at=datetime.utcnow(),
+                duration_seconds=0.0,
+                rate_hz=rate_hz,
+                route=route,
+                tenant_id=tenant_id
+            )
+            logger.info(f"Profiling for {seconds}s at {rate_hz}Hz")
+
+            interval = 1 / rate_hz
+            start = time.perf_counter()
+            deadline = start + seconds
+            next_tick = start
+            while True:
+                now = time.perf_counter()
+                if now >= deadline:
+                    break
+                if now < next_tick:
+                    time.sleep(next_tick - now)
+                self._sample(result, include_idle)
+                # Skip ticks that were missed instead of bursting to catch up
+                next_tick = max(next_tick + interval, time.perf_counter())
+
+            result.duration_seconds = time.perf_counter() - start
+            return result
+        finally:
+            self._labels.clear()
+            self._lock.release()
+
+    def _sample(self, result: ProfileResult, include_idle: bool) -> None:
+        tick_start = time.perf_counter()
+        own_thread = threading.get_ident()
+        loop_thread = self.watchdog.loop_thread_id if self.watchdog else None
+        thread_names = {thread.ident: thread.name for thread in threading.enumerate()}
+        filtering = result.route is not None or result.tenant_id is not None
+
+        result.ticks += 1
+        for thread_id, frame in sys._current_frames().items():
+            if thread_id == own_thread:
+                continue
+
+            leaf = frame.f_code
+            if not include_idle and (os.path.basename(leaf.co_filename), leaf.co_name) in IDLE_FRAMES:
+                result.idle_samples += 1
+                continue
+
+            if filtering:
+                tracker = self.watchdog.current_request() if self.watchdog and thread_id == loop_thread else None
+                if (
+                    tracker is None
+                    or (result.tenant_id is not None and tracker.tenant_id != result.tenant_id)
+                    or (result.route is not None and result.route not in (tracker.label or ""))
+                ):
+                    result.filtered_samples += 1
+                    continue
+
+            stack = self._collapse(frame, thread_names.get(thread_id, f"thread-{thread_id}"))
+            if stack not in result.stacks and len(result.stacks) >= MAX_DISTINCT_STACKS:
+                stack = TRUNCATED_STACK
+            result.stacks[stack] += 1
+            result.samples += 1
+
+        result.sampling_time_ms += (time.perf_counter() - tick_start) * 1000
+
+    def _collapse(self, frame, thread_name: str) -> Tuple[str, ...]:
+        """Thread name followed by function labels, outermost first."""
+        labels = []
+        while frame is not None and len(labels) < MAX_STACK_DEPTH:
+            code = frame.f_code
+            label = self._labels.get(code)
+            if label is None:
+                label = self._labels[code] = (
+                    f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})"
+                )
+            labels.append(label)
+            frame = frame.f_back
+        labels.append(thread_name)
+        return tuple(reversed(labels))
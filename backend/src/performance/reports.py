@@ -15,6 +15,7 @@ import json
 
 from .metrics import PerformanceMetrics, RequestMetrics, DatabaseMetrics
 from .monitoring import PerformanceMonitor, BottleneckAlert, BottleneckType
+from .history import PerformanceHistoryStore, Rollup
 
 
 @dataclass
@@ -33,11 +34,19 @@ class PerformanceReport:
 
 
 class PerformanceReporter:
-    """Generates comprehensive performance reports."""
+    """Generates comprehensive performance reports.
     
-    def __init__(self, metrics: PerformanceMetrics, monitor: PerformanceMonitor):
+    With a history store, request totals, per-endpoint statistics, hourly
+    patterns and trends cover the whole period from persisted rollups;
+    the in-memory samples only cover the last few thousand requests and
+    are used for the sections that need individual queries.
+    """
+    
+    def __init__(self, metrics: PerformanceMetrics, monitor: PerformanceMonitor,
+                 history: Optional[PerformanceHistoryStore] = None):
         self.metrics = metrics
         self.monitor = monitor
+        self.history = history
     
     async def generate_report(self, 
                             hours: int = 24,
@@ -55,8 +64,13 @@ class PerformanceReporter:
         alerts = self.monitor.get_recent_alerts(hours)
         
         # Generate report sections
-        summary = await self._generate_summary(requests, db_metrics, alerts)
+        if self.history is not None:
+            summary = await self._generate_history_summary(start_time, end_time, alerts)
+        else:
+            summary = await self._generate_summary(requests, db_metrics, alerts)
         request_analysis = await self._analyze_requests(requests)
+        if self.history is not None:
+            request_analysis.update(await self._analyze_history_requests(start_time, end_time))
         database_analysis = await self._analyze_database(db_metrics)
         system_analysis = await self._analyze_system()
         bottlenecks = await self._analyze_bottlenecks(alerts)
@@ -70,7 +84,10 @@ class PerformanceReporter:
             )
         
         if include_trends:
-            trends = await self._analyze_trends(requests, db_metrics, hours)
+            if self.history is not None:
+                trends = await self._analyze_history_trends(start_time, end_time, hours)
+            else:
+                trends = await self._analyze_trends(requests, db_metrics, hours)
         
         return PerformanceReport(
             report_id=report_id,
@@ -131,6 +148,87 @@ class PerformanceReporter:
             "total_alerts": len(alerts)
         }
     
+    async def _generate_history_summary(self,
+                                        start: datetime,
+                                        end: datetime,
+                                        alerts: List[BottleneckAlert]) -> Dict[str, Any]:
+        """Generate report summary from persisted rollups."""
+        total = (await asyncio.to_thread(self.history.summary, start, end)).to_dict()
+        if not total["request_count"]:
+            return {"status": "no_data", "message": "No requests in time period"}
+        
+        critical_alerts = [a for a in alerts if a.severity == "critical"]
+        high_alerts = [a for a in alerts if a.severity == "high"]
+        
+        health_score = self._calculate_health_score(
+            total["error_rate_percent"], total["avg_duration_ms"],
+            total["slow_queries_count"], len(critical_alerts)
+        )
+        
+        return {
+            "health_score": health_score,
+            "status": self._get_status_from_score(health_score),
+            "total_requests": total["request_count"],
+            "error_rate_percent": total["error_rate_percent"],
+            "avg_response_time_ms": total["avg_duration_ms"],
+            "p95_response_time_ms": total["p95_duration_ms"],
+            "p99_response_time_ms": total["p99_duration_ms"],
+            "total_database_queries": total["database_queries"],
+            "slow_queries_count": total["slow_queries_count"],
+            "critical_alerts": len(critical_alerts),
+            "high_alerts": len(high_alerts),
+            "total_alerts": len(alerts),
+            "data_source": "history"
+        }
+    
+    async def _analyze_history_requests(self, start: datetime, end: datetime) -> Dict[str, Any]:
+        """Per-endpoint statistics and hourly patterns from persisted rollups."""
+        endpoint_rollups = await asyncio.to_thread(self.history.endpoint_summaries, start, end)
+        if not endpoint_rollups:
+            return {}
+        
+        endpoints = {}
+        for rollup in endpoint_rollups:
+            stats = rollup.to_dict()
+            endpoints[rollup.endpoint] = {
+                key: stats[key] for key in (
+                    "request_count", "avg_duration_ms", "p95_duration_ms", "error_count",
+                    "error_rate_percent", "total_query_count", "avg_queries_per_request"
+                )
+            }
+        
+        def top(metric: str) -> Dict[str, Any]:
+            return dict(sorted(endpoints.items(), key=lambda x: x[1][metric], reverse=True)[:5])
+        
+        # Hour-of-day patterns from hourly rollups
+        hourly = await asyncio.to_thread(self.history.series, start, end, "hour")
+        by_hour: Dict[int, Rollup] = {}
+        for rollup in hourly:
+            hour = datetime.utcfromtimestamp(rollup.bucket).hour
+            if hour in by_hour:
+                by_hour[hour].merge(rollup)
+            else:
+                by_hour[hour] = rollup
+        
+        hourly_stats = {}
+        for hour in range(24):
+            stats = by_hour[hour].to_dict() if hour in by_hour else {}
+            hourly_stats[hour] = {
+                "request_count": stats.get("request_count", 0),
+                "avg_duration_ms": stats.get("avg_duration_ms", 0),
+                "p95_duration_ms": stats.get("p95_duration_ms", 0)
+            }
+        
+        return {
+            "endpoint_count": len(endpoints),
+            "endpoints": endpoints,
+            "slowest_endpoints": top("p95_duration_ms"),
+            "highest_error_endpoints": top("error_rate_percent"),
+            "most_queried_endpoints": top("avg_queries_per_request"),
+            "hourly_patterns": hourly_stats,
+            "data_source": "history"
+        }
+    
     async def _analyze_requests(self, requests: List[RequestMetrics]) -> Dict[str, Any]:
         """Analyze request performance."""
         if not requests:
@@ -394,6 +492,39 @@ class PerformanceReporter:
             "trend_status": self._get_trend_status(latency_trend, error_trend)
         }
     
+    async def _analyze_history_trends(self, start: datetime, end: datetime, hours: int) -> Dict[str, Any]:
+        """Compare the two halves of the period using persisted rollups."""
+        if hours < 2:
+            return {}
+        
+        mid_time = end - (end - start) / 2
+        early = (await asyncio.to_thread(self.history.summary, start, mid_time)).to_dict()
+        recent = (await asyncio.to_thread(self.history.summary, mid_time, end)).to_dict()
+        if not early["request_count"] or not recent["request_count"]:
+            return {}
+        
+        early_avg, recent_avg = early["avg_duration_ms"], recent["avg_duration_ms"]
+        latency_trend = ((recent_avg - early_avg) / early_avg) * 100 if early_avg > 0 else 0
+        error_trend = recent["error_rate_percent"] - early["error_rate_percent"]
+        
+        return {
+            "latency_trend_percent": latency_trend,
+            "error_rate_trend_percent": error_trend,
+            "early_period": {
+                "avg_latency_ms": early_avg,
+                "p95_latency_ms": early["p95_duration_ms"],
+                "error_rate_percent": early["error_rate_percent"],
+                "request_count": early["request_count"]
+            },
+            "recent_period": {
+                "avg_latency_ms": recent_avg,
+                "p95_latency_ms": recent["p95_duration_ms"],
+                "error_rate_percent": recent["error_rate_percent"],
+                "request_count": recent["request_count"]
+            },
+            "trend_status": self._get_trend_status(latency_trend, error_trend)
+        }
+    
     def _get_requests_in_period(self, start: datetime, end: datetime) -> List[RequestMetrics]:
         """Get requests in the specified time period."""
         return [
@@ -492,8 +623,9 @@ class PerformanceReporter:
 class PerformanceAnalyzer:
     """Advanced performance analysis tools."""
     
-    def __init__(self, metrics: PerformanceMetrics):
+    def __init__(self, metrics: PerformanceMetrics, history: Optional[PerformanceHistoryStore] = None):
         self.metrics = metrics
+        self.history = history
     
     async def analyze_endpoint_performance(self, endpoint: str, hours: int = 24) -> Dict[str, Any]:
         """Analyze performance for a specific endpoint."""
@@ -549,37 +681,54 @@ class PerformanceAnalyzer:
         """Compare performance between two time periods."""
         now = datetime.utcnow()
         
-        # Recent period
         recent_start = now - timedelta(hours=hours1)
-        recent_requests = [
-            req for req in self.metrics.request_metrics
-            if recent_start <= req.timestamp <= now
-        ]
-        
-        # Historical period
         historical_end = recent_start
         historical_start = historical_end - timedelta(hours=hours2)
-        historical_requests = [
-            req for req in self.metrics.request_metrics
-            if historical_start <= req.timestamp <= historical_end
-        ]
-        
-        if not recent_requests or not historical_requests:
-            return {"error": "Insufficient data for comparison"}
-        
-        def analyze_period(requests):
-            durations = [r.duration_ms for r in requests]
-            errors = [r for r in requests if r.status_code >= 400]
-            return {
-                "request_count": len(requests),
-                "avg_duration_ms": statistics.mean(durations),
-                "p95_duration_ms": self._percentile(durations, 95),
-                "error_count": len(errors),
-                "error_rate_percent": (len(errors) / len(requests)) * 100
-            }
         
-        recent_stats = analyze_period(recent_requests)
-        historical_stats = analyze_period(historical_requests)
+        if self.history is not None:
+            # Persisted rollups cover periods far beyond the in-memory samples
+            recent = await asyncio.to_thread(self.history.summary, recent_start, now)
+            historical = await asyncio.to_thread(self.history.summary, historical_start, historical_end)
+            if not recent.request_count or not historical.request_count:
+                return {"error": "Insufficient data for comparison"}
+            
+            def analyze_rollup(rollup: Rollup):
+                stats = rollup.to_dict()
+                return {key: stats[key] for key in (
+                    "request_count", "avg_duration_ms", "p95_duration_ms", "error_count", "error_rate_percent"
+                )}
+            
+            recent_stats = analyze_rollup(recent)
+            historical_stats = analyze_rollup(historical)
+        else:
+            # Recent period
+            recent_requests = [
+                req for req in self.metrics.request_metrics
+                if recent_start <= req.timestamp <= now
+            ]
+            
+            # Historical period
+            historical_requests = [
+                req for req in self.metrics.request_metrics
+                if historical_start <= req.timestamp <= historical_end
+            ]
+            
+            if not recent_requests or not historical_requests:
+                return {"error": "Insufficient data for comparison"}
+            
+            def analyze_period(requests):
+                durations = [r.duration_ms for r in requests]
+                errors = [r for r in requests if r.status_code >= 400]
+                return {
+                    "request_count": len(requests),
+                    "avg_duration_ms": statistics.mean(durations),
+                    "p95_duration_ms": self._percentile(durations, 95),
+                    "error_count": len(errors),
+                    "error_rate_percent": (len(errors) / len(requests)) * 100
+                }
+            
+            recent_stats = analyze_period(recent_requests)
+            historical_stats = analyze_period(historical_requests)
         
         # Calculate changes
         changes = {}
@@ -0,0 +1,185 @@
+"""
+Background system sampling.
+
+This module provides a sampler thread that periodically snapshots process
+and host resource usage, event loop lag, garbage collection pauses and
+connection pool usage into the metrics' system history. Nothing here
+blocks the event loop: readers only look at the latest snapshot.
+"""
+
+import gc
+import time
+import psutil
+import asyncio
+import logging
+import threading
+from typing import Dict, Optional, Any, Callable
+from datetime import datetime
+
+from .metrics import PerformanceMetrics, SystemMetrics
+
+logger = logging.getLogger(__name__)
+
+# Pool probes return a JSON-friendly description of a pool's usage, or None
+PoolProbe = Callable[[], Optional[Dict[str, Any]]]
+
+
+def sqlalchemy_pool_stats(engine) -> Dict[str, Any]:
+    """Usage of a SQLAlchemy engine's connection pool."""
+    pool = getattr(engine, "sync_engine", engine).pool
+    stats: Dict[str, Any] = {"type": type(pool).__name__}
+    for name in ("size", "checkedin", "checkedout", "overflow"):
+        counter = getattr(pool, name, None)
+        if callable(counter):
+            stats[name] = counter()
+    return stats
+
+
+class SystemSampler:
+    """Samples system resources on a daemon thread at a fixed interval."""
+
+    def __init__(self, metrics: PerformanceMetrics, interval_seconds: float = 5.0,
+                 disk_path: str = "/"):
+        self.metrics = metrics
+        self.interval_seconds = interval_seconds
+        self.disk_path = disk_path
+        self.pool_probes: Dict[str, PoolProbe] = {}
+
+        self._process = psutil.Process()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+
+        # Event loop lag: the sampler schedules a probe on the loop and the
+        # loop reports how late it ran; only the last measurement is kept
+        self._loop_probe_sent: Optional[float] = None
+        self._loop_lag_ms = 0.0
+
+        # GC pauses since the previous sample, written from gc callbacks
+        self._gc_started: Optional[float] = None
+        self._gc_collections = 0
+        self._gc_pause_ms = 0.0
+        self._gc_max_pause_ms = 0.0
+        self._gc_lock = threading.RLock()  # Collections can start while a sample holds it
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def register_pool(self, name: str, probe: PoolProbe) -> None:
+        """Include a connection pool in every snapshot."""
+        self.pool_probes[name] = probe
+
+    def start(self, loop: Optional[asyncio.AbstractEventLoop] = None) -> None:
+        """Start sampling; event loop lag is measured on ``loop`` if given."""
+        if self.running:
+            return
+
+        self._loop = loop
+        self._stop.clear()
+        gc.callbacks.append(self._on_gc)
+
+        # The first non-blocking CPU reading only sets the baseline
+        psutil.cpu_percent(interval=None)
+        self._process.cpu_percent(interval=None)
+
+        self._thread = threading.Thread(target=self._run, name="system-sampler", daemon=True)
+        self._thread.start()
+        logger.info(f"System sampler started with {self.interval_seconds}s interval")
+
+    def stop(self) -> None:
+        """Stop sampling and wait for the thread to exit."""
+        self._stop.set()
+        if self._thread:
+            self._thread.join(timeout=self.interval_seconds + 1)
+            self._thread = None
+        if self._on_gc in gc.callbacks:
+            gc.callbacks.remove(self._on_gc)
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            try:
+                self.metrics.add_system_metric(self.sample())
+            except Exception as e:
+                logger.error(f"Error sampling system metrics: {e}")
+            self._stop.wait(self.interval_seconds)
+
+    def sample(self) -> SystemMetrics:
+        """Take one snapshot; safe to call from any thread."""
+        memory = psutil.virtual_memory()
+        disk = psutil.disk_usage(self.disk_path)
+
+        with self._process.oneshot():
+            rss_mb = self._process.memory_info().rss / 1024 / 1024
+            process_cpu_percent = self._process.cpu_percent(interval=None)
+            open_fds = self._process.num_fds() if hasattr(self._process, "num_fds") else 0
+            thread_count = self._process.num_threads()
+
+        with self._gc_lock:
+            gc_collections, gc_pause_ms, gc_max_pause_ms = (
+                self._gc_collections, self._gc_pause_ms, self._gc_max_pause_ms
+            )
+            self._gc_collections, self._gc_pause_ms, self._gc_max_pause_ms = 0, 0.0, 0.0
+
+        return SystemMetrics(
+            timestamp=datetime.utcnow(),
+            cpu_percent=psutil.cpu_percent(interval=None),
+            memory_percent=memory.percent,
+            memory_used_mb=memory.used / 1024 / 1024,
+            disk_usage_percent=disk.percent,
+            active_connections=self.metrics.active_requests,
+            request_rate=self.metrics.request_rate(),
+            process_cpu_percent=process_cpu_percent,
+            rss_mb=rss_mb,
+            open_fds=open_fds,
+            thread_count=thread_count,
+            event_loop_lag_ms=self._measure_loop_lag(),
+            gc_collections=gc_collections,
+            gc_pause_ms=gc_pause_ms,
+            gc_max_pause_ms=gc_max_pause_ms,
+            pools=self._sample_pools()
+        )
+
+    def _measure_loop_lag(self) -> float:
+        """Lag of the last completed probe, and schedule the next one."""
+        if self._loop is None or self._loop.is_closed():
+            return 0.0
+
+        now = time.perf_counter()
+        sent = self._loop_probe_sent
+        if sent is not None:
+            # The previous probe has not run yet, so the loop is at least this late
+            return max(self._loop_lag_ms, (now - sent) * 1000)
+
+        self._loop_probe_sent = now
+        try:
+            self._loop.call_soon_threadsafe(self._on_loop_probe, now)
+        except RuntimeError:
+            self._loop_probe_sent = None
+        return self._loop_lag_ms
+
+    def _on_loop_probe(self, sent: float) -> None:
+        self._loop_lag_ms = (time.perf_counter() - sent) * 1000
+        self._loop_probe_sent = None
+
+    def _on_gc(self, phase: str, info: Dict[str, Any]) -> None:
+        if phase == "start":
+            self._gc_started = time.perf_counter()
+        elif self._gc_started is not None:
+            pause_ms = (time.perf_counter() - self._gc_started) * 1000
+            self._gc_started = None
+            with self._gc_lock:
+                self._gc_collections += 1
+                self._gc_pause_ms += pause_ms
+                self._gc_max_pause_ms = max(self._gc_max_pause_ms, pause_ms)
+
+    def _sample_pools(self) -> Dict[str, Any]:
+        pools = {}
+        for name, probe in list(self.pool_probes.items()):
+            try:
+                stats = probe()
+            except Exception as e:
+                stats = {"error": str(e)}
+            if stats is not None:
+                pools[name] = stats
+        return pools
@@ -0,0 +1,293 @@
+"""
+SQL statement statistics.
+
+This module normalizes SQL statements into fingerprints and keeps
+per-fingerprint execution statistics, similar to PostgreSQL's
+pg_stat_statements, separately for each tenant. Cardinality is bounded:
+each tenant tracks a fixed number of fingerprints and a fixed-size
+heap of its slowest executions.
+"""
+
+import re
+import heapq
+import itertools
+import threading
+from typing import Dict, List, Optional, Any, Tuple
+from datetime import datetime
+from dataclasses import dataclass, field
+from bisect import bisect_left
+
+# Statement normalization patterns, applied in order
+_COMMENTS = re.compile(r"--[^\n]*|/\*.*?\*/", re.DOTALL)
+_STRING_LITERALS = re.compile(r"'(?:[^']|'')*'")
+_NUMERIC_LITERALS = re.compile(r"(?<![\w.\"])-?\d+(?:\.\d+)?(?:[eE][-+]?\d+)?(?![\w\"])")
+_PLACEHOLDERS = re.compile(r"\$\d+|%\(\w+\)s|%s|(?<!:):\w+|\?")
+_IN_LISTS = re.compile(r"\bIN\s*\(\s*\?(?:\s*,\s*\?)*\s*\)", re.IGNORECASE)
+_VALUES_ROWS = re.compile(r"(\bVALUES\s*\([^()]*\))(?:\s*,\s*\([^()]*\))+", re.IGNORECASE)
+_WHITESPACE = re.compile(r"\s+")
+
+# Target table of a statement: the first table named after FROM, INTO or UPDATE,
+# optionally schema-qualified and quoted
+_TABLE = re.compile(
+    r"\b(?:FROM|INTO|UPDATE)\s+(?:[\"`\[]?\w+[\"`\]]?\.)?[\"`\[]?(\w+)[\"`\]]?",
+    re.IGNORECASE
+)
+_OPERATION = re.compile(r"\w+")
+
+# Fingerprints keep at most this many characters
+MAX_FINGERPRINT_LENGTH = 1000
+
+# Histogram bucket upper bounds in milliseconds; the last bucket is unbounded
+LATENCY_BUCKETS_MS = (0.5, 1, 2, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000)
+
+# Executions of fingerprints beyond a tenant's limit are pooled under this extra key
+OTHER_FINGERPRINT = "<other>"
+
+# Statistics of queries that ran without a tenant context
+NO_TENANT = "_system"
+
+
+def normalize_statement(statement: str) -> str:
+    """Reduce a SQL statement to a stable fingerprint.
+
+    Comments are removed, string and numeric literals and every bind
+    placeholder style become ``?``, IN-lists and multi-row VALUES
+    collapse to a single element, and whitespace is collapsed. Statements
+    that differ only in their parameters, or in the number of items
+    bound into an IN-list, share a fingerprint.
+    """
+    if not statement:
+        return ""
+
+    normalized = _COMMENTS.sub(" ", statement)
+    normalized = _STRING_LITERALS.sub("?", normalized)
+    normalized = _PLACEHOLDERS.sub("?", normalized)
+    normalized = _NUMERIC_LITERALS.sub("?", normalized)
+    normalized = _IN_LISTS.sub("IN (...)", normalized)
+    normalized = _VALUES_ROWS.sub(r"\1, ...", normalized)
+    normalized = _WHITESPACE.sub(" ", normalized).strip()
+    return normalized[:MAX_FINGERPRINT_LENGTH]
+
+
+def statement_operation(statement: str) -> str:
+    """Leading keyword of a statement, such as SELECT or INSERT."""
+    match = _OPERATION.search(_COMMENTS.sub(" ", statement)) if statement else None
+    return match.group(0).upper() if match else "UNKNOWN"
+
+
+def statement_table(statement: str) -> Optional[str]:
+    """Name of the table a statement reads from or writes to."""
+    match = _TABLE.search(statement) if statement else None
+    return match.group(1).lower() if match else None
+
+
+class LatencyHistogram:
+    """Fixed-bucket latency histogram with constant memory."""
+
+    def __init__(self):
+        self.counts = [0] * (len(LATENCY_BUCKETS_MS) + 1)
+        self.max_ms = 0.0
+
+    def observe(self, duration_ms: float) -> None:
+        """Count one observation."""
+        self.counts[bisect_left(LATENCY_BUCKETS_MS, duration_ms)] += 1
+        self.max_ms = max(self.max_ms, duration_ms)
+
+    def percentile(self, percentile: float) -> float:
+        """Upper bound of the bucket containing the given percentile, capped at the maximum."""
+        total = sum(self.counts)
+        if not total:
+            return 0.0
+
+        rank = total * percentile / 100
+        seen = 0
+        for index, count in enumerate(self.counts):
+            seen += count
+            if seen >= rank and count:
+                bound = LATENCY_BUCKETS_MS[index] if index < len(LATENCY_BUCKETS_MS) else self.max_ms
+                return float(min(bound, self.max_ms))
+        return float(self.max_ms)
+
+    def to_dict(self) -> Dict[str, int]:
+        """Bucket counts keyed by upper bound."""
+        labels = [f"le_{bound}" for bound in LATENCY_BUCKETS_MS] + ["le_inf"]
+        return dict(zip(labels, self.counts))
+
+
+@dataclass
+class StatementStats:
+    """Aggregated executions of one statement fingerprint."""
+    fingerprint: str
+    operation: str = "UNKNOWN"
+    table: Optional[str] = None
+    calls: int = 0
+    total_ms: float = 0.0
+    min_ms: float = float("inf")
+    max_ms: float = 0.0
+    rows: int = 0
+    first_seen: Optional[datetime] = None
+    last_seen: Optional[datetime] = None
+    histogram: LatencyHistogram = field(default_factory=LatencyHistogram)
+
+    @property
+    def mean_ms(self) -> float:
+        return self.total_ms / self.calls if self.calls else 0.0
+
+    def record(self, duration_ms: float, rows: int, timestamp: datetime) -> None:
+        """Add one execution."""
+        self.calls += 1
+        self.total_ms += duration_ms
+        self.min_ms = min(self.min_ms, duration_ms)
+        self.max_ms = max(self.max_ms, duration_ms)
+        self.rows += max(rows, 0)
+        self.first_seen = self.first_seen or timestamp
+        self.last_seen = timestamp
+        self.histogram.observe(duration_ms)
+
+    def to_dict(self, total_time_ms: float = 0.0) -> Dict[str, Any]:
+        """pg_stat_statements-style row."""
+        return {
+            "query": self.fingerprint,
+            "operation": self.operation,
+            "table": self.table,
+            "calls": self.calls,
+            "total_exec_time_ms": round(self.total_ms, 3),
+            "mean_exec_time_ms": round(self.mean_ms, 3),
+            "min_exec_time_ms": round(self.min_ms, 3) if self.calls else 0.0,
+            "max_exec_time_ms": round(self.max_ms, 3),
+            "p50_exec_time_ms": self.histogram.percentile(50),
+            "p95_exec_time_ms": self.histogram.percentile(95),
+            "p99_exec_time_ms": self.histogram.percentile(99),
+            "rows": self.rows,
+            "percent_of_total_time": round(self.total_ms / total_time_ms * 100, 2) if total_time_ms else 0.0,
+            "first_seen": self.first_seen.isoformat() if self.first_seen else None,
+            "last_seen": self.last_seen.isoformat() if self.last_seen else None,
+            "histogram": self.histogram.to_dict()
+        }
+
+
+@dataclass
+class SlowQuery:
+    """One slow execution kept in the slow-query log."""
+    fingerprint: str
+    query: str
+    duration_ms: float
+    timestamp: datetime
+    tenant_id: Optional[str] = None
+    table: Optional[str] = None
+    operation: str = "UNKNOWN"
+    request_id: Optional[str] = None
+    endpoint: Optional[str] = None
+
+
+class StatementStatsStore:
+    """Per-tenant statement statistics and slow-query logs with bounded size."""
+
+    SORT_KEYS = {
+        "total_time": lambda s: s.total_ms,
+        "mean_time": lambda s: s.mean_ms,
+        "max_time": lambda s: s.max_ms,
+        "calls": lambda s: s.calls,
+        "rows": lambda s: s.rows,
+    }
+
+    def __init__(self, max_fingerprints_per_tenant: int = 500, slow_log_size: int = 100,
+                 slow_threshold_ms: float = 100.0):
+        self.max_fingerprints_per_tenant = max_fingerprints_per_tenant
+        self.slow_log_size = slow_log_size
+        self.slow_threshold_ms = slow_threshold_ms
+        self._stats: Dict[str, Dict[str, StatementStats]] = {}
+        # Min-heaps of (duration, sequence, SlowQuery): the root is the fastest kept
+        self._slow_logs: Dict[str, List[Tuple[float, int, SlowQuery]]] = {}
+        self._sequence = itertools.count()
+        self._lock = threading.Lock()
+        self.reset_at = datetime.utcnow()
+
+    def record(self, fingerprint: str, duration_ms: float, *, tenant_id: Optional[str] = None,
+               operation: str = "UNKNOWN", table: Optional[str] = None, rows: int = 0,
+               query: Optional[str] = None, timestamp: Optional[datetime] = None,
+               request_id: Optional[str] = None, endpoint: Optional[str] = None) -> None:
+        """Record one execution of a normalized statement."""
+        tenant = tenant_id or NO_TENANT
+        timestamp = timestamp or datetime.utcnow()
+
+        with self._lock:
+            tenant_stats = self._stats.setdefault(tenant, {})
+            stats = tenant_stats.get(fingerprint)
+            if stats is None:
+                if len(tenant_stats) >= self.max_fingerprints_per_tenant:
+                    fingerprint = OTHER_FINGERPRINT
+                    stats = tenant_stats.get(fingerprint)
+                if stats is None:
+                    stats = tenant_stats[fingerprint] = StatementStats(
+                        fingerprint=fingerprint, operation=operation, table=table
+                    )
+            stats.record(duration_ms, rows, timestamp)
+
+            if duration_ms > self.slow_threshold_ms:
+                self._log_slow_query(tenant, SlowQuery(
+                    fingerprint=fingerprint,
+                    query=(query or fingerprint)[:500],
+                    duration_ms=duration_ms,
+                    timestamp=timestamp,
+                    tenant_id=tenant_id,
+                    table=table,
+                    operation=operation,
+                    request_id=request_id,
+                    endpoint=endpoint
+                ))
+
+    def _log_slow_query(self, tenant: str, slow_query: SlowQuery) -> None:
+        heap = self._slow_logs.setdefault(tenant, [])
+        entry = (slow_query.duration_ms, next(self._sequence), slow_query)
+        if len(heap) < self.slow_log_size:
+            heapq.heappush(heap, entry)
+        elif slow_query.duration_ms > heap[0][0]:
+            heapq.heapreplace(heap, entry)
+
+    def tenants(self) -> List[str]:
+        """Tenants with recorded statements."""
+        with self._lock:
+            return sorted(self._stats)
+
+    def get_statements(self, tenant_id: Optional[str] = None, sort_by: str = "total_time",
+                       limit: int = 20) -> Dict[str, Any]:
+        """Top statements of a tenant, or of all tenants combined when none is given."""
+        key = self.SORT_KEYS.get(sort_by, self.SORT_KEYS["total_time"])
+
+        with self._lock:
+            if tenant_id:
+                rows = list(self._stats.get(tenant_id, {}).values())
+            else:
+                rows = [stats for tenant_stats in self._stats.values() for stats in tenant_stats.values()]
+
+            total_time_ms = sum(stats.total_ms for stats in rows)
+            top = heapq.nlargest(limit, rows, key=key)
+            return {
+                "tenant_id": tenant_id,
+                "since": self.reset_at.isoformat(),
+                "statement_count": len(rows),
+                "total_calls": sum(stats.calls for stats in rows),
+                "total_exec_time_ms": round(total_time_ms, 3),
+                "statements": [stats.to_dict(total_time_ms) for stats in top]
+            }
+
+    def get_slow_queries(self, tenant_id: Optional[str] = None, limit: int = 20) -> List[SlowQuery]:
+        """Slowest logged executions, slowest first."""
+        with self._lock:
+            if tenant_id:
+                entries = list(self._slow_logs.get(tenant_id, []))
+            else:
+                entries = [entry for heap in self._slow_logs.values() for entry in heap]
+        return [entry[2] for entry in heapq.nlargest(limit, entries)]
+
+    def reset(self, tenant_id: Optional[str] = None) -> None:
+        """Discard statistics for one tenant, or for all of them."""
+        with self._lock:
+            if tenant_id:
+                self._stats.pop(tenant_id, None)
+                self._slow_logs.pop(tenant_id, None)
+            else:
+                self._stats.clear()
+                self._slow_logs.clear()
+                self.reset_at = datetime.utcnow()
@@ -7,6 +7,8 @@ from fastapi.responses import JSONResponse
 from src.services.plaid.client import PlaidClient
 from src.auth.dependencies import get_current_user
 from src.exceptions import NotFoundError, ValidationError, BusinessLogicError
+from src.tenant.context import require_tenant_context
+from src.tenant.routing import get_plaid_item_index
 from src.accounts.service import AccountService
 from src.transactions.service import TransactionService
 
@@ -95,6 +97,15 @@ async def exchange_public_token(
                 print(f"Failed to create account {plaid_account.get('account_id')}: {account_error}")
                 continue
         
+        # Index the item only once its accounts exist, so webhooks never route to a half-created item
+        if created_accounts:
+            tenant_context = require_tenant_context()
+            await get_plaid_item_index().register(
+                item_id=item_id,
+                tenant_id=tenant_context.tenant_id,
+                user_id=current_user["sub"]
+            )
+        
         return {
             "message": f"Successfully linked {len(created_accounts)} accounts",
             "item_id": item_id,
@@ -456,6 +467,9 @@ async def remove_plaid_item(
             )
             disabled_accounts.append(updated_account.id)
         
+        # Stop routing webhooks for this item
+        await get_plaid_item_index().remove(item_id)
+        
         # In a real implementation, you would also call Plaid's /item/remove endpoint
         # await plaid_client.remove_item(access_token)
         
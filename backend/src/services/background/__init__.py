@@ -5,8 +5,17 @@ from .tasks import (
     sync_account_data,
     process_transactions,
     send_notification_email,
+    send_batch_notification_emails,
     generate_monthly_report,
-    cleanup_expired_sessions
+    cleanup_expired_sessions,
+    process_webhook_inbox,
+    recover_webhook_inbox,
+    rebuild_plaid_item_index,
+    sync_budget_spending,
+    rollover_recurring_budgets,
+    refresh_goal_insights,
+    process_tithing_schedules,
+    downsample_balance_history
 )
 from .scheduler import TaskScheduler
 
@@ -16,7 +25,16 @@ __all__ = [
     "sync_account_data",
     "process_transactions", 
     "send_notification_email",
+    "send_batch_notification_emails",
     "generate_monthly_report",
     "cleanup_expired_sessions",
+    "process_webhook_inbox",
+    "recover_webhook_inbox",
+    "rebuild_plaid_item_index",
+    "sync_budget_spending",
+    "rollover_recurring_budgets",
+    "refresh_goal_insights",
+    "process_tithing_schedules",
+    "downsample_balance_history",
     "TaskScheduler"
 ]
\ No newline at end of file
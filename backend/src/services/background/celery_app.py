@@ -2,6 +2,7 @@
 
 import os
 from celery import Celery
+from celery.schedules import crontab
 from celery.signals import worker_ready, worker_shutdown
 import structlog
 
@@ -36,8 +37,17 @@ def create_celery_app() -> Celery:
             "src.services.background.tasks.sync_account_data": {"queue": "high_priority"},
             "src.services.background.tasks.process_transactions": {"queue": "medium_priority"},
             "src.services.background.tasks.send_notification_email": {"queue": "notifications"},
+            "src.services.background.tasks.send_batch_notification_emails": {"queue": "notifications"},
             "src.services.background.tasks.generate_monthly_report": {"queue": "reports"},
             "src.services.background.tasks.cleanup_expired_sessions": {"queue": "maintenance"},
+            "src.services.background.tasks.process_webhook_inbox": {"queue": "high_priority"},
+            "src.services.background.tasks.recover_webhook_inbox": {"queue": "maintenance"},
+            "src.services.background.tasks.rebuild_plaid_item_index": {"queue": "maintenance"},
+            "src.services.background.tasks.sync_budget_spending": {"queue": "medium_priority"},
+            "src.services.background.tasks.rollover_recurring_budgets": {"queue": "maintenance"},
+            "src.services.background.tasks.refresh_goal_insights": {"queue": "maintenance"},
+            "src.services.background.tasks.process_tithing_schedules": {"queue": "maintenance"},
+            "src.services.background.tasks.downsample_balance_history": {"queue": "maintenance"},
         },
         
         # Task execution settings
@@ -96,6 +106,31 @@ def create_celery_app() -> Celery:
                 "schedule": 3600.0,  # Every hour
                 "options": {"queue": "maintenance"}
             },
+            "recover-webhook-inbox": {
+                "task": "src.services.background.tasks.recover_webhook_inbox",
+                "schedule": 300.0,  # Every 5 minutes
+                "options": {"queue": "maintenance"}
+            },
+            "rollover-recurring-budgets": {
+                "task": "src.services.background.tasks.rollover_recurring_budgets",
+                "schedule": crontab(hour=0, minute=5),  # Just after each day's period boundary
+                "options": {"queue": "maintenance"}
+            },
+            "refresh-goal-insights": {
+                "task": "src.services.background.tasks.refresh_goal_insights",
+                "schedule": crontab(hour=3, minute=0),  # Nightly
+                "options": {"queue": "maintenance"}
+            },
+            "process-tithing-schedules": {
+                "task": "src.services.background.tasks.process_tithing_schedules",
+                "schedule": crontab(hour=1, minute=0),  # Daily, once the execution date begins
+                "options": {"queue": "maintenance"}
+            },
+            "downsample-balance-history": {
+                "task": "src.services.background.tasks.downsample_balance_history",
+                "schedule": crontab(hour=2, minute=30),  # Nightly, once the previous day is complete
+                "options": {"queue": "maintenance"}
+            },
             "generate-daily-reports": {
                 "task": "src.services.background.tasks.generate_daily_reports",
                 "schedule": 86400.0,  # Every day
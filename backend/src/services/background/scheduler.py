@@ -107,6 +107,34 @@ class TaskScheduler:
         
         return task.id
     
+    async def schedule_batch_notification_emails(
+        self,
+        tenant_id: str,
+        template: str,
+        recipients: List[Dict[str, Any]],
+        subject: str = None,
+        delay_seconds: int = 0
+    ) -> str:
+        """Schedule a digest notification email to many recipients."""
+        if delay_seconds > 0:
+            task = tasks.send_batch_notification_emails.apply_async(
+                args=[tenant_id, template, recipients, subject],
+                countdown=delay_seconds
+            )
+        else:
+            task = tasks.send_batch_notification_emails.delay(
+                tenant_id, template, recipients, subject
+            )
+        
+        logger.info("Batch notification email task scheduled",
+                   tenant_id=tenant_id,
+                   template=template,
+                   recipient_count=len(recipients),
+                   task_id=task.id,
+                   delay_seconds=delay_seconds)
+        
+        return task.id
+    
     async def schedule_monthly_report(
         self,
         tenant_id: str,
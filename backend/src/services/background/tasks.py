@@ -2,7 +2,7 @@
 
 import asyncio
 from typing import Dict, Any, List, Optional
-from datetime import datetime, timedelta
+from datetime import date, datetime, timedelta
 from decimal import Decimal
 
 import structlog
@@ -34,7 +34,6 @@ def sync_account_data(self, tenant_id: str, access_token: str, account_id: str =
         from src.services.plaid import get_plaid_client
         from src.services.redis.cache import get_cache_service
         from src.accounts.service import AccountService
-        from src.accounts.schemas import AccountCreate, AccountBalanceUpdate
         
         # Get services
         plaid_client = get_plaid_client()
@@ -52,54 +51,32 @@ def sync_account_data(self, tenant_id: str, access_token: str, account_id: str =
                 if account_id:
                     accounts = [acc for acc in accounts if acc["account_id"] == account_id]
                 
+                # Apply every balance of the response in one transaction
+                changes = await account_service.sync_plaid_balances(accounts)
+                changed = {change.key: change.changed for change in changes}
+                
                 synced_accounts = []
                 for account in accounts:
-                    try:
-                        # Find existing account by Plaid ID
-                        existing_account = await account_service.account_repo.get_by_plaid_account_id(
-                            account['account_id']
-                        )
-                        
-                        if existing_account:
-                            # Update existing account balance
-                            balance_update = AccountBalanceUpdate(
-                                current_balance=Decimal(str(account["balances"]["current"] or 0)),
-                                available_balance=Decimal(str(account["balances"]["available"] or 0)) if account["balances"]["available"] else None,
-                                balance_date=datetime.utcnow()
-                            )
-                            
-                            # Get user_id from existing account to update
-                            updated_account = await account_service.update_account_balance(
-                                account_id=existing_account.id,
-                                user_id=existing_account.user_id,
-                                balance_data=balance_update
-                            )
-                            
-                            if updated_account:
-                                synced_accounts.append({
-                                    "account_id": account["account_id"],
-                                    "name": account["name"],
-                                    "type": account["type"],
-                                    "subtype": account["subtype"],
-                                    "balance": {
-                                        "available": account["balances"]["available"],
-                                        "current": account["balances"]["current"],
-                                        "limit": account["balances"]["limit"]
-                                    },
-                                    "status": "updated"
-                                })
-                        else:
-                            logger.warning("Account not found for Plaid ID", 
-                                         plaid_account_id=account['account_id'])
-                            
-                        # Cache account data
-                        cache_key = f"account:{account['account_id']}"
-                        await cache_service.set(tenant_id, cache_key, account, ttl=1800)
-                        
-                    except Exception as e:
-                        logger.error("Failed to sync individual account",
-                                    account_id=account['account_id'],
-                                    error=str(e))
+                    if account["account_id"] in changed:
+                        synced_accounts.append({
+                            "account_id": account["account_id"],
+                            "name": account["name"],
+                            "type": account["type"],
+                            "subtype": account["subtype"],
+                            "balance": {
+                                "available": account["balances"]["available"],
+                                "current": account["balances"]["current"],
+                                "limit": account["balances"]["limit"]
+                            },
+                            "status": "updated" if changed[account["account_id"]] else "unchanged"
+                        })
+                    else:
+                        logger.warning("Account not found for Plaid ID", 
+                                     plaid_account_id=account['account_id'])
+                    
+                    # Cache account data
+                    cache_key = f"account:{account['account_id']}"
+                    await cache_service.set(tenant_id, cache_key, account, ttl=1800)
                 
                 logger.info("Account data sync completed",
                            tenant_id=tenant_id,
@@ -187,6 +164,7 @@ def process_transactions(
                 
                 transactions = transactions_response["transactions"]
                 processed_transactions = []
+                users_with_new_transactions = set()
                 
                 for transaction in transactions:
                     try:
@@ -222,6 +200,7 @@ def process_transactions(
                                 )
                                 
                                 if created_transaction:
+                                    users_with_new_transactions.add(account.user_id)
                                     processed_transactions.append({
                                         "transaction_id": transaction["transaction_id"],
                                         "account_id": transaction["account_id"],
@@ -266,6 +245,10 @@ def process_transactions(
                            transactions_processed=len(processed_transactions),
                            task_id=self.request.id)
                 
+                # Apply the new transactions to the affected users' budgets
+                if users_with_new_transactions:
+                    sync_budget_spending.delay(tenant_id, sorted(users_with_new_transactions))
+                
                 return {
                     "status": "success",
                     "transactions_processed": len(processed_transactions),
@@ -375,6 +358,67 @@ def send_notification_email(
         raise self.retry(countdown=60, max_retries=3)
 
 
+@notification_task()
+def send_batch_notification_emails(
+    self,
+    tenant_id: str,
+    template: str,
+    recipients: List[Dict[str, Any]],
+    subject: str = None
+):
+    """Send a digest-style notification (budget alerts, monthly reports) to many users.
+    
+    Each recipient is a dict with ``to`` and optional ``data`` keys. Messages are
+    delivered over pooled SMTP connections with per-domain concurrency limits.
+    """
+    try:
+        logger.info("Sending batch notification emails",
+                   tenant_id=tenant_id,
+                   template=template,
+                   recipient_count=len(recipients),
+                   task_id=self.request.id)
+        
+        from src.services.email.client import get_email_service
+        
+        async def _send_batch():
+            email_service = await get_email_service()
+            return await email_service.send_template_batch(
+                template_name=template,
+                recipients=recipients,
+                subject=subject
+            )
+        
+        # Run async code
+        loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(loop)
+        try:
+            result = loop.run_until_complete(_send_batch())
+        finally:
+            loop.close()
+        
+        logger.info("Batch notification emails sent",
+                   tenant_id=tenant_id,
+                   template=template,
+                   sent=result.sent,
+                   failed=result.failed,
+                   task_id=self.request.id)
+        
+        return {
+            "status": "success" if result.failed == 0 else "partial",
+            **result.to_dict(),
+            "template": template,
+            "timestamp": datetime.utcnow().isoformat()
+        }
+        
+    except Exception as e:
+        logger.error("Send batch notification emails task failed",
+                    tenant_id=tenant_id,
+                    template=template,
+                    error=str(e),
+                    task_id=self.request.id)
+        raise self.retry(countdown=60, max_retries=3)
+
+
 @tenant_task()
 def generate_monthly_report(self, tenant_id: str, month: str = None, year: int = None):
     """Generate monthly financial report for tenant."""
@@ -478,6 +522,447 @@ def cleanup_expired_sessions(self):
         raise self.retry(countdown=300, max_retries=2)
 
 
+# Webhook inbox tasks
+@tenant_task()
+def process_webhook_inbox(self, tenant_id: str):
+    """Drain one batch of queued webhook events for a tenant, in arrival order."""
+    try:
+        from src.services.webhook_inbox import get_webhook_inbox
+        
+        async def _drain():
+            return await get_webhook_inbox().drain(tenant_id)
+        
+        # Run async code
+        loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(loop)
+        try:
+            result = loop.run_until_complete(_drain())
+        finally:
+            loop.close()
+        
+        # Keep going until the queue is empty; a locked queue is already being drained
+        if result.remaining and not result.locked:
+            process_webhook_inbox.delay(tenant_id)
+        
+        return {
+            "status": "locked" if result.locked else "success",
+            **result.to_dict(),
+            "timestamp": datetime.utcnow().isoformat()
+        }
+        
+    except Exception as e:
+        logger.error("Process webhook inbox task failed",
+                    tenant_id=tenant_id,
+                    error=str(e),
+                    task_id=self.request.id)
+        raise self.retry(countdown=30, max_retries=3)
+
+
+@maintenance_task()
+def recover_webhook_inbox(self):
+    """Re-dispatch pending webhook queues and re-enqueue stranded events."""
+    try:
+        logger.info("Starting webhook inbox recovery", task_id=self.request.id)
+        
+        from src.services.webhook_inbox import get_webhook_inbox
+        from src.tenant.service import TenantService
+        
+        async def _recover():
+            inbox = get_webhook_inbox()
+            dispatched = await inbox.dispatch_pending()
+            
+            recovered = 0
+            for tenant_id in await TenantService().get_active_tenant_ids():
+                try:
+                    recovered += await inbox.recover(tenant_id)
+                except Exception as e:
+                    logger.error("Webhook recovery failed for tenant",
+                                tenant_id=tenant_id,
+                                error=str(e))
+            return dispatched, recovered
+        
+        # Run async code
+        loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(loop)
+        try:
+            dispatched, recovered = loop.run_until_complete(_recover())
+        finally:
+            loop.close()
+        
+        logger.info("Webhook inbox recovery completed",
+                   queues_dispatched=len(dispatched),
+                   events_recovered=recovered,
+                   task_id=self.request.id)
+        
+        return {
+            "status": "success",
+            "queues_dispatched": len(dispatched),
+            "events_recovered": recovered,
+            "timestamp": datetime.utcnow().isoformat()
+        }
+        
+    except Exception as e:
+        logger.error("Recover webhook inbox task failed",
+                    error=str(e),
+                    task_id=self.request.id)
+        raise self.retry(countdown=300, max_retries=2)
+
+
+@maintenance_task()
+def rebuild_plaid_item_index(self):
+    """Backfill the global Plaid item routing index from every tenant's linked accounts."""
+    try:
+        logger.info("Starting Plaid item index rebuild", task_id=self.request.id)
+        
+        from src.accounts.repository import AccountRepository
+        from src.tenant.context import set_tenant_context, clear_tenant_context
+        from src.tenant.routing import get_plaid_item_index
+        from src.tenant.service import TenantService
+        
+        async def _rebuild():
+            tenant_service = TenantService()
+            item_index = get_plaid_item_index()
+            
+            indexed = 0
+            for tenant_id in await tenant_service.get_active_tenant_ids():
+                tenant_context = await tenant_service.get_tenant_context(tenant_id)
+                if not tenant_context:
+                    continue
+                
+                set_tenant_context(tenant_context)
+                try:
+                    items = await AccountRepository().get_linked_plaid_items()
+                    indexed += await item_index.register_many(tenant_id, items)
+                except Exception as e:
+                    logger.error("Plaid item index rebuild failed for tenant",
+                                tenant_id=tenant_id,
+                                error=str(e))
+                finally:
+                    clear_tenant_context()
+            
+            return indexed
+        
+        # Run async code
+        loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(loop)
+        try:
+            indexed = loop.run_until_complete(_rebuild())
+        finally:
+            loop.close()
+        
+        logger.info("Plaid item index rebuild completed",
+                   items_indexed=indexed,
+                   task_id=self.request.id)
+        
+        return {
+            "status": "success",
+            "items_indexed": indexed,
+            "timestamp": datetime.utcnow().isoformat()
+        }
+        
+    except Exception as e:
+        logger.error("Rebuild Plaid item index task failed",
+                    error=str(e),
+                    task_id=self.request.id)
+        raise self.retry(countdown=300, max_retries=2)
+
+
+# Budget tasks
+@tenant_task()
+def sync_budget_spending(self, tenant_id: str, user_ids: List[str], full: bool = False):
+    """Sync active budgets of the given users with their transactions."""
+    try:
+        from src.budgets.service import BudgetService
+        from src.families.dashboard import FamilyDashboardCache
+        from src.tenant.context import set_tenant_context, clear_tenant_context
+        from src.tenant.service import TenantService
+        
+        async def _sync():
+            tenant_context = await TenantService().get_tenant_context(tenant_id)
+            if not tenant_context:
+                return None
+            
+            set_tenant_context(tenant_context)
+            try:
+                # Imported transactions also change the users' family dashboards
+                await FamilyDashboardCache().invalidate_for_users(*user_ids)
+                return await BudgetService().sync_user_budgets(user_ids, full=full)
+            finally:
+                clear_tenant_context()
+        
+        # Run async code
+        loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(loop)
+        try:
+            result = loop.run_until_complete(_sync())
+        finally:
+            loop.close()
+        
+        if result is None:
+            logger.warning("Budget sync skipped for unknown tenant", tenant_id=tenant_id)
+            return {
+                "status": "skipped",
+                "timestamp": datetime.utcnow().isoformat()
+            }
+        
+        return {
+            "status": "success",
+            **result.to_dict(),
+            "timestamp": datetime.utcnow().isoformat()
+        }
+        
+    except Exception as e:
+        logger.error("Sync budget spending task failed",
+                    tenant_id=tenant_id,
+                    error=str(e),
+                    task_id=self.request.id)
+        raise self.retry(countdown=60, max_retries=3)
+
+
+@maintenance_task()
+def rollover_recurring_budgets(self):
+    """Create next-period budgets for every tenant's ended recurring budgets."""
+    try:
+        logger.info("Starting recurring budget rollover", task_id=self.request.id)
+        
+        from src.budgets.service import BudgetService
+        from src.tenant.context import set_tenant_context, clear_tenant_context
+        from src.tenant.service import TenantService
+        
+        async def _rollover():
+            tenant_service = TenantService()
+            
+            rolled_over = 0
+            for tenant_id in await tenant_service.get_active_tenant_ids():
+                tenant_context = await tenant_service.get_tenant_context(tenant_id)
+                if not tenant_context:
+                    continue
+                
+                set_tenant_context(tenant_context)
+                try:
+                    result = await BudgetService().rollover_recurring_budgets()
+                    rolled_over += result.budgets_rolled_over
+                except Exception as e:
+                    logger.error("Budget rollover failed for tenant",
+                                tenant_id=tenant_id,
+                                error=str(e))
+                finally:
+                    clear_tenant_context()
+            
+            return rolled_over
+        
+        # Run async code
+        loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(loop)
+        try:
+            rolled_over = loop.run_until_complete(_rollover())
+        finally:
+            loop.close()
+        
+        logger.info("Recurring budget rollover completed",
+                   budgets_rolled_over=rolled_over,
+                   task_id=self.request.id)
+        
+        return {
+            "status": "success",
+            "budgets_rolled_over": rolled_over,
+            "timestamp": datetime.utcnow().isoformat()
+        }
+        
+    except Exception as e:
+        logger.error("Rollover recurring budgets task failed",
+                    error=str(e),
+                    task_id=self.request.id)
+        raise self.retry(countdown=300, max_retries=2)
+
+
+@maintenance_task()
+def refresh_goal_insights(self):
+    """Precompute goal projections and insights for every tenant's users."""
+    try:
+        logger.info("Starting goal insight refresh", task_id=self.request.id)
+        
+        from src.goals.service import GoalService
+        from src.tenant.context import set_tenant_context, clear_tenant_context
+        from src.tenant.service import TenantService
+        
+        async def _refresh():
+            tenant_service = TenantService()
+            
+            users = insights = 0
+            for tenant_id in await tenant_service.get_active_tenant_ids():
+                tenant_context = await tenant_service.get_tenant_context(tenant_id)
+                if not tenant_context:
+                    continue
+                
+                set_tenant_context(tenant_context)
+                try:
+                    result = await GoalService().refresh_goal_insights()
+                    users += result.users
+                    insights += result.insights
+                except Exception as e:
+                    logger.error("Goal insight refresh failed for tenant",
+                                tenant_id=tenant_id,
+                                error=str(e))
+                finally:
+                    clear_tenant_context()
+            
+            return users, insights
+        
+        # Run async code
+        loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(loop)
+        try:
+            users, insights = loop.run_until_complete(_refresh())
+        finally:
+            loop.close()
+        
+        logger.info("Goal insight refresh completed",
+                   users=users,
+                   insights=insights,
+                   task_id=self.request.id)
+        
+        return {
+            "status": "success",
+            "users": users,
+            "insights": insights,
+            "timestamp": datetime.utcnow().isoformat()
+        }
+        
+    except Exception as e:
+        logger.error("Refresh goal insights task failed",
+                    error=str(e),
+                    task_id=self.request.id)
+        raise self.retry(countdown=600, max_retries=2)
+
+
+@maintenance_task()
+def downsample_balance_history(self):
+    """Fold every tenant's old account balance history into daily and monthly rollups."""
+    try:
+        logger.info("Starting balance history downsampling", task_id=self.request.id)
+        
+        from src.accounts.service import AccountService
+        from src.tenant.context import set_tenant_context, clear_tenant_context
+        from src.tenant.service import TenantService
+        
+        async def _downsample():
+            tenant_service = TenantService()
+            
+            folded = {"day": 0, "month": 0}
+            for tenant_id in await tenant_service.get_active_tenant_ids():
+                tenant_context = await tenant_service.get_tenant_context(tenant_id)
+                if not tenant_context:
+                    continue
+                
+                set_tenant_context(tenant_context)
+                try:
+                    result = await AccountService().downsample_balance_history()
+                    for resolution, count in result.items():
+                        folded[resolution] += count
+                except Exception as e:
+                    logger.error("Balance history downsampling failed for tenant",
+                                tenant_id=tenant_id,
+                                error=str(e))
+                finally:
+                    clear_tenant_context()
+            
+            return folded
+        
+        # Run async code
+        loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(loop)
+        try:
+            folded = loop.run_until_complete(_downsample())
+        finally:
+            loop.close()
+        
+        logger.info("Balance history downsampling completed",
+                   daily_rollups=folded["day"],
+                   monthly_rollups=folded["month"],
+                   task_id=self.request.id)
+        
+        return {
+            "status": "success",
+            "daily_rollups": folded["day"],
+            "monthly_rollups": folded["month"],
+            "timestamp": datetime.utcnow().isoformat()
+        }
+        
+    except Exception as e:
+        logger.error("Downsample balance history task failed",
+                    error=str(e),
+                    task_id=self.request.id)
+        raise self.retry(countdown=600, max_retries=2)
+
+
+@maintenance_task()
+def process_tithing_schedules(self, process_date: Optional[str] = None):
+    """Create payments for every tenant's due tithing schedules."""
+    try:
+        logger.info("Starting tithing schedule processing", task_id=self.request.id)
+        
+        from src.tenant.context import set_tenant_context, clear_tenant_context
+        from src.tenant.manager import tenant_db_manager
+        from src.tenant.service import TenantService
+        from src.tithing.schedules import TithingScheduleProcessor
+        
+        run_date = date.fromisoformat(process_date) if process_date else date.today()
+        
+        async def _process():
+            tenant_service = TenantService()
+            
+            schedules = payments = 0
+            for tenant_id in await tenant_service.get_active_tenant_ids():
+                tenant_context = await tenant_service.get_tenant_context(tenant_id)
+                if not tenant_context:
+                    continue
+                
+                set_tenant_context(tenant_context)
+                try:
+                    # Safe to retry: payments are unique per schedule and execution date
+                    async with await tenant_db_manager.get_tenant_session(tenant_context) as session:
+                        result = await TithingScheduleProcessor(session).process_due(run_date)
+                    schedules += result.schedules
+                    payments += result.payments
+                except Exception as e:
+                    logger.error("Tithing schedule processing failed for tenant",
+                                tenant_id=tenant_id,
+                                error=str(e))
+                finally:
+                    clear_tenant_context()
+            
+            return schedules, payments
+        
+        # Run async code
+        loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(loop)
+        try:
+            schedules, payments = loop.run_until_complete(_process())
+        finally:
+            loop.close()
+        
+        logger.info("Tithing schedule processing completed",
+                   process_date=run_date.isoformat(),
+                   schedules=schedules,
+                   payments=payments,
+                   task_id=self.request.id)
+        
+        return {
+            "status": "success",
+            "process_date": run_date.isoformat(),
+            "schedules": schedules,
+            "payments": payments,
+            "timestamp": datetime.utcnow().isoformat()
+        }
+        
+    except Exception as e:
+        logger.error("Process tithing schedules task failed",
+                    error=str(e),
+                    task_id=self.request.id)
+        raise self.retry(countdown=300, max_retries=2)
+
+
 # Composite tasks (tasks that orchestrate other tasks)
 @tenant_task()
 def sync_all_accounts(self, tenant_id: str):
@@ -3,6 +3,8 @@
 import asyncio
 import smtplib
 from abc import ABC, abstractmethod
+from collections import defaultdict
+from dataclasses import dataclass, field
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
 from email.mime.base import MIMEBase
@@ -13,11 +15,114 @@ import aiosmtplib
 import structlog
 
 from src.config import settings
-from src.exceptions import EmailError
+from src.exceptions import EmailError, EmailTemplateError
+from .pool import SMTPConnectionPool
+from .template_engine import EmailTemplateEngine, get_template_engine
 
 logger = structlog.get_logger(__name__)
 
 
+@dataclass
+class OutgoingEmail:
+    """A fully-resolved email ready to hand to a provider."""
+    to: List[str]
+    subject: str
+    html_content: Optional[str] = None
+    text_content: Optional[str] = None
+    from_email: Optional[str] = None
+    from_name: Optional[str] = None
+    reply_to: Optional[str] = None
+    attachments: Optional[List[Dict[str, Any]]] = None
+    
+    @property
+    def recipient_domain(self) -> str:
+        """Domain of the first recipient, used for per-domain throttling."""
+        if not self.to or "@" not in self.to[0]:
+            return ""
+        return self.to[0].rsplit("@", 1)[1].lower()
+
+
+@dataclass
+class BatchSendResult:
+    """Outcome of a batch send."""
+    total: int = 0
+    sent: int = 0
+    failed: int = 0
+    failures: List[Dict[str, Any]] = field(default_factory=list)
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert result to dictionary."""
+        return {
+            "total": self.total,
+            "sent": self.sent,
+            "failed": self.failed,
+            "failures": self.failures
+        }
+
+
+def build_mime_message(email: OutgoingEmail, default_sender: Optional[str] = None) -> MIMEMultipart:
+    """Build a MIME message from an outgoing email."""
+    msg = MIMEMultipart('alternative')
+    msg['Subject'] = email.subject
+    msg['From'] = (
+        f"{email.from_name} <{email.from_email}>" if email.from_name
+        else email.from_email or default_sender
+    )
+    msg['To'] = ', '.join(email.to)
+    
+    if email.reply_to:
+        msg['Reply-To'] = email.reply_to
+    
+    # Add text content
+    if email.text_content:
+        msg.attach(MIMEText(email.text_content, 'plain', 'utf-8'))
+    
+    # Add HTML content
+    if email.html_content:
+        msg.attach(MIMEText(email.html_content, 'html', 'utf-8'))
+    
+    # Add attachments
+    if email.attachments:
+        for attachment in email.attachments:
+            _add_attachment(msg, attachment)
+    
+    return msg
+
+
+def _add_attachment(msg: MIMEMultipart, attachment: Dict[str, Any]):
+    """Add attachment to email message."""
+    try:
+        if 'content' in attachment:
+            # Content provided directly
+            part = MIMEBase('application', 'octet-stream')
+            part.set_payload(attachment['content'])
+            encoders.encode_base64(part)
+            part.add_header(
+                'Content-Disposition',
+                f'attachment; filename={attachment.get("filename", "attachment")}'
+            )
+            msg.attach(part)
+        
+        elif 'filepath' in attachment:
+            # File path provided
+            filepath = Path(attachment['filepath'])
+            if filepath.exists():
+                with open(filepath, 'rb') as f:
+                    part = MIMEBase('application', 'octet-stream')
+                    part.set_payload(f.read())
+                    encoders.encode_base64(part)
+                    part.add_header(
+                        'Content-Disposition',
+                        f'attachment; filename={filepath.name}'
+                    )
+                    msg.attach(part)
+                    
+    except Exception as e:
+        logger.warning("Failed to add attachment", 
+                      attachment=attachment, 
+                      error=str(e))
+
+
 class EmailProvider(ABC):
     """Abstract base class for email providers."""
     
@@ -35,6 +140,26 @@ class EmailProvider(ABC):
     ) -> bool:
         """Send an email."""
         pass
+    
+    async def send_batch(self, emails: List[OutgoingEmail]) -> List[bool]:
+        """Send several emails, returning a success flag per email in input order."""
+        results = []
+        for email in emails:
+            results.append(await self.send_email(
+                to=email.to,
+                subject=email.subject,
+                html_content=email.html_content,
+                text_content=email.text_content,
+                from_email=email.from_email,
+                from_name=email.from_name,
+                reply_to=email.reply_to,
+                attachments=email.attachments
+            ))
+        return results
+    
+    async def close(self) -> None:
+        """Release any resources held by the provider."""
+        pass
 
 
 class SMTPEmailProvider(EmailProvider):
@@ -67,29 +192,19 @@ class SMTPEmailProvider(EmailProvider):
     ) -> bool:
         """Send email via SMTP."""
         try:
-            # Create message
-            msg = MIMEMultipart('alternative')
-            msg['Subject'] = subject
-            msg['From'] = f"{from_name} <{from_email}>" if from_name else from_email or self.smtp_username
-            msg['To'] = ', '.join(to)
-            
-            if reply_to:
-                msg['Reply-To'] = reply_to
-            
-            # Add text content
-            if text_content:
-                text_part = MIMEText(text_content, 'plain', 'utf-8')
-                msg.attach(text_part)
-            
-            # Add HTML content
-            if html_content:
-                html_part = MIMEText(html_content, 'html', 'utf-8')
-                msg.attach(html_part)
-            
-            # Add attachments
-            if attachments:
-                for attachment in attachments:
-                    self._add_attachment(msg, attachment)
+            msg = build_mime_message(
+                OutgoingEmail(
+                    to=to,
+                    subject=subject,
+                    html_content=html_content,
+                    text_content=text_content,
+                    from_email=from_email,
+                    from_name=from_name,
+                    reply_to=reply_to,
+                    attachments=attachments
+                ),
+                default_sender=self.smtp_username
+            )
             
             # Send email
             if self.use_ssl:
@@ -120,39 +235,62 @@ class SMTPEmailProvider(EmailProvider):
                         subject=subject,
                         error=str(e))
             return False
+
+
+class PooledSMTPEmailProvider(EmailProvider):
+    """SMTP provider that reuses authenticated connections from a pool."""
     
-    def _add_attachment(self, msg: MIMEMultipart, attachment: Dict[str, Any]):
-        """Add attachment to email message."""
-        try:
-            if 'content' in attachment:
-                # Content provided directly
-                part = MIMEBase('application', 'octet-stream')
-                part.set_payload(attachment['content'])
-                encoders.encode_base64(part)
-                part.add_header(
-                    'Content-Disposition',
-                    f'attachment; filename={attachment.get("filename", "attachment")}'
-                )
-                msg.attach(part)
-            
-            elif 'filepath' in attachment:
-                # File path provided
-                filepath = Path(attachment['filepath'])
-                if filepath.exists():
-                    with open(filepath, 'rb') as f:
-                        part = MIMEBase('application', 'octet-stream')
-                        part.set_payload(f.read())
-                        encoders.encode_base64(part)
-                        part.add_header(
-                            'Content-Disposition',
-                            f'attachment; filename={filepath.name}'
-                        )
-                        msg.attach(part)
-                        
-        except Exception as e:
-            logger.warning("Failed to add attachment", 
-                          attachment=attachment, 
-                          error=str(e))
+    def __init__(self, pool: SMTPConnectionPool):
+        self.pool = pool
+    
+    async def send_email(
+        self,
+        to: List[str],
+        subject: str,
+        html_content: Optional[str] = None,
+        text_content: Optional[str] = None,
+        from_email: Optional[str] = None,
+        from_name: Optional[str] = None,
+        reply_to: Optional[str] = None,
+        attachments: Optional[List[Dict[str, Any]]] = None
+    ) -> bool:
+        """Send email over a pooled SMTP connection."""
+        results = await self.send_batch([
+            OutgoingEmail(
+                to=to,
+                subject=subject,
+                html_content=html_content,
+                text_content=text_content,
+                from_email=from_email,
+                from_name=from_name,
+                reply_to=reply_to,
+                attachments=attachments
+            )
+        ])
+        return results[0]
+    
+    async def send_batch(self, emails: List[OutgoingEmail]) -> List[bool]:
+        """Send emails back-to-back over a single pooled connection."""
+        messages = [build_mime_message(email, self.pool.smtp_username) for email in emails]
+        errors = await self.pool.send_messages(messages)
+        
+        for email, error in zip(emails, errors):
+            if error is None:
+                logger.info("Email sent successfully",
+                           to=email.to,
+                           subject=email.subject,
+                           provider="smtp_pool")
+            else:
+                logger.error("SMTP email sending failed",
+                            to=email.to,
+                            subject=email.subject,
+                            error=error)
+        
+        return [error is None for error in errors]
+    
+    async def close(self) -> None:
+        """Close pooled SMTP connections."""
+        await self.pool.close()
 
 
 class ConsoleEmailProvider(EmailProvider):
@@ -206,24 +344,36 @@ class ConsoleEmailProvider(EmailProvider):
 class EmailService:
     """Email service with template support and provider abstraction."""
     
-    def __init__(self, provider: Optional[EmailProvider] = None):
+    def __init__(
+        self,
+        provider: Optional[EmailProvider] = None,
+        template_engine: Optional[EmailTemplateEngine] = None
+    ):
         self.provider = provider or self._create_default_provider()
+        self.template_engine = template_engine or get_template_engine()
         self.default_from_email = settings.EMAIL_FROM_ADDRESS
         self.default_from_name = settings.EMAIL_FROM_NAME
+        self.per_domain_concurrency = settings.EMAIL_BATCH_PER_DOMAIN_CONCURRENCY
+        self.batch_chunk_size = settings.SMTP_MAX_MESSAGES_PER_CONNECTION
     
     def _create_default_provider(self) -> EmailProvider:
         """Create default email provider based on settings."""
         if settings.ENVIRONMENT == "development":
             return ConsoleEmailProvider()
         
-        # Production SMTP configuration
-        return SMTPEmailProvider(
-            smtp_host=settings.SMTP_HOST,
-            smtp_port=settings.SMTP_PORT,
-            smtp_username=settings.SMTP_USERNAME,
-            smtp_password=settings.SMTP_PASSWORD,
-            use_tls=settings.SMTP_USE_TLS,
-            use_ssl=settings.SMTP_USE_SSL
+        # Production SMTP configuration with pooled, authenticated connections
+        return PooledSMTPEmailProvider(
+            SMTPConnectionPool(
+                smtp_host=settings.SMTP_HOST,
+                smtp_port=settings.SMTP_PORT,
+                smtp_username=settings.SMTP_USERNAME,
+                smtp_password=settings.SMTP_PASSWORD,
+                use_tls=settings.SMTP_USE_TLS,
+                use_ssl=settings.SMTP_USE_SSL,
+                max_size=settings.SMTP_POOL_SIZE,
+                max_idle_seconds=settings.SMTP_POOL_MAX_IDLE_SECONDS,
+                max_messages_per_connection=settings.SMTP_MAX_MESSAGES_PER_CONNECTION
+            )
         )
     
     async def send_email(
@@ -293,14 +443,16 @@ class EmailService:
         subject: Optional[str] = None,
         from_email: Optional[str] = None,
         from_name: Optional[str] = None,
-        reply_to: Optional[str] = None
+        reply_to: Optional[str] = None,
+        template_version: Optional[str] = None
     ) -> bool:
         """Send email using template."""
         try:
-            # Load and render template
+            # Render precompiled template
             html_content, text_content, template_subject = await self._render_template(
                 template_name, 
-                template_data
+                template_data,
+                template_version
             )
             
             # Use template subject if not provided
@@ -316,6 +468,13 @@ class EmailService:
                 reply_to=reply_to
             )
             
+        except EmailTemplateError as e:
+            logger.error("Template email rendering failed",
+                        template_name=template_name,
+                        to=to,
+                        missing_variables=e.missing_variables,
+                        error=e.message)
+            raise
         except Exception as e:
             logger.error("Template email sending failed",
                         template_name=template_name,
@@ -323,99 +482,119 @@ class EmailService:
                         error=str(e))
             raise EmailError(f"Failed to send template email: {str(e)}")
     
+    async def send_batch(self, emails: List[OutgoingEmail]) -> BatchSendResult:
+        """Send many emails with per-recipient-domain concurrency limits.
+        
+        Emails are grouped by recipient domain; each domain is drained by at
+        most ``per_domain_concurrency`` workers, each handing the provider a
+        chunk of messages to deliver over one connection.
+        """
+        result = BatchSendResult(total=len(emails))
+        if not emails:
+            return result
+        
+        by_domain: Dict[str, List[OutgoingEmail]] = defaultdict(list)
+        for email in emails:
+            email.from_email = email.from_email or self.default_from_email
+            email.from_name = email.from_name or self.default_from_name
+            by_domain[email.recipient_domain].append(email)
+        
+        async def _drain_domain(domain: str, domain_emails: List[OutgoingEmail]):
+            semaphore = asyncio.Semaphore(self.per_domain_concurrency)
+            
+            async def _send_chunk(chunk: List[OutgoingEmail]):
+                async with semaphore:
+                    try:
+                        outcomes = await self.provider.send_batch(chunk)
+                    except Exception as e:
+                        logger.error("Email batch chunk failed", domain=domain, error=str(e))
+                        outcomes = [False] * len(chunk)
+                
+                for email, success in zip(chunk, outcomes):
+                    if success:
+                        result.sent += 1
+                    else:
+                        result.failed += 1
+                        result.failures.append({"to": email.to, "subject": email.subject})
+            
+            chunks = [
+                domain_emails[i:i + self.batch_chunk_size]
+                for i in range(0, len(domain_emails), self.batch_chunk_size)
+            ]
+            await asyncio.gather(*(_send_chunk(chunk) for chunk in chunks))
+        
+        await asyncio.gather(*(
+            _drain_domain(domain, domain_emails)
+            for domain, domain_emails in by_domain.items()
+        ))
+        
+        logger.info("Email batch completed",
+                   total=result.total,
+                   sent=result.sent,
+                   failed=result.failed,
+                   domains=len(by_domain))
+        
+        return result
+    
+    async def send_template_batch(
+        self,
+        template_name: str,
+        recipients: List[Dict[str, Any]],
+        subject: Optional[str] = None,
+        version: Optional[str] = None
+    ) -> BatchSendResult:
+        """Render one template per recipient and send them as a batch.
+        
+        Each recipient is a dict with ``to`` and optional ``data`` keys. The
+        template is compiled once; recipients whose data is missing template
+        variables are reported as failures instead of aborting the batch.
+        """
+        rendered = self.template_engine.render_batch(
+            template_name,
+            [recipient.get("data") or {} for recipient in recipients],
+            version=version,
+            skip_invalid=True
+        )
+        
+        emails = []
+        skipped = []
+        for recipient, content in zip(recipients, rendered):
+            to = recipient["to"]
+            to = [to] if isinstance(to, str) else list(to)
+            if content is None:
+                skipped.append({"to": to, "subject": subject, "error": "template rendering failed"})
+                continue
+            
+            emails.append(OutgoingEmail(
+                to=to,
+                subject=subject or content.subject or f"Notification from {self.default_from_name}",
+                html_content=content.html_content,
+                text_content=content.text_content
+            ))
+        
+        result = await self.send_batch(emails)
+        result.total += len(skipped)
+        result.failed += len(skipped)
+        result.failures.extend(skipped)
+        return result
+    
+    async def close(self) -> None:
+        """Close the underlying provider."""
+        await self.provider.close()
+    
     async def _render_template(
         self, 
         template_name: str, 
-        template_data: Dict[str, Any]
+        template_data: Dict[str, Any],
+        version: Optional[str] = None
     ) -> tuple[Optional[str], Optional[str], Optional[str]]:
         """Render email template."""
         try:
-            # For now, use simple string formatting
-            # In production, you'd use Jinja2 or similar
-            templates = {
-                "welcome": {
-                    "subject": "Welcome to {app_name}!",
-                    "html": """
-                    <h1>Welcome to {app_name}!</h1>
-                    <p>Hi {user_name},</p>
-                    <p>Welcome to your new account! We're excited to have you on board.</p>
-                    <p>You can start by connecting your bank accounts to track your finances.</p>
-                    <p>Best regards,<br>The {app_name} Team</p>
-                    """,
-                    "text": """
-                    Welcome to {app_name}!
-                    
-                    Hi {user_name},
-                    
-                    Welcome to your new account! We're excited to have you on board.
-                    
-                    You can start by connecting your bank accounts to track your finances.
-                    
-                    Best regards,
-                    The {app_name} Team
-                    """
-                },
-                "password_reset": {
-                    "subject": "Reset your password",
-                    "html": """
-                    <h1>Reset Your Password</h1>
-                    <p>Hi {user_name},</p>
-                    <p>You requested to reset your password. Click the link below to reset it:</p>
-                    <p><a href="{reset_link}">Reset Password</a></p>
-                    <p>This link will expire in 24 hours.</p>
-                    <p>If you didn't request this, please ignore this email.</p>
-                    """,
-                    "text": """
-                    Reset Your Password
-                    
-                    Hi {user_name},
-                    
-                    You requested to reset your password. Use this link to reset it:
-                    {reset_link}
-                    
-                    This link will expire in 24 hours.
-                    
-                    If you didn't request this, please ignore this email.
-                    """
-                },
-                "payment_success": {
-                    "subject": "Payment Confirmation",
-                    "html": """
-                    <h1>Payment Confirmed</h1>
-                    <p>Hi {user_name},</p>
-                    <p>Your payment has been successfully processed.</p>
-                    <p><strong>Amount:</strong> {currency} {amount}</p>
-                    <p><strong>Invoice ID:</strong> {invoice_id}</p>
-                    <p>Thank you for your payment!</p>
-                    """,
-                    "text": """
-                    Payment Confirmed
-                    
-                    Hi {user_name},
-                    
-                    Your payment has been successfully processed.
-                    
-                    Amount: {currency} {amount}
-                    Invoice ID: {invoice_id}
-                    
-                    Thank you for your payment!
-                    """
-                }
-            }
-            
-            template = templates.get(template_name)
-            if not template:
-                raise EmailError(f"Template '{template_name}' not found")
+            rendered = self.template_engine.render(template_name, template_data, version)
+            return rendered.html_content, rendered.text_content, rendered.subject
             
-            # Format templates with data
-            html_content = template.get("html", "").format(**template_data)
-            text_content = template.get("text", "").format(**template_data)
-            subject = template.get("subject", "").format(**template_data)
-            
-            return html_content, text_content, subject
-            
-        except KeyError as e:
-            raise EmailError(f"Missing template variable: {e}")
+        except EmailTemplateError:
+            raise
         except Exception as e:
             raise EmailError(f"Template rendering failed: {str(e)}")
 
@@ -432,6 +611,15 @@ async def get_email_service() -> EmailService:
     return _email_service
 
 
+async def close_email_service() -> None:
+    """Close email service instance and its pooled connections."""
+    global _email_service
+    
+    if _email_service:
+        await _email_service.close()
+        _email_service = None
+
+
 # Convenience functions
 async def send_email(
     to: Union[str, List[str]],
@@ -0,0 +1,236 @@
+"""Pooled SMTP transport that keeps authenticated connections alive."""
+
+import asyncio
+import time
+from collections import deque
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
+from email.message import Message
+from typing import Optional, Dict, Any, List
+
+import aiosmtplib
+import structlog
+
+from src.exceptions import EmailError
+
+logger = structlog.get_logger(__name__)
+
+
+@dataclass
+class PooledConnection:
+    """An authenticated SMTP connection plus its usage bookkeeping."""
+    client: aiosmtplib.SMTP
+    created_at: float = field(default_factory=time.monotonic)
+    last_used_at: float = field(default_factory=time.monotonic)
+    messages_sent: int = 0
+
+
+class SMTPConnectionPool:
+    """Bounded pool of authenticated SMTP connections.
+
+    Connections are opened lazily, authenticated once, and returned to the
+    pool after use so that subsequent messages skip the TCP/TLS/AUTH handshake.
+    Connections are recycled once they exceed the idle timeout or the
+    per-connection message cap (most providers disconnect after ~100 messages).
+
+    Connections belong to the event loop that opened them. Background tasks
+    run each job on a fresh loop, so the pool rebinds to the running loop on
+    use and drops whatever was left idle by the previous one.
+    """
+
+    def __init__(self,
+                 smtp_host: str,
+                 smtp_port: int,
+                 smtp_username: Optional[str] = None,
+                 smtp_password: Optional[str] = None,
+                 use_tls: bool = True,
+                 use_ssl: bool = False,
+                 max_size: int = 5,
+                 max_idle_seconds: int = 60,
+                 max_messages_per_connection: int = 100,
+                 timeout: float = 30):
+        self.smtp_host = smtp_host
+        self.smtp_port = smtp_port
+        self.smtp_username = smtp_username
+        self.smtp_password = smtp_password
+        self.use_tls = use_tls
+        self.use_ssl = use_ssl
+        self.max_size = max_size
+        self.max_idle_seconds = max_idle_seconds
+        self.max_messages_per_connection = max_messages_per_connection
+        self.timeout = timeout
+
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._idle: asyncio.LifoQueue = asyncio.LifoQueue()
+        self._slots = asyncio.Semaphore(max_size)
+        self._closed = False
+
+        # Statistics
+        self.connections_opened = 0
+        self.connections_reused = 0
+        self.messages_sent = 0
+
+    async def _open_connection(self) -> PooledConnection:
+        """Open, secure and authenticate a new SMTP connection."""
+        client = aiosmtplib.SMTP(
+            hostname=self.smtp_host,
+            port=self.smtp_port,
+            use_tls=self.use_ssl,
+            start_tls=self.use_tls and not self.use_ssl,
+            timeout=self.timeout
+        )
+        await client.connect()
+
+        if self.smtp_username and self.smtp_password:
+            await client.login(self.smtp_username, self.smtp_password)
+
+        self.connections_opened += 1
+        logger.debug("SMTP connection opened", host=self.smtp_host, port=self.smtp_port)
+        return PooledConnection(client=client)
+
+    async def _close_connection(self, connection: PooledConnection) -> None:
+        """Close a connection, ignoring errors from already-dropped sockets."""
+        try:
+            if connection.client.is_connected:
+                await connection.client.quit()
+        except Exception:
+            connection.client.close()
+
+    def _is_reusable(self, connection: PooledConnection) -> bool:
+        """Check whether a pooled connection can take another message."""
+        if not connection.client.is_connected:
+            return False
+        if connection.messages_sent >= self.max_messages_per_connection:
+            return False
+        return (time.monotonic() - connection.last_used_at) < self.max_idle_seconds
+
+    def _bind_loop(self) -> None:
+        """Recreate the idle queue and slots when the running event loop changes."""
+        loop = asyncio.get_running_loop()
+        if loop is self._loop:
+            return
+
+        stale = 0
+        while not self._idle.empty():
+            connection = self._idle.get_nowait()
+            stale += 1
+            try:
+                # The owning loop is gone, so the socket is dropped without a QUIT
+                connection.client.close()
+            except Exception:
+                pass
+        if stale:
+            logger.debug("Dropped SMTP connections of a previous event loop", count=stale)
+
+        self._loop = loop
+        self._idle = asyncio.LifoQueue()
+        self._slots = asyncio.Semaphore(self.max_size)
+
+    async def _checkout(self) -> PooledConnection:
+        """Take an idle connection from the pool or open a new one."""
+        while not self._idle.empty():
+            connection = self._idle.get_nowait()
+            if self._is_reusable(connection):
+                self.connections_reused += 1
+                return connection
+            await self._close_connection(connection)
+
+        return await self._open_connection()
+
+    async def _checkin(self, connection: PooledConnection, discard: bool = False) -> None:
+        """Return a connection to the pool, or close it if it is spent."""
+        if discard or self._closed or not self._is_reusable(connection):
+            await self._close_connection(connection)
+        else:
+            self._idle.put_nowait(connection)
+
+    @asynccontextmanager
+    async def connection(self):
+        """Borrow a connection for the duration of the context."""
+        if self._closed:
+            raise EmailError("SMTP connection pool is closed")
+
+        self._bind_loop()
+        async with self._slots:
+            connection = await self._checkout()
+            discard = False
+            try:
+                yield connection
+            except BaseException:
+                # The SMTP session may be mid-transaction; never hand it out again
+                discard = True
+                raise
+            finally:
+                await self._checkin(connection, discard=discard)
+
+    async def send_message(self, message: Message) -> None:
+        """Send one message over a pooled connection, reconnecting once if it was dropped."""
+        error = (await self.send_messages([message]))[0]
+        if error is not None:
+            raise EmailError(f"SMTP delivery failed: {error}")
+
+    async def send_messages(self, messages: List[Message]) -> List[Optional[str]]:
+        """Send several messages back-to-back over a single pooled connection.
+
+        Returns a list with ``None`` for each delivered message and the error
+        string for each failed one, in input order.
+        """
+        results: List[Optional[str]] = []
+        pending = deque(messages)
+        retried = False
+
+        while pending:
+            try:
+                async with self.connection() as connection:
+                    while pending:
+                        message = pending[0]
+                        try:
+                            await connection.client.send_message(message)
+                            results.append(None)
+                        except aiosmtplib.SMTPRecipientsRefused as e:
+                            # Recipient-level rejection; the connection is still usable
+                            results.append(str(e))
+                        except aiosmtplib.SMTPResponseException as e:
+                            if e.code == 421:
+                                # Server is closing the channel
+                                raise aiosmtplib.SMTPServerDisconnected(str(e)) from e
+                            results.append(str(e))
+                        else:
+                            connection.messages_sent += 1
+                            connection.last_used_at = time.monotonic()
+                            self.messages_sent += 1
+                        pending.popleft()
+
+                        if connection.messages_sent >= self.max_messages_per_connection:
+                            # Let the pool recycle this connection before continuing
+                            break
+            except (aiosmtplib.SMTPServerDisconnected, aiosmtplib.SMTPConnectError, ConnectionError) as e:
+                if retried:
+                    results.extend(str(e) for _ in pending)
+                    break
+                retried = True
+                logger.warning("SMTP connection dropped, reconnecting", error=str(e))
+            except Exception as e:
+                logger.error("SMTP batch delivery failed", error=str(e), remaining=len(pending))
+                results.extend(str(e) for _ in pending)
+                break
+
+        return results
+
+    async def close(self) -> None:
+        """Close every idle connection and reject new checkouts."""
+        self._closed = True
+        self._bind_loop()
+        while not self._idle.empty():
+            await self._close_connection(self._idle.get_nowait())
+        logger.info("SMTP connection pool closed")
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get pool usage statistics."""
+        return {
+            "max_size": self.max_size,
+            "idle_connections": self._idle.qsize(),
+            "connections_opened": self.connections_opened,
+            "connections_reused": self.connections_reused,
+            "messages_sent": self.messages_sent
+        }
@@ -0,0 +1,297 @@
+"""Precompiled, cached email templates backed by Jinja2."""
+
+import hashlib
+import threading
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Optional, Dict, Any, List, Tuple
+
+import structlog
+from jinja2 import Environment, StrictUndefined, Template, TemplateSyntaxError, UndefinedError, meta
+
+from src.config import settings
+from src.exceptions import EmailTemplateError
+
+logger = structlog.get_logger(__name__)
+
+DEFAULT_TEMPLATE_DIR = Path(__file__).parent / "templates"
+
+# Template parts and the file that holds each one inside a template directory
+TEMPLATE_PARTS = {
+    "subject": "subject.txt",
+    "html": "body.html",
+    "text": "body.txt",
+}
+
+LATEST_VERSION = "latest"
+
+
+def _is_path_segment(value: str) -> bool:
+    """Whether ``value`` names a single entry inside its directory."""
+    return bool(value) and "/" not in value and "\\" not in value and not value.startswith(".")
+
+
+@dataclass
+class RenderedEmail:
+    """Rendered email parts."""
+    subject: Optional[str]
+    html_content: Optional[str]
+    text_content: Optional[str]
+
+
+@dataclass
+class CompiledEmailTemplate:
+    """A template whose parts have been parsed and compiled once."""
+    name: str
+    version: str
+    parts: Dict[str, Template]
+    variables: Dict[str, frozenset]
+    fingerprint: str
+    source_mtime: float
+    render_count: int = field(default=0, compare=False)
+
+    def _missing_variables(self, part: str, context: Dict[str, Any]) -> List[str]:
+        """Top-level variables referenced by a part that the context lacks."""
+        return sorted(name for name in self.variables.get(part, ()) if name not in context)
+
+    def render(self, context: Dict[str, Any]) -> RenderedEmail:
+        """Render every part against a context."""
+        rendered: Dict[str, Optional[str]] = {part: None for part in TEMPLATE_PARTS}
+
+        for part, template in self.parts.items():
+            try:
+                rendered[part] = template.render(context)
+            except UndefinedError as e:
+                missing = self._missing_variables(part, context)
+                detail = ", ".join(missing) if missing else str(e)
+                raise EmailTemplateError(
+                    f"Template '{self.name}' ({self.version}) part '{part}' is missing variable(s): {detail}",
+                    template_name=self.name,
+                    missing_variables=missing,
+                    details={"part": part, "version": self.version, "error": str(e)}
+                )
+
+        if rendered["subject"] is not None:
+            rendered["subject"] = rendered["subject"].strip()
+
+        self.render_count += 1
+        return RenderedEmail(
+            subject=rendered["subject"],
+            html_content=rendered["html"],
+            text_content=rendered["text"]
+        )
+
+
+class EmailTemplateEngine:
+    """Loads email templates from disk once and serves compiled versions from memory.
+
+    Templates live in ``<template_dir>/<name>/`` with optional ``subject.txt``,
+    ``body.html`` and ``body.txt`` files; pinned versions live in
+    ``<template_dir>/<name>/<version>/``. Compiled templates are cached by
+    ``(name, version)``. With ``auto_reload`` enabled (the default in
+    development) a template is recompiled when any of its files change.
+    """
+
+    def __init__(self, template_dir: Optional[str] = None, auto_reload: Optional[bool] = None):
+        self.template_dir = Path(template_dir) if template_dir else DEFAULT_TEMPLATE_DIR
+        self.auto_reload = settings.is_development if auto_reload is None else auto_reload
+        self._cache: Dict[Tuple[str, str], CompiledEmailTemplate] = {}
+        self._lock = threading.Lock()
+
+        # HTML parts are autoescaped, subject and text parts are not
+        self._html_env = Environment(
+            undefined=StrictUndefined,
+            autoescape=True,
+            trim_blocks=True,
+            lstrip_blocks=True
+        )
+        self._text_env = Environment(
+            undefined=StrictUndefined,
+            autoescape=False,
+            trim_blocks=True,
+            lstrip_blocks=True,
+            keep_trailing_newline=True
+        )
+
+    def _template_path(self, name: str, version: str) -> Path:
+        """Resolve the directory holding a template version."""
+        if not _is_path_segment(name):
+            raise EmailTemplateError(f"Invalid template name '{name}'", template_name=name)
+        if version != LATEST_VERSION and not _is_path_segment(version):
+            raise EmailTemplateError(f"Invalid template version '{version}'", template_name=name)
+
+        path = self.template_dir / name
+        if version != LATEST_VERSION:
+            path = path / version
+        return path
+
+    def _source_files(self, path: Path) -> Dict[str, Path]:
+        """Template part files present in a template directory."""
+        return {
+            part: path / filename
+            for part, filename in TEMPLATE_PARTS.items()
+            if (path / filename).is_file()
+        }
+
+    def _source_mtime(self, files: Dict[str, Path]) -> float:
+        """Most recent modification time across a template's files."""
+        return max((f.stat().st_mtime for f in files.values()), default=0.0)
+
+    def _compile(self, name: str, version: str) -> CompiledEmailTemplate:
+        """Read a template's files from disk and compile each part."""
+        path = self._template_path(name, version)
+        files = self._source_files(path)
+        if not files:
+            raise EmailTemplateError(
+                f"Template '{name}' ({version}) not found",
+                template_name=name,
+                details={"path": str(path)}
+            )
+
+        parts: Dict[str, Template] = {}
+        variables: Dict[str, frozenset] = {}
+        digest = hashlib.sha256()
+
+        for part, file_path in files.items():
+            source = file_path.read_text(encoding="utf-8")
+            env = self._html_env if part == "html" else self._text_env
+            digest.update(part.encode())
+            digest.update(source.encode())
+
+            try:
+                ast = env.parse(source)
+                variables[part] = frozenset(meta.find_undeclared_variables(ast))
+                parts[part] = env.from_string(source)
+            except TemplateSyntaxError as e:
+                raise EmailTemplateError(
+                    f"Template '{name}' ({version}) part '{part}' has a syntax error "
+                    f"on line {e.lineno}: {e.message}",
+                    template_name=name,
+                    details={"part": part, "line": e.lineno}
+                )
+
+        compiled = CompiledEmailTemplate(
+            name=name,
+            version=version,
+            parts=parts,
+            variables=variables,
+            fingerprint=digest.hexdigest()[:12],
+            source_mtime=self._source_mtime(files)
+        )
+
+        logger.debug("Email template compiled",
+                    template_name=name,
+                    version=version,
+                    fingerprint=compiled.fingerprint)
+        return compiled
+
+    def _is_stale(self, compiled: CompiledEmailTemplate) -> bool:
+        """Check whether a cached template's files changed on disk."""
+        files = self._source_files(self._template_path(compiled.name, compiled.version))
+        return self._source_mtime(files) != compiled.source_mtime
+
+    def get_template(self, name: str, version: Optional[str] = None) -> CompiledEmailTemplate:
+        """Get a compiled template, compiling it on first use."""
+        key = (name, version or LATEST_VERSION)
+        compiled = self._cache.get(key)
+
+        if compiled is not None and not (self.auto_reload and self._is_stale(compiled)):
+            return compiled
+
+        with self._lock:
+            compiled = self._cache.get(key)
+            if compiled is None or (self.auto_reload and self._is_stale(compiled)):
+                if compiled is not None:
+                    logger.info("Reloading changed email template", template_name=name, version=key[1])
+                compiled = self._compile(*key)
+                self._cache[key] = compiled
+
+        return compiled
+
+    def render(
+        self,
+        name: str,
+        context: Dict[str, Any],
+        version: Optional[str] = None
+    ) -> RenderedEmail:
+        """Render a template against one context."""
+        return self.get_template(name, version).render(context)
+
+    def render_batch(
+        self,
+        name: str,
+        contexts: List[Dict[str, Any]],
+        version: Optional[str] = None,
+        skip_invalid: bool = False
+    ) -> List[Optional[RenderedEmail]]:
+        """Render one template against many contexts.
+
+        The template is resolved and compiled once for the whole batch. With
+        ``skip_invalid`` a context that fails to render yields ``None`` in its
+        slot instead of aborting the batch.
+        """
+        compiled = self.get_template(name, version)
+        rendered: List[Optional[RenderedEmail]] = []
+
+        for index, context in enumerate(contexts):
+            try:
+                rendered.append(compiled.render(context))
+            except EmailTemplateError as e:
+                if not skip_invalid:
+                    e.details["index"] = index
+                    raise
+                logger.warning("Skipping email context that failed to render",
+                              template_name=name,
+                              index=index,
+                              missing_variables=e.missing_variables)
+                rendered.append(None)
+
+        return rendered
+
+    def preload(self) -> int:
+        """Compile every template found under the template directory."""
+        count = 0
+        if not self.template_dir.is_dir():
+            return count
+
+        for path in sorted(self.template_dir.iterdir()):
+            if path.is_dir() and self._source_files(path):
+                self.get_template(path.name)
+                count += 1
+        return count
+
+    def clear_cache(self) -> None:
+        """Drop every compiled template."""
+        with self._lock:
+            self._cache.clear()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get cache statistics."""
+        return {
+            "template_dir": str(self.template_dir),
+            "auto_reload": self.auto_reload,
+            "cached_templates": [
+                {
+                    "name": compiled.name,
+                    "version": compiled.version,
+                    "fingerprint": compiled.fingerprint,
+                    "render_count": compiled.render_count
+                }
+                for compiled in self._cache.values()
+            ]
+        }
+
+
+# Global template engine instance
+_template_engine: Optional[EmailTemplateEngine] = None
+
+
+def get_template_engine() -> EmailTemplateEngine:
+    """Get or create the email template engine."""
+    global _template_engine
+    if _template_engine is None:
+        _template_engine = EmailTemplateEngine(
+            template_dir=settings.EMAIL_TEMPLATE_DIR,
+            auto_reload=settings.EMAIL_TEMPLATE_AUTO_RELOAD
+        )
+    return _template_engine
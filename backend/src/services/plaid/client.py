@@ -41,8 +41,8 @@ class PlaidClient:
             }
         )
         
-        api_client = ApiClient(configuration)
-        self.client = plaid_api.PlaidApi(api_client)
+        self.api_client = ApiClient(configuration)
+        self.client = plaid_api.PlaidApi(self.api_client)
         
         # Rate limiting tracking
         self.last_request_time = 0
@@ -54,6 +54,22 @@ class PlaidClient:
         self.products = settings.plaid_products_list
         self.country_codes = settings.plaid_country_codes_list
     
+    def get_pool_stats(self) -> Dict[str, Any]:
+        """Get HTTP connection pool usage per Plaid host."""
+        pool_manager = self.api_client.rest_client.pool_manager
+        hosts = {}
+        for key in list(pool_manager.pools.keys()):
+            pool = pool_manager.pools.get(key)
+            if pool is None:
+                continue
+            hosts[pool.host] = {
+                "max_size": pool.pool.maxsize if pool.pool else 0,
+                "idle_connections": pool.pool.qsize() if pool.pool else 0,
+                "connections_opened": pool.num_connections,
+                "requests": pool.num_requests
+            }
+        return {"hosts": hosts}
+    
     def _get_plaid_host(self):
         """Get Plaid host based on environment."""
         env_mapping = {
@@ -545,4 +561,9 @@ def get_plaid_client() -> PlaidClient:
     if _plaid_client is None:
         _plaid_client = PlaidClient()
     
-    return _plaid_client
\ No newline at end of file
+    return _plaid_client
+
+
+def get_plaid_pool_stats() -> Optional[Dict[str, Any]]:
+    """Get the Plaid client's pool usage, if the client has been created."""
+    return _plaid_client.get_pool_stats() if _plaid_client else None
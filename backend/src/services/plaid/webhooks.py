@@ -109,16 +109,10 @@ class WebhookService:
                 raise ValidationError("Missing required webhook fields")
             
             # Extract tenant_id from metadata or item_id
-            tenant_id = await self._extract_tenant_id(item_id)
+            tenant_id = await self.resolve_tenant_id(item_id)
             
-            # Process event
-            result = await self._process_event(payload, tenant_id)
-            
-            # Acknowledge webhook
-            try:
-                await self.plaid_client.acknowledge_webhook(webhook_code, webhook_type)
-            except Exception as e:
-                logger.warning("Failed to acknowledge webhook", error=str(e))
+            # Process and acknowledge event
+            result = await self.handle_event(payload, tenant_id)
             
             return {
                 "webhook_type": webhook_type,
@@ -134,6 +128,29 @@ class WebhookService:
             logger.error("Plaid webhook processing failed", error=str(e))
             raise PlaidError(f"Webhook processing failed: {str(e)}")
     
+    async def handle_event(
+        self,
+        payload: Dict[str, Any],
+        tenant_id: Optional[str]
+    ) -> Dict[str, Any]:
+        """Run the registered handler for a webhook and acknowledge it."""
+        result = await self._process_event(payload, tenant_id)
+        
+        try:
+            await self.plaid_client.acknowledge_webhook(
+                payload.get("webhook_code"), payload.get("webhook_type")
+            )
+        except Exception as e:
+            logger.warning("Failed to acknowledge webhook", error=str(e))
+        
+        return result
+    
+    async def resolve_tenant_id(self, item_id: Optional[str]) -> Optional[str]:
+        """Resolve the tenant that owns a Plaid item."""
+        if not item_id:
+            return None
+        return await self._extract_tenant_id(item_id)
+    
     async def _process_event(
         self,
         payload: Dict[str, Any],
@@ -164,20 +181,19 @@ class WebhookService:
             return {"status": "no_handler", "webhook_code": webhook_code}
     
     async def _extract_tenant_id(self, item_id: str) -> Optional[str]:
-        """Extract tenant_id from item_id by looking up in database."""
+        """Extract tenant_id from item_id using the global item routing index."""
         try:
-            from src.accounts.repository import AccountRepository
+            from src.tenant.routing import get_plaid_item_index
+            
+            tenant_id = await get_plaid_item_index().get_tenant_id(item_id)
+            if tenant_id:
+                return tenant_id
+            
+            # Items linked before the index existed resolve through the request context
             from src.tenant.context import get_tenant_context
             
-            # In a multi-tenant system, we'd need to search across all tenants
-            # For now, we'll check if we're in a tenant context
-            try:
-                tenant_context = get_tenant_context()
-                return tenant_context.tenant_id
-            except:
-                # If no tenant context, we'd need to query across tenant databases
-                # This is a more complex operation that would require admin-level access
-                return None
+            tenant_context = get_tenant_context()
+            return tenant_context.tenant_id if tenant_context else None
                 
         except Exception as e:
             logger.error("Failed to extract tenant_id from item_id", 
@@ -403,6 +419,15 @@ class WebhookService:
                       tenant_id=tenant_id,
                       item_id=item_id)
         
+        # Stop routing further webhooks for this item to the tenant
+        if item_id:
+            try:
+                from src.tenant.routing import get_plaid_item_index
+                await get_plaid_item_index().remove(item_id)
+            except Exception as e:
+                logger.error("Failed to remove Plaid item route",
+                            item_id=item_id, error=str(e))
+        
         # TODO: Handle permission revocation
         # - Disable item and stop syncing
         # - Notify user about revoked access
@@ -356,6 +356,11 @@ def cache_key_for_budget(budget_id: str, operation: str) -> str:
     return f"budget:{budget_id}:{operation}"
 
 
+def cache_key_for_family(family_id: str, operation: str) -> str:
+    """Generate cache key for family-specific operations."""
+    return f"family:{family_id}:{operation}"
+
+
 # Decorators for caching
 def cached(
     ttl: int = 3600,
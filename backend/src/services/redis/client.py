@@ -117,6 +117,20 @@ class RedisClient:
         self._connected = False
         logger.info("Redis connections closed")
     
+    def get_pool_stats(self) -> Optional[Dict[str, Any]]:
+        """Get connection pool usage without touching the network."""
+        if not self.pool:
+            return None
+        
+        idle = len(getattr(self.pool, "_available_connections", []))
+        in_use = len(getattr(self.pool, "_in_use_connections", []))
+        return {
+            "max_connections": self.pool.max_connections,
+            "open_connections": idle + in_use,
+            "idle_connections": idle,
+            "in_use_connections": in_use
+        }
+    
     @asynccontextmanager
     async def get_connection(self):
         """Get Redis connection with proper error handling."""
@@ -274,6 +288,16 @@ class RedisClient:
             logger.error("Redis SMEMBERS failed", name=name, error=str(e))
             raise
     
+    async def srem(self, name: str, *values: Any) -> int:
+        """Remove members from set."""
+        try:
+            async with self.get_connection() as conn:
+                result = await self.circuit_breaker.call(conn.srem, name, *values)
+                return result
+        except Exception as e:
+            logger.error("Redis SREM failed", name=name, error=str(e))
+            raise
+    
     async def lpush(self, name: str, *values: Any) -> int:
         """Push values to list head."""
         try:
@@ -284,11 +308,11 @@ class RedisClient:
             logger.error("Redis LPUSH failed", name=name, error=str(e))
             raise
     
-    async def rpop(self, name: str) -> Optional[str]:
-        """Pop value from list tail."""
+    async def rpop(self, name: str, count: Optional[int] = None) -> Optional[Union[str, List[str]]]:
+        """Pop value from list tail, or up to ``count`` values in one round trip."""
         try:
             async with self.get_connection() as conn:
-                result = await self.circuit_breaker.call(conn.rpop, name)
+                result = await self.circuit_breaker.call(conn.rpop, name, count)
                 return result
         except Exception as e:
             logger.error("Redis RPOP failed", name=name, error=str(e))
@@ -0,0 +1,187 @@
+"""Redis-backed cache for Stripe API objects with in-flight request coalescing."""
+
+import asyncio
+import hashlib
+import json
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+
+import stripe
+import structlog
+
+from src.config import settings
+
+logger = structlog.get_logger(__name__)
+
+# Catalog objects change rarely and are only refreshed by TTL or price/product events
+CATALOG_KINDS = {"price", "product", "prices", "products"}
+
+CATALOG_SCOPE = "catalog"
+
+
+def params_signature(**params: Any) -> str:
+    """Stable signature for a set of list parameters."""
+    canonical = json.dumps(params, sort_keys=True, default=str)
+    return hashlib.sha1(canonical.encode("utf-8")).hexdigest()[:16]
+
+
+class StripeObjectCache:
+    """Read-through cache for Stripe objects.
+
+    Prices, products and plan pricing are cached for ``catalog_ttl``. Customers,
+    subscriptions and invoices are cached for ``object_ttl`` and invalidated by
+    webhook events and by our own writes. Identical reads that are already in
+    flight share one Stripe request.
+    """
+
+    def __init__(self,
+                 redis_client=None,
+                 catalog_ttl: Optional[int] = None,
+                 object_ttl: Optional[int] = None):
+        self.redis_client = redis_client
+        self.catalog_ttl = catalog_ttl or settings.STRIPE_CATALOG_CACHE_TTL_SECONDS
+        self.object_ttl = object_ttl or settings.STRIPE_OBJECT_CACHE_TTL_SECONDS
+        self._inflight: Dict[str, asyncio.Future] = {}
+
+        # Statistics
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+
+    async def _get_redis(self):
+        if self.redis_client is None:
+            from src.services.redis.client import get_redis_client
+            self.redis_client = await get_redis_client()
+        return self.redis_client
+
+    @staticmethod
+    def _key(kind: str, identifier: str) -> str:
+        return f"stripe:{kind}:{identifier}"
+
+    def _ttl(self, kind: str) -> int:
+        return self.catalog_ttl if kind in CATALOG_KINDS else self.object_ttl
+
+    @staticmethod
+    def _serialize(obj: Any) -> str:
+        # StripeObjects are dict subclasses, so nested objects serialize as plain JSON
+        return json.dumps(obj, default=str)
+
+    @staticmethod
+    def _deserialize(raw: str) -> Any:
+        return stripe.convert_to_stripe_object(json.loads(raw))
+
+    async def get_or_fetch(self,
+                           kind: str,
+                           identifier: str,
+                           fetch: Callable[[], Awaitable[Any]],
+                           field: Optional[str] = None) -> Any:
+        """Return the cached object, or fetch it once for all concurrent callers.
+
+        List results pass ``field`` (a parameter signature) and are stored in a
+        Redis hash per scope, so every cached page can be dropped with one DELETE.
+        """
+        key = self._key(kind, identifier)
+        inflight_key = f"{key}#{field}" if field else key
+        loop = asyncio.get_running_loop()
+
+        task = self._inflight.get(inflight_key)
+        if task is not None and task.get_loop() is loop:
+            self.coalesced += 1
+        else:
+            task = loop.create_task(self._read_through(kind, key, field, fetch))
+            self._inflight[inflight_key] = task
+            task.add_done_callback(lambda done: self._release(inflight_key, done))
+
+        return await asyncio.shield(task)
+
+    def _release(self, inflight_key: str, task: asyncio.Future) -> None:
+        if self._inflight.get(inflight_key) is task:
+            del self._inflight[inflight_key]
+
+    async def _read_through(self,
+                            kind: str,
+                            key: str,
+                            field: Optional[str],
+                            fetch: Callable[[], Awaitable[Any]]) -> Any:
+        cached = await self._read(key, field)
+        if cached is not None:
+            self.hits += 1
+            return self._deserialize(cached)
+
+        self.misses += 1
+        result = await fetch()
+        await self._write(kind, key, field, self._serialize(result))
+        return result
+
+    async def _read(self, key: str, field: Optional[str]) -> Optional[str]:
+        try:
+            redis_client = await self._get_redis()
+            if field:
+                return await redis_client.hget(key, field)
+            return await redis_client.get(key)
+        except Exception as e:
+            logger.warning("Stripe cache read failed", key=key, error=str(e))
+            return None
+
+    async def _write(self, kind: str, key: str, field: Optional[str], value: str) -> None:
+        try:
+            redis_client = await self._get_redis()
+            ttl = self._ttl(kind)
+            if field:
+                await redis_client.hset(key, {field: value})
+                await redis_client.expire(key, ttl)
+            else:
+                await redis_client.set(key, value, ttl=ttl)
+        except Exception as e:
+            logger.warning("Stripe cache write failed", key=key, error=str(e))
+
+    async def invalidate(self, *entries: Tuple[str, str]) -> None:
+        """Drop cached entries given as ``(kind, identifier)`` pairs."""
+        keys = [self._key(kind, identifier) for kind, identifier in entries if identifier]
+        if not keys:
+            return
+
+        try:
+            redis_client = await self._get_redis()
+            await redis_client.delete(*keys)
+        except Exception as e:
+            logger.warning("Stripe cache invalidation failed", keys=keys, error=str(e))
+
+    async def invalidate_customer_billing(self, customer_id: Optional[str]) -> None:
+        """Drop the upcoming invoice and invoice lists cached for a customer."""
+        await self.invalidate(("upcoming_invoice", customer_id), ("invoices", customer_id))
+
+    async def invalidate_for_event(self, event: Dict[str, Any]) -> None:
+        """Drop whatever a webhook event may have changed."""
+        obj = event["data"]["object"]
+        object_type = obj.get("object")
+        object_id = obj.get("id")
+        customer_id = object_id if object_type == "customer" else obj.get("customer")
+        if isinstance(customer_id, dict):
+            customer_id = customer_id.get("id")
+
+        entries = self._entries_for_object(object_type, object_id)
+        if customer_id:
+            entries.extend([("upcoming_invoice", customer_id), ("invoices", customer_id)])
+
+        await self.invalidate(*entries)
+
+    @staticmethod
+    def _entries_for_object(object_type: Optional[str], object_id: Optional[str]) -> list:
+        if object_type in ("customer", "subscription", "invoice"):
+            return [(object_type, object_id)]
+        if object_type == "price":
+            return [("price", object_id), ("prices", CATALOG_SCOPE)]
+        if object_type == "product":
+            return [("product", object_id), ("products", CATALOG_SCOPE), ("prices", CATALOG_SCOPE)]
+        return []
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get cache statistics."""
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "coalesced": self.coalesced,
+            "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0,
+            "in_flight": len(self._inflight)
+        }
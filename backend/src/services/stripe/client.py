@@ -1,23 +1,56 @@
 """Stripe API client with error handling and retry logic."""
 
 import asyncio
+import functools
+from concurrent.futures import ThreadPoolExecutor
 from typing import Dict, Any, Optional, List
 import time
 from datetime import datetime
 
+import requests
 import stripe
 import structlog
+from requests.adapters import HTTPAdapter
 
 from src.config import settings
 from src.exceptions import StripeError
+from .cache import StripeObjectCache, CATALOG_SCOPE, params_signature
 
 logger = structlog.get_logger(__name__)
 
+# The Stripe SDK is synchronous; calls run on a dedicated thread pool sized to
+# the HTTP connection pool so they never block the event loop and every worker
+# thread can reuse a keep-alive connection.
+_executor: Optional[ThreadPoolExecutor] = None
+
+
+def _get_executor() -> ThreadPoolExecutor:
+    global _executor
+
+    if _executor is None:
+        _executor = ThreadPoolExecutor(
+            max_workers=settings.STRIPE_HTTP_POOL_SIZE,
+            thread_name_prefix="stripe"
+        )
+
+    return _executor
+
+
+def _build_http_client(timeout: int) -> stripe.HTTPClient:
+    """Create a Stripe HTTP client backed by a pooled keep-alive session."""
+    session = requests.Session()
+    adapter = HTTPAdapter(
+        pool_connections=settings.STRIPE_HTTP_POOL_SIZE,
+        pool_maxsize=settings.STRIPE_HTTP_POOL_SIZE
+    )
+    session.mount("https://", adapter)
+    return stripe.RequestsClient(timeout=timeout, session=session)
+
 
 class StripeClient:
     """Enhanced Stripe API client with error handling, retries, and monitoring."""
     
-    def __init__(self, api_key: str = None):
+    def __init__(self, api_key: str = None, cache: Optional[StripeObjectCache] = None):
         self.api_key = api_key or settings.STRIPE_SECRET_KEY
         stripe.api_key = self.api_key
         stripe.api_version = "2023-10-16"  # Pin API version for consistency
@@ -27,6 +60,11 @@ class StripeClient:
             "timeout": 30,
             "max_network_retries": 3
         }
+        stripe.max_network_retries = self.default_request_options["max_network_retries"]
+        stripe.default_http_client = _build_http_client(self.default_request_options["timeout"])
+        
+        # Read-through cache for customers, subscriptions, invoices and catalog
+        self.cache = cache or StripeObjectCache()
         
         # Rate limiting tracking
         self.last_request_time = 0
@@ -83,13 +121,13 @@ class StripeClient:
         """Make Stripe API request with error handling and rate limiting."""
         await self._handle_rate_limiting()
         
-        # Add default request options
-        if "request_options" not in kwargs:
-            kwargs["request_options"] = self.default_request_options.copy()
-        
         try:
             start_time = time.time()
-            result = func(*args, **kwargs)
+            loop = asyncio.get_running_loop()
+            result = await loop.run_in_executor(
+                _get_executor(),
+                functools.partial(func, *args, **kwargs)
+            )
             response_time = (time.time() - start_time) * 1000
             
             logger.debug(
@@ -130,10 +168,10 @@ class StripeClient:
     
     async def get_customer(self, customer_id: str) -> stripe.Customer:
         """Get Stripe customer by ID."""
-        return await self._make_request(
-            "get_customer",
-            stripe.Customer.retrieve,
-            customer_id
+        return await self.cache.get_or_fetch(
+            "customer",
+            customer_id,
+            lambda: self._make_request("get_customer", stripe.Customer.retrieve, customer_id)
         )
     
     async def update_customer(
@@ -142,20 +180,25 @@ class StripeClient:
         **kwargs
     ) -> stripe.Customer:
         """Update Stripe customer."""
-        return await self._make_request(
+        customer = await self._make_request(
             "update_customer",
             stripe.Customer.modify,
             customer_id,
             **kwargs
         )
+        await self.cache.invalidate(("customer", customer_id))
+        return customer
     
     async def delete_customer(self, customer_id: str) -> stripe.Customer:
         """Delete Stripe customer."""
-        return await self._make_request(
+        result = await self._make_request(
             "delete_customer",
             stripe.Customer.delete,
             customer_id
         )
+        await self.cache.invalidate(("customer", customer_id))
+        await self.cache.invalidate_customer_billing(customer_id)
+        return result
     
     # Subscription operations
     async def create_subscription(
@@ -178,18 +221,20 @@ class StripeClient:
         
         params.update(kwargs)
         
-        return await self._make_request(
+        subscription = await self._make_request(
             "create_subscription",
             stripe.Subscription.create,
             **params
         )
+        await self.cache.invalidate_customer_billing(customer_id)
+        return subscription
     
     async def get_subscription(self, subscription_id: str) -> stripe.Subscription:
         """Get Stripe subscription by ID."""
-        return await self._make_request(
-            "get_subscription",
-            stripe.Subscription.retrieve,
-            subscription_id
+        return await self.cache.get_or_fetch(
+            "subscription",
+            subscription_id,
+            lambda: self._make_request("get_subscription", stripe.Subscription.retrieve, subscription_id)
         )
     
     async def update_subscription(
@@ -198,12 +243,14 @@ class StripeClient:
         **kwargs
     ) -> stripe.Subscription:
         """Update Stripe subscription."""
-        return await self._make_request(
+        subscription = await self._make_request(
             "update_subscription",
             stripe.Subscription.modify,
             subscription_id,
             **kwargs
         )
+        await self._invalidate_subscription(subscription)
+        return subscription
     
     async def cancel_subscription(
         self,
@@ -212,18 +259,26 @@ class StripeClient:
     ) -> stripe.Subscription:
         """Cancel Stripe subscription."""
         if at_period_end:
-            return await self._make_request(
+            subscription = await self._make_request(
                 "cancel_subscription",
                 stripe.Subscription.modify,
                 subscription_id,
                 cancel_at_period_end=True
             )
         else:
-            return await self._make_request(
+            subscription = await self._make_request(
                 "cancel_subscription",
                 stripe.Subscription.delete,
                 subscription_id
             )
+        
+        await self._invalidate_subscription(subscription)
+        return subscription
+    
+    async def _invalidate_subscription(self, subscription: stripe.Subscription) -> None:
+        """Drop cached copies of a subscription and its customer's invoices."""
+        await self.cache.invalidate(("subscription", subscription["id"]))
+        await self.cache.invalidate_customer_billing(subscription.get("customer"))
     
     async def list_subscriptions(
         self,
@@ -293,10 +348,10 @@ class StripeClient:
     # Invoice operations
     async def get_upcoming_invoice(self, customer_id: str) -> stripe.Invoice:
         """Get upcoming invoice for customer."""
-        return await self._make_request(
-            "get_upcoming_invoice",
-            stripe.Invoice.upcoming,
-            customer=customer_id
+        return await self.cache.get_or_fetch(
+            "upcoming_invoice",
+            customer_id,
+            lambda: self._make_request("get_upcoming_invoice", stripe.Invoice.upcoming, customer=customer_id)
         )
     
     async def list_invoices(
@@ -312,10 +367,11 @@ class StripeClient:
         }
         params.update(kwargs)
         
-        return await self._make_request(
-            "list_invoices",
-            stripe.Invoice.list,
-            **params
+        return await self.cache.get_or_fetch(
+            "invoices",
+            customer_id,
+            lambda: self._make_request("list_invoices", stripe.Invoice.list, **params),
+            field=params_signature(**params)
         )
     
     # Price and Product operations
@@ -334,27 +390,28 @@ class StripeClient:
         if product:
             params["product"] = product
         
-        return await self._make_request(
-            "list_prices",
-            stripe.Price.list,
-            **params
+        return await self.cache.get_or_fetch(
+            "prices",
+            CATALOG_SCOPE,
+            lambda: self._make_request("list_prices", stripe.Price.list, **params),
+            field=params_signature(**params)
         )
     
     async def get_price(self, price_id: str) -> stripe.Price:
         """Get Stripe price by ID."""
-        return await self._make_request(
-            "get_price",
-            stripe.Price.retrieve,
-            price_id
+        return await self.cache.get_or_fetch(
+            "price",
+            price_id,
+            lambda: self._make_request("get_price", stripe.Price.retrieve, price_id)
         )
     
     async def list_products(self, active: bool = True, limit: int = 100) -> stripe.ListObject:
         """List Stripe products."""
-        return await self._make_request(
-            "list_products",
-            stripe.Product.list,
-            active=active,
-            limit=limit
+        return await self.cache.get_or_fetch(
+            "products",
+            CATALOG_SCOPE,
+            lambda: self._make_request("list_products", stripe.Product.list, active=active, limit=limit),
+            field=params_signature(active=active, limit=limit)
         )
     
     # Portal operations
@@ -443,7 +500,8 @@ class StripeClient:
                     "charges_enabled": account.charges_enabled,
                     "payouts_enabled": account.payouts_enabled,
                     "response_time_ms": round(response_time, 2),
-                    "api_version": stripe.api_version
+                    "api_version": stripe.api_version,
+                    "cache": self.cache.get_stats()
                 }
             })
             
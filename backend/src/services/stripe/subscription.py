@@ -1,5 +1,6 @@
 """Stripe subscription management service."""
 
+import asyncio
 from typing import Dict, Any, Optional, List
 from datetime import datetime, timezone
 from enum import Enum
@@ -151,7 +152,7 @@ class SubscriptionService:
             customer = await self.stripe_client.get_customer(subscription.customer)
             
             # Get plan details
-            price = subscription.items.data[0].price
+            price = subscription["items"].data[0].price
             plan_type = PlanType(subscription.metadata.get("plan_type", "personal"))
             plan_config = self.plan_configs.get(plan_type, {})
             
@@ -206,7 +207,7 @@ class SubscriptionService:
             updated_subscription = await self.stripe_client.update_subscription(
                 subscription_id,
                 items=[{
-                    "id": subscription.items.data[0].id,
+                    "id": subscription["items"].data[0].id,
                     "price": new_plan_config["price_id"]
                 }],
                 proration_behavior="create_prorations" if prorate else "none",
@@ -436,6 +437,30 @@ class SubscriptionService:
                         error=str(e))
             raise StripeError(f"Failed to get billing history: {str(e)}")
     
+    async def get_billing_overview(
+        self,
+        tenant_id: str,
+        subscription_id: str,
+        customer_id: str,
+        limit: int = 10
+    ) -> Dict[str, Any]:
+        """Get subscription, upcoming invoice and billing history in one round trip.
+        
+        The three reads run concurrently; their overlapping customer lookups are
+        coalesced by the client cache into a single Stripe request.
+        """
+        subscription, upcoming_invoice, billing_history = await asyncio.gather(
+            self.get_subscription_details(tenant_id, subscription_id),
+            self.get_upcoming_invoice(tenant_id, customer_id),
+            self.get_billing_history(tenant_id, customer_id, limit=limit)
+        )
+        
+        return {
+            "subscription": subscription,
+            "upcoming_invoice": upcoming_invoice,
+            "billing_history": billing_history
+        }
+    
     async def create_billing_portal_session(
         self,
         tenant_id: str,
@@ -479,6 +504,27 @@ class SubscriptionService:
         """Get all available plans."""
         return {plan.value: config for plan, config in self.plan_configs.items()}
     
+    async def get_all_plans_with_pricing(self) -> Dict[str, Dict[str, Any]]:
+        """Get all available plans with their current Stripe pricing.
+        
+        Prices come from the client's catalog cache, so this only reaches Stripe
+        once per catalog TTL.
+        """
+        plans = list(self.plan_configs.items())
+        prices = await asyncio.gather(
+            *(self.stripe_client.get_price(config["price_id"]) for _, config in plans)
+        )
+        
+        return {
+            plan.value: {
+                **config,
+                "amount": price.unit_amount,
+                "currency": price.currency,
+                "interval": price.recurring.interval if price.recurring else None
+            }
+            for (plan, config), price in zip(plans, prices)
+        }
+    
     async def validate_plan_limits(
         self,
         tenant_id: str,
@@ -1,7 +1,7 @@
 """Stripe webhook handling service."""
 
 import json
-from typing import Dict, Any, Callable, Optional
+from typing import Dict, Any, Callable, Optional, List
 from datetime import datetime, timezone
 from enum import Enum
 
@@ -105,6 +105,16 @@ class WebhookService:
         self.event_handlers[event_type] = handler
         logger.debug("Webhook handler registered", event_type=event_type)
     
+    def verify_webhook(self, payload: bytes, signature_header: str) -> stripe.Event:
+        """Verify the webhook signature and build the event without processing it."""
+        try:
+            return self.stripe_client.construct_event(
+                payload, signature_header, self.webhook_secret
+            )
+        except stripe.error.SignatureVerificationError as e:
+            logger.error("Webhook signature verification failed", error=str(e))
+            raise StripeError(f"Invalid webhook signature: {str(e)}")
+    
     async def process_webhook(
         self,
         payload: bytes,
@@ -113,9 +123,7 @@ class WebhookService:
         """Process incoming webhook event."""
         try:
             # Verify webhook signature
-            event = self.stripe_client.construct_event(
-                payload, signature_header, self.webhook_secret
-            )
+            event = self.verify_webhook(payload, signature_header)
             
             event_type = event["type"]
             event_data = event["data"]["object"]
@@ -136,21 +144,28 @@ class WebhookService:
                 "timestamp": datetime.now(timezone.utc).isoformat()
             }
             
-        except stripe.error.SignatureVerificationError as e:
-            logger.error("Webhook signature verification failed", error=str(e))
-            raise StripeError(f"Invalid webhook signature: {str(e)}")
+        except StripeError:
+            raise
         
         except Exception as e:
             logger.error("Webhook processing failed", error=str(e))
             raise StripeError(f"Webhook processing failed: {str(e)}")
     
-    async def _process_event(self, event: stripe.Event) -> Dict[str, Any]:
+    async def _process_event(
+        self,
+        event: stripe.Event,
+        tenant_id: Optional[str] = None
+    ) -> Dict[str, Any]:
         """Process individual webhook event."""
         event_type = event["type"]
         event_data = event["data"]["object"]
         
         # Get tenant_id from event metadata
-        tenant_id = self._extract_tenant_id(event_data)
+        if tenant_id is None:
+            tenant_id = self._extract_tenant_id(event_data)
+        
+        # Drop cached copies of whatever this event changed before handlers re-read them
+        await self.stripe_client.cache.invalidate_for_event(event)
         
         # Find and execute handler
         handler = self.event_handlers.get(event_type)
@@ -173,24 +188,40 @@ class WebhookService:
             logger.warning("No handler for webhook event", event_type=event_type)
             return {"status": "no_handler", "event_type": event_type}
     
+    async def handle_event(
+        self,
+        event: Dict[str, Any],
+        tenant_id: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """Run the registered handler for an already-verified event."""
+        return await self._process_event(event, tenant_id)
+    
+    def get_metadata_tenant_id(self, event_data: Dict[str, Any]) -> Optional[str]:
+        """Read tenant_id from event metadata without calling the Stripe API."""
+        metadata = event_data.get("metadata")
+        if metadata:
+            return metadata.get("tenant_id")
+        return None
+    
     def _extract_tenant_id(self, event_data: Dict[str, Any]) -> Optional[str]:
         """Extract tenant_id from event data metadata."""
         # Try to get tenant_id from various places in event data
-        if hasattr(event_data, 'metadata') and event_data.metadata:
-            return event_data.metadata.get("tenant_id")
+        tenant_id = self.get_metadata_tenant_id(event_data)
+        if tenant_id:
+            return tenant_id
         
         # For invoice events, try to get from subscription
-        if hasattr(event_data, 'subscription') and event_data.subscription:
+        if event_data.get("subscription"):
             try:
-                subscription = stripe.Subscription.retrieve(event_data.subscription)
+                subscription = stripe.Subscription.retrieve(event_data["subscription"])
                 return subscription.metadata.get("tenant_id")
             except:
                 pass
         
         # For customer events, try to get from customer
-        if hasattr(event_data, 'customer') and event_data.customer:
+        if event_data.get("customer"):
             try:
-                customer = stripe.Customer.retrieve(event_data.customer)
+                customer = stripe.Customer.retrieve(event_data["customer"])
                 return customer.metadata.get("tenant_id")
             except:
                 pass
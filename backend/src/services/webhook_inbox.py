@@ -0,0 +1,552 @@
+"""Durable webhook inbox.
+
+Incoming Stripe and Plaid webhooks are verified, deduplicated on their event id,
+persisted and queued per tenant, and acknowledged immediately. Celery workers
+drain each tenant queue in arrival order under a per-tenant lock, running the
+existing handler registries in batches. Persisted Stripe events that were never
+drained are re-enqueued from ``SubscriptionEventRepository.get_unprocessed_events``.
+"""
+
+import hashlib
+import json
+import uuid
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field, asdict
+from datetime import datetime, timedelta
+from typing import Any, Callable, Dict, List, Optional
+
+import structlog
+
+from src.config import settings
+from src.exceptions import ValidationError
+from src.tenant.context import (
+    TenantContext,
+    get_tenant_context,
+    set_tenant_context,
+    clear_tenant_context
+)
+
+logger = structlog.get_logger(__name__)
+
+STRIPE_SOURCE = "stripe"
+PLAID_SOURCE = "plaid"
+
+# Queue for events whose tenant could not be resolved cheaply at ingest time
+UNROUTED_TENANT = "_unrouted"
+PENDING_TENANTS_KEY = "webhook:pending_tenants"
+
+# Plaid transaction webhooks all trigger the same sync for an item, so repeats
+# within one batch only need to be handled once
+COALESCED_PLAID_CODES = {"INITIAL_UPDATE", "HISTORICAL_UPDATE", "DEFAULT_UPDATE"}
+
+
+@dataclass
+class InboxEvent:
+    """A verified webhook event waiting to be processed."""
+    source: str
+    event_id: str
+    event_type: str
+    payload: Dict[str, Any]
+    tenant_id: Optional[str] = None
+    record_id: Optional[str] = None
+    received_at: str = field(default_factory=lambda: datetime.utcnow().isoformat())
+
+    @property
+    def queue_tenant(self) -> str:
+        """Tenant queue this event belongs to."""
+        return self.tenant_id or UNROUTED_TENANT
+
+    def to_json(self) -> str:
+        return json.dumps(asdict(self), default=str)
+
+    @classmethod
+    def from_json(cls, raw: str) -> "InboxEvent":
+        return cls(**json.loads(raw))
+
+
+@dataclass
+class DrainResult:
+    """Outcome of draining one batch from a tenant queue."""
+    tenant_id: str
+    processed: int = 0
+    failed: int = 0
+    coalesced: int = 0
+    rerouted: int = 0
+    remaining: int = 0
+    locked: bool = False
+
+    def to_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+
+def plaid_event_id(payload: Dict[str, Any]) -> str:
+    """Derive a stable event id for a Plaid webhook.
+
+    Plaid does not send an event id, but retries deliver an identical body.
+    """
+    canonical = json.dumps(payload, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+class WebhookInbox:
+    """Accepts webhooks quickly and processes them asynchronously per tenant."""
+
+    def __init__(self,
+                 redis_client=None,
+                 stripe_service=None,
+                 plaid_service=None,
+                 event_repository=None,
+                 dispatcher: Optional[Callable[[str], Any]] = None):
+        self.redis_client = redis_client
+        self.stripe_service = stripe_service
+        self.plaid_service = plaid_service
+        self.event_repository = event_repository
+        self.dispatcher = dispatcher or self._dispatch_drain_task
+        self._tenant_contexts: Dict[str, TenantContext] = {}
+
+    # Redis keys
+    @staticmethod
+    def _seen_key(source: str, event_id: str) -> str:
+        return f"webhook:seen:{source}:{event_id}"
+
+    @staticmethod
+    def _queue_key(tenant_id: str) -> str:
+        return f"webhook:queue:{tenant_id}"
+
+    @staticmethod
+    def _lock_key(tenant_id: str) -> str:
+        return f"webhook:lock:{tenant_id}"
+
+    @staticmethod
+    def _dead_letter_key(tenant_id: str) -> str:
+        return f"webhook:dead:{tenant_id}"
+
+    # Lazily created collaborators
+    async def _get_redis(self):
+        if self.redis_client is None:
+            from src.services.redis.client import get_redis_client
+            self.redis_client = await get_redis_client()
+        return self.redis_client
+
+    def _get_stripe_service(self):
+        if self.stripe_service is None:
+            from src.services.stripe import WebhookService as StripeWebhookService
+            self.stripe_service = StripeWebhookService()
+        return self.stripe_service
+
+    def _get_plaid_service(self):
+        if self.plaid_service is None:
+            from src.services.plaid import WebhookService as PlaidWebhookService
+            self.plaid_service = PlaidWebhookService()
+        return self.plaid_service
+
+    def _get_event_repository(self):
+        if self.event_repository is None:
+            from src.subscriptions.repository import SubscriptionEventRepository
+            self.event_repository = SubscriptionEventRepository()
+        return self.event_repository
+
+    @staticmethod
+    def _dispatch_drain_task(tenant_id: str) -> None:
+        from src.services.background.tasks import process_webhook_inbox
+        process_webhook_inbox.delay(tenant_id)
+
+    async def _load_tenant_context(self, tenant_id: str) -> Optional[TenantContext]:
+        """Load and memoize the tenant context used to reach the tenant database."""
+        if tenant_id not in self._tenant_contexts:
+            from src.tenant.service import TenantService
+            context = await TenantService().get_tenant_context(tenant_id)
+            if context is None:
+                return None
+            self._tenant_contexts[tenant_id] = context
+        return self._tenant_contexts[tenant_id]
+
+    @asynccontextmanager
+    async def _tenant_scope(self, tenant_id: str):
+        """Run the enclosed block against the tenant's database."""
+        context = await self._load_tenant_context(tenant_id)
+        if context is None:
+            raise ValidationError(f"Unknown or inactive tenant: {tenant_id}")
+
+        previous = get_tenant_context()
+        set_tenant_context(context)
+        try:
+            yield context
+        finally:
+            if previous:
+                set_tenant_context(previous)
+            else:
+                clear_tenant_context()
+
+    # Ingestion (request path)
+    async def accept_stripe(self, payload: bytes, signature_header: str) -> Dict[str, Any]:
+        """Verify and enqueue a Stripe webhook."""
+        stripe_service = self._get_stripe_service()
+        stripe_service.verify_webhook(payload, signature_header)
+
+        # Store the raw JSON rather than the StripeObject so it survives serialization
+        event = json.loads(payload)
+        tenant_id = stripe_service.get_metadata_tenant_id(event["data"]["object"])
+
+        return await self.accept(InboxEvent(
+            source=STRIPE_SOURCE,
+            event_id=event["id"],
+            event_type=event["type"],
+            payload=event,
+            tenant_id=tenant_id
+        ))
+
+    async def accept_plaid(self, payload: Dict[str, Any]) -> Dict[str, Any]:
+        """Validate and enqueue a Plaid webhook."""
+        webhook_type = payload.get("webhook_type")
+        webhook_code = payload.get("webhook_code")
+        if not webhook_type or not webhook_code:
+            raise ValidationError("Missing required webhook fields")
+
+        tenant_id = await self._get_plaid_service().resolve_tenant_id(payload.get("item_id"))
+
+        return await self.accept(InboxEvent(
+            source=PLAID_SOURCE,
+            event_id=plaid_event_id(payload),
+            event_type=f"{webhook_type}.{webhook_code}",
+            payload=payload,
+            tenant_id=tenant_id
+        ))
+
+    async def accept(self, event: InboxEvent) -> Dict[str, Any]:
+        """Deduplicate, persist and enqueue an event without processing it."""
+        redis_client = await self._get_redis()
+
+        if not await self._mark_seen(redis_client, event):
+            logger.info("Duplicate webhook ignored",
+                       source=event.source,
+                       event_id=event.event_id,
+                       event_type=event.event_type)
+            return self._receipt(event, duplicate=True, queued=False)
+
+        if event.tenant_id and await self._load_tenant_context(event.tenant_id) is None:
+            logger.warning("Webhook names an unknown tenant", event_id=event.event_id, tenant_id=event.tenant_id)
+            event.tenant_id = None
+
+        if event.source == STRIPE_SOURCE and event.tenant_id:
+            try:
+                record = await self._persist(event)
+            except Exception:
+                # Let the provider's retry through instead of dropping the event
+                await self._forget(redis_client, event)
+                raise
+
+            if record is None:
+                logger.info("Duplicate webhook ignored",
+                           source=event.source,
+                           event_id=event.event_id,
+                           tenant_id=event.tenant_id)
+                return self._receipt(event, duplicate=True, queued=False)
+            event.record_id = record.id
+
+        queued = await self._enqueue(redis_client, event.queue_tenant, [event])
+
+        if not queued and event.record_id is None:
+            # Nothing durable holds this event, so process it inline as before
+            logger.warning("Webhook queue unavailable, processing inline",
+                          source=event.source,
+                          event_id=event.event_id)
+            try:
+                await self._handle(event)
+            except Exception:
+                # Let the provider's retry through instead of dropping the event
+                await self._forget(redis_client, event)
+                raise
+
+        logger.info("Webhook accepted",
+                   source=event.source,
+                   event_id=event.event_id,
+                   event_type=event.event_type,
+                   tenant_id=event.tenant_id,
+                   queued=queued)
+
+        return self._receipt(event, duplicate=False, queued=queued)
+
+    @staticmethod
+    def _receipt(event: InboxEvent, duplicate: bool, queued: bool) -> Dict[str, Any]:
+        return {
+            "event_id": event.event_id,
+            "event_type": event.event_type,
+            "duplicate": duplicate,
+            "queued": queued
+        }
+
+    async def _mark_seen(self, redis_client, event: InboxEvent) -> bool:
+        """SET NX the event id; False means it was already seen.
+
+        If Redis is unavailable the event is treated as new and the unique
+        ``stripe_event_id`` row remains the idempotency check.
+        """
+        try:
+            return bool(await redis_client.set(
+                self._seen_key(event.source, event.event_id),
+                "1",
+                ttl=settings.WEBHOOK_DEDUPE_TTL_SECONDS,
+                nx=True
+            ))
+        except Exception as e:
+            logger.warning("Webhook dedupe check failed", event_id=event.event_id, error=str(e))
+            return True
+
+    async def _forget(self, redis_client, event: InboxEvent) -> None:
+        try:
+            await redis_client.delete(self._seen_key(event.source, event.event_id))
+        except Exception as e:
+            logger.warning("Failed to clear webhook dedupe key", event_id=event.event_id, error=str(e))
+
+    async def _persist(self, event: InboxEvent):
+        """Record the event in the tenant database; None if already recorded."""
+        async with self._tenant_scope(event.tenant_id):
+            return await self._get_event_repository().record_webhook_event(
+                stripe_event_id=event.event_id,
+                event_type=event.event_type,
+                event_data=event.payload
+            )
+
+    async def _enqueue(self,
+                       redis_client,
+                       tenant_id: str,
+                       events: List[InboxEvent],
+                       dispatch: bool = True) -> bool:
+        """Append events to the tenant queue and schedule a drain."""
+        try:
+            await redis_client.lpush(self._queue_key(tenant_id), *[e.to_json() for e in events])
+            await redis_client.sadd(PENDING_TENANTS_KEY, tenant_id)
+        except Exception as e:
+            logger.error("Failed to enqueue webhook events", tenant_id=tenant_id, error=str(e))
+            return False
+
+        if dispatch:
+            try:
+                self.dispatcher(tenant_id)
+            except Exception as e:
+                # The periodic sweep picks up pending queues
+                logger.warning("Failed to dispatch webhook drain", tenant_id=tenant_id, error=str(e))
+        return True
+
+    # Processing (worker path)
+    async def drain(self, tenant_id: str, batch_size: Optional[int] = None) -> DrainResult:
+        """Process the next batch from a tenant queue in arrival order."""
+        redis_client = await self._get_redis()
+        batch_size = batch_size or settings.WEBHOOK_BATCH_SIZE
+        queue_key = self._queue_key(tenant_id)
+        lock_key = self._lock_key(tenant_id)
+        token = str(uuid.uuid4())
+        result = DrainResult(tenant_id=tenant_id)
+
+        # One drainer per tenant keeps events in order
+        if not await redis_client.set(lock_key, token, ttl=settings.WEBHOOK_LOCK_TTL_SECONDS, nx=True):
+            result.locked = True
+            return result
+
+        try:
+            raw_events = await redis_client.rpop(queue_key, batch_size) or []
+            events = [InboxEvent.from_json(raw) for raw in raw_events]
+
+            if events and tenant_id == UNROUTED_TENANT:
+                await self._process_unrouted(redis_client, events, result)
+            elif events:
+                await self._process_batch(redis_client, tenant_id, events, result)
+        finally:
+            if await redis_client.get(lock_key) == token:
+                await redis_client.delete(lock_key)
+
+        # Checked after releasing the lock so events that arrived meanwhile are not stranded
+        result.remaining = await redis_client.llen(queue_key)
+        if result.remaining == 0:
+            await redis_client.srem(PENDING_TENANTS_KEY, tenant_id)
+
+        logger.info("Webhook inbox drained", **result.to_dict())
+        return result
+
+    def _coalesce(self, events: List[InboxEvent], result: DrainResult) -> List[InboxEvent]:
+        """Drop repeated events that a single handler run already covers."""
+        seen = set()
+        batch = []
+        for event in events:
+            if event.source == PLAID_SOURCE:
+                code = event.payload.get("webhook_code")
+                key = (PLAID_SOURCE, event.payload.get("item_id"), code) if code in COALESCED_PLAID_CODES else None
+            else:
+                key = (event.source, event.event_id)
+
+            if key is not None and key in seen:
+                result.coalesced += 1
+                continue
+            if key is not None:
+                seen.add(key)
+            batch.append(event)
+        return batch
+
+    async def _handle(self, event: InboxEvent) -> Dict[str, Any]:
+        if event.source == STRIPE_SOURCE:
+            return await self._get_stripe_service().handle_event(event.payload, event.tenant_id)
+        return await self._get_plaid_service().handle_event(event.payload, event.tenant_id)
+
+    async def _process_batch(self,
+                             redis_client,
+                             tenant_id: str,
+                             events: List[InboxEvent],
+                             result: DrainResult) -> None:
+        """Run handlers for a batch and record outcomes with one UPDATE."""
+        events = self._coalesce(events, result)
+        processed_record_ids = []
+
+        if await self._load_tenant_context(tenant_id) is None:
+            logger.error("Webhook events queued for unknown tenant", tenant_id=tenant_id, count=len(events))
+            await redis_client.lpush(self._dead_letter_key(tenant_id), *[e.to_json() for e in events])
+            result.failed += len(events)
+            return
+
+        async with self._tenant_scope(tenant_id):
+            repository = self._get_event_repository()
+
+            for event in events:
+                try:
+                    await self._handle(event)
+                    result.processed += 1
+                    if event.record_id:
+                        processed_record_ids.append(event.record_id)
+                except Exception as e:
+                    result.failed += 1
+                    logger.error("Webhook event processing failed",
+                                source=event.source,
+                                event_id=event.event_id,
+                                event_type=event.event_type,
+                                tenant_id=tenant_id,
+                                error=str(e))
+                    if event.record_id:
+                        # Left unprocessed so the recovery sweep retries it
+                        await repository.record_event_error(event.record_id, str(e))
+                    else:
+                        await redis_client.lpush(self._dead_letter_key(tenant_id), event.to_json())
+
+            if processed_record_ids:
+                await repository.mark_events_processed(processed_record_ids)
+
+    async def _process_unrouted(self,
+                                redis_client,
+                                events: List[InboxEvent],
+                                result: DrainResult) -> None:
+        """Resolve tenants for unrouted events and move them to their tenant queue."""
+        for event in events:
+            try:
+                if event.source == STRIPE_SOURCE:
+                    # May call the Stripe API, which is why it is not done at ingest
+                    event.tenant_id = self._get_stripe_service()._extract_tenant_id(
+                        event.payload["data"]["object"]
+                    )
+                else:
+                    event.tenant_id = await self._get_plaid_service().resolve_tenant_id(
+                        event.payload.get("item_id")
+                    )
+
+                if event.tenant_id:
+                    if event.source == STRIPE_SOURCE:
+                        record = await self._persist(event)
+                        if record is None:
+                            result.coalesced += 1
+                            continue
+                        event.record_id = record.id
+                    await self._enqueue(redis_client, event.tenant_id, [event])
+                    result.rerouted += 1
+                    continue
+
+                # No owning tenant; handlers still run for global side effects
+                await self._handle(event)
+                result.processed += 1
+            except Exception as e:
+                result.failed += 1
+                logger.error("Unrouted webhook processing failed",
+                            source=event.source,
+                            event_id=event.event_id,
+                            error=str(e))
+                await redis_client.lpush(self._dead_letter_key(UNROUTED_TENANT), event.to_json())
+
+    # Recovery
+    async def dispatch_pending(self) -> List[str]:
+        """Schedule drains for every tenant with queued events."""
+        redis_client = await self._get_redis()
+        dispatched = []
+
+        for tenant_id in await redis_client.smembers(PENDING_TENANTS_KEY):
+            if await redis_client.llen(self._queue_key(tenant_id)) > 0:
+                self.dispatcher(tenant_id)
+                dispatched.append(tenant_id)
+            else:
+                await redis_client.srem(PENDING_TENANTS_KEY, tenant_id)
+
+        return dispatched
+
+    async def recover(self, tenant_id: str, limit: Optional[int] = None) -> int:
+        """Re-enqueue persisted Stripe events that were never processed.
+
+        Skipped while the tenant queue is non-empty or being drained, so an
+        event can never be queued twice.
+        """
+        redis_client = await self._get_redis()
+        if await redis_client.llen(self._queue_key(tenant_id)) > 0:
+            return 0
+        if await redis_client.exists(self._lock_key(tenant_id)):
+            return 0
+
+        now = datetime.utcnow()
+        async with self._tenant_scope(tenant_id):
+            rows = await self._get_event_repository().get_unprocessed_events(
+                limit=limit or settings.WEBHOOK_BATCH_SIZE,
+                event_source=STRIPE_SOURCE,
+                created_before=now - timedelta(seconds=settings.WEBHOOK_RECOVERY_GRACE_SECONDS),
+                created_after=now - timedelta(seconds=settings.WEBHOOK_DEDUPE_TTL_SECONDS)
+            )
+
+        events = [
+            InboxEvent(
+                source=STRIPE_SOURCE,
+                event_id=row.stripe_event_id,
+                event_type=row.event_type,
+                payload=row.event_data,
+                tenant_id=tenant_id,
+                record_id=row.id,
+                received_at=row.created_at.isoformat()
+            )
+            for row in rows
+            if row.stripe_event_id
+        ]
+        if not events:
+            return 0
+
+        if not await self._enqueue(redis_client, tenant_id, events):
+            return 0
+
+        logger.info("Recovered unprocessed webhook events", tenant_id=tenant_id, count=len(events))
+        return len(events)
+
+    async def get_stats(self) -> Dict[str, Any]:
+        """Get queue depths for pending tenants."""
+        redis_client = await self._get_redis()
+        pending = await redis_client.smembers(PENDING_TENANTS_KEY)
+        depths = {tenant_id: await redis_client.llen(self._queue_key(tenant_id)) for tenant_id in pending}
+        return {
+            "pending_tenants": len(depths),
+            "queued_events": sum(depths.values()),
+            "queue_depths": depths
+        }
+
+
+# Global webhook inbox instance
+_webhook_inbox: Optional[WebhookInbox] = None
+
+
+def get_webhook_inbox() -> WebhookInbox:
+    """Get or create the webhook inbox."""
+    global _webhook_inbox
+
+    if _webhook_inbox is None:
+        _webhook_inbox = WebhookInbox()
+
+    return _webhook_inbox
@@ -5,9 +5,8 @@ from fastapi.responses import JSONResponse
 from typing import Optional
 import structlog
 
-from src.services.stripe import WebhookService as StripeWebhookService
-from src.services.plaid import WebhookService as PlaidWebhookService
-from src.exceptions import StripeError, PlaidError
+from src.services.webhook_inbox import get_webhook_inbox
+from src.exceptions import StripeError, PlaidError, ValidationError
 from src.middleware import TenantContextMiddleware
 
 logger = structlog.get_logger(__name__)
@@ -20,7 +19,11 @@ async def stripe_webhook(
     request: Request,
     stripe_signature: str = Header(None, alias="stripe-signature")
 ):
-    """Handle Stripe webhook events."""
+    """Handle Stripe webhook events.
+    
+    The event is verified, deduplicated and queued; handlers run in a worker
+    so Stripe gets its 200 before any database or email work happens.
+    """
     if not stripe_signature:
         logger.warning("Missing Stripe signature header")
         raise HTTPException(status_code=400, detail="Missing Stripe signature")
@@ -29,13 +32,13 @@ async def stripe_webhook(
         # Get raw request body
         payload = await request.body()
         
-        # Process webhook
-        webhook_service = StripeWebhookService()
-        result = await webhook_service.process_webhook(payload, stripe_signature)
+        # Verify and enqueue webhook
+        result = await get_webhook_inbox().accept_stripe(payload, stripe_signature)
         
-        logger.info("Stripe webhook processed successfully",
+        logger.info("Stripe webhook accepted",
                    event_id=result.get("event_id"),
-                   event_type=result.get("event_type"))
+                   event_type=result.get("event_type"),
+                   duplicate=result.get("duplicate"))
         
         return JSONResponse(
             status_code=200,
@@ -53,25 +56,28 @@ async def stripe_webhook(
 
 @router.post("/plaid")
 async def plaid_webhook(request: Request):
-    """Handle Plaid webhook events."""
+    """Handle Plaid webhook events.
+    
+    Like Stripe events, Plaid webhooks are queued and processed by a worker.
+    """
     try:
         # Get request body
         payload = await request.json()
         
-        # Process webhook
-        webhook_service = PlaidWebhookService()
-        result = await webhook_service.process_webhook(payload)
+        # Validate and enqueue webhook
+        result = await get_webhook_inbox().accept_plaid(payload)
         
-        logger.info("Plaid webhook processed successfully",
+        logger.info("Plaid webhook accepted",
                    webhook_type=payload.get("webhook_type"),
-                   webhook_code=payload.get("webhook_code"))
+                   webhook_code=payload.get("webhook_code"),
+                   duplicate=result.get("duplicate"))
         
         return JSONResponse(
             status_code=200,
             content={"received": True, "result": result}
         )
         
-    except PlaidError as e:
+    except (PlaidError, ValidationError) as e:
         logger.error("Plaid webhook processing failed", error=str(e))
         raise HTTPException(status_code=400, detail=str(e))
     
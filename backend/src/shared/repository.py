@@ -1,6 +1,7 @@
 """Base repository pattern with tenant-aware data access."""
-from typing import Type, TypeVar, Generic, Optional, List, Dict, Any, Sequence
+from typing import Type, TypeVar, Generic, Optional, List, Dict, Any, Sequence, Tuple
 from abc import ABC, abstractmethod
+from datetime import date
 from uuid import uuid4
 
 from sqlalchemy import select, update, delete, func, and_, or_
@@ -19,6 +20,34 @@ CreateSchemaType = TypeVar("CreateSchemaType")
 UpdateSchemaType = TypeVar("UpdateSchemaType")
 
 
+def period_bounds(year: int, month: Optional[int] = None) -> Tuple[date, date]:
+    """Half-open ``[start, end)`` bounds of a calendar year, or of one month of it."""
+    if month is None:
+        return date(year, 1, 1), date(year + 1, 1, 1)
+    
+    start = date(year, month, 1)
+    end = date(year + 1, 1, 1) if month == 12 else date(year, month + 1, 1)
+    return start, end
+
+
+def period_filter(column, year: int, month: Optional[int] = None):
+    """Filter a date or datetime column to a calendar year or month.
+    
+    The bare column is compared with the period's bounds, so an index on it
+    (or a composite index such as ``(user_id, date)``) serves the filter as a
+    range scan. ``extract('year', column) == year`` cannot use the index and
+    reads every row of the owner's history instead.
+    """
+    start, end = period_bounds(year, month)
+    return and_(column >= start, column < end)
+
+
+def period_overlap_filter(start_column, end_column, year: int, month: Optional[int] = None):
+    """Filter rows whose ``[start_column, end_column]`` span overlaps a calendar period."""
+    start, end = period_bounds(year, month)
+    return and_(start_column < end, end_column >= start)
+
+
 class BaseRepository(Generic[ModelType, CreateSchemaType, UpdateSchemaType], ABC):
     """Base repository class with tenant-aware CRUD operations."""
     
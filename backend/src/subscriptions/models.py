@@ -162,7 +162,8 @@ class SubscriptionEvent(TenantBase):
     __tablename__ = "subscription_events"
     
     id: Mapped[str] = mapped_column(String(36), primary_key=True)
-    subscription_id: Mapped[str] = mapped_column(String(36), ForeignKey("subscriptions.id"), index=True)
+    # Nullable so webhook events can be recorded before they are matched to a subscription
+    subscription_id: Mapped[Optional[str]] = mapped_column(String(36), ForeignKey("subscriptions.id"), nullable=True, index=True)
     
     # Event information
     event_type: Mapped[str] = mapped_column(String(50), index=True)
@@ -183,7 +184,7 @@ class SubscriptionEvent(TenantBase):
     created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
     
     # Relationships
-    subscription: Mapped["Subscription"] = relationship("Subscription", back_populates="events")
+    subscription: Mapped[Optional["Subscription"]] = relationship("Subscription", back_populates="events")
     
     # Indexes
     __table_args__ = (
@@ -2,8 +2,10 @@
 from typing import List, Optional, Dict, Any
 from datetime import datetime, date
 from decimal import Decimal
+from uuid import uuid4
 
-from sqlalchemy import select, func, and_, or_, desc, asc
+from sqlalchemy import select, update, func, and_, or_, desc, asc
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import selectinload
 
 from src.shared.repository import BaseRepository, UserScopedRepository
@@ -261,13 +263,113 @@ class SubscriptionEventRepository(BaseRepository[SubscriptionEvent, None, None])
             limit=limit
         )
     
-    async def get_unprocessed_events(self, limit: int = 100) -> List[SubscriptionEvent]:
-        """Get unprocessed events."""
-        return await self.get_multi(
-            filters={"processed": False},
-            order_by="created_at",
-            limit=limit
-        )
+    async def get_unprocessed_events(
+        self,
+        limit: int = 100,
+        event_source: Optional[str] = None,
+        created_before: Optional[datetime] = None,
+        created_after: Optional[datetime] = None
+    ) -> List[SubscriptionEvent]:
+        """Get unprocessed events, oldest first.
+        
+        This is the webhook inbox recovery path: events that were persisted but
+        never drained from the queue are re-enqueued from here.
+        """
+        async with await self.get_session() as session:
+            try:
+                conditions = [self.model.processed == False]
+                if event_source:
+                    conditions.append(self.model.event_source == event_source)
+                if created_before:
+                    conditions.append(self.model.created_at < created_before)
+                if created_after:
+                    conditions.append(self.model.created_at >= created_after)
+                
+                query = (
+                    select(self.model)
+                    .where(and_(*conditions))
+                    .order_by(asc(self.model.created_at))
+                    .limit(limit)
+                )
+                result = await session.execute(query)
+                return list(result.scalars().all())
+                
+            except Exception as e:
+                raise DatabaseError(f"Failed to get unprocessed events: {str(e)}")
+    
+    async def record_webhook_event(
+        self,
+        stripe_event_id: str,
+        event_type: str,
+        event_data: Dict[str, Any],
+        subscription_id: Optional[str] = None
+    ) -> Optional[SubscriptionEvent]:
+        """Persist an incoming Stripe webhook event.
+        
+        Returns None when the event was already recorded; the unique
+        ``stripe_event_id`` makes this the durable idempotency check.
+        """
+        async with await self.get_session() as session:
+            try:
+                event = self.model(
+                    id=str(uuid4()),
+                    subscription_id=subscription_id,
+                    event_type=event_type,
+                    event_source="stripe",
+                    stripe_event_id=stripe_event_id,
+                    event_data=event_data,
+                    processed=False,
+                    created_at=datetime.utcnow()
+                )
+                session.add(event)
+                await session.commit()
+                return event
+                
+            except IntegrityError:
+                await session.rollback()
+                return None
+            except Exception as e:
+                await session.rollback()
+                raise DatabaseError(f"Failed to record webhook event: {str(e)}")
+    
+    async def mark_events_processed(self, event_ids: List[str]) -> int:
+        """Mark a batch of events as processed with a single UPDATE."""
+        if not event_ids:
+            return 0
+        
+        async with await self.get_session() as session:
+            try:
+                query = (
+                    update(self.model)
+                    .where(self.model.id.in_(event_ids))
+                    .values(processed=True, processed_at=datetime.utcnow(), error_message=None)
+                )
+                result = await session.execute(query)
+                await session.commit()
+                
+                return result.rowcount
+                
+            except Exception as e:
+                await session.rollback()
+                raise DatabaseError(f"Failed to mark events as processed: {str(e)}")
+    
+    async def record_event_error(self, event_id: str, error_message: str) -> bool:
+        """Record a processing failure, leaving the event unprocessed for recovery."""
+        async with await self.get_session() as session:
+            try:
+                query = (
+                    update(self.model)
+                    .where(self.model.id == event_id)
+                    .values(error_message=error_message)
+                )
+                result = await session.execute(query)
+                await session.commit()
+                
+                return result.rowcount > 0
+                
+            except Exception as e:
+                await session.rollback()
+                raise DatabaseError(f"Failed to record event error: {str(e)}")
     
     async def mark_event_processed(self, event_id: str, error_message: Optional[str] = None) -> bool:
         """Mark event as processed."""
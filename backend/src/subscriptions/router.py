@@ -165,6 +165,24 @@ async def get_billing_history(
     return invoices
 
 
+@router.get("/billing/overview")
+async def get_billing_overview(
+    limit: int = Query(10, ge=1, le=100, description="Maximum number of invoices to return"),
+    current_user: dict = Depends(get_current_user),
+    subscription_service: SubscriptionService = Depends()
+):
+    """Get subscription, upcoming invoice and billing history for the billing page."""
+    try:
+        return await subscription_service.get_billing_overview(
+            user_id=current_user["sub"],
+            limit=limit
+        )
+    except ValidationError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except StripeError as e:
+        raise HTTPException(status_code=402, detail=str(e))
+
+
 @router.post("/billing/portal", response_model=BillingPortalResponse)
 async def create_billing_portal_session(
     request_data: BillingPortalRequest,
@@ -255,6 +273,18 @@ async def get_plan_comparison(
         raise HTTPException(status_code=422, detail=str(e))
 
 
+@router.get("/plans/pricing")
+async def get_plan_pricing(
+    current_user: dict = Depends(get_current_user),
+    subscription_service: SubscriptionService = Depends()
+):
+    """Get available plans with their current Stripe pricing."""
+    try:
+        return await subscription_service.get_plan_pricing()
+    except StripeError as e:
+        raise HTTPException(status_code=402, detail=str(e))
+
+
 @router.get("/plans/features")
 async def get_plan_features():
     """Get detailed plan features comparison."""
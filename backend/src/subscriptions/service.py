@@ -435,6 +435,36 @@ class SubscriptionService:
             logger.error("Failed to get billing history", user_id=user_id, error=str(e))
             raise BusinessLogicError(f"Failed to get billing history: {str(e)}")
     
+    async def get_billing_overview(self, user_id: str, limit: int = 10) -> Dict[str, Any]:
+        """Get the Stripe subscription, upcoming invoice and invoices for the billing page."""
+        try:
+            subscription = await self.subscription_repo.get_active_subscription_for_user(user_id)
+            if not subscription:
+                raise ValidationError("No active subscription found")
+            
+            return await self.stripe_service.get_billing_overview(
+                tenant_id=user_id,
+                subscription_id=subscription.stripe_subscription_id,
+                customer_id=subscription.stripe_customer_id,
+                limit=limit
+            )
+            
+        except (ValidationError, StripeError) as e:
+            raise e
+        except Exception as e:
+            logger.error("Failed to get billing overview", user_id=user_id, error=str(e))
+            raise BusinessLogicError(f"Failed to get billing overview: {str(e)}")
+    
+    async def get_plan_pricing(self) -> Dict[str, Dict[str, Any]]:
+        """Get the available plans with their current Stripe prices."""
+        try:
+            return await self.stripe_service.get_all_plans_with_pricing()
+        except StripeError as e:
+            raise e
+        except Exception as e:
+            logger.error("Failed to get plan pricing", error=str(e))
+            raise BusinessLogicError(f"Failed to get plan pricing: {str(e)}")
+    
     async def get_subscription_usage(
         self,
         subscription_id: str,
@@ -223,6 +223,10 @@ class TenantDatabaseManager:
             del self._session_makers[tenant_id]
             logger.info(f"Closed connections for tenant: {tenant_id}")
     
+    def get_engines(self) -> Dict[str, Engine]:
+        """Get a snapshot of the open tenant engines."""
+        return dict(self._engines)
+    
     async def close_all_connections(self):
         """Close all tenant database connections."""
         for tenant_id, engine in self._engines.items():
@@ -261,4 +261,38 @@ class TenantInvitation(GlobalBase):
     def expire(self):
         """Mark invitation as expired."""
         self.status = "expired"
-        self.updated_at = func.now()
\ No newline at end of file
+        self.updated_at = func.now()
+
+
+class PlaidItemRoute(GlobalBase):
+    """Global index of which tenant owns each Plaid item, used to route webhooks."""
+    
+    __tablename__ = "plaid_item_routes"
+    
+    # Plaid item identifier is globally unique
+    plaid_item_id: Mapped[str] = mapped_column(String(255), primary_key=True)
+    
+    # Owning tenant and user
+    tenant_id: Mapped[str] = mapped_column(
+        String(36),
+        ForeignKey("tenant_registry.id", ondelete="CASCADE"),
+        nullable=False,
+        index=True
+    )
+    user_id: Mapped[Optional[str]] = mapped_column(String(36))
+    
+    # Timestamps
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        server_default=func.now(),
+        nullable=False
+    )
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        server_default=func.now(),
+        onupdate=func.now(),
+        nullable=False
+    )
+    
+    def __repr__(self):
+        return f"<PlaidItemRoute(plaid_item_id={self.plaid_item_id}, tenant_id={self.tenant_id})>"
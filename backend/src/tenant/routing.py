@@ -0,0 +1,163 @@
+"""Global routing index from Plaid items to the tenants that own them.
+
+Tenant data lives in per-tenant databases, so finding the owner of a Plaid item
+from a webhook would otherwise mean searching every tenant. The global database
+keeps an ``item_id -> tenant_id`` index, fronted by a Redis read-through cache.
+"""
+from typing import Dict, List, Optional
+
+import structlog
+
+from src.config import settings
+
+logger = structlog.get_logger(__name__)
+
+CACHE_KEY_PREFIX = "plaid:item_tenant"
+
+# Cached marker for items with no route, so unknown items do not hit the database
+_NO_ROUTE = "-"
+
+
+class PlaidItemRoutingIndex:
+    """Resolves, registers and removes Plaid item routes."""
+
+    def __init__(self,
+                 redis_client=None,
+                 cache_ttl: Optional[int] = None,
+                 negative_cache_ttl: Optional[int] = None):
+        self.redis_client = redis_client
+        self.cache_ttl = cache_ttl or settings.PLAID_ITEM_ROUTE_CACHE_TTL_SECONDS
+        self.negative_cache_ttl = negative_cache_ttl or settings.PLAID_ITEM_ROUTE_NEGATIVE_TTL_SECONDS
+
+    @staticmethod
+    def _cache_key(item_id: str) -> str:
+        return f"{CACHE_KEY_PREFIX}:{item_id}"
+
+    async def _get_redis(self):
+        if self.redis_client is None:
+            from src.services.redis.client import get_redis_client
+            self.redis_client = await get_redis_client()
+        return self.redis_client
+
+    async def get_tenant_id(self, item_id: str) -> Optional[str]:
+        """Get the tenant that owns a Plaid item."""
+        cached = await self._cache_get(item_id)
+        if cached is not None:
+            return None if cached == _NO_ROUTE else cached
+
+        tenant_id = await self._lookup(item_id)
+
+        if tenant_id:
+            await self._cache_set(item_id, tenant_id, self.cache_ttl)
+        else:
+            await self._cache_set(item_id, _NO_ROUTE, self.negative_cache_ttl)
+
+        return tenant_id
+
+    async def register(self, item_id: str, tenant_id: str, user_id: Optional[str] = None) -> None:
+        """Record that a tenant owns a Plaid item."""
+        await self._upsert([{"plaid_item_id": item_id, "tenant_id": tenant_id, "user_id": user_id}])
+        await self._cache_set(item_id, tenant_id, self.cache_ttl)
+
+        logger.info("Plaid item route registered", item_id=item_id, tenant_id=tenant_id)
+
+    async def register_many(self, tenant_id: str, items: List[Dict[str, Optional[str]]]) -> int:
+        """Record routes for several items owned by one tenant in a single transaction."""
+        routes = [
+            {"plaid_item_id": item["plaid_item_id"], "tenant_id": tenant_id, "user_id": item.get("user_id")}
+            for item in items
+        ]
+        if not routes:
+            return 0
+
+        await self._upsert(routes)
+        for route in routes:
+            await self._cache_set(route["plaid_item_id"], tenant_id, self.cache_ttl)
+
+        return len(routes)
+
+    async def remove(self, item_id: str) -> bool:
+        """Remove a Plaid item route, e.g. after the item is removed or revoked."""
+        removed = await self._delete(item_id)
+        await self._cache_delete(item_id)
+
+        logger.info("Plaid item route removed", item_id=item_id, existed=removed)
+        return removed
+
+    # Global database access
+    async def _lookup(self, item_id: str) -> Optional[str]:
+        from sqlalchemy import select
+        from src.database import get_global_database_session
+        from src.tenant.models import PlaidItemRoute
+
+        async with get_global_database_session() as session:
+            result = await session.execute(
+                select(PlaidItemRoute.tenant_id).where(PlaidItemRoute.plaid_item_id == item_id)
+            )
+            return result.scalar_one_or_none()
+
+    async def _upsert(self, routes: List[Dict[str, Optional[str]]]) -> None:
+        from src.database import get_global_database_session
+        from src.tenant.models import PlaidItemRoute
+
+        async with get_global_database_session() as session:
+            try:
+                for route in routes:
+                    await session.merge(PlaidItemRoute(**route))
+                await session.commit()
+            except Exception:
+                await session.rollback()
+                raise
+
+    async def _delete(self, item_id: str) -> bool:
+        from sqlalchemy import delete
+        from src.database import get_global_database_session
+        from src.tenant.models import PlaidItemRoute
+
+        async with get_global_database_session() as session:
+            try:
+                result = await session.execute(
+                    delete(PlaidItemRoute).where(PlaidItemRoute.plaid_item_id == item_id)
+                )
+                await session.commit()
+                return result.rowcount > 0
+            except Exception:
+                await session.rollback()
+                raise
+
+    # Cache access; Redis failures fall back to the database
+    async def _cache_get(self, item_id: str) -> Optional[str]:
+        try:
+            redis_client = await self._get_redis()
+            return await redis_client.get(self._cache_key(item_id))
+        except Exception as e:
+            logger.warning("Plaid item route cache read failed", item_id=item_id, error=str(e))
+            return None
+
+    async def _cache_set(self, item_id: str, value: str, ttl: int) -> None:
+        try:
+            redis_client = await self._get_redis()
+            await redis_client.set(self._cache_key(item_id), value, ttl=ttl)
+        except Exception as e:
+            logger.warning("Plaid item route cache write failed", item_id=item_id, error=str(e))
+
+    async def _cache_delete(self, item_id: str) -> None:
+        try:
+            redis_client = await self._get_redis()
+            await redis_client.delete(self._cache_key(item_id))
+        except Exception as e:
+            logger.warning("Plaid item route cache delete failed", item_id=item_id, error=str(e))
+
+
+# Global routing index instance
+_plaid_item_index: Optional[PlaidItemRoutingIndex] = None
+
+
+def get_plaid_item_index() -> PlaidItemRoutingIndex:
+    """Get or create the Plaid item routing index."""
+    global _plaid_item_index
+
+    if _plaid_item_index is None:
+        _plaid_item_index = PlaidItemRoutingIndex()
+
+    return _plaid_item_index
@@ -1,6 +1,6 @@
 """Tenant management service."""
 import logging
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, TYPE_CHECKING
 from datetime import datetime, timedelta
 from uuid import uuid4
 import secrets
@@ -22,6 +22,9 @@ from src.exceptions import (
     BusinessLogicError, NotFoundError
 )
 
+if TYPE_CHECKING:
+    from src.tenant.context import TenantContext
+
 logger = logging.getLogger(__name__)
 
 
@@ -114,6 +117,32 @@ class TenantService:
             tenant = await self._get_tenant_by_id_db(session, tenant_id)
             return Tenant.model_validate(tenant) if tenant else None
     
+    async def get_tenant_context(self, tenant_id: str) -> Optional["TenantContext"]:
+        """Build a tenant context for work running outside a request (workers, webhooks)."""
+        from src.tenant.context import TenantContext
+        
+        async with get_global_database_session() as session:
+            tenant = await self._get_tenant_by_id_db(session, tenant_id)
+            if not tenant or not tenant.is_active:
+                return None
+            
+            return TenantContext(
+                tenant_id=tenant.id,
+                tenant_slug=tenant.slug,
+                database_url=tenant.database_url,
+                auth_token=tenant.database_auth_token,
+                plan=tenant.subscription_tier,
+                is_active=tenant.is_active
+            )
+    
+    async def get_active_tenant_ids(self) -> List[str]:
+        """Get IDs of all active tenants, for system-wide background jobs."""
+        async with get_global_database_session() as session:
+            result = await session.execute(
+                select(TenantRegistry.id).where(TenantRegistry.is_active == True)
+            )
+            return list(result.scalars().all())
+    
     async def get_tenant_by_slug(self, slug: str) -> Optional[Tenant]:
         """Get tenant by slug."""
         async with get_global_database_session() as session:
@@ -30,6 +30,7 @@ class TithingPayment(TenantBase):
     # Payment reference
     reference_number: Mapped[Optional[str]] = mapped_column(String(50), nullable=True)
     transaction_id: Mapped[Optional[str]] = mapped_column(String(36), nullable=True, index=True)
+    schedule_id: Mapped[Optional[str]] = mapped_column(String(36), nullable=True)  # Set for scheduled payments
     
     # Notes and metadata
     notes: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
@@ -71,6 +72,8 @@ class TithingPayment(TenantBase):
         # Composite indexes
         Index("idx_tithing_payments_user_date", "user_id", "date"),
         Index("idx_tithing_payments_user_recipient", "user_id", "recipient"),
+        # One payment per schedule execution
+        Index("idx_tithing_payments_schedule_date", "schedule_id", "date", unique=True),
     )
 
 
@@ -234,4 +237,5 @@ class TithingGoal(TenantBase):
         Index("idx_tithing_goals_completed", "is_completed"),
         Index("idx_tithing_goals_start_date", "start_date"),
         Index("idx_tithing_goals_end_date", "end_date"),
+        Index("idx_tithing_goals_user_period", "user_id", "start_date", "end_date"),
     )
\ No newline at end of file
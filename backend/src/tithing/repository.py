@@ -2,11 +2,11 @@
 from typing import List, Optional, Dict, Any
 from datetime import datetime, date
 from decimal import Decimal
-from sqlalchemy import select, func, and_, or_, desc, asc, extract
+from sqlalchemy import select, func, and_, desc, asc, extract
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
 
-from src.shared.repository import UserScopedRepository
+from src.shared.repository import UserScopedRepository, period_filter, period_overlap_filter
 from src.tithing.models import (
     TithingPayment,
     TithingSchedule,
@@ -30,15 +30,24 @@ class TithingPaymentRepository(UserScopedRepository[TithingPayment]):
     async def create_payment(
         self,
         payment_data: TithingPaymentCreate,
-        user_id: str
+        user_id: str,
+        commit: bool = True
     ) -> TithingPayment:
-        """Create a new tithing payment."""
+        """Create a new tithing payment.
+        
+        With ``commit=False`` the payment is only flushed, so the caller can
+        apply its summary changes in the same transaction.
+        """
         payment = TithingPayment(
             user_id=user_id,
             **payment_data.model_dump()
         )
         
         self.session.add(payment)
+        if not commit:
+            await self.session.flush()
+            return payment
+        
         await self.session.commit()
         await self.session.refresh(payment)
         return payment
@@ -97,7 +106,7 @@ class TithingPaymentRepository(UserScopedRepository[TithingPayment]):
         query = select(func.sum(TithingPayment.amount)).where(
             and_(
                 TithingPayment.user_id == user_id,
-                extract('year', TithingPayment.date) == year
+                period_filter(TithingPayment.date, year)
             )
         )
         
@@ -118,7 +127,7 @@ class TithingPaymentRepository(UserScopedRepository[TithingPayment]):
         ).where(
             and_(
                 TithingPayment.user_id == user_id,
-                extract('year', TithingPayment.date) == year
+                period_filter(TithingPayment.date, year)
             )
         ).group_by(
             extract('month', TithingPayment.date)
@@ -165,6 +174,25 @@ class TithingPaymentRepository(UserScopedRepository[TithingPayment]):
             for row in result
         ]
     
+    async def get_payments_by_ids(
+        self,
+        user_id: str,
+        payment_ids: List[str]
+    ) -> List[TithingPayment]:
+        """Get the user's payments with the given IDs, oldest first."""
+        if not payment_ids:
+            return []
+        
+        query = select(TithingPayment).where(
+            and_(
+                TithingPayment.user_id == user_id,
+                TithingPayment.id.in_(payment_ids)
+            )
+        ).order_by(TithingPayment.date)
+        
+        result = await self.session.execute(query)
+        return result.scalars().all()
+    
     async def update_payment(
         self,
         payment_id: str,
@@ -269,12 +297,12 @@ class TithingSummaryRepository(UserScopedRepository[TithingSummary]):
     def __init__(self, session: AsyncSession):
         super().__init__(session, TithingSummary)
     
-    async def get_or_create_year_summary(
+    async def get_year_summary(
         self,
         user_id: str,
         year: int
-    ) -> TithingSummary:
-        """Get or create summary for a specific year."""
+    ) -> Optional[TithingSummary]:
+        """Get the summary for a specific year, if one exists."""
         query = select(TithingSummary).where(
             and_(
                 TithingSummary.user_id == user_id,
@@ -283,7 +311,15 @@ class TithingSummaryRepository(UserScopedRepository[TithingSummary]):
         )
         
         result = await self.session.execute(query)
-        summary = result.scalar_one_or_none()
+        return result.scalar_one_or_none()
+    
+    async def get_or_create_year_summary(
+        self,
+        user_id: str,
+        year: int
+    ) -> TithingSummary:
+        """Get or create summary for a specific year."""
+        summary = await self.get_year_summary(user_id, year)
         
         if not summary:
             summary = TithingSummary(
@@ -366,14 +402,7 @@ class TithingGoalRepository(UserScopedRepository[TithingGoal]):
         query = select(TithingGoal).where(
             and_(
                 TithingGoal.user_id == user_id,
-                or_(
-                    extract('year', TithingGoal.start_date) == year,
-                    extract('year', TithingGoal.end_date) == year,
-                    and_(
-                        TithingGoal.start_date <= date(year, 12, 31),
-                        TithingGoal.end_date >= date(year, 1, 1)
-                    )
-                )
+                period_overlap_filter(TithingGoal.start_date, TithingGoal.end_date, year)
             )
         ).order_by(TithingGoal.start_date)
         
@@ -180,6 +180,20 @@ async def get_year_summary(
     return summary
 
 
+@router.post("/summary/{year}/rebuild", response_model=TithingSummaryResponse)
+async def rebuild_year_summary(
+    year: int,
+    current_user: dict = Depends(get_current_user),
+    tithing_service: TithingService = Depends()
+):
+    """Rebuild tithing summary and goal progress for a year from its payments."""
+    summary = await tithing_service.rebuild_year_summary(
+        user_id=current_user["sub"],
+        year=year
+    )
+    return summary
+
+
 @router.get("/analysis/{year}", response_model=TithingAnalysisResponse)
 async def get_tithing_analysis(
     year: int,
@@ -0,0 +1,228 @@
+"""Batch processing of due tithing schedules.
+
+All due schedules of a tenant (optionally of one user) are read in one
+query. Every missed execution date up to the processing date becomes a
+payment, and all payments are written with one multi-row INSERT. Each
+payment carries its ``schedule_id`` and execution date, which are unique
+together, so re-running a crashed or overlapping batch inserts nothing
+twice. One UPDATE then advances ``next_execution_date`` for every processed
+schedule, guarded on the date that was read so a concurrent run cannot
+advance a schedule twice. Summaries and goals are rebuilt once per affected
+(user, year) rather than once per payment.
+"""
+from dataclasses import dataclass, field
+from datetime import date, datetime, timedelta
+from decimal import Decimal
+from typing import Dict, List, Optional, Set, Tuple
+from uuid import uuid4
+
+import structlog
+from dateutil.relativedelta import relativedelta
+from sqlalchemy import and_, case, or_, select, update
+from sqlalchemy.dialects.sqlite import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.tithing.models import TithingPayment, TithingSchedule
+from src.tithing.summaries import TithingSummaryMaintainer
+
+logger = structlog.get_logger(__name__)
+
+# Executions created per schedule and run; schedules further behind catch up on later runs
+MAX_CATCH_UP_EXECUTIONS = 53
+
+_payments = TithingPayment.__table__
+_schedules = TithingSchedule.__table__
+
+# Keyed by TithingFrequency value
+_FREQUENCY_STEPS = {
+    "weekly": timedelta(weeks=1),
+    "biweekly": timedelta(weeks=2),
+    "monthly": relativedelta(months=1),
+    "quarterly": relativedelta(months=3),
+    "yearly": relativedelta(years=1),
+}
+
+
+def next_execution_date(start_date: date, frequency: str) -> date:
+    """Date of the execution after ``start_date``; unchanged for unknown frequencies."""
+    step = _FREQUENCY_STEPS.get(getattr(frequency, "value", frequency))
+    return start_date + step if step else start_date
+
+
+def execution_dates(next_execution: date, frequency: str, end_date: Optional[date], through: date) -> List[date]:
+    """Execution dates from ``next_execution`` up to ``through`` and the schedule's end date."""
+    last = min(through, end_date) if end_date else through
+    dates = []
+    current = next_execution
+    while current <= last and len(dates) < MAX_CATCH_UP_EXECUTIONS:
+        dates.append(current)
+        following = next_execution_date(current, frequency)
+        if following <= current:
+            break
+        current = following
+    return dates
+
+
+@dataclass
+class ScheduleRunResult:
+    """Outcome of processing due schedules."""
+    schedules: int = 0
+    payment_ids: List[str] = field(default_factory=list)
+    duplicates: int = 0
+    affected_years: Set[Tuple[str, int]] = field(default_factory=set)
+
+    @property
+    def payments(self) -> int:
+        return len(self.payment_ids)
+
+
+class TithingScheduleProcessor:
+    """Turns due schedules into payments for one tenant database."""
+
+    def __init__(self, session: AsyncSession):
+        self.session = session
+        self.summary_maintainer = TithingSummaryMaintainer(session)
+
+    async def process_due(
+        self,
+        process_date: Optional[date] = None,
+        user_id: Optional[str] = None
+    ) -> ScheduleRunResult:
+        """Create payments for every schedule due on or before ``process_date``.
+
+        Everything is committed in one transaction.
+        """
+        process_date = process_date or date.today()
+        result = ScheduleRunResult()
+
+        try:
+            schedules = await self._due_schedules(process_date, user_id)
+            if not schedules:
+                return result
+
+            rows, next_dates = self._plan(schedules, process_date)
+            inserted = await self._insert_payments(rows)
+            await self._advance_schedules(schedules, next_dates, inserted)
+
+            result.schedules = len(schedules)
+            result.payment_ids = [payment_id for payment_id, _, _, _ in inserted]
+            result.duplicates = len(rows) - len(inserted)
+            result.affected_years = {(owner, payment_date.year) for _, _, owner, payment_date in inserted}
+
+            for owner, years in _years_by_user(result.affected_years).items():
+                await self.summary_maintainer.rebuild_years(owner, years)
+
+            await self.session.commit()
+        except Exception:
+            await self.session.rollback()
+            raise
+
+        logger.info("Processed due tithing schedules",
+                    process_date=process_date.isoformat(),
+                    schedules=result.schedules,
+                    payments=result.payments,
+                    duplicates=result.duplicates)
+        return result
+
+    async def _due_schedules(self, process_date: date, user_id: Optional[str]):
+        query = select(
+            _schedules.c.id,
+            _schedules.c.user_id,
+            _schedules.c.name,
+            _schedules.c.amount,
+            _schedules.c.frequency,
+            _schedules.c.method,
+            _schedules.c.recipient,
+            _schedules.c.end_date,
+            _schedules.c.next_execution_date
+        ).where(
+            _schedules.c.is_active.is_(True),
+            _schedules.c.auto_process.is_(True),
+            _schedules.c.next_execution_date <= process_date,
+            or_(_schedules.c.end_date.is_(None), _schedules.c.next_execution_date <= _schedules.c.end_date)
+        )
+        if user_id:
+            query = query.where(_schedules.c.user_id == user_id)
+
+        result = await self.session.execute(query)
+        return result.all()
+
+    def _plan(self, schedules, process_date: date):
+        """Payment rows for every missed execution, and each schedule's next date."""
+        now = datetime.utcnow()
+        rows = []
+        next_dates: Dict[str, date] = {}
+
+        for schedule in schedules:
+            dates = execution_dates(
+                schedule.next_execution_date, schedule.frequency, schedule.end_date, process_date
+            )
+            if not dates:
+                continue
+            next_dates[schedule.id] = next_execution_date(dates[-1], schedule.frequency)
+            rows.extend(
+                {
+                    "id": str(uuid4()),
+                    "user_id": schedule.user_id,
+                    "schedule_id": schedule.id,
+                    "amount": Decimal(schedule.amount),
+                    "date": execution_date,
+                    "method": schedule.method,
+                    "recipient": schedule.recipient,
+                    "purpose": "regular_tithe",
+                    "notes": f"Automatic payment from schedule: {schedule.name}",
+                    "created_at": now,
+                    "updated_at": now
+                }
+                for execution_date in dates
+            )
+
+        return rows, next_dates
+
+    async def _insert_payments(self, rows) -> list:
+        """Insert payments, skipping executions that already have one."""
+        if not rows:
+            return []
+
+        statement = (
+            insert(_payments)
+            .values(rows)
+            .on_conflict_do_nothing(index_elements=["schedule_id", "date"])
+            .returning(_payments.c.id, _payments.c.schedule_id, _payments.c.user_id, _payments.c.date)
+        )
+        result = await self.session.execute(statement)
+        return result.all()
+
+    async def _advance_schedules(self, schedules, next_dates: Dict[str, date], inserted) -> None:
+        """Move every processed schedule to its next execution in one UPDATE."""
+        if not next_dates:
+            return
+
+        executed: Dict[str, int] = {}
+        for _, schedule_id, _, _ in inserted:
+            executed[schedule_id] = executed.get(schedule_id, 0) + 1
+        read_dates = {s.id: s.next_execution_date for s in schedules if s.id in next_dates}
+        now = datetime.utcnow()
+
+        await self.session.execute(
+            update(_schedules)
+            .where(and_(
+                _schedules.c.id.in_(list(next_dates)),
+                _schedules.c.next_execution_date == case(read_dates, value=_schedules.c.id)
+            ))
+            .values(
+                next_execution_date=case(next_dates, value=_schedules.c.id),
+                execution_count=_schedules.c.execution_count + (
+                    case(executed, value=_schedules.c.id, else_=0) if executed else 0
+                ),
+                last_executed_at=now,
+                updated_at=now
+            )
+        )
+
+
+def _years_by_user(affected_years: Set[Tuple[str, int]]) -> Dict[str, Set[int]]:
+    years: Dict[str, Set[int]] = {}
+    for user_id, year in affected_years:
+        years.setdefault(user_id, set()).add(year)
+    return years
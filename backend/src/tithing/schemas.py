@@ -105,6 +105,7 @@ class TithingPaymentResponse(TithingPaymentBase):
     recipient_address: Optional[str] = Field(None, description="Recipient address")
     reference_number: Optional[str] = Field(None, description="Payment reference number")
     transaction_id: Optional[str] = Field(None, description="Associated transaction ID")
+    schedule_id: Optional[str] = Field(None, description="Schedule that created the payment")
     notes: Optional[str] = Field(None, description="Payment notes")
     is_verified: bool = Field(default=True, description="Payment verification status")
     verification_method: Optional[str] = Field(None, description="Verification method")
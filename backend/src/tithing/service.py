@@ -1,8 +1,7 @@
 """Tithing service for business logic."""
 from typing import List, Optional, Dict, Any
-from datetime import datetime, date, timedelta
+from datetime import date
 from decimal import Decimal
-from dateutil.relativedelta import relativedelta
 from fastapi import Depends
 from sqlalchemy.ext.asyncio import AsyncSession
 
@@ -19,6 +18,8 @@ from src.tithing.models import (
     TithingSummary,
     TithingGoal
 )
+from src.tithing.schedules import TithingScheduleProcessor, next_execution_date
+from src.tithing.summaries import TithingSummaryMaintainer
 from src.tithing.schemas import (
     TithingPaymentCreate,
     TithingPaymentUpdate,
@@ -39,6 +40,8 @@ class TithingService:
         self.schedule_repo = TithingScheduleRepository(session)
         self.summary_repo = TithingSummaryRepository(session)
         self.goal_repo = TithingGoalRepository(session)
+        self.summary_maintainer = TithingSummaryMaintainer(session)
+        self.schedule_processor = TithingScheduleProcessor(session)
     
     # Payment operations
     async def create_payment(
@@ -54,12 +57,11 @@ class TithingService:
         if payment_data.date > date.today():
             raise ValidationError("Payment date cannot be in the future")
         
-        # Create payment
-        payment = await self.payment_repo.create_payment(payment_data, user_id)
-        
-        # Update related summaries and goals
-        await self._update_summaries_after_payment(payment)
-        await self._update_goals_after_payment(payment)
+        # Create payment and apply it to summaries and goals in one transaction
+        payment = await self.payment_repo.create_payment(payment_data, user_id, commit=False)
+        await self.summary_maintainer.apply_payment(payment)
+        await self.session.commit()
+        await self.session.refresh(payment)
         
         return payment
     
@@ -99,12 +101,19 @@ class TithingService:
         user_id: str
     ) -> Optional[TithingPayment]:
         """Update payment."""
+        existing = await self.payment_repo.get_by_id_and_user(payment_id, user_id)
+        if not existing:
+            return None
+        
+        previous = self._summarized_fields(existing)
         payment = await self.payment_repo.update_payment(payment_id, user_id, payment_data)
         
-        if payment:
-            # Recalculate summaries and goals
-            await self._update_summaries_after_payment(payment)
-            await self._update_goals_after_payment(payment)
+        # Only changes to summarized fields need the affected years rebuilt
+        if payment and self._summarized_fields(payment) != previous:
+            await self.summary_maintainer.rebuild_years(
+                user_id, {previous[0].year, payment.date.year}
+            )
+            await self.session.commit()
         
         return payment
     
@@ -120,9 +129,9 @@ class TithingService:
         
         await self.payment_repo.delete(payment_id)
         
-        # Recalculate summaries and goals
-        await self._recalculate_year_summary(user_id, payment.date.year)
-        await self._recalculate_goals_for_year(user_id, payment.date.year)
+        # A removed payment cannot be subtracted from the largest payment, so rebuild
+        await self.summary_maintainer.rebuild_years(user_id, [payment.date.year])
+        await self.session.commit()
         
         return True
     
@@ -180,37 +189,9 @@ class TithingService:
         user_id: str,
         process_date: Optional[date] = None
     ) -> List[TithingPayment]:
-        """Process schedules that are due."""
-        if not process_date:
-            process_date = date.today()
-        
-        due_schedules = await self.schedule_repo.get_schedules_due(user_id, process_date)
-        created_payments = []
-        
-        for schedule in due_schedules:
-            # Create payment from schedule
-            payment_data = TithingPaymentCreate(
-                amount=schedule.amount,
-                date=process_date,
-                method=schedule.method,
-                recipient=schedule.recipient,
-                purpose="regular_tithe",
-                notes=f"Automatic payment from schedule: {schedule.name}"
-            )
-            
-            payment = await self.create_payment(payment_data, user_id)
-            created_payments.append(payment)
-            
-            # Update schedule execution
-            next_execution = self._calculate_next_execution_date(
-                process_date, schedule.frequency
-            )
-            
-            await self.schedule_repo.update_schedule_execution(
-                schedule.id, user_id, datetime.utcnow(), next_execution
-            )
-        
-        return created_payments
+        """Process the user's schedules that are due."""
+        result = await self.schedule_processor.process_due(process_date, user_id=user_id)
+        return await self.payment_repo.get_payments_by_ids(user_id, result.payment_ids)
     
     # Summary operations
     async def get_year_summary(
@@ -218,15 +199,28 @@ class TithingService:
         user_id: str,
         year: int
     ) -> TithingSummary:
-        """Get or create summary for a specific year."""
-        summary = await self.summary_repo.get_or_create_year_summary(user_id, year)
+        """Get or create summary for a specific year.
+        
+        Payments keep summaries current, so a summary is only built here the
+        first time a year is requested.
+        """
+        summary = await self.summary_repo.get_year_summary(user_id, year)
+        if summary:
+            return summary
         
-        # Recalculate if not recent
-        if not summary.last_calculated_at or \
-           (datetime.utcnow() - summary.last_calculated_at).days > 1:
-            await self._recalculate_year_summary(user_id, year)
-            await self.session.refresh(summary)
+        return await self.rebuild_year_summary(user_id, year)
+    
+    async def rebuild_year_summary(
+        self,
+        user_id: str,
+        year: int
+    ) -> TithingSummary:
+        """Rebuild a year's summary and goal progress from its payments."""
+        await self.summary_maintainer.rebuild_years(user_id, [year])
+        await self.session.commit()
         
+        summary = await self.summary_repo.get_year_summary(user_id, year)
+        await self.session.refresh(summary)
         return summary
     
     async def get_monthly_breakdown(
@@ -340,62 +334,10 @@ class TithingService:
         )
     
     # Private helper methods
-    async def _update_summaries_after_payment(self, payment: TithingPayment):
-        """Update summaries after a payment."""
-        await self._recalculate_year_summary(payment.user_id, payment.date.year)
-    
-    async def _update_goals_after_payment(self, payment: TithingPayment):
-        """Update goals after a payment."""
-        goals = await self.goal_repo.get_goals_by_year(payment.user_id, payment.date.year)
-        
-        for goal in goals:
-            if goal.start_date <= payment.date <= goal.end_date:
-                await self._update_goal_progress(goal)
-    
-    async def _recalculate_year_summary(self, user_id: str, year: int):
-        """Recalculate year summary."""
-        # Get all payments for the year
-        start_date = date(year, 1, 1)
-        end_date = date(year, 12, 31)
-        
-        payments = await self.payment_repo.get_payments_by_date_range(
-            user_id, start_date, end_date
-        )
-        
-        # Calculate totals
-        total_paid = sum(p.amount for p in payments)
-        payment_count = len(payments)
-        
-        # Get recipient breakdown
-        recipient_totals = await self.payment_repo.get_recipient_totals(
-            user_id, start_date, end_date
-        )
-        
-        # Get method breakdown
-        method_breakdown = {}
-        for payment in payments:
-            method = payment.method
-            method_breakdown[method] = method_breakdown.get(method, Decimal('0')) + payment.amount
-        
-        # Update summary
-        summary_data = {
-            'total_tithe_paid': total_paid,
-            'payment_count': payment_count,
-            'average_payment': total_paid / payment_count if payment_count > 0 else Decimal('0'),
-            'largest_payment': max((p.amount for p in payments), default=Decimal('0')),
-            'current_percentage': Decimal('10.0'),  # TODO: Calculate from income
-            'payment_methods': method_breakdown,
-            'recipients': {r['recipient']: r['total'] for r in recipient_totals}
-        }
-        
-        await self.summary_repo.update_summary_calculations(user_id, year, summary_data)
-    
-    async def _recalculate_goals_for_year(self, user_id: str, year: int):
-        """Recalculate all goals for a year."""
-        goals = await self.goal_repo.get_goals_by_year(user_id, year)
-        
-        for goal in goals:
-            await self._update_goal_progress(goal)
+    @staticmethod
+    def _summarized_fields(payment: TithingPayment) -> tuple:
+        """Payment fields that feed summaries and goal progress."""
+        return (payment.date, payment.amount, payment.method, payment.recipient)
     
     async def _update_goal_progress(self, goal: TithingGoal):
         """Update progress for a specific goal."""
@@ -419,18 +361,7 @@ class TithingService:
         frequency: TithingFrequency
     ) -> date:
         """Calculate next execution date based on frequency."""
-        if frequency == TithingFrequency.WEEKLY:
-            return start_date + timedelta(weeks=1)
-        elif frequency == TithingFrequency.BIWEEKLY:
-            return start_date + timedelta(weeks=2)
-        elif frequency == TithingFrequency.MONTHLY:
-            return start_date + relativedelta(months=1)
-        elif frequency == TithingFrequency.QUARTERLY:
-            return start_date + relativedelta(months=3)
-        elif frequency == TithingFrequency.YEARLY:
-            return start_date + relativedelta(years=1)
-        else:
-            return start_date
+        return next_execution_date(start_date, frequency)
     
     def _calculate_consistency_score(self, monthly_data: List[Dict[str, Any]]) -> Decimal:
         """Calculate consistency score based on monthly data."""
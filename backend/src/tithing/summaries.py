@@ -0,0 +1,222 @@
+"""Incremental tithing summary and goal maintenance.
+
+A new payment is applied as a delta rather than by recomputing the year: one
+upsert adds it to the user's ``TithingSummary`` for that year (total, count,
+average, largest payment, and the method and recipient maps, merged in SQL)
+and one UPDATE adds it to every goal whose period contains the payment date.
+No payments are read back.
+
+Deltas cannot take a payment back out (the largest payment is not
+reversible), so deleting or changing a recorded payment rebuilds the affected
+years instead, as does an explicit rebuild. Rebuilds also run entirely in
+SQL, aggregating the payments table into the summary and goals.
+"""
+from datetime import date, datetime
+from decimal import Decimal
+from typing import Iterable
+from uuid import uuid4
+
+from sqlalchemy import Float, and_, case, cast, func, literal, select, update
+from sqlalchemy.dialects.sqlite import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.shared.repository import period_filter, period_overlap_filter
+from src.tithing.models import TithingGoal, TithingPayment, TithingSummary
+
+# Core tables, so maintenance statements never depend on ORM mapper setup
+_payments = TithingPayment.__table__
+_summaries = TithingSummary.__table__
+_goals = TithingGoal.__table__
+
+# Summaries are not linked to the user's income, so every summary reports the
+# standard 10% tithe as its current percentage and percentage goals compare
+# against that figure
+PLACEHOLDER_PERCENTAGE = Decimal("10.0")
+
+_EMPTY_MAP = "{}"
+
+
+def _amount(value) -> Decimal:
+    return Decimal(str(value))
+
+
+def _merge_into_map(column, key: str, amount: Decimal):
+    """``column`` JSON map with ``amount`` added to the entry for ``key``."""
+    current = func.coalesce(column, _EMPTY_MAP)
+    entries = func.json_each(current).table_valued("key", "value")
+    existing = select(entries.c.value).where(entries.c.key == key).scalar_subquery()
+    return func.json_patch(current, func.json_object(key, func.coalesce(existing, 0) + amount))
+
+
+def _year_bounds(year: int):
+    return date(year, 1, 1), date(year, 12, 31)
+
+
+class TithingSummaryMaintainer:
+    """Keeps summaries and goal progress in step with payments.
+
+    Statements run on the caller's session and are committed by the caller,
+    so a payment and its summary changes land in one transaction.
+    """
+
+    def __init__(self, session: AsyncSession):
+        self.session = session
+
+    async def apply_payment(self, payment: TithingPayment) -> None:
+        """Add a newly recorded payment to its year summary and goals."""
+        await self._add_to_summary(payment)
+        await self._add_to_goals(payment)
+
+    async def rebuild_years(self, user_id: str, years: Iterable[int]) -> None:
+        """Recompute summaries and goal progress for ``years`` from the payments."""
+        for year in sorted(set(years)):
+            await self._rebuild_summary(user_id, year)
+            await self._rebuild_goals(user_id, year)
+
+    async def _add_to_summary(self, payment: TithingPayment) -> None:
+        year = payment.date.year
+        period_start, period_end = _year_bounds(year)
+        amount = literal(_amount(payment.amount), _summaries.c.total_tithe_paid.type)
+        now = datetime.utcnow()
+
+        statement = insert(_summaries).values(
+            id=str(uuid4()),
+            user_id=payment.user_id,
+            year=year,
+            period_start=period_start,
+            period_end=period_end,
+            total_tithe_paid=amount,
+            balance=amount,
+            current_percentage=PLACEHOLDER_PERCENTAGE,
+            payment_count=1,
+            average_payment=amount,
+            largest_payment=amount,
+            payment_methods=func.json_object(payment.method, amount),
+            recipients=func.json_object(payment.recipient, amount),
+            last_calculated_at=now,
+            created_at=now,
+            updated_at=now
+        )
+        await self.session.execute(statement.on_conflict_do_update(
+            index_elements=["user_id", "year"],
+            set_={
+                "total_tithe_paid": _summaries.c.total_tithe_paid + amount,
+                "balance": _summaries.c.balance + amount,
+                "current_percentage": PLACEHOLDER_PERCENTAGE,
+                "payment_count": _summaries.c.payment_count + 1,
+                "average_payment": func.round(
+                    cast(_summaries.c.total_tithe_paid + amount, Float) / (_summaries.c.payment_count + 1), 2
+                ),
+                "largest_payment": func.max(_summaries.c.largest_payment, amount),
+                "payment_methods": _merge_into_map(_summaries.c.payment_methods, payment.method, amount),
+                "recipients": _merge_into_map(_summaries.c.recipients, payment.recipient, amount),
+                "last_calculated_at": now,
+                "updated_at": now
+            }
+        ))
+
+    async def _add_to_goals(self, payment: TithingPayment) -> None:
+        amount = literal(_amount(payment.amount), _goals.c.current_amount.type)
+        await self._update_goals(
+            and_(
+                _goals.c.user_id == payment.user_id,
+                _goals.c.start_date <= payment.date,
+                _goals.c.end_date >= payment.date
+            ),
+            _goals.c.current_amount + amount
+        )
+
+    async def _rebuild_summary(self, user_id: str, year: int) -> None:
+        period_start, period_end = _year_bounds(year)
+        in_year = (_payments.c.user_id == user_id, period_filter(_payments.c.date, year))
+
+        def aggregate(expression):
+            return select(expression).where(*in_year).scalar_subquery()
+
+        def breakdown(column):
+            grouped = (
+                select(column.label("key"), func.sum(_payments.c.amount).label("total"))
+                .where(*in_year)
+                .group_by(column)
+                .subquery()
+            )
+            return select(
+                func.coalesce(func.json_group_object(grouped.c.key, grouped.c.total), _EMPTY_MAP)
+            ).scalar_subquery()
+
+        payment_count = aggregate(func.count(_payments.c.id))
+        total_paid = aggregate(func.coalesce(func.sum(_payments.c.amount), 0))
+        now = datetime.utcnow()
+
+        statement = insert(_summaries).values(
+            id=str(uuid4()),
+            user_id=user_id,
+            year=year,
+            period_start=period_start,
+            period_end=period_end,
+            total_tithe_paid=total_paid,
+            balance=total_paid,
+            current_percentage=PLACEHOLDER_PERCENTAGE,
+            payment_count=payment_count,
+            average_payment=func.coalesce(func.round(cast(total_paid, Float) / func.nullif(payment_count, 0), 2), 0),
+            largest_payment=aggregate(func.coalesce(func.max(_payments.c.amount), 0)),
+            payment_methods=breakdown(_payments.c.method),
+            recipients=breakdown(_payments.c.recipient),
+            last_calculated_at=now,
+            created_at=now,
+            updated_at=now
+        )
+        excluded = statement.excluded
+        await self.session.execute(statement.on_conflict_do_update(
+            index_elements=["user_id", "year"],
+            set_={
+                "total_tithe_paid": excluded.total_tithe_paid,
+                "balance": excluded.total_tithe_paid - _summaries.c.total_tithe_due,
+                "current_percentage": excluded.current_percentage,
+                "payment_count": excluded.payment_count,
+                "average_payment": excluded.average_payment,
+                "largest_payment": excluded.largest_payment,
+                "payment_methods": excluded.payment_methods,
+                "recipients": excluded.recipients,
+                "last_calculated_at": now,
+                "updated_at": now
+            }
+        ))
+
+    async def _rebuild_goals(self, user_id: str, year: int) -> None:
+        paid_in_goal_period = (
+            select(func.coalesce(func.sum(_payments.c.amount), 0))
+            .where(
+                _payments.c.user_id == _goals.c.user_id,
+                _payments.c.date.between(_goals.c.start_date, _goals.c.end_date)
+            )
+            .scalar_subquery()
+        )
+        await self._update_goals(
+            and_(
+                _goals.c.user_id == user_id,
+                period_overlap_filter(_goals.c.start_date, _goals.c.end_date, year)
+            ),
+            paid_in_goal_period
+        )
+
+    async def _update_goals(self, criteria, new_amount) -> None:
+        """Set goal progress to ``new_amount``, completing goals that reach their target."""
+        reaches_target = (
+            (_goals.c.target_amount.is_not(None) & (new_amount >= _goals.c.target_amount))
+            | (_goals.c.target_percentage <= PLACEHOLDER_PERCENTAGE)
+        )
+        newly_completed = reaches_target & _goals.c.is_completed.is_(False)
+        now = datetime.utcnow()
+
+        await self.session.execute(
+            update(_goals)
+            .where(criteria)
+            .values(
+                current_amount=new_amount,
+                current_percentage=PLACEHOLDER_PERCENTAGE,
+                is_completed=case((reaches_target, True), else_=_goals.c.is_completed),
+                completed_at=case((newly_completed, now), else_=_goals.c.completed_at),
+                updated_at=now
+            )
+        )
@@ -3,6 +3,7 @@ from typing import Optional, List, Dict, Any
 from datetime import datetime, date, timedelta
 from decimal import Decimal
 
+from src.families.dashboard import FamilyDashboardCache
 from src.transactions.repository import TransactionRepository
 from src.transactions.schemas import (
     TransactionCreate, TransactionUpdate, TransactionResponse, TransactionListResponse,
@@ -18,6 +19,7 @@ class TransactionService:
     
     def __init__(self):
         self.transaction_repo = TransactionRepository()
+        self.family_dashboard_cache = FamilyDashboardCache()
     
     async def create_transaction(
         self, 
@@ -39,6 +41,7 @@ class TransactionService:
         
         # Create transaction
         transaction = await self.transaction_repo.create_for_user(user_id, transaction_data)
+        await self._transactions_changed(user_id, full=False)
         
         return TransactionResponse.model_validate(transaction)
     
@@ -128,6 +131,7 @@ class TransactionService:
         if not updated_transaction:
             return None
         
+        await self._transactions_changed(user_id)
         return TransactionResponse.model_validate(updated_transaction)
     
     async def delete_transaction(self, transaction_id: str, user_id: str) -> bool:
@@ -137,7 +141,10 @@ class TransactionService:
         if not transaction:
             return False
         
-        return await self.transaction_repo.delete(transaction_id)
+        deleted = await self.transaction_repo.delete(transaction_id)
+        if deleted:
+            await self._transactions_changed(user_id)
+        return deleted
     
     async def get_transaction_summary(
         self,
@@ -273,6 +280,9 @@ class TransactionService:
                 await self.transaction_repo.update(transaction_id, update_data)
                 categorized_count += 1
         
+        if categorized_count:
+            await self._transactions_changed(user_id)
+        
         return {
             "message": f"Categorized {categorized_count} transactions",
             "categorized_count": categorized_count,
@@ -302,6 +312,9 @@ class TransactionService:
             if updated_transaction:
                 updated_count += 1
         
+        if updated_count:
+            await self._transactions_changed(user_id)
+        
         return {
             "message": f"Updated {updated_count} transactions",
             "updated_count": updated_count,
@@ -388,9 +401,26 @@ class TransactionService:
             is_excluded_from_budgets=True
         )
         await self.transaction_repo.update(request.transaction_id, update_data)
+        await self._transactions_changed(user_id)
         
         return split_transactions
     
+    async def _transactions_changed(self, user_id: str, full: bool = True) -> None:
+        """Refresh what is derived from a user's transactions after a manual write.
+        
+        Budget spending (and the alerts it triggers) is re-synced in the
+        background. An incremental sync only notices newly created spending,
+        so edits and deletes re-sum the user's budgets in full.
+        """
+        await self.family_dashboard_cache.invalidate_for_users(user_id)
+        
+        tenant_context = get_tenant_context()
+        if tenant_context is None:
+            return
+        
+        from src.services.background.tasks import sync_budget_spending
+        sync_budget_spending.delay(tenant_context.tenant_id, [user_id], full=full)
+    
     async def _auto_categorize_transaction(
         self,
         merchant_name: Optional[str],
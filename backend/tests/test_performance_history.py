@@ -0,0 +1,183 @@
+"""
+Tests for persisted performance history.
+
+This module tests per-minute rollups, the SQLite time-series store with
+its downsampling and retention, and reports read from the store.
+"""
+
+import pytest
+from datetime import datetime, timedelta
+
+from src.performance.metrics import PerformanceMetrics, RequestMetrics, DatabaseMetrics
+from src.performance.monitoring import PerformanceMonitor
+from src.performance.reports import PerformanceReporter, PerformanceAnalyzer
+from src.performance.history import (
+    RollupAggregator,
+    PerformanceHistoryStore,
+    RetentionPolicy,
+    ALL_ENDPOINTS,
+    OTHER_ENDPOINT
+)
+
+BASE = datetime(2026, 1, 5, 10, 0)
+
+
+def make_request(timestamp: datetime, duration_ms: float = 100.0, status_code: int = 200,
+                 endpoint: str = "GET /api/accounts") -> RequestMetrics:
+    method, path = endpoint.split(" ", 1)
+    return RequestMetrics(
+        path=path,
+        method=method,
+        status_code=status_code,
+        duration_ms=duration_ms,
+        timestamp=timestamp,
+        endpoint=endpoint,
+        query_count=2,
+        query_time_ms=10.0
+    )
+
+
+def record(store: PerformanceHistoryStore, requests) -> None:
+    aggregator = RollupAggregator()
+    for request in requests:
+        aggregator.add_request(request)
+    store.write(aggregator.drain())
+
+
+class TestRollupAggregator:
+    """Test in-memory per-minute rollups."""
+
+    def test_drain_returns_closed_minutes_only(self):
+        """Test that the open minute stays in memory."""
+        aggregator = RollupAggregator()
+        aggregator.add_request(make_request(BASE + timedelta(seconds=10)))
+        aggregator.add_request(make_request(BASE + timedelta(seconds=20), status_code=500))
+        aggregator.add_request(make_request(BASE + timedelta(minutes=1, seconds=5)))
+
+        closed = aggregator.drain(before=int((BASE + timedelta(minutes=1)).timestamp()))
+        rollups = {rollup.endpoint: rollup for rollup in closed}
+
+        assert set(rollups) == {ALL_ENDPOINTS, "GET /api/accounts"}
+        assert rollups[ALL_ENDPOINTS].request_count == 2
+        assert rollups[ALL_ENDPOINTS].error_count == 1
+        assert len(aggregator.drain()) == 2
+
+    def test_endpoints_beyond_limit_are_pooled(self):
+        """Test that a bucket's endpoint count is bounded."""
+        aggregator = RollupAggregator(max_endpoints_per_bucket=2)
+        for index in range(5):
+            aggregator.add_request(make_request(BASE, endpoint=f"GET /api/item{index}"))
+
+        rollups = {rollup.endpoint: rollup for rollup in aggregator.drain()}
+
+        assert rollups[ALL_ENDPOINTS].request_count == 5
+        assert rollups[OTHER_ENDPOINT].request_count == 3
+
+    def test_metrics_feed_rollups(self):
+        """Test that PerformanceMetrics rolls up requests and queries as they are added."""
+        metrics = PerformanceMetrics()
+        metrics.add_request_metric(make_request(BASE))
+        metrics.add_database_metric(DatabaseMetrics(query="SELECT 1", duration_ms=600.0, timestamp=BASE))
+
+        totals = [rollup for rollup in metrics.rollups.drain() if rollup.endpoint == ALL_ENDPOINTS][0]
+
+        assert totals.request_count == 1
+        assert totals.db_query_count == 1
+        assert totals.slow_query_count == 1
+
+
+class TestPerformanceHistoryStore:
+    """Test the SQLite rollup store."""
+
+    def test_repeated_writes_of_a_minute_are_merged(self):
+        """Test that late requests flushed separately add to the same minute."""
+        store = PerformanceHistoryStore()
+        record(store, [make_request(BASE, 100.0)])
+        record(store, [make_request(BASE + timedelta(seconds=30), 300.0, status_code=500)])
+
+        series = store.series(BASE, BASE + timedelta(minutes=5), resolution="minute")
+
+        assert len(series) == 1
+        point = series[0].to_dict()
+        assert point["request_count"] == 2
+        assert point["error_count"] == 1
+        assert point["avg_duration_ms"] == 200.0
+        assert point["max_duration_ms"] == 300.0
+
+    def test_downsampling_is_idempotent_and_keeps_recent_minutes_visible(self):
+        """Test folding minutes into hours and reading across both."""
+        store = PerformanceHistoryStore()
+        record(store, [make_request(BASE + timedelta(minutes=minute)) for minute in range(0, 180, 10)])
+        now = BASE + timedelta(hours=2, minutes=30)
+
+        store.downsample(now)
+        store.downsample(now)
+
+        hours = store.series(BASE, now, resolution="hour")
+        assert [rollup.to_dict()["request_count"] for rollup in hours] == [6, 6, 3]
+        assert store.summary(BASE, now).request_count == 15
+
+    def test_retention_drops_folded_minutes_only(self):
+        """Test that old minutes are deleted once downsampled and totals survive."""
+        store = PerformanceHistoryStore(retention=RetentionPolicy(minute=timedelta(hours=1)))
+        record(store, [make_request(BASE + timedelta(minutes=minute), 40.0) for minute in range(0, 240, 30)])
+        now = BASE + timedelta(hours=4, minutes=10)
+
+        store.apply_retention(now)
+        assert len(store.series(BASE, now, resolution="minute")) == 8
+
+        store.downsample(now)
+        store.apply_retention(now)
+        assert len(store.series(BASE, now, resolution="minute")) == 1
+        assert store.summary(BASE, now).request_count == 8
+        assert store.series(BASE, now, resolution="day")[0].percentile(95) == 40.0
+
+    def test_endpoint_summaries(self):
+        """Test per-endpoint totals over a period."""
+        store = PerformanceHistoryStore()
+        record(store, [
+            make_request(BASE, 50.0, endpoint="GET /api/accounts"),
+            make_request(BASE, 900.0, endpoint="GET /api/reports"),
+            make_request(BASE, 700.0, endpoint="GET /api/reports")
+        ])
+
+        summaries = {rollup.endpoint: rollup for rollup in store.endpoint_summaries(BASE, BASE + timedelta(hours=1))}
+
+        assert set(summaries) == {"GET /api/accounts", "GET /api/reports"}
+        assert summaries["GET /api/reports"].to_dict()["p95_duration_ms"] == 900.0
+
+
+class TestHistoryReports:
+    """Test reports and comparisons read from the history."""
+
+    @pytest.mark.asyncio
+    async def test_report_covers_period_beyond_in_memory_samples(self):
+        """Test a three-day report whose requests are no longer held in memory."""
+        store = PerformanceHistoryStore()
+        now = datetime.utcnow()
+        record(store, [make_request(now - timedelta(hours=hours), 100.0) for hours in range(1, 72, 2)])
+        record(store, [make_request(now - timedelta(hours=60), 400.0, status_code=500)])
+        metrics = PerformanceMetrics()
+
+        reporter = PerformanceReporter(metrics, PerformanceMonitor(metrics), history=store)
+        report = await reporter.generate_report(hours=72)
+
+        assert report.summary["data_source"] == "history"
+        assert report.summary["total_requests"] == 37
+        assert report.request_analysis["endpoints"]["GET /api/accounts"]["error_count"] == 1
+        assert report.trends["early_period"]["request_count"] + report.trends["recent_period"]["request_count"] == 37
+
+    @pytest.mark.asyncio
+    async def test_compare_time_periods_uses_history(self):
+        """Test comparing last day's latency with the week before."""
+        store = PerformanceHistoryStore()
+        now = datetime.utcnow()
+        record(store, [make_request(now - timedelta(hours=hours), 100.0) for hours in range(30, 150, 6)])
+        record(store, [make_request(now - timedelta(hours=hours), 300.0) for hours in range(1, 24, 6)])
+
+        analyzer = PerformanceAnalyzer(PerformanceMetrics(), history=store)
+        comparison = await analyzer.compare_time_periods(24, 144)
+
+        assert comparison["recent_period"]["stats"]["request_count"] == 4
+        assert comparison["historical_period"]["stats"]["request_count"] == 20
+        assert comparison["overall_trend"] == "significantly_worse"
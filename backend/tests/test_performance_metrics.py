@@ -17,6 +17,9 @@ from src.performance.metrics import (
     SystemMetrics,
     RequestTimer,
     DatabaseProfiler,
+    QueryStats,
+    fingerprint_statement,
+    get_request_query_tracker,
     performance_monitor,
     global_metrics
 )
@@ -265,6 +268,109 @@ class TestDatabaseProfiler:
         assert db_metric.duration_ms >= 10.0
 
 
+class TestRequestQueryAttribution:
+    """Test attributing database queries to the request that ran them."""
+    
+    def test_tracker_is_set_only_inside_request(self):
+        """Test that RequestTimer scopes the query tracker to the request."""
+        metrics = PerformanceMetrics()
+        
+        assert get_request_query_tracker() is None
+        with RequestTimer(metrics, "/api/test", "GET") as timer:
+            assert get_request_query_tracker() is timer.queries
+        assert get_request_query_tracker() is None
+    
+    @pytest.mark.asyncio
+    async def test_queries_are_counted_per_request(self):
+        """Test query counts, time and repeated statements of concurrent requests."""
+        from sqlalchemy import text
+        from sqlalchemy.ext.asyncio import create_async_engine
+        
+        metrics = PerformanceMetrics()
+        DatabaseProfiler(metrics)  # Registers the query listeners
+        engine = create_async_engine("sqlite+aiosqlite://")
+        
+        async def handle(path, repeats):
+            with RequestTimer(metrics, path, "GET", endpoint=f"GET {path}"):
+                async with engine.connect() as connection:
+                    for i in range(repeats):
+                        await connection.execute(text("SELECT :value"), {"value": i})
+                    await connection.execute(text("SELECT 'once' AS label"))
+        
+        await asyncio.gather(handle("/api/families", 8), handle("/api/users/me", 1))
+        await engine.dispose()
+        
+        requests = {r.path: r for r in metrics.request_metrics}
+        assert requests["/api/families"].query_count == 9
+        assert requests["/api/users/me"].query_count == 2
+        assert requests["/api/families"].query_time_ms > 0
+        assert requests["/api/families"].repeated_queries["SELECT ?"].count == 8
+        assert requests["/api/users/me"].repeated_queries == {}
+        
+        request_ids = {m.request_id for m in metrics.database_metrics if m.request_id}
+        assert len(request_ids) == 2
+    
+    @pytest.mark.asyncio
+    async def test_queries_are_attributed_to_the_route_template(self):
+        """Test that database metrics carry the request's route template, not its concrete path."""
+        from sqlalchemy import text
+        from sqlalchemy.ext.asyncio import create_async_engine
+        
+        metrics = PerformanceMetrics()
+        DatabaseProfiler(metrics)  # Registers the query listeners
+        engine = create_async_engine("sqlite+aiosqlite://")
+        
+        for family_id in ("f1", "f2"):
+            with RequestTimer(metrics, f"/api/families/{family_id}", "GET",
+                              endpoint="GET /api/families/{family_id}") as timer:
+                async with engine.connect() as connection:
+                    await connection.execute(text("SELECT 1"))
+        await engine.dispose()
+        
+        endpoints = {m.endpoint for m in metrics.database_metrics if m.request_id}
+        assert endpoints == {"GET /api/families/{family_id}"}
+        assert timer.queries.label == "GET /api/families/{family_id}"
+        assert {r.endpoint for r in metrics.request_metrics} == endpoints
+    
+    def test_fingerprint_ignores_formatting(self):
+        """Test that whitespace differences map to one fingerprint."""
+        assert fingerprint_statement("SELECT id\n  FROM users\tWHERE id = ?") == \
+            fingerprint_statement("SELECT id FROM users WHERE id = ?")
+    
+    def test_query_offenders_rank_route_and_statement_pairs(self):
+        """Test the route to statement ranking served on /performance/database."""
+        metrics = PerformanceMetrics()
+        for repeats in (12, 20):
+            metrics.add_request_metric(RequestMetrics(
+                path="/api/families/abc",
+                method="GET",
+                status_code=200,
+                duration_ms=100.0,
+                timestamp=datetime.utcnow(),
+                endpoint="GET /api/families/{family_id}",
+                repeated_queries={"SELECT * FROM users WHERE id = ?": QueryStats(repeats, repeats * 2.0)}
+            ))
+        metrics.add_request_metric(RequestMetrics(
+            path="/api/accounts",
+            method="GET",
+            status_code=200,
+            duration_ms=100.0,
+            timestamp=datetime.utcnow(),
+            repeated_queries={"SELECT * FROM accounts": QueryStats(2, 1.0)}
+        ))
+        
+        offenders = metrics.get_query_offenders(minutes=5, min_repeats=6)
+        
+        assert offenders == [{
+            "endpoint": "GET /api/families/{family_id}",
+            "fingerprint": "SELECT * FROM users WHERE id = ?",
+            "requests": 2,
+            "total_executions": 32,
+            "max_per_request": 20,
+            "total_time_ms": 64.0
+        }]
+
+
 class TestPerformanceMonitorDecorator:
     """Test performance monitoring decorator."""
     
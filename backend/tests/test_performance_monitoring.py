@@ -18,6 +18,7 @@ from src.performance.monitoring import (
     BottleneckAlert,
     BottleneckType
 )
+from src.performance.event_loop import EventLoopWatchdog, BlockedLoopEvent
 
 
 class TestPerformanceThresholds:
@@ -242,21 +243,24 @@ class TestPerformanceMonitor:
     
     @pytest.mark.asyncio
     async def test_detect_n_plus_one_queries(self):
-        """Test N+1 query pattern detection."""
+        """Test N+1 query pattern detection within a single request."""
         metrics = PerformanceMetrics()
         monitor = PerformanceMonitor(metrics)
         
-        # Create many similar queries in a short time window
+        # The same statement repeated within one request
         base_time = datetime.utcnow()
         db_metrics = []
         
         for i in range(12):  # More than threshold
             db_metric = DatabaseMetrics(
-                query=f"SELECT * FROM users WHERE id = {i}",
+                query="SELECT * FROM users WHERE id = ?",
                 duration_ms=50.0,
-                timestamp=base_time,  # Same time window
+                timestamp=base_time,
                 table="users",
-                operation="SELECT"
+                operation="SELECT",
+                fingerprint="SELECT * FROM users WHERE id = ?",
+                request_id="request-1",
+                endpoint="GET /api/families"
             )
             db_metrics.append(db_metric)
         
@@ -267,7 +271,35 @@ class TestPerformanceMonitor:
         alert = alerts[0]
         assert alert.type == BottleneckType.QUERY_N_PLUS_ONE
         assert alert.severity == "medium"
-        assert "SELECT:users" in alert.details["pattern"]
+        assert alert.details["fingerprint"] == "SELECT * FROM users WHERE id = ?"
+        assert alert.details["max_executions_per_request"] == 12
+        assert alert.affected_endpoints == ["GET /api/families"]
+    
+    @pytest.mark.asyncio
+    async def test_repeated_queries_across_requests_are_not_n_plus_one(self):
+        """Test that concurrent requests running the same query are not flagged."""
+        metrics = PerformanceMetrics()
+        monitor = PerformanceMonitor(metrics)
+        
+        # One execution in each of 12 requests within the same second
+        base_time = datetime.utcnow()
+        db_metrics = [
+            DatabaseMetrics(
+                query="SELECT * FROM users WHERE id = ?",
+                duration_ms=50.0,
+                timestamp=base_time,
+                table="users",
+                fingerprint="SELECT * FROM users WHERE id = ?",
+                request_id=f"request-{i}",
+                endpoint="GET /api/users/me"
+            )
+            for i in range(12)
+        ]
+        
+        alerts = []
+        await monitor._detect_n_plus_one_queries(db_metrics, alerts)
+        
+        assert alerts == []
     
     @pytest.mark.asyncio
     async def test_analyze_performance_trends_degrading(self):
@@ -626,4 +658,51 @@ class TestPerformanceIntegration:
         
         # Should be the last 5 alerts (5-9)
         alert_indices = [alert.details["index"] for alert in monitor.alerts]
-        assert alert_indices == [5, 6, 7, 8, 9]
\ No newline at end of file
+        assert alert_indices == [5, 6, 7, 8, 9]
+
+class TestEventLoopWatchdog:
+    """Test event loop blocking detection."""
+    
+    @pytest.mark.asyncio
+    async def test_blocking_callback_is_captured_and_attributed(self):
+        """Test that a blocking call inside a request raises an attributed alert."""
+        import time
+        from src.performance.metrics import RequestTimer
+        
+        metrics = PerformanceMetrics()
+        monitor = PerformanceMonitor(metrics)
+        watchdog = EventLoopWatchdog(monitor, threshold_ms=50.0, heartbeat_interval_ms=10.0)
+        watchdog.start()
+        
+        async def blocking_handler():
+            time.sleep(0.2)  # A synchronous SDK call on the loop
+        
+        try:
+            await asyncio.sleep(0.05)
+            with RequestTimer(metrics, "/api/plaid/sync", "POST", tenant_id="tenant1"):
+                await asyncio.create_task(blocking_handler())
+            await asyncio.sleep(0.05)
+        finally:
+            await watchdog.stop()
+        
+        alerts = [a for a in monitor.alerts if a.type == BottleneckType.EVENT_LOOP_BLOCKED]
+        assert len(alerts) == 1
+        alert = alerts[0]
+        assert alert.details["blocked_ms"] >= 150
+        assert alert.details["tenant_id"] == "tenant1"
+        assert alert.details["coroutine"].endswith("blocking_handler")
+        assert alert.affected_endpoints == ["POST /api/plaid/sync"]
+        assert any("blocking_handler" in frame for frame in alert.details["stack"])
+        assert asyncio.get_running_loop().get_task_factory() is None
+        assert watchdog.get_lag_statistics()["blocked_count"] == 1
+    
+    def test_block_severity_scales_with_duration(self):
+        """Test alert severity for short and long blocks."""
+        monitor = PerformanceMonitor(PerformanceMetrics())
+        short = monitor.record_event_loop_block(BlockedLoopEvent(duration_ms=150.0, timestamp=datetime.utcnow()))
+        long = monitor.record_event_loop_block(BlockedLoopEvent(duration_ms=2500.0, timestamp=datetime.utcnow()))
+        
+        assert short.severity == "medium"
+        assert long.severity == "critical"
+        assert short.affected_endpoints == []
+        assert len(monitor.get_recent_alerts()) == 2
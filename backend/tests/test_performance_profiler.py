@@ -0,0 +1,110 @@
+"""
+Tests for the sampling profiler.
+
+This module tests stack sampling, collapsed-stack output, request
+filtering and the profiler's safety limits.
+"""
+
+import asyncio
+import threading
+import time
+import pytest
+
+from src.performance.metrics import PerformanceMetrics, RequestTimer
+from src.performance.monitoring import PerformanceMonitor
+from src.performance.event_loop import EventLoopWatchdog
+from src.performance.profiler import SamplingProfiler, ProfilerBusyError, MAX_RATE_HZ
+
+
+def busy_work(stop: threading.Event):
+    """Keep a thread on the CPU until told to stop."""
+    while not stop.is_set():
+        sum(i * i for i in range(1000))
+
+
+class TestSamplingProfiler:
+    """Test sampling thread stacks."""
+    
+    def test_collapsed_stacks_include_busy_thread(self):
+        """Test that a CPU-bound thread shows up with its call path."""
+        stop = threading.Event()
+        worker = threading.Thread(target=busy_work, args=(stop,), name="busy-worker")
+        worker.start()
+        try:
+            result = SamplingProfiler().profile(seconds=0.3, rate_hz=100)
+        finally:
+            stop.set()
+            worker.join()
+        
+        collapsed = result.collapsed()
+        assert result.ticks > 10
+        assert any(line.startswith("busy-worker;") and "busy_work (test_performance_profiler.py" in line
+                   for line in collapsed.splitlines())
+        assert all(line.rsplit(" ", 1)[1].isdigit() for line in collapsed.splitlines())
+        assert result.top_functions()[0]["total_samples"] > 0
+        assert result.to_dict()["samples"] == result.samples
+    
+    def test_idle_threads_are_skipped(self):
+        """Test that threads blocked on a wait are not counted by default."""
+        stop = threading.Event()
+        waiter = threading.Thread(target=stop.wait, name="idle-waiter")
+        waiter.start()
+        try:
+            idle = SamplingProfiler().profile(seconds=0.1, rate_hz=50)
+            with_idle = SamplingProfiler().profile(seconds=0.1, rate_hz=50, include_idle=True)
+        finally:
+            stop.set()
+            waiter.join()
+        
+        assert "idle-waiter" not in idle.collapsed()
+        assert idle.idle_samples > 0
+        assert "idle-waiter" in with_idle.collapsed()
+    
+    def test_limits_and_single_run(self):
+        """Test rate clamping and that concurrent profiles are refused."""
+        profiler = SamplingProfiler()
+        
+        profiler._lock.acquire()
+        try:
+            with pytest.raises(ProfilerBusyError):
+                profiler.profile(seconds=0.1)
+        finally:
+            profiler._lock.release()
+        
+        result = profiler.profile(seconds=0.1, rate_hz=100000)
+        assert result.rate_hz == MAX_RATE_HZ
+        assert not profiler.running
+    
+    @pytest.mark.asyncio
+    async def test_samples_are_filtered_by_tenant(self):
+        """Test that only event loop samples of the tenant's requests are kept."""
+        watchdog = EventLoopWatchdog(PerformanceMonitor(PerformanceMetrics()), threshold_ms=10000.0)
+        watchdog.start()
+        profiler = SamplingProfiler(watchdog)
+        metrics = PerformanceMetrics()
+        
+        async def handler(duration):
+            # Holds the loop, as a synchronous SDK call would
+            end = time.perf_counter() + duration
+            while time.perf_counter() < end:
+                sum(i * i for i in range(1000))
+        
+        async def request(tenant_id):
+            with RequestTimer(metrics, "/api/budgets", "GET", tenant_id=tenant_id):
+                await asyncio.create_task(handler(0.3))
+        
+        try:
+            profile = asyncio.create_task(asyncio.to_thread(
+                profiler.profile, 0.5, 100, None, "tenant1"
+            ))
+            await asyncio.sleep(0.01)
+            await request("tenant1")
+            await request("tenant2")
+            result = await profile
+        finally:
+            await watchdog.stop()
+        
+        assert result.samples > 0
+        assert result.filtered_samples > 0
+        assert all("handler (test_performance_profiler.py" in line for line in result.collapsed().splitlines())
+        assert result.tenant_id == "tenant1"
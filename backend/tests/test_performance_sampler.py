@@ -0,0 +1,167 @@
+"""
+Tests for background system sampling.
+
+This module tests the system sampler thread, event loop lag and GC pause
+measurement, pool probes and the O(1) health readout built on them.
+"""
+
+import gc
+import time
+import asyncio
+import pytest
+from datetime import datetime, timedelta
+from unittest.mock import patch
+
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from src.performance.metrics import (
+    PerformanceMetrics,
+    RequestMetrics,
+    SystemMetrics,
+    SlidingWindowCounter
+)
+from src.performance.sampler import SystemSampler, sqlalchemy_pool_stats
+
+
+class TestSlidingWindowCounter:
+    """Test the per-minute request counter."""
+
+    def test_counts_expire_after_window(self):
+        """Test that buckets older than the window are not counted."""
+        counter = SlidingWindowCounter(60)
+        for now in (1000.0, 1000.5, 1030.0, 1059.9):
+            counter.add(now)
+
+        assert counter.count(1059.9) == 4
+        assert counter.count(1061.0) == 2
+        assert counter.count(1200.0) == 0
+
+    def test_request_rate_tracks_added_requests(self):
+        """Test that PerformanceMetrics counts requests without scanning history."""
+        metrics = PerformanceMetrics()
+        for _ in range(3):
+            metrics.add_request_metric(RequestMetrics(
+                path="/api/test",
+                method="GET",
+                status_code=200,
+                duration_ms=10.0,
+                timestamp=datetime.utcnow()
+            ))
+
+        assert metrics.request_rate() == 3
+
+
+class TestSystemSampler:
+    """Test system snapshots."""
+
+    def test_sample_collects_process_and_pool_usage(self):
+        """Test one snapshot with a pool probe and a failing probe."""
+        metrics = PerformanceMetrics()
+        sampler = SystemSampler(metrics)
+        sampler.register_pool("db", lambda: {"checkedout": 2})
+        sampler.register_pool("unused", lambda: None)
+        sampler.register_pool("broken", lambda: 1 / 0)
+
+        snapshot = sampler.sample()
+
+        assert snapshot.rss_mb > 0
+        assert snapshot.thread_count >= 1
+        assert snapshot.open_fds > 0
+        assert snapshot.pools["db"] == {"checkedout": 2}
+        assert "unused" not in snapshot.pools
+        assert "error" in snapshot.pools["broken"]
+
+    def test_gc_pauses_are_measured_and_reset(self):
+        """Test that collections between samples are reported once."""
+        sampler = SystemSampler(PerformanceMetrics())
+        gc.callbacks.append(sampler._on_gc)
+        try:
+            gc.collect()
+            first = sampler.sample()
+            second = sampler.sample()
+        finally:
+            gc.callbacks.remove(sampler._on_gc)
+
+        assert first.gc_collections >= 1
+        assert first.gc_pause_ms > 0
+        assert second.gc_collections <= first.gc_collections
+
+    @pytest.mark.asyncio
+    async def test_event_loop_lag_is_measured_without_blocking(self):
+        """Test lag reported for a loop that was blocked by a synchronous call."""
+        sampler = SystemSampler(PerformanceMetrics())
+        sampler._loop = asyncio.get_running_loop()
+
+        sampler._measure_loop_lag()
+        time.sleep(0.05)  # Block the loop so the probe runs late
+        await asyncio.sleep(0)
+
+        assert sampler._measure_loop_lag() >= 50.0
+
+    def test_thread_fills_ring_buffer(self):
+        """Test the background thread appending snapshots."""
+        metrics = PerformanceMetrics(max_history=3)
+        sampler = SystemSampler(metrics, interval_seconds=0.01)
+
+        sampler.start()
+        time.sleep(0.2)
+        sampler.stop()
+
+        assert not sampler.running
+        assert len(metrics.system_metrics) == 3
+        assert sampler._on_gc not in gc.callbacks
+
+    @pytest.mark.asyncio
+    async def test_sqlalchemy_pool_stats(self):
+        """Test pool usage of an async engine."""
+        engine = create_async_engine("sqlite+aiosqlite://")
+
+        stats = sqlalchemy_pool_stats(engine)
+        await engine.dispose()
+
+        assert stats["type"]
+
+
+class TestSystemHealth:
+    """Test reading health from the latest snapshot."""
+
+    def test_health_reads_latest_snapshot(self):
+        """Test that a current snapshot is returned without calling psutil."""
+        metrics = PerformanceMetrics()
+        metrics.add_system_metric(SystemMetrics(
+            timestamp=datetime.utcnow(),
+            cpu_percent=42.0,
+            memory_percent=50.0,
+            memory_used_mb=1024.0,
+            disk_usage_percent=30.0,
+            rss_mb=256.0,
+            event_loop_lag_ms=3.5,
+            pools={"redis": {"in_use_connections": 1}}
+        ))
+
+        with patch('psutil.cpu_percent') as mock_cpu:
+            health = metrics.get_system_health()
+
+        mock_cpu.assert_not_called()
+        assert health["cpu_percent"] == 42.0
+        assert health["event_loop_lag_ms"] == 3.5
+        assert health["pools"]["redis"]["in_use_connections"] == 1
+        assert health["request_rate_per_minute"] == 0
+
+    def test_stale_snapshot_falls_back_to_non_blocking_reading(self):
+        """Test that an old snapshot is ignored and CPU is read without an interval."""
+        metrics = PerformanceMetrics()
+        metrics.add_system_metric(SystemMetrics(
+            timestamp=datetime.utcnow() - timedelta(minutes=5),
+            cpu_percent=99.0,
+            memory_percent=50.0,
+            memory_used_mb=1024.0,
+            disk_usage_percent=30.0
+        ))
+
+        with patch('psutil.cpu_percent', return_value=12.0) as mock_cpu:
+            health = metrics.get_system_health()
+
+        mock_cpu.assert_called_once_with(interval=None)
+        assert health["cpu_percent"] == 12.0
+        assert len(metrics.get_recent_system_metrics(10)) == 1
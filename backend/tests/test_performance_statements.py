@@ -0,0 +1,153 @@
+"""
+Tests for SQL statement statistics.
+
+This module tests statement normalization, latency histograms and the
+per-tenant statement statistics and slow query log.
+"""
+
+import json
+from datetime import datetime
+
+from src.performance.metrics import PerformanceMetrics, DatabaseMetrics
+from src.performance.statements import (
+    LatencyHistogram,
+    StatementStats,
+    StatementStatsStore,
+    OTHER_FINGERPRINT,
+    NO_TENANT,
+    normalize_statement,
+    statement_operation,
+    statement_table
+)
+
+
+class TestNormalizeStatement:
+    """Test SQL statement fingerprinting."""
+    
+    def test_literals_and_placeholders_are_replaced(self):
+        """Test that statements differing only in parameters share a fingerprint."""
+        expected = "SELECT * FROM users WHERE id = ? AND name = ?"
+        
+        assert normalize_statement("SELECT * FROM users WHERE id = 42 AND name = 'O''Brien'") == expected
+        assert normalize_statement("SELECT * FROM users WHERE id = $1 AND name = $2") == expected
+        assert normalize_statement("SELECT * FROM users WHERE id = :id AND name = :name") == expected
+        assert normalize_statement("SELECT * FROM users WHERE id = %(id)s AND name = %s") == expected
+        assert normalize_statement("SELECT  *\n FROM users WHERE id = ? AND name = ?") == expected
+    
+    def test_in_lists_and_values_rows_collapse(self):
+        """Test that the number of bound items does not change the fingerprint."""
+        assert normalize_statement("SELECT id FROM accounts WHERE id IN (?, ?, ?)") == \
+            "SELECT id FROM accounts WHERE id IN (...)"
+        assert normalize_statement("SELECT id FROM accounts WHERE id in (7)") == \
+            "SELECT id FROM accounts WHERE id IN (...)"
+        assert normalize_statement("INSERT INTO t (a, b) VALUES (?, ?), (?, ?), (?, ?)") == \
+            "INSERT INTO t (a, b) VALUES (?, ?), ..."
+    
+    def test_identifiers_and_comments(self):
+        """Test that digits inside identifiers survive and comments are dropped."""
+        assert normalize_statement("SELECT col1 FROM t2 /* hint */ WHERE x = 5 -- trailing") == \
+            "SELECT col1 FROM t2 WHERE x = ?"
+        assert normalize_statement("") == ""
+    
+    def test_operation_and_table(self):
+        """Test operation and table extraction, including quoted names."""
+        assert statement_operation("/* app */ UPDATE accounts SET balance = ?") == "UPDATE"
+        assert statement_operation("") == "UNKNOWN"
+        assert statement_table('SELECT * FROM "main"."Accounts" WHERE id = ?') == "accounts"
+        assert statement_table("UPDATE accounts SET x = v.x FROM (VALUES (?, ?)) AS v") == "accounts"
+        assert statement_table("INVALID SQL") is None
+
+
+class TestLatencyHistogram:
+    """Test fixed-bucket latency histograms."""
+    
+    def test_percentiles_use_bucket_bounds(self):
+        """Test percentile estimates from bucket counts."""
+        histogram = LatencyHistogram()
+        for duration in [0.3] * 90 + [40.0] * 9 + [20000.0]:
+            histogram.observe(duration)
+        
+        assert histogram.percentile(50) == 0.5
+        assert histogram.percentile(95) == 50.0
+        assert histogram.percentile(100) == 20000.0  # Overflow bucket capped at the maximum
+        assert sum(histogram.to_dict().values()) == 100
+        assert LatencyHistogram().percentile(50) == 0.0
+    
+    def test_statement_over_overflow_bound_serializes(self):
+        """Test that a statement slower than the last bucket yields finite, JSON-safe percentiles."""
+        stats = StatementStats(fingerprint="SELECT * FROM accounts")
+        stats.record(12500.0, rows=1, timestamp=datetime.utcnow())
+        
+        data = stats.to_dict()
+        
+        assert data["p50_exec_time_ms"] == data["p99_exec_time_ms"] == 12500.0
+        json.dumps(data, default=str, allow_nan=False)
+
+
+class TestStatementStatsStore:
+    """Test per-tenant statement statistics."""
+    
+    def test_statistics_are_kept_per_tenant(self):
+        """Test aggregation per fingerprint and tenant isolation."""
+        store = StatementStatsStore()
+        for duration in (10.0, 30.0):
+            store.record("SELECT * FROM users WHERE id = ?", duration, tenant_id="t1", rows=1)
+        store.record("SELECT * FROM goals", 5.0, tenant_id="t2")
+        store.record("SELECT ?", 1.0)
+        
+        stats = store.get_statements("t1")
+        assert stats["statement_count"] == 1
+        row = stats["statements"][0]
+        assert row["calls"] == 2
+        assert row["mean_exec_time_ms"] == 20.0
+        assert (row["min_exec_time_ms"], row["max_exec_time_ms"]) == (10.0, 30.0)
+        assert row["rows"] == 2
+        assert row["percent_of_total_time"] == 100.0
+        assert store.get_statements()["total_calls"] == 4
+        assert store.tenants() == [NO_TENANT, "t1", "t2"]
+    
+    def test_fingerprint_cardinality_is_bounded(self):
+        """Test that statements past the limit are pooled."""
+        store = StatementStatsStore(max_fingerprints_per_tenant=3)
+        for i in range(10):
+            store.record(f"SELECT * FROM table_{i}", 1.0, tenant_id="t1")
+        
+        stats = store.get_statements("t1", sort_by="calls", limit=10)
+        assert stats["statement_count"] == 4
+        assert stats["statements"][0]["query"] == OTHER_FINGERPRINT
+        assert stats["statements"][0]["calls"] == 7
+    
+    def test_slow_log_keeps_slowest(self):
+        """Test the bounded top-K slow query log."""
+        store = StatementStatsStore(slow_log_size=3, slow_threshold_ms=100.0)
+        for duration in (150.0, 900.0, 50.0, 300.0, 120.0, 600.0):
+            store.record("SELECT ?", duration, tenant_id="t1")
+        store.record("SELECT ?", 1000.0, tenant_id="t2")
+        
+        assert [q.duration_ms for q in store.get_slow_queries("t1")] == [900.0, 600.0, 300.0]
+        assert [q.duration_ms for q in store.get_slow_queries(limit=2)] == [1000.0, 900.0]
+        
+        store.reset("t2")
+        assert store.get_slow_queries("t2") == []
+        assert store.tenants() == ["t1"]
+
+
+class TestPerformanceMetricsStatements:
+    """Test that database metrics feed the statement statistics."""
+    
+    def test_database_metrics_are_fingerprinted(self):
+        """Test recording through PerformanceMetrics."""
+        metrics = PerformanceMetrics()
+        for user_id in (1, 2, 3):
+            metrics.add_database_metric(DatabaseMetrics(
+                query=f"SELECT * FROM users WHERE id = {user_id}",
+                duration_ms=150.0 * user_id,
+                timestamp=datetime.utcnow(),
+                tenant_id="t1",
+                table="users"
+            ))
+        
+        stats = metrics.statements.get_statements("t1")
+        assert stats["statements"][0]["query"] == "SELECT * FROM users WHERE id = ?"
+        assert stats["statements"][0]["calls"] == 3
+        assert [q.duration_ms for q in metrics.slow_queries] == [450.0, 300.0, 150.0]
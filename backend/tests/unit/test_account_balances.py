@@ -0,0 +1,151 @@
+"""Unit tests for set-based account balance updates."""
+import pytest
+from decimal import Decimal
+
+from sqlalchemy import event, select
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from src.accounts.balances import BalanceUpdate, apply_balance_updates
+from src.accounts.models import Account, AccountBalanceHistory
+from src.database import TenantBase
+
+
+def plaid_account(account_id, current, available=None, limit=None):
+    return {
+        "account_id": account_id,
+        "balances": {"current": current, "available": available, "limit": limit, "iso_currency_code": "USD"}
+    }
+
+
+@pytest.fixture
+async def database():
+    """In-memory SQLite database with three accounts, counting statements."""
+    engine = create_async_engine("sqlite+aiosqlite://")
+    async with engine.begin() as connection:
+        await connection.run_sync(
+            lambda sync_connection: TenantBase.metadata.create_all(
+                sync_connection, tables=[Account.__table__, AccountBalanceHistory.__table__]
+            )
+        )
+
+    sessionmaker = async_sessionmaker(engine, expire_on_commit=False)
+    async with sessionmaker() as session:
+        session.add_all([
+            Account(id="a1", user_id="u1", plaid_account_id="p1", name="Checking", type="depository",
+                    subtype="checking", current_balance=Decimal("100.00"), available_balance=Decimal("90.00")),
+            Account(id="a2", user_id="u1", plaid_account_id="p2", name="Savings", type="depository",
+                    subtype="savings", current_balance=Decimal("500.00")),
+            Account(id="a3", user_id="u1", plaid_account_id="p3", name="Card", type="credit",
+                    subtype="credit card", current_balance=Decimal("20.00"), credit_limit=Decimal("1000.00")),
+        ])
+        await session.commit()
+
+    statements = []
+    event.listen(
+        engine.sync_engine, "before_cursor_execute",
+        lambda conn, cursor, statement, *args: statements.append(statement.split()[0].upper())
+    )
+
+    yield sessionmaker, statements
+    await engine.dispose()
+
+
+@pytest.mark.unit
+class TestApplyBalanceUpdates:
+    """Test applying a Plaid balance response."""
+
+    @pytest.mark.asyncio
+    async def test_response_is_applied_with_a_fixed_number_of_statements(self, database):
+        """Test one read, one UPDATE and one INSERT for the whole response."""
+        # Arrange
+        sessionmaker, statements = database
+        response = [
+            plaid_account("p1", 125.5, 115.5),
+            plaid_account("p2", 500.0),
+            plaid_account("p3", 45.0),
+            plaid_account("unknown", 1.0),
+        ]
+
+        # Act
+        async with sessionmaker() as session:
+            changes = await apply_balance_updates(session, [BalanceUpdate.from_plaid(a) for a in response])
+            await session.commit()
+
+        # Assert
+        assert [statement for statement in statements if statement != "COMMIT"] == ["WITH", "WITH", "INSERT"]
+        by_account = {change.account_id: change for change in changes}
+        assert set(by_account) == {"a1", "a2", "a3"}
+        assert by_account["a1"].change_amount == Decimal("25.50")
+        assert by_account["a2"].changed is False
+
+        async with sessionmaker() as session:
+            accounts = {a.id: a for a in (await session.execute(select(Account))).scalars()}
+            history = (await session.execute(select(AccountBalanceHistory))).scalars().all()
+
+        assert accounts["a1"].current_balance == Decimal("125.50")
+        assert accounts["a1"].available_balance == Decimal("115.50")
+        assert accounts["a3"].credit_limit == Decimal("1000.00")  # Kept when Plaid sends none
+        assert accounts["a2"].last_sync_at is not None
+        assert sorted(row.account_id for row in history) == ["a1", "a3"]
+
+    @pytest.mark.asyncio
+    async def test_repeated_response_appends_no_history(self, database):
+        """Test that unchanged balances are not recorded again."""
+        # Arrange
+        sessionmaker, _ = database
+        updates = [BalanceUpdate.from_plaid(plaid_account("p1", 130.0, 120.0))]
+
+        # Act
+        for _ in range(2):
+            async with sessionmaker() as session:
+                changes = await apply_balance_updates(session, updates)
+                await session.commit()
+
+        # Assert
+        assert changes[0].changed is False
+        async with sessionmaker() as session:
+            history = (await session.execute(select(AccountBalanceHistory))).scalars().all()
+        assert len(history) == 1
+
+    @pytest.mark.asyncio
+    async def test_manual_update_without_available_keeps_it(self, database):
+        """Test that a manual update that omits the available balance leaves it in place."""
+        # Arrange
+        sessionmaker, _ = database
+
+        # Act
+        async with sessionmaker() as session:
+            changes = await apply_balance_updates(
+                session, [BalanceUpdate(key="a1", current_balance=Decimal("100.00"))],
+                key_column=Account.id, source="manual"
+            )
+            await session.commit()
+
+        # Assert
+        assert changes[0].available_balance == Decimal("90.00")
+        assert changes[0].changed is False
+        async with sessionmaker() as session:
+            account = await session.get(Account, "a1")
+            history = (await session.execute(select(AccountBalanceHistory))).scalars().all()
+        assert account.available_balance == Decimal("90.00")
+        assert history == []
+
+    @pytest.mark.asyncio
+    async def test_manual_update_records_effective_available_in_history(self, database):
+        """Test that history written for a manual update carries the kept available balance."""
+        # Arrange
+        sessionmaker, _ = database
+
+        # Act
+        async with sessionmaker() as session:
+            await apply_balance_updates(
+                session, [BalanceUpdate(key="a1", current_balance=Decimal("150.00"))],
+                key_column=Account.id, source="manual"
+            )
+            await session.commit()
+
+        # Assert
+        async with sessionmaker() as session:
+            history = (await session.execute(select(AccountBalanceHistory))).scalars().one()
+        assert (history.current_balance, history.available_balance) == (Decimal("150.00"), Decimal("90.00"))
+        assert history.source == "manual"
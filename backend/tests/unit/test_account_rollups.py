@@ -0,0 +1,178 @@
+"""Unit tests for tiered balance history and SQL balance series."""
+import pytest
+from datetime import date, datetime, timedelta
+from decimal import Decimal
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from src.accounts.models import Account, AccountBalanceHistory, AccountBalanceRollup
+from src.accounts.rollups import (
+    BalanceHistoryDownsampler,
+    BalanceRetentionPolicy,
+    balance_trend_query,
+    net_worth_query,
+    user_accounts
+)
+from src.database import TenantBase
+
+TODAY = date(2024, 6, 15)
+POLICY = BalanceRetentionPolicy(raw_days=10, daily_days=60)
+
+
+def sample(account_id, day, hour, balance):
+    return AccountBalanceHistory(
+        id=f"{account_id}-{day.isoformat()}-{hour}", account_id=account_id,
+        current_balance=Decimal(balance), recorded_at=datetime.combine(day, datetime.min.time()) + timedelta(hours=hour)
+    )
+
+
+@pytest.fixture
+async def sessionmaker():
+    """In-memory SQLite database with a checking account and a credit card."""
+    engine = create_async_engine("sqlite+aiosqlite://")
+    async with engine.begin() as connection:
+        await connection.run_sync(
+            lambda sync_connection: TenantBase.metadata.create_all(
+                sync_connection,
+                tables=[Account.__table__, AccountBalanceHistory.__table__, AccountBalanceRollup.__table__]
+            )
+        )
+
+    maker = async_sessionmaker(engine, expire_on_commit=False)
+    async with maker() as session:
+        session.add_all([
+            Account(id="a1", user_id="u1", name="Checking", type="depository", subtype="checking"),
+            Account(id="a2", user_id="u1", name="Card", type="credit", subtype="credit card"),
+            Account(id="a3", user_id="u2", name="Other user", type="depository", subtype="checking"),
+            # Old enough to end up in a monthly rollup
+            sample("a1", date(2024, 3, 1), 9, "100.00"),
+            sample("a1", date(2024, 3, 1), 18, "80.00"),
+            sample("a1", date(2024, 3, 20), 12, "300.00"),
+            # Folded into a daily rollup
+            sample("a1", date(2024, 6, 1), 9, "500.00"),
+            sample("a1", date(2024, 6, 1), 12, "450.00"),
+            sample("a1", date(2024, 6, 1), 20, "600.00"),
+            sample("a2", date(2024, 6, 1), 12, "200.00"),
+            # Recent, kept raw
+            sample("a1", date(2024, 6, 14), 12, "700.00"),
+            sample("a3", date(2024, 6, 14), 12, "9999.00"),
+        ])
+        await session.commit()
+
+    yield maker
+    await engine.dispose()
+
+
+async def downsample(sessionmaker):
+    async with sessionmaker() as session:
+        folded = await BalanceHistoryDownsampler(session, POLICY).downsample(TODAY)
+        await session.commit()
+    return folded
+
+
+@pytest.mark.unit
+class TestBalanceHistoryDownsampler:
+    """Test folding raw history into daily and monthly rollups."""
+
+    @pytest.mark.asyncio
+    async def test_tiers_are_folded_and_folding_is_idempotent(self, sessionmaker):
+        """Test that raw rows become daily rollups and old days become months."""
+        # Act
+        first = await downsample(sessionmaker)
+        second = await downsample(sessionmaker)
+
+        # Assert
+        assert first == {"day": 4, "month": 1}
+        assert second == {"day": 0, "month": 0}
+        async with sessionmaker() as session:
+            rollups = {
+                (row.account_id, row.resolution, row.period_start): row
+                for row in (await session.execute(select(AccountBalanceRollup))).scalars()
+            }
+            raw = (await session.execute(select(AccountBalanceHistory))).scalars().all()
+
+        assert sorted(rollups) == [
+            ("a1", "day", date(2024, 6, 1)),
+            ("a1", "month", date(2024, 3, 1)),
+            ("a2", "day", date(2024, 6, 1)),
+        ]
+        june = rollups[("a1", "day", date(2024, 6, 1))]
+        assert (june.open_balance, june.close_balance) == (Decimal("500.00"), Decimal("600.00"))
+        assert (june.min_balance, june.max_balance, june.sample_count) == (Decimal("450.00"), Decimal("600.00"), 3)
+        march = rollups[("a1", "month", date(2024, 3, 1))]
+        assert (march.open_balance, march.close_balance, march.min_balance) == (
+            Decimal("100.00"), Decimal("300.00"), Decimal("80.00")
+        )
+        assert march.sample_count == 3
+        assert len(raw) == 2
+
+    @pytest.mark.asyncio
+    async def test_late_samples_merge_into_existing_rollups(self, sessionmaker):
+        """Test that a sample arriving after its day was folded updates the rollup."""
+        # Arrange
+        await downsample(sessionmaker)
+        async with sessionmaker() as session:
+            session.add(sample("a2", date(2024, 6, 1), 23, "150.00"))
+            await session.commit()
+
+        # Act
+        await downsample(sessionmaker)
+
+        # Assert
+        async with sessionmaker() as session:
+            card = await session.get(AccountBalanceRollup, ("a2", "day", date(2024, 6, 1)))
+        assert (card.open_balance, card.close_balance, card.min_balance) == (
+            Decimal("200.00"), Decimal("150.00"), Decimal("150.00")
+        )
+        assert card.sample_count == 2
+
+
+@pytest.mark.unit
+class TestBalanceSeries:
+    """Test trends and net worth computed across the tiers."""
+
+    @pytest.mark.asyncio
+    async def test_trend_reads_raw_and_rolled_up_history(self, sessionmaker):
+        """Test that a trend spans rollups and raw rows of every user account."""
+        # Arrange
+        await downsample(sessionmaker)
+
+        # Act
+        async with sessionmaker() as session:
+            rows = (await session.execute(balance_trend_query(user_accounts("u1"), datetime(2024, 5, 1)))).all()
+
+        # Assert
+        checking = [row for row in rows if row.account_id == "a1"]
+        assert [row.day for row in checking] == ["2024-06-01", "2024-06-14"]
+        assert Decimal(str(checking[0].start_balance)) == Decimal("500.00")
+        assert Decimal(str(checking[0].end_balance)) == Decimal("700.00")
+        assert Decimal(str(checking[0].lowest_balance)) == Decimal("450.00")
+        assert Decimal(str(checking[0].average_balance)) == Decimal("562.5")
+        assert {row.account_id for row in rows} == {"a1", "a2"}
+
+    @pytest.mark.asyncio
+    async def test_net_worth_carries_balances_forward(self, sessionmaker):
+        """Test daily net worth with liabilities and days without samples."""
+        # Arrange
+        await downsample(sessionmaker)
+
+        # Act
+        async with sessionmaker() as session:
+            rows = (await session.execute(net_worth_query("u1", date(2024, 5, 31), date(2024, 6, 14)))).all()
+            months = (await session.execute(net_worth_query("u1", date(2024, 2, 1), date(2024, 6, 30), "month"))).all()
+
+        # Assert
+        by_day = {row.bucket: row for row in rows}
+        assert len(rows) == 15
+        assert Decimal(str(by_day["2024-05-31"].net_worth)) == Decimal("300.00")  # Seeded from March
+        assert by_day["2024-05-31"].accounts == 1
+        assert Decimal(str(by_day["2024-06-05"].net_worth)) == Decimal("400.00")
+        assert Decimal(str(by_day["2024-06-05"].liabilities)) == Decimal("200.00")
+        assert Decimal(str(by_day["2024-06-14"].net_worth)) == Decimal("500.00")
+        assert [row.bucket for row in months] == [
+            "2024-02-01", "2024-03-01", "2024-04-01", "2024-05-01", "2024-06-01"
+        ]
+        assert [Decimal(str(row.net_worth)) for row in months] == [
+            Decimal("0"), Decimal("300.00"), Decimal("300.00"), Decimal("300.00"), Decimal("500.00")
+        ]
@@ -49,6 +49,7 @@ def mock_account_service():
     service = Mock()
     service.account_repo = Mock()
     service.update_account_balance = AsyncMock()
+    service.sync_plaid_balances = AsyncMock(return_value=[])
     return service
 
 
@@ -125,8 +126,9 @@ class TestSyncAccountDataTask:
             mock_get_cache.return_value = mock_cache_service
             
             mock_account_service = Mock()
-            mock_account_service.account_repo.get_by_plaid_account_id.return_value = mock_existing_account
-            mock_account_service.update_account_balance.return_value = mock_existing_account
+            mock_account_service.sync_plaid_balances = AsyncMock(return_value=[
+                Mock(account_id=mock_existing_account.id, key="plaid_account_123", changed=True)
+            ])
             mock_account_service_class.return_value = mock_account_service
             
             # Create task instance with bound self
@@ -147,6 +149,7 @@ class TestSyncAccountDataTask:
             assert len(result["accounts"]) == 1
             assert result["accounts"][0]["account_id"] == "plaid_account_123"
             assert result["accounts"][0]["status"] == "updated"
+            mock_account_service.sync_plaid_balances.assert_awaited_once_with(mock_account_data["accounts"])
 
     @pytest.mark.asyncio
     async def test_sync_account_data_retry_on_failure(self, mock_celery_request):
@@ -211,7 +214,7 @@ class TestSyncAccountDataTask:
             mock_get_cache.return_value = mock_cache_service
             
             mock_account_service = Mock()
-            mock_account_service.account_repo.get_by_plaid_account_id.return_value = None  # Not found
+            mock_account_service.sync_plaid_balances = AsyncMock(return_value=[])  # Not found
             mock_account_service_class.return_value = mock_account_service
             
             task_instance = Mock()
@@ -1057,6 +1060,7 @@ class TestTaskPerformanceAndMemory:
             mock_get_cache.return_value = mock_cache_service
             
             mock_account_service = Mock()
+            mock_account_service.sync_plaid_balances = AsyncMock(return_value=[])
             mock_account_service_class.return_value = mock_account_service
             
             task_instance = Mock()
@@ -0,0 +1,95 @@
+"""Unit tests for budget threshold alert detection."""
+import pytest
+from datetime import date
+from decimal import Decimal
+
+from src.budgets.alerts import SpendingChange, ThresholdCrossing, detect_crossings
+from src.budgets.models import AlertType
+
+
+def change(previous, new, limit="1000", category_id=None):
+    """Spending change for a budget, or a category when ``category_id`` is given."""
+    return SpendingChange(
+        budget_id="b1",
+        user_id="u1",
+        budget_name="Monthly",
+        period_start=date(2024, 2, 1),
+        limit_amount=Decimal(limit),
+        previous_amount=Decimal(previous),
+        new_amount=Decimal(new),
+        warning_threshold=Decimal("75"),
+        critical_threshold=Decimal("90"),
+        category_id=category_id,
+        category_name="Dining" if category_id else None
+    )
+
+
+@pytest.mark.unit
+class TestDetectCrossings:
+    """Test that only upward threshold crossings produce alerts."""
+
+    def test_warning_crossing(self):
+        """Test that crossing the warning threshold emits a warning."""
+        # Act
+        crossings = detect_crossings([change("700", "760")])
+
+        # Assert
+        assert [crossing.alert_type for crossing in crossings] == [AlertType.WARNING]
+        assert crossings[0].threshold == Decimal("75")
+        assert "76.0%" in crossings[0].message
+
+    def test_already_exceeded_budget_does_not_realert(self):
+        """Test that further spending on an exceeded budget emits nothing."""
+        # Act
+        crossings = detect_crossings([change("1100", "1200")])
+
+        # Assert
+        assert crossings == []
+
+    def test_single_change_crossing_every_threshold(self):
+        """Test that one large change emits each crossed threshold."""
+        # Act
+        crossings = detect_crossings([change("100", "1500")])
+
+        # Assert
+        assert [crossing.alert_type for crossing in crossings] == [
+            AlertType.WARNING, AlertType.CRITICAL, AlertType.EXCEEDED
+        ]
+
+    def test_decrease_does_not_alert(self):
+        """Test that refunds and recomputes that lower spending emit nothing."""
+        # Act
+        crossings = detect_crossings([change("950", "700")])
+
+        # Assert
+        assert crossings == []
+
+    def test_category_alerts_only_when_exceeded(self):
+        """Test that categories alert on exceeding their allocation."""
+        # Act
+        crossings = detect_crossings([
+            change("100", "190", limit="200", category_id="c1"),
+            change("190", "210", limit="200", category_id="c1"),
+        ])
+
+        # Assert
+        assert len(crossings) == 1
+        assert crossings[0].alert_type == AlertType.EXCEEDED
+        assert "Category 'Dining'" in crossings[0].message
+
+
+@pytest.mark.unit
+class TestAlertKeys:
+    """Test idempotent alert keys."""
+
+    def test_key_is_stable_per_period_scope_and_type(self):
+        """Test that the same crossing in the same period has the same key."""
+        # Arrange
+        first = ThresholdCrossing(change("700", "760"), AlertType.WARNING)
+        repeat = ThresholdCrossing(change("0", "800"), AlertType.WARNING)
+        category = ThresholdCrossing(change("0", "800", category_id="c1"), AlertType.WARNING)
+
+        # Assert
+        assert first.alert_key == repeat.alert_key == "b1:budget:warning:2024-02-01"
+        assert category.alert_key == "b1:c1:warning:2024-02-01"
+        assert first.to_alert_row()["alert_key"] == first.alert_key
@@ -0,0 +1,186 @@
+"""Unit tests for single-query budget analytics and its cache."""
+import pytest
+from datetime import date, timedelta
+from decimal import Decimal
+from unittest.mock import AsyncMock
+
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from src.budgets.analytics import (
+    BudgetAnalyticsCache,
+    analytics_from_row,
+    budget_analytics_query,
+    spending_trend
+)
+from src.budgets.models import Budget, BudgetCategory, BudgetPeriod, BudgetStatus
+from src.tenant.context import TenantContext, with_tenant_context
+
+
+def budget(budget_id, total, spent, status=BudgetStatus.ACTIVE, user_id="u1", month=2):
+    start_date = date(2024, month, 1)
+    return Budget(
+        id=budget_id, name=budget_id, total_amount=Decimal(total), spent_amount=Decimal(spent),
+        remaining_amount=Decimal(total) - Decimal(spent), period_type=BudgetPeriod.MONTHLY,
+        start_date=start_date, end_date=date(2024, month + 1, 1) - timedelta(days=1), status=status,
+        user_id=user_id, created_by=user_id
+    )
+
+
+def category(category_id, budget_id, name, allocated, spent):
+    return BudgetCategory(
+        id=category_id, budget_id=budget_id, category_name=name, allocated_amount=Decimal(allocated),
+        spent_amount=Decimal(spent), remaining_amount=Decimal(allocated) - Decimal(spent)
+    )
+
+
+@pytest.fixture
+async def sessionmaker():
+    """In-memory SQLite database with the budget tables."""
+    engine = create_async_engine("sqlite+aiosqlite://")
+    async with engine.begin() as connection:
+        await connection.run_sync(
+            lambda sync_connection: Budget.metadata.create_all(
+                sync_connection, tables=[Budget.__table__, BudgetCategory.__table__]
+            )
+        )
+
+    yield async_sessionmaker(engine, expire_on_commit=False)
+    await engine.dispose()
+
+
+async def run_analytics(sessionmaker, user_id="u1", today=None):
+    async with sessionmaker() as session:
+        result = await session.execute(budget_analytics_query(user_id, today))
+        return analytics_from_row(result.one())
+
+
+@pytest.mark.unit
+class TestBudgetAnalyticsQuery:
+    """Test the single-statement analytics query against a real database."""
+
+    @pytest.mark.asyncio
+    async def test_metrics_cover_budgets_and_categories(self, sessionmaker):
+        """Test counts, totals and category extremes in one query."""
+        # Arrange
+        async with sessionmaker() as session:
+            session.add_all([
+                budget("b1", "1000", "800"),  # At the 75% warning threshold
+                budget("b2", "500", "600"),   # Over budget
+                budget("b3", "2000", "1900", status=BudgetStatus.INACTIVE),
+                budget("other", "100", "500", user_id="u2"),
+                category("c1", "b1", "Groceries", "400", "300"),
+                category("c2", "b1", "Dining", "200", "260"),
+                category("c3", "b2", "Transport", "300", "30"),
+                category("c4", "b3", "Travel", "100", "900"),  # Inactive budget
+            ])
+            await session.commit()
+
+        # Act
+        analytics = await run_analytics(sessionmaker)
+
+        # Assert
+        assert analytics["total_budgets"] == 3
+        assert analytics["active_budgets"] == 2
+        assert analytics["total_budgeted_amount"] == Decimal("1500")
+        assert analytics["total_spent_amount"] == Decimal("1400")
+        assert analytics["budgets_over_threshold"] == 2
+        assert analytics["budgets_over_budget"] == 1
+        assert analytics["most_overspent_category"] == "Dining"
+        assert analytics["best_performing_category"] == "Transport"
+        assert round(analytics["average_utilization"], 2) == Decimal("93.33")
+
+    @pytest.mark.asyncio
+    async def test_user_without_budgets(self, sessionmaker):
+        """Test that an empty user still gets one zeroed row."""
+        # Act
+        analytics = await run_analytics(sessionmaker)
+
+        # Assert
+        assert analytics["total_budgets"] == 0
+        assert analytics["total_budgeted_amount"] == Decimal(0)
+        assert analytics["average_utilization"] == Decimal(0)
+        assert analytics["most_overspent_category"] is None
+        assert analytics["best_performing_category"] is None
+
+    @pytest.mark.asyncio
+    async def test_no_overspent_category_when_all_within_allocation(self, sessionmaker):
+        """Test that the most overspent category is only reported when one is over."""
+        # Arrange
+        async with sessionmaker() as session:
+            session.add_all([budget("b1", "1000", "100"), category("c1", "b1", "Groceries", "400", "100")])
+            await session.commit()
+
+        # Act
+        analytics = await run_analytics(sessionmaker)
+
+        # Assert
+        assert analytics["most_overspent_category"] is None
+        assert analytics["best_performing_category"] == "Groceries"
+
+
+    @pytest.mark.asyncio
+    async def test_spending_trend_compares_last_two_ended_periods(self, sessionmaker):
+        """Test that the trend follows utilization across ended periods, ignoring the current one."""
+        # Arrange
+        async with sessionmaker() as session:
+            session.add_all([
+                budget("jan", "1000", "600", status=BudgetStatus.COMPLETED, month=1),
+                budget("feb-1", "1000", "700", status=BudgetStatus.COMPLETED, month=2),
+                budget("feb-2", "500", "400", status=BudgetStatus.COMPLETED, month=2),
+                budget("mar", "1000", "50", month=3),  # Current period, still open
+                budget("other", "100", "10", user_id="u2", month=2),
+            ])
+            await session.commit()
+
+        # Act
+        analytics = await run_analytics(sessionmaker, today=date(2024, 3, 10))
+
+        # Assert
+        assert analytics["spending_trend"] == "increasing"  # 60% in January, 73.3% in February
+        assert "last_period_spent" not in analytics
+
+    def test_spending_trend_thresholds(self):
+        """Test the trend labels and the fallback without enough history."""
+        assert spending_trend(Decimal("80"), Decimal("90")) == "decreasing"
+        assert spending_trend(Decimal("82"), Decimal("80")) == "stable"
+        assert spending_trend(Decimal("80"), None) == "stable"
+
+
+@pytest.mark.unit
+class TestBudgetAnalyticsCache:
+    """Test tenant-scoped caching of analytics."""
+
+    @pytest.mark.asyncio
+    async def test_keys_are_scoped_to_tenant_and_user(self):
+        """Test that cache calls use the current tenant and a per-user key."""
+        # Arrange
+        cache_service = AsyncMock()
+        cache = BudgetAnalyticsCache(cache_service=cache_service, ttl=60)
+        tenant_context = TenantContext(tenant_id="tenant-1", tenant_slug="t1", database_url="sqlite://", auth_token="")
+
+        # Act
+        with with_tenant_context(tenant_context):
+            await cache.set("u1", {"total_budgets": 1})
+            await cache.invalidate("u1", "u1", None)
+
+        # Assert
+        cache_service.set.assert_awaited_once_with(
+            "tenant-1", "user:u1:budget_analytics", {"total_budgets": 1}, ttl=60, namespace="budgets"
+        )
+        cache_service.delete.assert_awaited_once_with("tenant-1", "user:u1:budget_analytics", namespace="budgets")
+
+    @pytest.mark.asyncio
+    async def test_no_tenant_context_bypasses_cache(self):
+        """Test that the cache is skipped outside a tenant context."""
+        # Arrange
+        cache_service = AsyncMock()
+        cache = BudgetAnalyticsCache(cache_service=cache_service, ttl=60)
+
+        # Act
+        result = await cache.get("u1")
+        await cache.invalidate("u1")
+
+        # Assert
+        assert result is None
+        cache_service.get.assert_not_called()
+        cache_service.delete.assert_not_called()
@@ -0,0 +1,160 @@
+"""Unit tests for bulk budget creation and recurring rollover."""
+import pytest
+from datetime import date
+from decimal import Decimal
+from unittest.mock import AsyncMock
+
+from sqlalchemy import event, select
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from src.budgets.bulk import BudgetBulkWriter, BudgetDraft
+from src.budgets.models import Budget, BudgetCategory, BudgetPeriod, BudgetStatus
+from src.budgets.rollover import BudgetRolloverEngine, next_period
+from src.exceptions import DatabaseError
+
+
+@pytest.fixture
+async def database():
+    """In-memory SQLite database with the budget tables, counting statements."""
+    engine = create_async_engine("sqlite+aiosqlite://")
+    async with engine.begin() as connection:
+        await connection.run_sync(
+            lambda sync_connection: Budget.metadata.create_all(
+                sync_connection, tables=[Budget.__table__, BudgetCategory.__table__]
+            )
+        )
+
+    statements = []
+    event.listen(
+        engine.sync_engine, "before_cursor_execute",
+        lambda conn, cursor, statement, *args: statements.append(statement.split()[0].upper())
+    )
+
+    sessionmaker = async_sessionmaker(engine, expire_on_commit=False)
+
+    async def factory():
+        return sessionmaker()
+
+    yield factory, statements
+    await engine.dispose()
+
+
+def draft(user_id="u1", name="Monthly", start=date(2024, 1, 1), end=date(2024, 1, 31), **fields):
+    return BudgetDraft(
+        user_id=user_id,
+        created_by=user_id,
+        fields={
+            "name": name, "total_amount": Decimal("1000"), "period_type": BudgetPeriod.MONTHLY,
+            "start_date": start, "end_date": end, "rollover_unused": True, **fields
+        },
+        categories=[
+            {"category_name": "Groceries", "allocated_amount": Decimal("400"), "priority": 1},
+            {"category_name": "Dining", "allocated_amount": Decimal("200"), "priority": 2},
+        ]
+    )
+
+
+async def load_budgets(session_factory):
+    async with await session_factory() as session:
+        result = await session.execute(select(Budget).order_by(Budget.user_id, Budget.start_date))
+        return result.scalars().all()
+
+
+@pytest.mark.unit
+class TestBudgetBulkWriter:
+    """Test creating budgets and categories in one transaction."""
+
+    @pytest.mark.asyncio
+    async def test_budgets_are_created_without_read_back(self, database):
+        """Test that a batch is inserted with no SELECTs and returned fully populated."""
+        # Arrange
+        session_factory, statements = database
+        writer = BudgetBulkWriter(session_factory=session_factory)
+
+        # Act
+        budgets = await writer.create_budgets([draft("u1"), draft("u2")])
+
+        # Assert
+        assert "SELECT" not in statements
+        assert statements.count("INSERT") == 2  # One multi-row statement per table
+        assert budgets[0].remaining_amount == Decimal("1000")
+        assert budgets[0].categories[0].remaining_amount == Decimal("400")
+        assert budgets[0].created_at is not None and budgets[0].alerts == []
+        assert [budget.user_id for budget in await load_budgets(session_factory)] == ["u1", "u2"]
+
+    @pytest.mark.asyncio
+    async def test_failed_batch_creates_nothing(self, database):
+        """Test that one bad budget rolls back the whole batch."""
+        # Arrange
+        session_factory, _ = database
+        writer = BudgetBulkWriter(session_factory=session_factory)
+
+        # Act
+        with pytest.raises(DatabaseError):
+            await writer.create_budgets([draft("u1"), draft("u2", name=None)])
+
+        # Assert
+        assert await load_budgets(session_factory) == []
+
+
+@pytest.mark.unit
+class TestNextPeriod:
+    """Test period boundary calculation."""
+
+    @pytest.mark.parametrize("period_type, end, expected", [
+        (BudgetPeriod.WEEKLY, date(2024, 1, 7), (date(2024, 1, 8), date(2024, 1, 14))),
+        (BudgetPeriod.MONTHLY, date(2024, 1, 31), (date(2024, 2, 1), date(2024, 2, 29))),
+        (BudgetPeriod.QUARTERLY, date(2024, 3, 31), (date(2024, 4, 1), date(2024, 6, 30))),
+        (BudgetPeriod.YEARLY, date(2024, 12, 31), (date(2025, 1, 1), date(2025, 12, 31))),
+    ])
+    def test_next_period_follows_end_date(self, period_type, end, expected):
+        """Test that the next period starts the day after the current one ends."""
+        # Act & Assert
+        assert next_period(Budget(period_type=period_type, end_date=end)) == expected
+
+
+@pytest.mark.unit
+class TestBudgetRolloverEngine:
+    """Test rolling recurring budgets into their next period."""
+
+    @pytest.mark.asyncio
+    async def test_ended_recurring_budgets_roll_over_once(self, database):
+        """Test that ended budgets get one successor, carrying unused amounts when enabled."""
+        # Arrange
+        session_factory, _ = database
+        await BudgetBulkWriter(session_factory=session_factory).create_budgets([
+            draft("u1", is_recurring=True, auto_rollover=True, spent_amount=Decimal("700")),
+            draft("u2", is_recurring=True, auto_rollover=False, spent_amount=Decimal("100")),
+            draft("u3", is_recurring=False),
+            draft("u4", is_recurring=True, start=date(2024, 2, 1), end=date(2024, 2, 29)),
+        ])
+        cache = AsyncMock()
+        engine = BudgetRolloverEngine(session_factory=session_factory, analytics_cache=cache, batch_size=1)
+
+        # Act
+        result = await engine.rollover_due(as_of=date(2024, 2, 1))
+        rerun = await engine.rollover_due(as_of=date(2024, 2, 1))
+
+        # Assert
+        budgets = await load_budgets(session_factory)
+        by_user = {}
+        for budget in budgets:
+            by_user.setdefault(budget.user_id, []).append(budget)
+
+        assert result.budgets_rolled_over == 2 and rerun.budgets_rolled_over == 0
+        assert result.amount_carried == Decimal("300")
+        previous, successor = by_user["u1"]
+        assert previous.status == BudgetStatus.COMPLETED
+        assert (successor.start_date, successor.end_date) == (date(2024, 2, 1), date(2024, 2, 29))
+        assert successor.total_amount == Decimal("1300") and successor.spent_amount == Decimal("0")
+        assert by_user["u2"][1].total_amount == Decimal("1000")
+        assert len(by_user["u3"]) == 1 and len(by_user["u4"]) == 1
+        cache.invalidate.assert_awaited_once_with("u1", "u2")
+
+        async with await session_factory() as session:
+            categories = (await session.execute(
+                select(BudgetCategory.category_name, BudgetCategory.spent_amount)
+                .where(BudgetCategory.budget_id == successor.id)
+                .order_by(BudgetCategory.priority)
+            )).all()
+        assert categories == [("Groceries", Decimal("0")), ("Dining", Decimal("0"))]
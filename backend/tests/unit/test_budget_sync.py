@@ -0,0 +1,260 @@
+"""Unit tests for the budget spending sync engine."""
+import pytest
+from datetime import date, datetime
+from decimal import Decimal
+from unittest.mock import AsyncMock, patch
+
+from sqlalchemy import DateTime, Numeric, String, false, literal, select, union_all
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from src.budgets.alerts import BudgetAlertEvaluator
+from src.budgets.models import Budget, BudgetAlert, BudgetCategory, BudgetPeriod, BudgetStatus
+from src.budgets.sync import BudgetSyncEngine, SyncTarget, build_sync_plan
+from src.tenant.context import TenantContext, with_tenant_context
+
+
+def spending_rows(*rows):
+    """Stand-in for the grouped spending query, returning fixed rows."""
+    return union_all(*(
+        select(
+            literal(budget_id, String),
+            literal(category_id, String),
+            literal(amount, Numeric(15, 2)),
+            literal(newest, DateTime)
+        )
+        for budget_id, category_id, amount, newest in rows
+    ))
+
+
+def changed_budgets(*budget_ids):
+    """Stand-in for the changed-budgets query, returning fixed ids."""
+    if not budget_ids:
+        return select(literal("none", String)).where(false())
+    return union_all(*(select(literal(budget_id, String)) for budget_id in budget_ids))
+
+
+@pytest.fixture
+async def session_factory():
+    """In-memory SQLite database with the budget tables."""
+    engine = create_async_engine("sqlite+aiosqlite://")
+    async with engine.begin() as connection:
+        await connection.run_sync(
+            lambda sync_connection: Budget.metadata.create_all(
+                sync_connection, tables=[Budget.__table__, BudgetCategory.__table__, BudgetAlert.__table__]
+            )
+        )
+
+    sessionmaker = async_sessionmaker(engine, expire_on_commit=False)
+
+    async with sessionmaker() as session:
+        session.add_all([
+            Budget(
+                id="b1", name="Monthly", total_amount=Decimal("1000"), spent_amount=Decimal("100"),
+                remaining_amount=Decimal("900"), period_type=BudgetPeriod.MONTHLY,
+                start_date=date(2024, 2, 1), end_date=date(2024, 2, 29), status=BudgetStatus.ACTIVE,
+                user_id="u1", created_by="u1", spending_watermark=datetime(2024, 2, 10)
+            ),
+            BudgetCategory(
+                id="c1", budget_id="b1", category_name="Groceries", allocated_amount=Decimal("400"),
+                spent_amount=Decimal("60"), remaining_amount=Decimal("340")
+            ),
+            BudgetCategory(
+                id="c2", budget_id="b1", category_name="Dining", allocated_amount=Decimal("200"),
+                spent_amount=Decimal("40"), remaining_amount=Decimal("160")
+            ),
+        ])
+        await session.commit()
+
+    async def factory():
+        return sessionmaker()
+
+    yield factory
+    await engine.dispose()
+
+
+async def load_amounts(session_factory):
+    """Read back spent and remaining amounts keyed by id."""
+    async with await session_factory() as session:
+        budgets = (await session.execute(
+            select(Budget.id, Budget.spent_amount, Budget.remaining_amount, Budget.spending_watermark)
+        )).all()
+        categories = (await session.execute(
+            select(BudgetCategory.id, BudgetCategory.spent_amount, BudgetCategory.remaining_amount)
+        )).all()
+    return {row[0]: row[1:] for row in budgets + categories}
+
+
+def sync_engine(session_factory):
+    """Sync engine whose alert notifications are captured instead of sent."""
+    evaluator = BudgetAlertEvaluator(session_factory=session_factory, notifier=AsyncMock())
+    evaluator._load_recipients = AsyncMock(return_value={"u1": {"email": "u1@example.com", "name": "User"}})
+    return BudgetSyncEngine(session_factory=session_factory, alert_evaluator=evaluator)
+
+
+@pytest.mark.unit
+class TestBuildSyncPlan:
+    """Test turning grouped spending rows into UPDATE parameters."""
+
+    def test_full_sync_zero_fills_categories(self):
+        """Test that a full sync writes every category, including those without spending.
+
+        Spending outside the budget's categories is not counted, so the budget
+        total always equals the sum of its categories.
+        """
+        # Arrange
+        targets = [SyncTarget(Budget(id="b1"), [BudgetCategory(id="c1"), BudgetCategory(id="c2")])]
+        rows = [("b1", "c1", Decimal("50"), datetime(2024, 2, 3)), ("b1", None, Decimal("25"), datetime(2024, 2, 5))]
+
+        # Act
+        plan = build_sync_plan(targets, rows)
+
+        # Assert
+        assert plan.set_budgets == [{"b_id": "b1", "b_amount": Decimal("50"), "b_watermark": datetime(2024, 2, 5)}]
+        assert plan.set_categories == [
+            {"b_id": "c1", "b_amount": Decimal("50")},
+            {"b_id": "c2", "b_amount": Decimal("0")},
+        ]
+
+    def test_only_changed_budgets_are_resummed(self):
+        """Test that budgets outside the changed set are left untouched."""
+        # Arrange
+        targets = [
+            SyncTarget(Budget(id="b1", spending_watermark=datetime(2024, 2, 1)), [BudgetCategory(id="c1")]),
+            SyncTarget(Budget(id="b2", spending_watermark=datetime(2024, 2, 1)), [BudgetCategory(id="c3")]),
+        ]
+        rows = [("b1", "c1", Decimal("10"), datetime(2024, 2, 2))]
+
+        # Act
+        plan = build_sync_plan(targets, rows, budget_ids=["b1"])
+
+        # Assert
+        assert plan.set_budgets == [{"b_id": "b1", "b_amount": Decimal("10"), "b_watermark": datetime(2024, 2, 2)}]
+        assert plan.set_categories == [{"b_id": "c1", "b_amount": Decimal("10")}]
+        assert plan.budget_ids == ["b1"]
+
+
+@pytest.mark.unit
+class TestBudgetSyncEngine:
+    """Test the sync transaction against a real database."""
+
+    @pytest.mark.asyncio
+    async def test_incremental_sync_resums_changed_budgets(self, session_factory):
+        """Test that a budget with new spending gets its totals re-summed."""
+        # Arrange
+        engine = sync_engine(session_factory)
+        rows = spending_rows(
+            ("b1", "c1", Decimal("75.50"), datetime(2024, 2, 12)),
+            ("b1", "c2", Decimal("40"), datetime(2024, 2, 8)),
+            ("b1", None, Decimal("4.50"), datetime(2024, 2, 11))
+        )
+
+        # Act
+        with patch.object(BudgetSyncEngine, "_changed_budgets_query", return_value=changed_budgets("b1")), \
+                patch.object(BudgetSyncEngine, "_spending_query", return_value=rows):
+            result = await engine.sync_user_budgets(["u1"])
+
+        # Assert
+        amounts = await load_amounts(session_factory)
+        assert result.incremental_syncs == 1 and result.categories_updated == 2
+        assert amounts["b1"] == (Decimal("115.50"), Decimal("884.50"), datetime(2024, 2, 12))
+        assert amounts["c1"] == (Decimal("75.50"), Decimal("324.50"))
+        assert amounts["c2"] == (Decimal("40.00"), Decimal("160.00"))
+        assert amounts["b1"][0] == amounts["c1"][0] + amounts["c2"][0]
+
+    @pytest.mark.asyncio
+    async def test_late_committed_transaction_is_counted_once(self, session_factory):
+        """Test that a row created before the watermark but committed after it is not lost or double counted."""
+        # Arrange
+        engine = sync_engine(session_factory)
+        # The stored 100 plus a 12.00 transaction created before the watermark that committed late
+        rows = spending_rows(
+            ("b1", "c1", Decimal("72"), datetime(2024, 2, 9, 23, 30)),
+            ("b1", "c2", Decimal("40"), datetime(2024, 2, 10))
+        )
+
+        # Act
+        with patch.object(BudgetSyncEngine, "_changed_budgets_query", return_value=changed_budgets("b1")), \
+                patch.object(BudgetSyncEngine, "_spending_query", return_value=rows):
+            await engine.sync_user_budgets(["u1"])
+            await engine.sync_user_budgets(["u1"])
+
+        # Assert
+        amounts = await load_amounts(session_factory)
+        assert amounts["b1"] == (Decimal("112.00"), Decimal("888.00"), datetime(2024, 2, 10))
+        assert amounts["c1"] == (Decimal("72.00"), Decimal("328.00"))
+
+    @pytest.mark.asyncio
+    async def test_unchanged_budgets_are_not_resummed(self, session_factory):
+        """Test that an incremental sync skips the spending query when nothing changed."""
+        # Arrange
+        engine = sync_engine(session_factory)
+
+        # Act
+        with patch.object(BudgetSyncEngine, "_changed_budgets_query", return_value=changed_budgets()), \
+                patch.object(BudgetSyncEngine, "_spending_query") as spending_query:
+            result = await engine.sync_user_budgets(["u1"])
+
+        # Assert
+        assert result.updated_budget_ids == []
+        assert (await load_amounts(session_factory))["b1"][0] == Decimal("100.00")
+        spending_query.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_full_sync_recomputes_amounts(self, session_factory):
+        """Test that a forced sync replaces stored amounts."""
+        # Arrange
+        engine = sync_engine(session_factory)
+        rows = spending_rows(("b1", "c2", Decimal("30"), datetime(2024, 2, 9)))
+
+        # Act
+        with patch.object(BudgetSyncEngine, "_spending_query", return_value=rows):
+            result = await engine.sync_budgets(["b1"], full=True)
+
+        # Assert
+        amounts = await load_amounts(session_factory)
+        assert result.full_syncs == 1 and result.updated_budget_ids == ["b1"]
+        assert amounts["b1"] == (Decimal("30.00"), Decimal("970.00"), datetime(2024, 2, 10))
+        assert amounts["c1"] == (Decimal("0.00"), Decimal("400.00"))
+        assert amounts["c2"] == (Decimal("30.00"), Decimal("170.00"))
+
+    @pytest.mark.asyncio
+    async def test_inactive_budgets_are_not_synced_for_users(self, session_factory):
+        """Test that user-wide syncs only touch active budgets."""
+        # Arrange
+        engine = sync_engine(session_factory)
+        async with await session_factory() as session:
+            budget = await session.get(Budget, "b1")
+            budget.status = BudgetStatus.PAUSED
+            await session.commit()
+
+        # Act
+        result = await engine.sync_user_budgets(["u1"])
+
+        # Assert
+        assert result.budgets_checked == 0
+
+    @pytest.mark.asyncio
+    async def test_crossing_alerts_are_recorded_once(self, session_factory):
+        """Test that a sync crossing thresholds alerts once, even when re-run."""
+        # Arrange
+        engine = sync_engine(session_factory)
+        rows = spending_rows(("b1", "c2", Decimal("800"), datetime(2024, 2, 12)))
+        tenant_context = TenantContext(tenant_id="tenant-1", tenant_slug="t1", database_url="sqlite://", auth_token="")
+
+        # Act
+        with patch.object(BudgetSyncEngine, "_changed_budgets_query", return_value=changed_budgets("b1")), \
+                patch.object(BudgetSyncEngine, "_spending_query", return_value=rows), \
+                with_tenant_context(tenant_context):
+            first = await engine.sync_budgets(["b1"])
+            second = await engine.sync_budgets(["b1"], full=True)
+
+        # Assert
+        async with await session_factory() as session:
+            alerts = (await session.execute(select(BudgetAlert.alert_key))).scalars().all()
+        assert first.alerts_created == 2  # Budget at 80%, category over its allocation
+        assert second.alerts_created == 0
+        assert sorted(alerts) == ["b1:budget:warning:2024-02-01", "b1:c2:exceeded:2024-02-01"]
+        engine.alert_evaluator.notifier.assert_awaited_once()
+        tenant_id, recipients = engine.alert_evaluator.notifier.call_args[0]
+        assert tenant_id == "tenant-1"
+        assert [recipient["data"]["title"] for recipient in recipients] == ["Budget Warning", "Budget Exceeded"]
@@ -39,6 +39,10 @@ class TestBudgetService:
         service.alert_repo = mock_repositories['alert_repo']
         service.template_repo = mock_repositories['template_repo']
         service.template_category_repo = mock_repositories['template_category_repo']
+        service.alert_evaluator = AsyncMock()
+        service.analytics_cache = AsyncMock()
+        service.analytics_cache.get.return_value = None
+        service.bulk_writer = AsyncMock()
         return service
     
     @pytest.fixture
@@ -100,8 +104,7 @@ class TestBudgetService:
         user_id = "user-123"
         created_by = "user-123"
         
-        mock_repositories['budget_repo'].create_for_user.return_value = sample_budget_model
-        mock_repositories['budget_repo'].get_by_id.return_value = sample_budget_model
+        budget_service.bulk_writer.create_budgets.return_value = [sample_budget_model]
         
         # Act
         result = await budget_service.create_budget(sample_budget_data, user_id, created_by)
@@ -110,9 +113,12 @@ class TestBudgetService:
         assert result.id == "budget-123"
         assert result.name == "Monthly Family Budget"
         assert result.total_amount == Decimal("5000.00")
-        mock_repositories['budget_repo'].create_for_user.assert_called_once()
-        mock_repositories['category_repo'].create.assert_called()
-        mock_repositories['budget_repo'].get_by_id.assert_called_once()
+        drafts = budget_service.bulk_writer.create_budgets.call_args[0][0]
+        assert len(drafts) == 1
+        assert len(drafts[0].categories) == len(sample_budget_data.categories)
+        mock_repositories['category_repo'].create.assert_not_called()
+        mock_repositories['budget_repo'].get_by_id.assert_not_called()
+        budget_service.analytics_cache.invalidate.assert_awaited_once_with(user_id)
 
     @pytest.mark.asyncio
     async def test_create_budget_categories_exceed_total(self, budget_service, sample_budget_data):
@@ -138,7 +144,7 @@ class TestBudgetService:
     async def test_create_budget_database_error(self, budget_service, mock_repositories, sample_budget_data):
         """Test budget creation with database error."""
         # Arrange
-        mock_repositories['budget_repo'].create_for_user.side_effect = Exception("Database connection failed")
+        budget_service.bulk_writer.create_budgets.side_effect = Exception("Database connection failed")
         
         # Act & Assert
         with pytest.raises(DatabaseError) as exc_info:
@@ -295,6 +301,7 @@ class TestBudgetService:
         assert result is not None
         assert result.spent_amount == new_spent_amount
         mock_repositories['budget_repo'].update_spent_amount.assert_called_once_with(budget_id, new_spent_amount)
+        budget_service.alert_evaluator.evaluate.assert_awaited_once()
 
     @pytest.mark.asyncio
     async def test_get_budget_analytics(self, budget_service, mock_repositories):
@@ -304,9 +311,15 @@ class TestBudgetService:
         mock_analytics_data = {
             "total_budgets": 5,
             "active_budgets": 3,
-            "total_budgeted": Decimal("15000.00"),
-            "total_spent": Decimal("8500.00"),
-            "average_utilization": Decimal("56.67")
+            "total_budgeted_amount": Decimal("15000.00"),
+            "total_spent_amount": Decimal("8500.00"),
+            "total_remaining_amount": Decimal("6500.00"),
+            "average_utilization": Decimal("56.67"),
+            "budgets_over_threshold": 1,
+            "budgets_over_budget": 0,
+            "most_overspent_category": None,
+            "best_performing_category": "Transportation",
+            "spending_trend": "increasing"
         }
         mock_repositories['budget_repo'].get_budget_analytics.return_value = mock_analytics_data
         
@@ -317,7 +330,35 @@ class TestBudgetService:
         assert isinstance(result, BudgetAnalytics)
         assert result.total_budgets == 5
         assert result.active_budgets == 3
+        assert result.budgets_over_threshold == 1
+        assert result.spending_trend == "increasing"
         mock_repositories['budget_repo'].get_budget_analytics.assert_called_once_with(user_id)
+        budget_service.analytics_cache.set.assert_awaited_once_with(user_id, mock_analytics_data)
+
+    @pytest.mark.asyncio
+    async def test_get_budget_analytics_cached(self, budget_service, mock_repositories):
+        """Test that cached analytics skip the query."""
+        # Arrange
+        budget_service.analytics_cache.get.return_value = {
+            "total_budgets": 1,
+            "active_budgets": 1,
+            "total_budgeted_amount": Decimal("100.00"),
+            "total_spent_amount": Decimal("20.00"),
+            "total_remaining_amount": Decimal("80.00"),
+            "average_utilization": Decimal("20.00"),
+            "budgets_over_threshold": 0,
+            "budgets_over_budget": 0,
+            "most_overspent_category": None,
+            "best_performing_category": None,
+            "spending_trend": "stable"
+        }
+        
+        # Act
+        result = await budget_service.get_budget_analytics("user-123")
+        
+        # Assert
+        assert result.total_budgets == 1
+        mock_repositories['budget_repo'].get_budget_analytics.assert_not_called()
 
     @pytest.mark.asyncio
     async def test_add_category_to_budget_success(self, budget_service, mock_repositories, sample_budget_model):
@@ -626,128 +667,64 @@ class TestBudgetService:
 
 @pytest.mark.unit
 class TestBudgetServiceAlertLogic:
-    """Test budget alert creation logic."""
+    """Test that spending updates hand threshold evaluation the before/after amounts."""
     
     @pytest.fixture
     def budget_service(self):
-        """Create BudgetService instance."""
+        """Create BudgetService instance with mocked repositories and evaluator."""
         service = BudgetService()
-        service.alert_repo = AsyncMock()
+        service.budget_repo = AsyncMock()
+        service.alert_evaluator = AsyncMock()
         return service
     
     @pytest.fixture
-    def warning_threshold_budget(self):
-        """Budget that has reached warning threshold."""
-        budget = Mock()
-        budget.id = "budget-123"
-        budget.name = "Test Budget"
-        budget.utilization_percentage = Decimal("80.0")  # 80% utilization
-        budget.warning_threshold = Decimal("75.0")
-        budget.critical_threshold = Decimal("90.0")
-        budget.spent_amount = Decimal("4000.00")
-        budget.total_amount = Decimal("5000.00")
-        budget.is_warning_threshold_reached = True
-        budget.is_critical_threshold_reached = False
-        budget.is_over_budget = False
-        return budget
-    
-    @pytest.fixture
-    def critical_threshold_budget(self):
-        """Budget that has reached critical threshold."""
-        budget = Mock()
-        budget.id = "budget-123"
-        budget.name = "Test Budget"
-        budget.utilization_percentage = Decimal("95.0")  # 95% utilization
-        budget.warning_threshold = Decimal("75.0")
-        budget.critical_threshold = Decimal("90.0")
-        budget.spent_amount = Decimal("4750.00")
-        budget.total_amount = Decimal("5000.00")
-        budget.is_warning_threshold_reached = True
-        budget.is_critical_threshold_reached = True
-        budget.is_over_budget = False
-        return budget
+    def budget_before_update(self):
+        """Budget below its warning threshold."""
+        return Budget(
+            id="budget-123",
+            name="Test Budget",
+            total_amount=Decimal("5000.00"),
+            spent_amount=Decimal("3000.00"),
+            remaining_amount=Decimal("2000.00"),
+            period_type=BudgetPeriod.MONTHLY,
+            start_date=date(2024, 2, 1),
+            end_date=date(2024, 2, 29),
+            status=BudgetStatus.ACTIVE,
+            warning_threshold=Decimal("75.00"),
+            critical_threshold=Decimal("90.00"),
+            user_id="user-123",
+            created_by="user-123"
+        )
     
-    @pytest.fixture
-    def over_budget(self):
-        """Budget that is over budget."""
-        budget = Mock()
-        budget.id = "budget-123"
-        budget.name = "Test Budget"
-        budget.utilization_percentage = Decimal("110.0")  # 110% utilization
-        budget.warning_threshold = Decimal("75.0")
-        budget.critical_threshold = Decimal("90.0")
-        budget.spent_amount = Decimal("5500.00")
-        budget.total_amount = Decimal("5000.00")
-        budget.is_warning_threshold_reached = True
-        budget.is_critical_threshold_reached = True
-        budget.is_over_budget = True
-        return budget
-
-    @pytest.mark.asyncio
-    async def test_check_and_create_warning_alert(self, budget_service, warning_threshold_budget):
-        """Test creating warning alert when threshold is reached."""
-        # Act
-        await budget_service._check_and_create_alerts(warning_threshold_budget)
-        
-        # Assert
-        budget_service.alert_repo.create.assert_called()
-        call_args = budget_service.alert_repo.create.call_args[0][0]
-        assert call_args["alert_type"] == AlertType.WARNING
-        assert call_args["title"] == "Budget Warning"
-        assert "80.0%" in call_args["message"]
-
     @pytest.mark.asyncio
-    async def test_check_and_create_critical_alert(self, budget_service, critical_threshold_budget):
-        """Test creating critical alert when threshold is reached."""
-        # Act
-        await budget_service._check_and_create_alerts(critical_threshold_budget)
+    async def test_update_spending_evaluates_change(self, budget_service, budget_before_update):
+        """Test that the evaluator sees the previous and new spent amounts."""
+        # Arrange
+        budget_service.budget_repo.get_by_id.return_value = budget_before_update
+        budget_service.budget_repo.update_spent_amount.return_value = Mock()
         
-        # Assert
-        budget_service.alert_repo.create.assert_called()
-        call_args = budget_service.alert_repo.create.call_args[0][0]
-        assert call_args["alert_type"] == AlertType.CRITICAL
-        assert call_args["title"] == "Budget Critical"
-        assert "95.0%" in call_args["message"]
-
-    @pytest.mark.asyncio
-    async def test_check_and_create_exceeded_alert(self, budget_service, over_budget):
-        """Test creating exceeded alert when budget is over."""
         # Act
-        await budget_service._check_and_create_alerts(over_budget)
+        with patch("src.budgets.service.Budget.model_validate"):
+            await budget_service.update_budget_spending("budget-123", Decimal("4000.00"))
         
         # Assert
-        budget_service.alert_repo.create.assert_called()
-        call_args = budget_service.alert_repo.create.call_args[0][0]
-        assert call_args["alert_type"] == AlertType.EXCEEDED
-        assert call_args["title"] == "Budget Exceeded"
-
+        change = budget_service.alert_evaluator.evaluate.call_args[0][0][0]
+        assert change.previous_amount == Decimal("3000.00")
+        assert change.new_amount == Decimal("4000.00")
+        assert change.period_start == date(2024, 2, 1)
+    
     @pytest.mark.asyncio
-    async def test_create_alert_with_proper_data(self, budget_service):
-        """Test alert creation with proper data structure."""
+    async def test_update_spending_for_missing_budget(self, budget_service):
+        """Test that no evaluation happens for unknown budgets."""
         # Arrange
-        budget_id = "budget-123"
-        alert_type = AlertType.WARNING
-        title = "Test Alert"
-        message = "Test message"
-        threshold_percentage = Decimal("75.0")
-        amount_at_alert = Decimal("3750.00")
+        budget_service.budget_repo.get_by_id.return_value = None
         
         # Act
-        await budget_service._create_alert(
-            budget_id, alert_type, title, message, threshold_percentage, amount_at_alert
-        )
+        result = await budget_service.update_budget_spending("missing", Decimal("10.00"))
         
         # Assert
-        budget_service.alert_repo.create.assert_called_once()
-        call_args = budget_service.alert_repo.create.call_args[0][0]
-        
-        assert call_args["budget_id"] == budget_id
-        assert call_args["alert_type"] == alert_type
-        assert call_args["title"] == title
-        assert call_args["message"] == message
-        assert call_args["threshold_percentage"] == threshold_percentage
-        assert call_args["amount_at_alert"] == amount_at_alert
-        assert "id" in call_args  # UUID should be generated
+        assert result is None
+        budget_service.alert_evaluator.evaluate.assert_not_called()
 
 
 @pytest.mark.unit
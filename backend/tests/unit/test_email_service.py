@@ -0,0 +1,290 @@
+"""Unit tests for pooled SMTP delivery and batch email sending."""
+import asyncio
+import pytest
+from collections import defaultdict
+from email.mime.text import MIMEText
+from unittest.mock import Mock, AsyncMock
+
+import aiosmtplib
+
+from src.services.email.client import (
+    EmailService,
+    EmailProvider,
+    ConsoleEmailProvider,
+    OutgoingEmail,
+    PooledSMTPEmailProvider
+)
+from src.services.email.pool import SMTPConnectionPool, PooledConnection
+
+
+def make_smtp_client():
+    """Create a mock aiosmtplib client."""
+    client = Mock()
+    client.is_connected = True
+    client.send_message = AsyncMock()
+    client.quit = AsyncMock()
+    return client
+
+
+@pytest.fixture
+def smtp_pool():
+    """SMTP pool whose connections are mock clients."""
+    pool = SMTPConnectionPool(
+        smtp_host="smtp.test.com",
+        smtp_port=587,
+        smtp_username="user",
+        smtp_password="pass",
+        max_size=2,
+        max_messages_per_connection=3
+    )
+    pool.opened_clients = []
+
+    async def _open_connection():
+        client = make_smtp_client()
+        pool.opened_clients.append(client)
+        pool.connections_opened += 1
+        return PooledConnection(client=client)
+
+    pool._open_connection = _open_connection
+    return pool
+
+
+class TrackingProvider(EmailProvider):
+    """Provider that records per-domain concurrency."""
+
+    def __init__(self, delay: float = 0.01):
+        self.delay = delay
+        self.in_flight = defaultdict(int)
+        self.max_in_flight = defaultdict(int)
+        self.batches = []
+
+    async def send_email(self, to, subject, **kwargs):
+        return True
+
+    async def send_batch(self, emails):
+        domain = emails[0].recipient_domain
+        self.in_flight[domain] += 1
+        self.max_in_flight[domain] = max(self.max_in_flight[domain], self.in_flight[domain])
+        self.batches.append(emails)
+        await asyncio.sleep(self.delay)
+        self.in_flight[domain] -= 1
+        return [not email.to[0].startswith("bounce") for email in emails]
+
+
+@pytest.mark.unit
+class TestSMTPConnectionPool:
+    """Test SMTP connection pooling."""
+
+    def _message(self, to: str = "user@example.com"):
+        msg = MIMEText("hello")
+        msg["To"] = to
+        return msg
+
+    @pytest.mark.asyncio
+    async def test_messages_share_one_connection(self, smtp_pool):
+        """Test that a batch is sent over a single authenticated connection."""
+        # Act
+        errors = await smtp_pool.send_messages([self._message(), self._message()])
+
+        # Assert
+        assert errors == [None, None]
+        assert smtp_pool.connections_opened == 1
+        assert smtp_pool.opened_clients[0].send_message.await_count == 2
+
+    @pytest.mark.asyncio
+    async def test_connection_reused_across_sends(self, smtp_pool):
+        """Test that idle connections are reused by later sends."""
+        # Act
+        await smtp_pool.send_message(self._message())
+        await smtp_pool.send_message(self._message())
+
+        # Assert
+        assert smtp_pool.connections_opened == 1
+        assert smtp_pool.connections_reused == 1
+
+    @pytest.mark.asyncio
+    async def test_connection_recycled_after_message_cap(self, smtp_pool):
+        """Test that connections are replaced after the per-connection cap."""
+        # Act
+        errors = await smtp_pool.send_messages([self._message() for _ in range(5)])
+
+        # Assert
+        assert errors == [None] * 5
+        assert smtp_pool.connections_opened == 2
+        smtp_pool.opened_clients[0].quit.assert_awaited()
+
+    @pytest.mark.asyncio
+    async def test_reconnects_after_disconnect(self, smtp_pool):
+        """Test that a dropped connection is replaced and the message retried."""
+        # Arrange
+        await smtp_pool.send_message(self._message())
+        stale_client = smtp_pool.opened_clients[0]
+        stale_client.send_message.side_effect = aiosmtplib.SMTPServerDisconnected("gone")
+
+        # Act
+        errors = await smtp_pool.send_messages([self._message()])
+
+        # Assert
+        assert errors == [None]
+        assert smtp_pool.connections_opened == 2
+
+    @pytest.mark.asyncio
+    async def test_recipient_refused_does_not_fail_batch(self, smtp_pool):
+        """Test that a refused recipient only fails its own message."""
+        # Arrange
+        await smtp_pool.send_message(self._message())
+        client = smtp_pool.opened_clients[0]
+        client.send_message.side_effect = [
+            aiosmtplib.SMTPRecipientsRefused([]),
+            None
+        ]
+
+        # Act
+        errors = await smtp_pool.send_messages([self._message("bad@x.com"), self._message()])
+
+        # Assert
+        assert errors[0] is not None
+        assert errors[1] is None
+
+    @pytest.mark.asyncio
+    async def test_connection_discarded_after_send_error(self, smtp_pool):
+        """Test that a connection is closed rather than pooled after an unexpected error."""
+        # Arrange
+        await smtp_pool.send_message(self._message())
+        client = smtp_pool.opened_clients[0]
+        client.send_message.side_effect = RuntimeError("protocol state corrupted")
+
+        # Act
+        errors = await smtp_pool.send_messages([self._message()])
+
+        # Assert
+        assert errors == ["protocol state corrupted"]
+        client.quit.assert_awaited_once()
+        assert smtp_pool.get_stats()["idle_connections"] == 0
+
+    def test_pool_rebinds_to_new_event_loop(self, smtp_pool):
+        """Test that connections of a finished event loop are not reused on the next one."""
+        # Act
+        first = asyncio.run(smtp_pool.send_messages([self._message()]))
+        second = asyncio.run(smtp_pool.send_messages([self._message()]))
+
+        # Assert
+        assert first == [None]
+        assert second == [None]
+        assert smtp_pool.connections_opened == 2
+        assert smtp_pool.connections_reused == 0
+        smtp_pool.opened_clients[0].close.assert_called_once()
+
+    @pytest.mark.asyncio
+    async def test_close_quits_idle_connections(self, smtp_pool):
+        """Test that closing the pool quits idle connections."""
+        # Arrange
+        await smtp_pool.send_message(self._message())
+
+        # Act
+        await smtp_pool.close()
+
+        # Assert
+        smtp_pool.opened_clients[0].quit.assert_awaited_once()
+        assert smtp_pool.get_stats()["idle_connections"] == 0
+
+
+@pytest.mark.unit
+class TestBatchEmailSending:
+    """Test batch send API."""
+
+    @pytest.mark.asyncio
+    async def test_send_batch_limits_per_domain_concurrency(self):
+        """Test that no domain exceeds the configured concurrency."""
+        # Arrange
+        provider = TrackingProvider()
+        service = EmailService(provider=provider)
+        service.per_domain_concurrency = 2
+        service.batch_chunk_size = 1
+        emails = [
+            OutgoingEmail(to=[f"user{i}@{domain}"], subject="Digest", text_content="hi")
+            for i in range(6)
+            for domain in ("gmail.com", "yahoo.com")
+        ]
+
+        # Act
+        result = await service.send_batch(emails)
+
+        # Assert
+        assert result.sent == 12
+        assert result.failed == 0
+        assert provider.max_in_flight["gmail.com"] <= 2
+        assert provider.max_in_flight["yahoo.com"] <= 2
+
+    @pytest.mark.asyncio
+    async def test_send_batch_chunks_by_domain(self):
+        """Test that each provider batch targets a single domain."""
+        # Arrange
+        provider = TrackingProvider(delay=0)
+        service = EmailService(provider=provider)
+        service.batch_chunk_size = 10
+        emails = [
+            OutgoingEmail(to=["a@gmail.com"], subject="s", text_content="t"),
+            OutgoingEmail(to=["b@yahoo.com"], subject="s", text_content="t"),
+            OutgoingEmail(to=["c@gmail.com"], subject="s", text_content="t"),
+        ]
+
+        # Act
+        await service.send_batch(emails)
+
+        # Assert
+        assert len(provider.batches) == 2
+        for batch in provider.batches:
+            assert len({email.recipient_domain for email in batch}) == 1
+
+    @pytest.mark.asyncio
+    async def test_send_batch_reports_failures(self):
+        """Test that failed deliveries are reported individually."""
+        # Arrange
+        service = EmailService(provider=TrackingProvider(delay=0))
+        emails = [
+            OutgoingEmail(to=["bounce@gmail.com"], subject="s", text_content="t"),
+            OutgoingEmail(to=["ok@gmail.com"], subject="s", text_content="t"),
+        ]
+
+        # Act
+        result = await service.send_batch(emails)
+
+        # Assert
+        assert result.sent == 1
+        assert result.failed == 1
+        assert result.failures[0]["to"] == ["bounce@gmail.com"]
+
+    @pytest.mark.asyncio
+    async def test_send_template_batch_with_console_provider(self):
+        """Test digest rendering per recipient using the console stand-in."""
+        # Arrange
+        service = EmailService(provider=ConsoleEmailProvider())
+        recipients = [
+            {"to": "a@example.com", "data": {"app_name": "FF", "user_name": "A"}},
+            {"to": "b@example.com", "data": {"app_name": "FF", "user_name": "B"}},
+        ]
+
+        # Act
+        result = await service.send_template_batch("welcome", recipients)
+
+        # Assert
+        assert result.total == 2
+        assert result.sent == 2
+
+    @pytest.mark.asyncio
+    async def test_pooled_provider_sends_batch_over_pool(self, smtp_pool):
+        """Test that the pooled provider hands a whole chunk to the pool."""
+        # Arrange
+        provider = PooledSMTPEmailProvider(smtp_pool)
+        emails = [
+            OutgoingEmail(to=[f"user{i}@example.com"], subject="s", text_content="t")
+            for i in range(3)
+        ]
+
+        # Act
+        results = await provider.send_batch(emails)
+
+        # Assert
+        assert results == [True, True, True]
+        assert smtp_pool.connections_opened == 1
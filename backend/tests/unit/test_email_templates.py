@@ -0,0 +1,198 @@
+"""Unit tests for the precompiled email template engine."""
+import os
+import time
+import pytest
+
+from src.exceptions import EmailTemplateError
+from src.services.email.template_engine import EmailTemplateEngine
+
+
+def write_template(root, name, subject=None, html=None, text=None):
+    """Write template part files under root/name."""
+    path = root / name
+    path.mkdir(parents=True, exist_ok=True)
+    if subject is not None:
+        (path / "subject.txt").write_text(subject)
+    if html is not None:
+        (path / "body.html").write_text(html)
+    if text is not None:
+        (path / "body.txt").write_text(text)
+    return path
+
+
+@pytest.fixture
+def template_dir(tmp_path):
+    """Template directory with a simple alert template."""
+    write_template(
+        tmp_path,
+        "budget_alert",
+        subject="Budget alert: {{ budget_name }}",
+        html="<p>Hi {{ user_name }}, you spent {{ spent }} of {{ limit }}.</p>",
+        text="Hi {{ user_name }}, you spent {{ spent }} of {{ limit }}."
+    )
+    return tmp_path
+
+
+@pytest.mark.unit
+class TestEmailTemplateEngine:
+    """Test template loading, caching and rendering."""
+
+    def test_render_all_parts(self, template_dir):
+        """Test rendering subject, HTML and text parts."""
+        # Arrange
+        engine = EmailTemplateEngine(str(template_dir), auto_reload=False)
+
+        # Act
+        rendered = engine.render("budget_alert", {
+            "budget_name": "Groceries", "user_name": "Sam", "spent": 90, "limit": 100
+        })
+
+        # Assert
+        assert rendered.subject == "Budget alert: Groceries"
+        assert rendered.html_content == "<p>Hi Sam, you spent 90 of 100.</p>"
+        assert rendered.text_content == "Hi Sam, you spent 90 of 100."
+
+    def test_template_compiled_once(self, template_dir):
+        """Test that repeated renders reuse the compiled template."""
+        # Arrange
+        engine = EmailTemplateEngine(str(template_dir), auto_reload=False)
+
+        # Act
+        first = engine.get_template("budget_alert")
+        second = engine.get_template("budget_alert")
+
+        # Assert
+        assert first is second
+
+    def test_html_is_autoescaped_but_text_is_not(self, template_dir):
+        """Test that only the HTML part escapes user data."""
+        # Arrange
+        engine = EmailTemplateEngine(str(template_dir), auto_reload=False)
+        context = {"budget_name": "A&B", "user_name": "<b>Sam</b>", "spent": 1, "limit": 2}
+
+        # Act
+        rendered = engine.render("budget_alert", context)
+
+        # Assert
+        assert "&lt;b&gt;Sam&lt;/b&gt;" in rendered.html_content
+        assert "<b>Sam</b>" in rendered.text_content
+        assert rendered.subject == "Budget alert: A&B"
+
+    def test_missing_variable_error_names_variables(self, template_dir):
+        """Test that missing variables are reported precisely."""
+        # Arrange
+        engine = EmailTemplateEngine(str(template_dir), auto_reload=False)
+
+        # Act & Assert
+        with pytest.raises(EmailTemplateError) as exc_info:
+            engine.render("budget_alert", {"budget_name": "Groceries", "user_name": "Sam"})
+
+        assert exc_info.value.template_name == "budget_alert"
+        assert exc_info.value.missing_variables == ["limit", "spent"]
+        assert "limit, spent" in str(exc_info.value)
+
+    def test_unknown_template(self, template_dir):
+        """Test that unknown templates raise a template error."""
+        engine = EmailTemplateEngine(str(template_dir), auto_reload=False)
+
+        with pytest.raises(EmailTemplateError):
+            engine.render("does_not_exist", {})
+
+    def test_template_name_cannot_escape_directory(self, template_dir):
+        """Test that path traversal in template names is rejected."""
+        engine = EmailTemplateEngine(str(template_dir), auto_reload=False)
+
+        with pytest.raises(EmailTemplateError):
+            engine.render("../secrets", {})
+
+    @pytest.mark.parametrize("version", ["../../secrets", "..", "v1/../../secrets", "v1\\.."])
+    def test_template_version_cannot_escape_directory(self, template_dir, version):
+        """Test that path traversal in template versions is rejected."""
+        engine = EmailTemplateEngine(str(template_dir), auto_reload=False)
+
+        with pytest.raises(EmailTemplateError, match="Invalid template version"):
+            engine.render("budget_alert", {}, version=version)
+
+    def test_versions_cached_separately(self, template_dir):
+        """Test that pinned versions are resolved and cached by version."""
+        # Arrange
+        write_template(template_dir / "budget_alert", "v2", subject="v2: {{ budget_name }}")
+        engine = EmailTemplateEngine(str(template_dir), auto_reload=False)
+
+        # Act
+        latest = engine.render("budget_alert", {
+            "budget_name": "Rent", "user_name": "Sam", "spent": 1, "limit": 2
+        })
+        pinned = engine.render("budget_alert", {"budget_name": "Rent"}, version="v2")
+
+        # Assert
+        assert latest.subject == "Budget alert: Rent"
+        assert pinned.subject == "v2: Rent"
+        assert pinned.html_content is None
+        assert len(engine.get_stats()["cached_templates"]) == 2
+
+    def test_hot_reload_recompiles_changed_template(self, template_dir):
+        """Test that auto reload picks up edited template files."""
+        # Arrange
+        engine = EmailTemplateEngine(str(template_dir), auto_reload=True)
+        engine.get_template("budget_alert")
+        subject_file = template_dir / "budget_alert" / "subject.txt"
+        subject_file.write_text("Updated: {{ budget_name }}")
+        future = time.time() + 10
+        os.utime(subject_file, (future, future))
+
+        # Act
+        rendered = engine.render("budget_alert", {
+            "budget_name": "Rent", "user_name": "Sam", "spent": 1, "limit": 2
+        })
+
+        # Assert
+        assert rendered.subject == "Updated: Rent"
+
+    def test_no_reload_when_disabled(self, template_dir):
+        """Test that production mode keeps serving the compiled template."""
+        # Arrange
+        engine = EmailTemplateEngine(str(template_dir), auto_reload=False)
+        engine.get_template("budget_alert")
+        (template_dir / "budget_alert" / "subject.txt").write_text("Updated")
+
+        # Act
+        rendered = engine.render("budget_alert", {
+            "budget_name": "Rent", "user_name": "Sam", "spent": 1, "limit": 2
+        })
+
+        # Assert
+        assert rendered.subject == "Budget alert: Rent"
+
+    def test_render_batch_skips_invalid_contexts(self, template_dir):
+        """Test batch rendering against many contexts."""
+        # Arrange
+        engine = EmailTemplateEngine(str(template_dir), auto_reload=False)
+        contexts = [
+            {"budget_name": "A", "user_name": "Sam", "spent": 1, "limit": 2},
+            {"budget_name": "B"},
+            {"budget_name": "C", "user_name": "Pat", "spent": 3, "limit": 4},
+        ]
+
+        # Act
+        rendered = engine.render_batch("budget_alert", contexts, skip_invalid=True)
+
+        # Assert
+        assert rendered[0].subject == "Budget alert: A"
+        assert rendered[1] is None
+        assert rendered[2].subject == "Budget alert: C"
+
+    def test_render_batch_reports_failing_index(self, template_dir):
+        """Test that strict batch rendering reports the failing context index."""
+        engine = EmailTemplateEngine(str(template_dir), auto_reload=False)
+
+        with pytest.raises(EmailTemplateError) as exc_info:
+            engine.render_batch("budget_alert", [{"budget_name": "A"}])
+
+        assert exc_info.value.details["index"] == 0
+
+    def test_bundled_templates_compile(self):
+        """Test that every bundled template compiles."""
+        engine = EmailTemplateEngine(auto_reload=False)
+
+        assert engine.preload() >= 4
@@ -16,6 +16,19 @@ from src.families.schemas import (
     FamilyInvitationCreate, SpendingApprovalRequestCreate, SpendingApprovalDecision,
     FamilyRole, FamilyMemberStatus, InvitationStatus, ApprovalStatus
 )
+from src.families.permissions import FamilyAccess, MemberAccess, compile_permissions
+
+
+def family_access(family_id, administrator_id, *members):
+    """Permission index of a family with (user_id, role, permissions) members."""
+    return FamilyAccess(
+        family_id=family_id,
+        administrator_id=administrator_id,
+        members={
+            user_id: MemberAccess(str(uuid4()), user_id, role, compile_permissions(permissions))
+            for user_id, role, permissions in members
+        }
+    )
 
 
 class TestFamilyRepository:
@@ -33,9 +46,14 @@ class TestFamilyRepository:
         return session
     
     @pytest.fixture
-    def family_repo(self, mock_session):
-        """Family repository with mocked session."""
-        return FamilyRepository(mock_session)
+    def permissions(self):
+        """Mock family permission cache."""
+        return AsyncMock()
+    
+    @pytest.fixture
+    def family_repo(self, mock_session, permissions):
+        """Family repository with mocked session and permission cache."""
+        return FamilyRepository(mock_session, permissions)
     
     @pytest.fixture
     def sample_family_data(self):
@@ -110,42 +128,37 @@ class TestFamilyRepository:
         assert result == mock_families
     
     @pytest.mark.asyncio
-    async def test_get_family_with_members_success(self, family_repo, mock_session):
+    async def test_get_family_with_members_success(self, family_repo, mock_session, permissions):
         """Test getting family with members when user is a member."""
         family_id = str(uuid4())
         user_id = str(uuid4())
         
         # Mock member verification (user is a member)
-        mock_member_result = Mock()
-        mock_member_result.scalar_one_or_none.return_value = Mock()  # Member exists
+        permissions.get.return_value = family_access(family_id, str(uuid4()), (user_id, "spouse", {}))
         
         # Mock family retrieval
         mock_family = Mock()
         mock_family_result = Mock()
         mock_family_result.scalar_one_or_none.return_value = mock_family
-        
-        mock_session.execute.side_effect = [mock_member_result, mock_family_result]
+        mock_session.execute.return_value = mock_family_result
         
         result = await family_repo.get_family_with_members(family_id, user_id)
         
-        assert mock_session.execute.call_count == 2
+        assert mock_session.execute.call_count == 1  # Membership comes from the permission index
         assert result == mock_family
     
     @pytest.mark.asyncio
-    async def test_get_family_with_members_not_member(self, family_repo, mock_session):
+    async def test_get_family_with_members_not_member(self, family_repo, mock_session, permissions):
         """Test getting family when user is not a member."""
         family_id = str(uuid4())
         user_id = str(uuid4())
         
         # Mock member verification (user is not a member)
-        mock_member_result = Mock()
-        mock_member_result.scalar_one_or_none.return_value = None  # No member found
-        
-        mock_session.execute.return_value = mock_member_result
+        permissions.get.return_value = family_access(family_id, str(uuid4()))
         
         result = await family_repo.get_family_with_members(family_id, user_id)
         
-        assert mock_session.execute.call_count == 1  # Only member check
+        mock_session.execute.assert_not_called()
         assert result is None
     
     @pytest.mark.asyncio
@@ -202,6 +215,7 @@ class TestFamilyRepository:
         
         mock_session.delete.assert_called_once_with(mock_family)
         mock_session.commit.assert_called_once()
+        family_repo.permissions.invalidate.assert_awaited_once_with(family_id)
         assert result is True
     
     @pytest.mark.asyncio
@@ -232,9 +246,14 @@ class TestFamilyMemberRepository:
         return session
     
     @pytest.fixture
-    def member_repo(self, mock_session):
-        """Member repository with mocked session."""
-        return FamilyMemberRepository(mock_session)
+    def permissions(self):
+        """Mock family permission cache."""
+        return AsyncMock()
+    
+    @pytest.fixture
+    def member_repo(self, mock_session, permissions):
+        """Member repository with mocked session and permission cache."""
+        return FamilyMemberRepository(mock_session, permissions)
     
     @pytest.fixture
     def sample_member_data(self):
@@ -264,57 +283,51 @@ class TestFamilyMemberRepository:
         assert result == mock_member
     
     @pytest.mark.asyncio
-    async def test_get_family_members_success(self, member_repo, mock_session):
+    async def test_get_family_members_success(self, member_repo, mock_session, permissions):
         """Test getting family members when user is authorized."""
         family_id = str(uuid4())
         user_id = str(uuid4())
         
         # Mock user verification (user is a member)
-        mock_verification_result = Mock()
-        mock_verification_result.scalar_one_or_none.return_value = Mock()
+        permissions.get.return_value = family_access(family_id, str(uuid4()), (user_id, "teen", {}))
         
         # Mock members retrieval
         mock_members = [Mock(), Mock()]
         mock_members_result = Mock()
         mock_members_result.scalars.return_value.all.return_value = mock_members
-        
-        mock_session.execute.side_effect = [mock_verification_result, mock_members_result]
+        mock_session.execute.return_value = mock_members_result
         
         result = await member_repo.get_family_members(family_id, user_id)
         
-        assert mock_session.execute.call_count == 2
+        assert mock_session.execute.call_count == 1
         assert result == mock_members
     
     @pytest.mark.asyncio
-    async def test_get_family_members_unauthorized(self, member_repo, mock_session):
+    async def test_get_family_members_unauthorized(self, member_repo, mock_session, permissions):
         """Test getting family members when user is not authorized."""
         family_id = str(uuid4())
         user_id = str(uuid4())
         
         # Mock user verification (user is not a member)
-        mock_verification_result = Mock()
-        mock_verification_result.scalar_one_or_none.return_value = None
-        mock_session.execute.return_value = mock_verification_result
+        permissions.get.return_value = family_access(family_id, str(uuid4()))
         
         result = await member_repo.get_family_members(family_id, user_id)
         
-        assert mock_session.execute.call_count == 1  # Only verification query
+        mock_session.execute.assert_not_called()
         assert result == []
     
     @pytest.mark.asyncio
-    async def test_add_member_to_family_success(self, member_repo, mock_session, sample_member_data):
+    async def test_add_member_to_family_success(self, member_repo, mock_session, permissions, sample_member_data):
         """Test successful member addition to family."""
         family_id = str(uuid4())
         added_by_user_id = str(uuid4())
         
         # Mock family verification (user is administrator)
+        permissions.get.return_value = family_access(family_id, added_by_user_id)
         mock_family = Mock()
         mock_family.current_member_count = 3
         mock_family.max_members = 6
-        
-        mock_admin_result = Mock()
-        mock_admin_result.scalar_one_or_none.return_value = mock_family
-        mock_session.execute.return_value = mock_admin_result
+        mock_session.get.return_value = mock_family
         
         # Mock member creation
         mock_member = Mock()
@@ -336,21 +349,20 @@ class TestFamilyMemberRepository:
         assert mock_family.current_member_count == 4
         mock_session.commit.assert_called_once()
         mock_session.refresh.assert_called_once()
+        permissions.invalidate.assert_awaited_once_with(family_id)
     
     @pytest.mark.asyncio
-    async def test_add_member_family_full(self, member_repo, mock_session, sample_member_data):
+    async def test_add_member_family_full(self, member_repo, mock_session, permissions, sample_member_data):
         """Test adding member to full family."""
         family_id = str(uuid4())
         added_by_user_id = str(uuid4())
         
         # Mock family at capacity
+        permissions.get.return_value = family_access(family_id, added_by_user_id)
         mock_family = Mock()
         mock_family.current_member_count = 6
         mock_family.max_members = 6
-        
-        mock_admin_result = Mock()
-        mock_admin_result.scalar_one_or_none.return_value = mock_family
-        mock_session.execute.return_value = mock_admin_result
+        mock_session.get.return_value = mock_family
         
         result = await member_repo.add_member_to_family(
             family_id, sample_member_data, added_by_user_id
@@ -360,15 +372,13 @@ class TestFamilyMemberRepository:
         mock_session.add.assert_not_called()
     
     @pytest.mark.asyncio
-    async def test_add_member_not_administrator(self, member_repo, mock_session, sample_member_data):
+    async def test_add_member_not_administrator(self, member_repo, mock_session, permissions, sample_member_data):
         """Test adding member by non-administrator."""
         family_id = str(uuid4())
         added_by_user_id = str(uuid4())
         
-        # Mock family not found (user is not administrator)
-        mock_admin_result = Mock()
-        mock_admin_result.scalar_one_or_none.return_value = None
-        mock_session.execute.return_value = mock_admin_result
+        # Mock family administered by someone else
+        permissions.get.return_value = family_access(family_id, str(uuid4()), (added_by_user_id, "spouse", {}))
         
         result = await member_repo.add_member_to_family(
             family_id, sample_member_data, added_by_user_id
@@ -378,7 +388,7 @@ class TestFamilyMemberRepository:
         mock_session.add.assert_not_called()
     
     @pytest.mark.asyncio
-    async def test_update_member_success(self, member_repo, mock_session):
+    async def test_update_member_success(self, member_repo, mock_session, permissions):
         """Test successful member update."""
         member_id = str(uuid4())
         updated_by_user_id = str(uuid4())
@@ -390,11 +400,7 @@ class TestFamilyMemberRepository:
         member_repo.get_by_id = AsyncMock(return_value=mock_member)
         
         # Mock family verification
-        mock_family = Mock()
-        mock_family.administrator_id = str(uuid4())  # Different admin
-        mock_family_result = Mock()
-        mock_family_result.scalar_one_or_none.return_value = mock_family
-        mock_session.execute.return_value = mock_family_result
+        permissions.get.return_value = family_access(mock_member.family_id, str(uuid4()))  # Different admin
         
         result = await member_repo.update_member(member_id, update_data, updated_by_user_id)
         
@@ -403,10 +409,11 @@ class TestFamilyMemberRepository:
         assert mock_member.spending_limit == update_data.spending_limit
         mock_session.commit.assert_called_once()
         mock_session.refresh.assert_called_once_with(mock_member)
+        permissions.invalidate.assert_awaited_once_with(mock_member.family_id)
         assert result == mock_member
     
     @pytest.mark.asyncio
-    async def test_update_member_unauthorized(self, member_repo, mock_session):
+    async def test_update_member_unauthorized(self, member_repo, mock_session, permissions):
         """Test member update by unauthorized user."""
         member_id = str(uuid4())
         updated_by_user_id = str(uuid4())
@@ -418,19 +425,16 @@ class TestFamilyMemberRepository:
         member_repo.get_by_id = AsyncMock(return_value=mock_member)
         
         # Mock family with different administrator
-        mock_family = Mock()
-        mock_family.administrator_id = str(uuid4())  # Different admin
-        mock_family_result = Mock()
-        mock_family_result.scalar_one_or_none.return_value = mock_family
-        mock_session.execute.return_value = mock_family_result
+        permissions.get.return_value = family_access(mock_member.family_id, str(uuid4()))
         
         result = await member_repo.update_member(member_id, update_data, updated_by_user_id)
         
         assert result is None
         mock_session.commit.assert_not_called()
+        permissions.invalidate.assert_not_called()
     
     @pytest.mark.asyncio
-    async def test_remove_member_success(self, member_repo, mock_session):
+    async def test_remove_member_success(self, member_repo, mock_session, permissions):
         """Test successful member removal."""
         member_id = str(uuid4())
         removed_by_user_id = str(uuid4())
@@ -441,22 +445,21 @@ class TestFamilyMemberRepository:
         member_repo.get_by_id = AsyncMock(return_value=mock_member)
         
         # Mock family with user as administrator
+        permissions.get.return_value = family_access(mock_member.family_id, removed_by_user_id)
         mock_family = Mock()
-        mock_family.administrator_id = removed_by_user_id
         mock_family.current_member_count = 3
-        mock_family_result = Mock()
-        mock_family_result.scalar_one_or_none.return_value = mock_family
-        mock_session.execute.return_value = mock_family_result
+        mock_session.get.return_value = mock_family
         
         result = await member_repo.remove_member(member_id, removed_by_user_id)
         
         mock_session.delete.assert_called_once_with(mock_member)
         assert mock_family.current_member_count == 2
         mock_session.commit.assert_called_once()
+        permissions.invalidate.assert_awaited_once_with(mock_member.family_id)
         assert result is True
     
     @pytest.mark.asyncio
-    async def test_remove_administrator_member(self, member_repo, mock_session):
+    async def test_remove_administrator_member(self, member_repo, mock_session, permissions):
         """Test attempting to remove administrator member."""
         member_id = str(uuid4())
         removed_by_user_id = str(uuid4())
@@ -467,11 +470,7 @@ class TestFamilyMemberRepository:
         member_repo.get_by_id = AsyncMock(return_value=mock_member)
         
         # Mock family
-        mock_family = Mock()
-        mock_family.administrator_id = removed_by_user_id
-        mock_family_result = Mock()
-        mock_family_result.scalar_one_or_none.return_value = mock_family
-        mock_session.execute.return_value = mock_family_result
+        permissions.get.return_value = family_access(mock_member.family_id, removed_by_user_id)
         
         result = await member_repo.remove_member(member_id, removed_by_user_id)
         
@@ -493,9 +492,14 @@ class TestFamilyInvitationRepository:
         return session
     
     @pytest.fixture
-    def invitation_repo(self, mock_session):
-        """Invitation repository with mocked session."""
-        return FamilyInvitationRepository(mock_session)
+    def permissions(self):
+        """Mock family permission cache."""
+        return AsyncMock()
+    
+    @pytest.fixture
+    def invitation_repo(self, mock_session, permissions):
+        """Invitation repository with mocked session and permission cache."""
+        return FamilyInvitationRepository(mock_session, permissions)
     
     @pytest.fixture
     def sample_invitation_data(self):
@@ -547,41 +551,37 @@ class TestFamilyInvitationRepository:
         assert result == mock_invitation
     
     @pytest.mark.asyncio
-    async def test_get_family_invitations_authorized(self, invitation_repo, mock_session):
+    async def test_get_family_invitations_authorized(self, invitation_repo, mock_session, permissions):
         """Test getting family invitations by administrator."""
         family_id = str(uuid4())
         user_id = str(uuid4())
         
         # Mock administrator verification
-        mock_family_result = Mock()
-        mock_family_result.scalar_one_or_none.return_value = Mock()  # Family found
+        permissions.get.return_value = family_access(family_id, user_id)
         
         # Mock invitations retrieval
         mock_invitations = [Mock(), Mock()]
         mock_invitations_result = Mock()
         mock_invitations_result.scalars.return_value.all.return_value = mock_invitations
-        
-        mock_session.execute.side_effect = [mock_family_result, mock_invitations_result]
+        mock_session.execute.return_value = mock_invitations_result
         
         result = await invitation_repo.get_family_invitations(family_id, user_id)
         
-        assert mock_session.execute.call_count == 2
+        assert mock_session.execute.call_count == 1
         assert result == mock_invitations
     
     @pytest.mark.asyncio
-    async def test_get_family_invitations_unauthorized(self, invitation_repo, mock_session):
+    async def test_get_family_invitations_unauthorized(self, invitation_repo, mock_session, permissions):
         """Test getting family invitations by non-administrator."""
         family_id = str(uuid4())
         user_id = str(uuid4())
         
         # Mock administrator verification (user is not administrator)
-        mock_family_result = Mock()
-        mock_family_result.scalar_one_or_none.return_value = None
-        mock_session.execute.return_value = mock_family_result
+        permissions.get.return_value = family_access(family_id, str(uuid4()), (user_id, "spouse", {}))
         
         result = await invitation_repo.get_family_invitations(family_id, user_id)
         
-        assert mock_session.execute.call_count == 1  # Only verification
+        mock_session.execute.assert_not_called()
         assert result == []
     
     @pytest.mark.asyncio
@@ -627,6 +627,7 @@ class TestFamilyInvitationRepository:
         
         mock_session.commit.assert_called_once()
         mock_session.refresh.assert_called_once()
+        invitation_repo.permissions.invalidate.assert_awaited_once_with(mock_invitation.family_id)
     
     @pytest.mark.asyncio
     async def test_accept_invitation_expired(self, invitation_repo, mock_session):
@@ -723,9 +724,14 @@ class TestSpendingApprovalRepository:
         return session
     
     @pytest.fixture
-    def approval_repo(self, mock_session):
-        """Approval repository with mocked session."""
-        return SpendingApprovalRepository(mock_session)
+    def permissions(self):
+        """Mock family permission cache."""
+        return AsyncMock()
+    
+    @pytest.fixture
+    def approval_repo(self, mock_session, permissions):
+        """Approval repository with mocked session and permission cache."""
+        return SpendingApprovalRepository(mock_session, permissions)
     
     @pytest.fixture
     def sample_request_data(self):
@@ -761,90 +767,64 @@ class TestSpendingApprovalRepository:
         mock_session.refresh.assert_called_once()
     
     @pytest.mark.asyncio
-    async def test_get_pending_approvals_for_family_admin(self, approval_repo, mock_session):
+    async def test_get_pending_approvals_for_family_admin(self, approval_repo, mock_session, permissions):
         """Test getting pending approvals by administrator."""
         family_id = str(uuid4())
         user_id = str(uuid4())
         
-        # Mock member verification
-        mock_member = Mock()
-        mock_member_result = Mock()
-        mock_member_result.scalar_one_or_none.return_value = mock_member
-        
-        # Mock family verification (user is administrator)
-        mock_family = Mock()
-        mock_family.administrator_id = user_id
-        mock_family_result = Mock()
-        mock_family_result.scalar_one_or_none.return_value = mock_family
+        # Mock member and administrator verification
+        permissions.get.return_value = family_access(family_id, user_id, (user_id, "administrator", {}))
         
         # Mock pending approvals
         mock_requests = [Mock(), Mock()]
         mock_requests_result = Mock()
         mock_requests_result.scalars.return_value.all.return_value = mock_requests
-        
-        mock_session.execute.side_effect = [mock_member_result, mock_family_result, mock_requests_result]
+        mock_session.execute.return_value = mock_requests_result
         
         result = await approval_repo.get_pending_approvals_for_family(family_id, user_id)
         
-        assert mock_session.execute.call_count == 3
+        assert mock_session.execute.call_count == 1
         assert result == mock_requests
     
     @pytest.mark.asyncio
-    async def test_get_pending_approvals_with_permission(self, approval_repo, mock_session):
+    async def test_get_pending_approvals_with_permission(self, approval_repo, mock_session, permissions):
         """Test getting pending approvals by member with permission."""
         family_id = str(uuid4())
         user_id = str(uuid4())
         
-        # Mock member with approval permission
-        mock_member = Mock()
-        mock_member.permissions = {"can_approve_spending": True}
-        mock_member_result = Mock()
-        mock_member_result.scalar_one_or_none.return_value = mock_member
-        
-        # Mock family (user is not administrator)
-        mock_family = Mock()
-        mock_family.administrator_id = str(uuid4())  # Different user
-        mock_family_result = Mock()
-        mock_family_result.scalar_one_or_none.return_value = mock_family
+        # Mock member with approval permission (user is not administrator)
+        permissions.get.return_value = family_access(
+            family_id, str(uuid4()), (user_id, "spouse", {"can_approve_spending": True})
+        )
         
         # Mock pending approvals
         mock_requests = [Mock()]
         mock_requests_result = Mock()
         mock_requests_result.scalars.return_value.all.return_value = mock_requests
-        
-        mock_session.execute.side_effect = [mock_member_result, mock_family_result, mock_requests_result]
+        mock_session.execute.return_value = mock_requests_result
         
         result = await approval_repo.get_pending_approvals_for_family(family_id, user_id)
         
         assert result == mock_requests
     
     @pytest.mark.asyncio
-    async def test_get_pending_approvals_unauthorized(self, approval_repo, mock_session):
+    async def test_get_pending_approvals_unauthorized(self, approval_repo, mock_session, permissions):
         """Test getting pending approvals by unauthorized user."""
         family_id = str(uuid4())
         user_id = str(uuid4())
         
-        # Mock member without approval permission
-        mock_member = Mock()
-        mock_member.permissions = {"can_view_budgets": True}  # No approval permission
-        mock_member_result = Mock()
-        mock_member_result.scalar_one_or_none.return_value = mock_member
-        
-        # Mock family (user is not administrator)
-        mock_family = Mock()
-        mock_family.administrator_id = str(uuid4())
-        mock_family_result = Mock()
-        mock_family_result.scalar_one_or_none.return_value = mock_family
-        
-        mock_session.execute.side_effect = [mock_member_result, mock_family_result]
+        # Mock member without approval permission (user is not administrator)
+        permissions.get.return_value = family_access(
+            family_id, str(uuid4()), (user_id, "teen", {"can_view_budgets": True})
+        )
         
         result = await approval_repo.get_pending_approvals_for_family(family_id, user_id)
         
         assert result == []
-        assert mock_session.execute.call_count == 2  # No requests query
+        mock_session.execute.assert_not_called()  # No requests query
     
     @pytest.mark.asyncio
-    async def test_process_approval_decision_success(self, approval_repo, mock_session):
+    async def test_process_approval_decision_success(self, approval_repo, mock_session, permissions):
         """Test successful approval decision processing."""
         request_id = str(uuid4())
         approver_id = str(uuid4())
@@ -863,12 +843,8 @@ class TestSpendingApprovalRepository:
         mock_request_result.scalar_one_or_none.return_value = mock_request
         
         # Mock family verification (user is administrator)
-        mock_family = Mock()
-        mock_family.administrator_id = approver_id
-        mock_family_result = Mock()
-        mock_family_result.scalar_one_or_none.return_value = mock_family
-        
-        mock_session.execute.side_effect = [mock_request_result, mock_family_result]
+        permissions.get.return_value = family_access(mock_request.family_id, approver_id)
+        mock_session.execute.return_value = mock_request_result
         
         result = await approval_repo.process_approval_decision(request_id, decision, approver_id)
         
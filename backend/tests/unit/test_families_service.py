@@ -12,9 +12,22 @@ from src.families.schemas import (
     FamilyRole, FamilyMemberStatus, InvitationStatus, ApprovalStatus
 )
 from src.families.models import Family, FamilyMember, FamilyInvitation, SpendingApprovalRequest
+from src.families.permissions import FamilyAccess, MemberAccess, compile_permissions
 from src.exceptions import NotFoundError, ValidationError, BusinessLogicError
 
 
+def family_access(family_id, administrator_id, *members):
+    """Permission index of a family with (user_id, role, permissions) members."""
+    return FamilyAccess(
+        family_id=family_id,
+        administrator_id=administrator_id,
+        members={
+            user_id: MemberAccess(str(uuid4()), user_id, role, compile_permissions(permissions))
+            for user_id, role, permissions in members
+        }
+    )
+
+
 class TestFamilyService:
     """Test family service business logic."""
     
@@ -27,6 +40,8 @@ class TestFamilyService:
         service.member_repo = AsyncMock()
         service.invitation_repo = AsyncMock()
         service.approval_repo = AsyncMock()
+        service.dashboard_cache = AsyncMock()
+        service.permissions = AsyncMock()
         return service
     
     @pytest.fixture
@@ -513,52 +528,83 @@ class TestFamilyService:
     # Dashboard and analytics tests
     @pytest.mark.asyncio
     async def test_get_family_dashboard_success(self, family_service):
-        """Test successful family dashboard retrieval."""
+        """Test dashboard built by the aggregator and cached for the family."""
         family_id = str(uuid4())
         user_id = str(uuid4())
         
-        # Mock family
-        mock_family = Mock()
-        mock_family.shared_budgets = [Mock(), Mock()]
-        mock_family.shared_goals = [Mock()]
-        family_service.get_family = AsyncMock(return_value=mock_family)
-        
-        # Mock members
-        mock_members = [Mock(), Mock(), Mock()]
-        family_service.get_family_members = AsyncMock(return_value=mock_members)
-        
-        # Mock invitations
-        mock_invitations = [
-            Mock(status="pending"),
-            Mock(status="accepted"),
-            Mock(status="pending")
-        ]
-        family_service.get_family_invitations = AsyncMock(return_value=mock_invitations)
-        
-        # Mock pending approvals
-        mock_approvals = [Mock(), Mock()]
-        family_service.get_pending_approvals = AsyncMock(return_value=mock_approvals)
-        
-        result = await family_service.get_family_dashboard(family_id, user_id)
-        
+        family_service.permissions.get.return_value = family_access(
+            family_id, user_id, (user_id, "administrator", {})
+        )
+        family_service.dashboard_cache.get.return_value = None
+        
+        dashboard = {
+            "family_id": family_id,
+            "member_count": 3,
+            "pending_invitations": 2,
+            "pending_approvals": 2,
+            "shared_budgets": 2,
+            "shared_goals": 1,
+            "total_family_spending": Decimal("812.50"),
+            "member_spending": [],
+            "recent_activities": [{"type": "member_joined", "member": "Jane Smith"}],
+            "upcoming_approvals": [],
+            "shared_plans": []
+        }
+        
+        with patch("src.families.service.FamilyDashboardAggregator") as aggregator_class, \
+                patch("src.families.service.tenant_session_factory", return_value=None):
+            aggregator_class.return_value.build = AsyncMock(return_value=dashboard)
+            result = await family_service.get_family_dashboard(family_id, user_id)
+        
+        aggregator_class.return_value.build.assert_awaited_once_with(family_id)
+        family_service.dashboard_cache.set.assert_awaited_once_with(family_id, dashboard)
         assert result.family_id == family_id
         assert result.member_count == 3
-        assert result.pending_invitations == 2  # Only pending invitations
+        assert result.pending_invitations == 2
         assert result.pending_approvals == 2
         assert result.shared_budgets == 2
         assert result.shared_goals == 1
-        assert result.total_family_spending == Decimal("2500.00")
-        assert len(result.recent_activities) > 0
+        assert result.total_family_spending == Decimal("812.50")
+        assert len(result.recent_activities) == 1
+    
+    @pytest.mark.asyncio
+    async def test_get_family_dashboard_cached_hides_admin_items(self, family_service):
+        """Test cached dashboard without invitations and approvals for a regular member."""
+        family_id = str(uuid4())
+        user_id = str(uuid4())
+        
+        family_service.permissions.get.return_value = family_access(
+            family_id, str(uuid4()), (user_id, "teen", {"can_view_budgets": True})
+        )
+        family_service.dashboard_cache.get.return_value = {
+            "family_id": family_id,
+            "member_count": 2,
+            "pending_invitations": 1,
+            "pending_approvals": 3,
+            "shared_budgets": 0,
+            "shared_goals": 0,
+            "total_family_spending": Decimal("0"),
+            "recent_activities": [],
+            "upcoming_approvals": []
+        }
+        
+        with patch("src.families.service.FamilyDashboardAggregator") as aggregator_class:
+            result = await family_service.get_family_dashboard(family_id, user_id)
+        
+        aggregator_class.assert_not_called()
+        assert result.pending_invitations == 0
+        assert result.pending_approvals == 0
     
     @pytest.mark.asyncio
     async def test_get_family_dashboard_not_found(self, family_service):
         """Test family dashboard with non-existent family."""
         family_id = str(uuid4())
         user_id = str(uuid4())
-        family_service.get_family = AsyncMock(return_value=None)
+        family_service.permissions.get.return_value = family_access(family_id, str(uuid4()))
         
         with pytest.raises(NotFoundError, match="Family not found"):
             await family_service.get_family_dashboard(family_id, user_id)
+        family_service.dashboard_cache.get.assert_not_called()
 
     # Helper methods tests
     @pytest.mark.asyncio
@@ -569,12 +615,9 @@ class TestFamilyService:
         required_permission = "can_approve_spending"
         
         # Mock administrator member
-        admin_member = Mock()
-        admin_member.user_id = user_id
-        admin_member.role = "administrator"
-        admin_member.permissions = {}
-        
-        family_service.member_repo.get_family_members.return_value = [admin_member]
+        family_service.permissions.get.return_value = family_access(
+            family_id, user_id, (user_id, "administrator", {})
+        )
         
         result = await family_service._check_member_permissions(
             user_id, family_id, required_permission
@@ -590,12 +633,9 @@ class TestFamilyService:
         required_permission = "can_approve_spending"
         
         # Mock member with permission
-        member = Mock()
-        member.user_id = user_id
-        member.role = "spouse"
-        member.permissions = {"can_approve_spending": True}
-        
-        family_service.member_repo.get_family_members.return_value = [member]
+        family_service.permissions.get.return_value = family_access(
+            family_id, str(uuid4()), (user_id, "spouse", {"can_approve_spending": True})
+        )
         
         result = await family_service._check_member_permissions(
             user_id, family_id, required_permission
@@ -611,12 +651,9 @@ class TestFamilyService:
         required_permission = "can_approve_spending"
         
         # Mock member without permission
-        member = Mock()
-        member.user_id = user_id
-        member.role = "teen"
-        member.permissions = {"can_view_budgets": True}
-        
-        family_service.member_repo.get_family_members.return_value = [member]
+        family_service.permissions.get.return_value = family_access(
+            family_id, str(uuid4()), (user_id, "teen", {"can_view_budgets": True})
+        )
         
         result = await family_service._check_member_permissions(
             user_id, family_id, required_permission
@@ -631,8 +668,8 @@ class TestFamilyService:
         family_id = str(uuid4())
         required_permission = "can_approve_spending"
         
-        # Mock empty member list
-        family_service.member_repo.get_family_members.return_value = []
+        # Mock family without the user
+        family_service.permissions.get.return_value = family_access(family_id, str(uuid4()))
         
         result = await family_service._check_member_permissions(
             user_id, family_id, required_permission
@@ -719,6 +756,8 @@ class TestFamilyServiceEdgeCases:
         service.member_repo = AsyncMock()
         service.invitation_repo = AsyncMock()
         service.approval_repo = AsyncMock()
+        service.dashboard_cache = AsyncMock()
+        service.permissions = AsyncMock()
         return service
     
     @pytest.mark.asyncio
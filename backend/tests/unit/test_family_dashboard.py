@@ -0,0 +1,224 @@
+"""Unit tests for the family dashboard aggregator and its cache."""
+import pytest
+from datetime import date, datetime, timedelta
+from decimal import Decimal
+from unittest.mock import AsyncMock
+
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from src.accounts.models import Account
+from src.database import TenantBase
+from src.families.dashboard import FamilyDashboardAggregator, FamilyDashboardCache, dashboard_for_viewer
+from src.families.models import (
+    Family,
+    FamilyBudget,
+    FamilyInvitation,
+    FamilyMember,
+    FamilySavingsGoal,
+    SpendingApprovalRequest
+)
+from src.families.permissions import FamilyAccess, MemberAccess, FamilyPermission
+from src.tenant.context import TenantContext, with_tenant_context
+from src.transactions.models import Transaction
+from src.users.models import User
+
+NOW = datetime(2024, 3, 15, 12, 0)
+
+
+def member(member_id, user_id, name, role, joined_days_ago, spending_limit=None):
+    return FamilyMember(
+        id=member_id, family_id="f1", user_id=user_id, name=name, email=f"{name}@example.com",
+        role=role, spending_limit=spending_limit, joined_at=NOW - timedelta(days=joined_days_ago)
+    )
+
+
+def transaction(transaction_id, user_id, amount, day, **flags):
+    return Transaction(
+        id=transaction_id, user_id=user_id, account_id="a1", amount=Decimal(amount), date=day,
+        name=transaction_id, plaid_category="Shopping", app_expense_type="discretionary", **flags
+    )
+
+
+@pytest.fixture
+async def sessionmaker():
+    """In-memory SQLite database with the family and transaction tables."""
+    engine = create_async_engine("sqlite+aiosqlite://")
+    tables = [
+        User.__table__, Account.__table__, Transaction.__table__, Family.__table__,
+        FamilyMember.__table__, FamilyInvitation.__table__, FamilyBudget.__table__,
+        FamilySavingsGoal.__table__, SpendingApprovalRequest.__table__
+    ]
+    async with engine.begin() as connection:
+        await connection.run_sync(
+            lambda sync_connection: TenantBase.metadata.create_all(sync_connection, tables=tables)
+        )
+
+    maker = async_sessionmaker(engine, expire_on_commit=False)
+    async with maker() as session:
+        session.add_all([
+            Family(id="f1", name="Smiths", administrator_id="u1"),
+            member("m1", "u1", "Ann", "administrator", 60),
+            member("m2", "u2", "Bob", "teen", 3, spending_limit=Decimal("50")),
+            FamilyInvitation(
+                id="i1", family_id="f1", inviter_id="u1", email="new@example.com", role="teen",
+                invitation_token="t1", expires_at=NOW + timedelta(days=2)
+            ),
+            FamilyInvitation(
+                id="i2", family_id="f1", inviter_id="u1", email="old@example.com", role="teen",
+                invitation_token="t2", expires_at=NOW - timedelta(days=1)
+            ),
+            SpendingApprovalRequest(
+                id="r1", family_id="f1", member_id="m2", amount=Decimal("75"), description="Video game",
+                expires_at=NOW + timedelta(hours=5), created_at=NOW - timedelta(hours=1)
+            ),
+            SpendingApprovalRequest(
+                id="r2", family_id="f1", member_id="m2", amount=Decimal("20"), description="Book",
+                status="approved", approved_at=NOW - timedelta(hours=2),
+                expires_at=NOW + timedelta(days=2), created_at=NOW - timedelta(days=1)
+            ),
+            FamilyBudget(
+                id="b1", family_id="f1", created_by="u1", name="Groceries",
+                budget_data={"total_amount": "400.00", "spent_amount": "500.00"}
+            ),
+            FamilySavingsGoal(
+                id="g1", family_id="f1", created_by="u1", name="Vacation",
+                goal_data={"target_amount": "1000.00", "current_amount": "250.00"}
+            ),
+            transaction("t1", "u1", "100.50", date(2024, 3, 2)),
+            transaction("t2", "u2", "60.00", date(2024, 3, 10)),
+            transaction("t3", "u2", "999.00", date(2024, 2, 10)),  # Last month
+            transaction("t4", "u2", "-40.00", date(2024, 3, 10)),  # Refund
+            transaction("t5", "u1", "30.00", date(2024, 3, 10), is_transfer=True),
+        ])
+        await session.commit()
+
+    yield maker
+    await engine.dispose()
+
+
+@pytest.mark.unit
+class TestFamilyDashboardAggregator:
+    """Test the dashboard statements against a real database."""
+
+    @pytest.mark.asyncio
+    async def test_dashboard_is_computed_from_family_data(self, sessionmaker):
+        """Test spending, pending items, activity and plan status."""
+        # Act
+        async with sessionmaker() as session:
+            dashboard = await FamilyDashboardAggregator(session).build("f1", now=NOW)
+
+        # Assert
+        assert dashboard["member_count"] == 2
+        assert dashboard["total_family_spending"] == Decimal("160.50")
+        spending = {row["name"]: row for row in dashboard["member_spending"]}
+        assert spending["Bob"]["spent"] == Decimal("60.00")
+        assert spending["Bob"]["over_limit"] is True
+        assert dashboard["pending_invitations"] == 1
+        assert dashboard["pending_approvals"] == 1
+        assert [approval["id"] for approval in dashboard["upcoming_approvals"]] == ["r1"]
+        assert [activity["type"] for activity in dashboard["recent_activities"]] == [
+            "spending_request", "spending_decision", "spending_request", "member_joined", "member_joined"
+        ]
+        statuses = {plan["name"]: plan["status"] for plan in dashboard["shared_plans"]}
+        assert statuses == {"Groceries": "over_budget", "Vacation": "in_progress"}
+
+    @pytest.mark.asyncio
+    async def test_concurrent_sessions_give_the_same_dashboard(self, sessionmaker):
+        """Test that running the statements in separate sessions changes nothing."""
+        # Arrange
+        async def open_session():
+            return sessionmaker()
+
+        async with sessionmaker() as session:
+            sequential = await FamilyDashboardAggregator(session).build("f1", now=NOW)
+
+        # Act
+        concurrent = await FamilyDashboardAggregator(session_factory=open_session).build("f1", now=NOW)
+
+        # Assert
+        assert concurrent == sequential
+
+    def test_viewer_without_permissions_sees_no_pending_items(self):
+        """Test that invitations and approvals are hidden from regular members."""
+        # Arrange
+        dashboard = {"pending_invitations": 2, "pending_approvals": 1, "upcoming_approvals": [{"id": "r1"}]}
+        access = FamilyAccess(family_id="f1", administrator_id="u1", members={
+            "u2": MemberAccess("m2", "u2", "teen"),
+            "u3": MemberAccess("m3", "u3", "spouse", int(FamilyPermission.APPROVE_SPENDING))
+        })
+
+        # Act
+        teen_view = dashboard_for_viewer(dashboard, access, "u2")
+        spouse_view = dashboard_for_viewer(dashboard, access, "u3")
+
+        # Assert
+        assert teen_view["pending_invitations"] == 0
+        assert teen_view["upcoming_approvals"] == []
+        assert spouse_view["pending_invitations"] == 0
+        assert spouse_view["pending_approvals"] == 1
+        assert dashboard["pending_invitations"] == 2
+
+    def test_viewer_without_approval_permission_sees_no_spending_activity(self):
+        """Test that spending requests and decisions are hidden from members who cannot approve them."""
+        # Arrange
+        activities = [
+            {"type": "spending_request", "member": "Bob"},
+            {"type": "spending_decision", "member": "Bob"},
+            {"type": "member_joined", "member": "Bob"},
+        ]
+        dashboard = {"pending_invitations": 0, "pending_approvals": 1, "recent_activities": activities}
+        access = FamilyAccess(family_id="f1", administrator_id="u1", members={
+            "u2": MemberAccess("m2", "u2", "teen"),
+            "u3": MemberAccess("m3", "u3", "spouse", int(FamilyPermission.APPROVE_SPENDING))
+        })
+
+        # Act
+        teen_view = dashboard_for_viewer(dashboard, access, "u2")
+        spouse_view = dashboard_for_viewer(dashboard, access, "u3")
+        admin_view = dashboard_for_viewer(dashboard, access, "u1")
+
+        # Assert
+        assert [activity["type"] for activity in teen_view["recent_activities"]] == ["member_joined"]
+        assert spouse_view["recent_activities"] == activities
+        assert admin_view["recent_activities"] == activities
+        assert len(dashboard["recent_activities"]) == 3
+
+
+@pytest.mark.unit
+class TestFamilyDashboardCache:
+    """Test tenant-scoped caching of dashboards."""
+
+    @pytest.mark.asyncio
+    async def test_keys_are_scoped_to_tenant_and_family(self):
+        """Test that cache calls use the current tenant and a per-family key."""
+        # Arrange
+        cache_service = AsyncMock()
+        cache = FamilyDashboardCache(cache_service=cache_service, ttl=60)
+        tenant_context = TenantContext(tenant_id="tenant-1", tenant_slug="t1", database_url="sqlite://", auth_token="")
+
+        # Act
+        with with_tenant_context(tenant_context):
+            await cache.set("f1", {"member_count": 2})
+            await cache.invalidate("f1", "f1", None)
+
+        # Assert
+        cache_service.set.assert_awaited_once_with(
+            "tenant-1", "family:f1:dashboard", {"member_count": 2}, ttl=60, namespace="families"
+        )
+        cache_service.delete.assert_awaited_once_with("tenant-1", "family:f1:dashboard", namespace="families")
+
+    @pytest.mark.asyncio
+    async def test_transaction_writes_invalidate_the_users_families(self, sessionmaker):
+        """Test that families are found from the users whose transactions changed."""
+        # Arrange
+        cache_service = AsyncMock()
+        cache = FamilyDashboardCache(cache_service=cache_service, ttl=60)
+        tenant_context = TenantContext(tenant_id="tenant-1", tenant_slug="t1", database_url="sqlite://", auth_token="")
+
+        # Act
+        with with_tenant_context(tenant_context):
+            async with sessionmaker() as session:
+                await cache.invalidate_for_users("u2", "unknown", session=session)
+
+        # Assert
+        cache_service.delete.assert_awaited_once_with("tenant-1", "family:f1:dashboard", namespace="families")
@@ -0,0 +1,119 @@
+"""Unit tests for the compiled family permission index and its cache."""
+import pytest
+from unittest.mock import AsyncMock
+
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from src.database import TenantBase
+from src.families.models import Family, FamilyMember
+from src.families.permissions import (
+    FamilyAccess,
+    FamilyPermission,
+    FamilyPermissionCache,
+    compile_permissions,
+    load_family_access
+)
+from src.tenant.context import TenantContext, with_tenant_context
+
+TENANT = TenantContext(tenant_id="tenant-1", tenant_slug="t1", database_url="sqlite://", auth_token="")
+
+
+@pytest.fixture
+async def session():
+    """In-memory SQLite database with one family."""
+    engine = create_async_engine("sqlite+aiosqlite://")
+    async with engine.begin() as connection:
+        await connection.run_sync(
+            lambda sync_connection: TenantBase.metadata.create_all(
+                sync_connection, tables=[Family.__table__, FamilyMember.__table__]
+            )
+        )
+
+    maker = async_sessionmaker(engine, expire_on_commit=False)
+    async with maker() as session:
+        session.add_all([
+            Family(id="f1", name="Smiths", administrator_id="u1"),
+            FamilyMember(id="m1", family_id="f1", user_id="u1", name="Ann", email="ann@example.com",
+                         role="administrator"),
+            FamilyMember(id="m2", family_id="f1", user_id="u2", name="Bob", email="bob@example.com",
+                         role="spouse", permissions={"can_approve_spending": True, "can_view_budgets": True}),
+            FamilyMember(id="m3", family_id="f1", user_id="u3", name="Cy", email="cy@example.com",
+                         role="teen", status="removed"),
+        ])
+        await session.commit()
+        yield session
+
+    await engine.dispose()
+
+
+@pytest.mark.unit
+class TestFamilyAccess:
+    """Test compiling and checking permissions."""
+
+    def test_compile_permissions_ignores_false_and_unknown_keys(self):
+        """Test that only granted, known permissions set bits."""
+        bits = compile_permissions({"can_edit_budgets": True, "can_create_goals": False, "can_fly": True})
+
+        assert bits == FamilyPermission.EDIT_BUDGETS
+        assert compile_permissions(None) == 0
+
+    @pytest.mark.asyncio
+    async def test_index_holds_active_members_only(self, session):
+        """Test that the index is compiled in one statement from active members."""
+        # Act
+        access = await load_family_access(session, "f1")
+
+        # Assert
+        assert set(access.members) == {"u1", "u2"}
+        assert access.can("u1", FamilyPermission.MANAGE_MEMBERS)
+        assert access.can("u2", FamilyPermission.APPROVE_SPENDING)
+        assert not access.can("u2", FamilyPermission.EDIT_BUDGETS)
+        assert not access.can("u3", FamilyPermission.VIEW_BUDGETS)
+        assert FamilyAccess.from_dict(access.to_dict()) == access
+        assert await load_family_access(session, "missing") is None
+
+
+@pytest.mark.unit
+class TestFamilyPermissionCache:
+    """Test the in-process and Redis layers of the permission cache."""
+
+    @pytest.mark.asyncio
+    async def test_lookups_are_served_from_cache_until_invalidated(self, session):
+        """Test that only the first lookup reaches Redis and the database."""
+        # Arrange
+        cache_service = AsyncMock()
+        cache_service.get.return_value = None
+        cache = FamilyPermissionCache(cache_service=cache_service, ttl=60, local_ttl=30)
+
+        # Act
+        with with_tenant_context(TENANT):
+            first = await cache.get(session, "f1")
+            second = await cache.get(session, "f1")
+            await cache.invalidate("f1")
+            await cache.get(session, "f1")
+
+        # Assert
+        assert second is first
+        assert cache_service.get.await_count == 2
+        cache_service.set.assert_awaited_with(
+            "tenant-1", "family:f1:permissions", first.to_dict(), ttl=60, namespace="families"
+        )
+        cache_service.delete.assert_awaited_once_with("tenant-1", "family:f1:permissions", namespace="families")
+
+    @pytest.mark.asyncio
+    async def test_redis_hit_skips_the_database(self):
+        """Test that an index cached by another process is used as is."""
+        # Arrange
+        cached = FamilyAccess(family_id="f1", administrator_id="u1")
+        cache_service = AsyncMock()
+        cache_service.get.return_value = cached.to_dict()
+        cache = FamilyPermissionCache(cache_service=cache_service, ttl=60, local_ttl=0)
+        db_session = AsyncMock()
+
+        # Act
+        with with_tenant_context(TENANT):
+            access = await cache.get(db_session, "f1")
+
+        # Assert
+        assert access == cached
+        db_session.execute.assert_not_called()
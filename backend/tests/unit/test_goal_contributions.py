@@ -0,0 +1,170 @@
+"""Unit tests for atomic goal contribution accounting."""
+import asyncio
+import pytest
+from datetime import date
+from decimal import Decimal
+
+from sqlalchemy import event, select
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from src.exceptions import DatabaseError, ValidationError
+from src.goals.contributions import ContributionRequest, GoalContributionLedger
+from src.goals.models import Goal, GoalContribution, GoalMilestone, GoalStatus, GoalType, MilestoneStatus
+
+
+@pytest.fixture
+async def database():
+    """In-memory SQLite database with goals and milestones, counting statements."""
+    engine = create_async_engine("sqlite+aiosqlite://")
+    async with engine.begin() as connection:
+        await connection.run_sync(
+            lambda sync_connection: Goal.metadata.create_all(
+                sync_connection,
+                tables=[Goal.__table__, GoalMilestone.__table__, GoalContribution.__table__]
+            )
+        )
+
+    sessionmaker = async_sessionmaker(engine, expire_on_commit=False)
+    async with sessionmaker() as session:
+        session.add_all([
+            Goal(id="g1", name="Emergency Fund", goal_type=GoalType.EMERGENCY_FUND, target_amount=Decimal("1000"),
+                 current_amount=Decimal("400"), start_date=date(2024, 1, 1), user_id="u1", created_by="u1"),
+            Goal(id="g2", name="Vacation", goal_type=GoalType.TRAVEL, target_amount=Decimal("500"),
+                 start_date=date(2024, 1, 1), user_id="u1", created_by="u1"),
+            Goal(id="g3", name="Other user", goal_type=GoalType.SAVINGS, target_amount=Decimal("500"),
+                 start_date=date(2024, 1, 1), user_id="u2", created_by="u2"),
+            GoalMilestone(id="m1", goal_id="g1", name="Half", target_amount=Decimal("500"), is_automatic=True),
+            GoalMilestone(id="m2", goal_id="g1", name="Most", target_amount=Decimal("900"), is_automatic=True),
+            GoalMilestone(id="m3", goal_id="g1", name="Manual", target_amount=Decimal("450"), is_automatic=False),
+        ])
+        await session.commit()
+
+    statements = []
+    event.listen(
+        engine.sync_engine, "before_cursor_execute",
+        lambda conn, cursor, statement, *args: statements.append(statement.split()[0].upper())
+    )
+
+    async def factory():
+        return sessionmaker()
+
+    yield factory, statements
+    await engine.dispose()
+
+
+async def load(session_factory, model, *ids):
+    async with await session_factory() as session:
+        result = await session.execute(select(model).where(model.id.in_(ids)).order_by(model.id))
+        return result.scalars().all()
+
+
+@pytest.mark.unit
+class TestGoalContributionLedger:
+    """Test contributions applied with set-based statements."""
+
+    @pytest.mark.asyncio
+    async def test_contribution_increments_in_the_database(self, database):
+        """Test that a contribution is three writes and no reads of the goal."""
+        # Arrange
+        session_factory, statements = database
+        ledger = GoalContributionLedger(session_factory=session_factory)
+
+        # Act
+        result = await ledger.contribute(
+            ContributionRequest(goal_id="g1", user_id="u1", amount=Decimal("150"), description="Bonus")
+        )
+
+        # Assert
+        assert statements == ["UPDATE", "INSERT", "UPDATE"]
+        assert result.balances["g1"].current_amount == Decimal("550")
+        assert result.completed_goal_ids == []
+        assert result.completed_milestone_ids == ["m1"]
+        assert result.contributions[0].description == "Bonus"
+        assert result.contributions[0].created_at is not None
+        assert result.balances["g1"].user_id == "u1"
+        milestones = await load(session_factory, GoalMilestone, "m1", "m2", "m3")
+        assert [m.status for m in milestones] == [
+            MilestoneStatus.COMPLETED, MilestoneStatus.PENDING, MilestoneStatus.PENDING
+        ]
+        assert milestones[0].actual_amount == Decimal("550")
+
+    @pytest.mark.asyncio
+    async def test_concurrent_contributions_are_not_lost(self, database):
+        """Test that contributions racing on the same goal all count."""
+        # Arrange
+        session_factory, _ = database
+        ledger = GoalContributionLedger(session_factory=session_factory)
+
+        # Act
+        await asyncio.gather(*[
+            ledger.contribute(ContributionRequest(goal_id="g2", user_id="u1", amount=Decimal("10")))
+            for _ in range(20)
+        ])
+
+        # Assert
+        goal, = await load(session_factory, Goal, "g2")
+        assert goal.current_amount == Decimal("200")
+
+    @pytest.mark.asyncio
+    async def test_batch_completes_goals_and_skips_foreign_ones(self, database):
+        """Test that a batch applies owned goals only and completes those reaching target."""
+        # Arrange
+        session_factory, statements = database
+        ledger = GoalContributionLedger(session_factory=session_factory)
+
+        # Act
+        result = await ledger.contribute_many([
+            ContributionRequest(goal_id="g1", user_id="u1", amount=Decimal("300")),
+            ContributionRequest(goal_id="g1", user_id="u1", amount=Decimal("300")),
+            ContributionRequest(goal_id="g2", user_id="u1", amount=Decimal("25")),
+            ContributionRequest(goal_id="g3", user_id="u1", amount=Decimal("25")),
+            ContributionRequest(goal_id="missing", user_id="u1", amount=Decimal("25")),
+        ])
+
+        # Assert
+        assert statements == ["UPDATE", "INSERT", "UPDATE"]
+        assert len(result.contributions) == 3
+        assert result.completed_goal_ids == ["g1"]
+        assert result.completed_milestone_ids == ["m1", "m2"]
+        assert result.skipped_goal_ids == ["g3", "missing"]
+        g1, g2, g3 = await load(session_factory, Goal, "g1", "g2", "g3")
+        assert (g1.current_amount, g1.status) == (Decimal("1000"), GoalStatus.COMPLETED)
+        assert g1.completed_at is not None
+        assert (g2.current_amount, g2.status) == (Decimal("25"), GoalStatus.ACTIVE)
+        assert g3.current_amount == Decimal("0")
+
+    @pytest.mark.asyncio
+    async def test_non_positive_amount_rejects_whole_batch(self, database):
+        """Test that validation happens before anything is written."""
+        # Arrange
+        session_factory, statements = database
+        ledger = GoalContributionLedger(session_factory=session_factory)
+
+        # Act & Assert
+        with pytest.raises(ValidationError):
+            await ledger.contribute_many([
+                ContributionRequest(goal_id="g1", user_id="u1", amount=Decimal("10")),
+                ContributionRequest(goal_id="g2", user_id="u1", amount=Decimal("0")),
+            ])
+        assert statements == []
+
+    @pytest.mark.asyncio
+    async def test_failing_before_commit_records_nothing(self, database):
+        """Test that the pre-commit hook sees the recorded rows and can roll the batch back."""
+        # Arrange
+        session_factory, _ = database
+        ledger = GoalContributionLedger(session_factory=session_factory)
+        seen = []
+
+        def reject(result):
+            seen.extend((c.goal_id, result.balances[c.goal_id].user_id) for c in result.contributions)
+            raise ValueError("invalid response")
+
+        # Act & Assert
+        with pytest.raises(DatabaseError, match="invalid response"):
+            await ledger.contribute(ContributionRequest(goal_id="g1", user_id="u1", amount=Decimal("150")), reject)
+        assert seen == [("g1", "u1")]
+        goal, = await load(session_factory, Goal, "g1")
+        assert goal.current_amount == Decimal("400")
+        async with await session_factory() as session:
+            assert (await session.execute(select(GoalContribution))).scalars().all() == []
@@ -0,0 +1,217 @@
+"""Unit tests for vectorized goal projections and stored goal insights."""
+import pytest
+from datetime import date, timedelta
+from decimal import Decimal
+from unittest.mock import AsyncMock
+
+from sqlalchemy import event, select
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from src.goals.insights import GoalInsightEngine
+from src.goals.models import Goal, GoalContribution, GoalInsight, GoalInsightRefresh, GoalStatus, GoalType
+
+TODAY = date(2024, 6, 30)
+
+
+def goal(goal_id, user_id="u1", target="1200", current="0", target_date=None, **fields):
+    return Goal(id=goal_id, name=goal_id.title(), goal_type=GoalType.SAVINGS, target_amount=Decimal(target),
+                current_amount=Decimal(current), target_date=target_date, start_date=date(2024, 1, 1),
+                user_id=user_id, created_by=user_id, **fields)
+
+
+def monthly(goal_id, amount, months=3):
+    """One contribution a month over the trailing window."""
+    return [
+        GoalContribution(id=f"{goal_id}-{i}", goal_id=goal_id, amount=Decimal(amount),
+                         contribution_date=TODAY - timedelta(days=30 * i + 1))
+        for i in range(months)
+    ]
+
+
+@pytest.fixture
+async def database():
+    """In-memory SQLite database with goals in several schedule situations."""
+    engine = create_async_engine("sqlite+aiosqlite://")
+    async with engine.begin() as connection:
+        await connection.run_sync(
+            lambda sync_connection: Goal.metadata.create_all(
+                sync_connection,
+                tables=[Goal.__table__, GoalContribution.__table__, GoalInsight.__table__,
+                        GoalInsightRefresh.__table__]
+            )
+        )
+
+    sessionmaker = async_sessionmaker(engine, expire_on_commit=False)
+    async with sessionmaker() as session:
+        session.add_all([
+            # 100/month, 600 left, a year to go: ahead of schedule
+            goal("ahead", current="600", target_date=TODAY + timedelta(days=360)),
+            # 100/month, 1100 left, two months to go: behind schedule
+            goal("behind", current="100", target_date=TODAY + timedelta(days=60)),
+            # Nothing contributed in the window
+            goal("stalled", current="50"),
+            # Done apart from the last few dollars
+            goal("nearly", target="1000", current="950"),
+            goal("paused", status=GoalStatus.PAUSED),
+            goal("other", user_id="u2", target_date=TODAY + timedelta(days=30)),
+            *monthly("ahead", "100"),
+            *monthly("behind", "100"),
+            *monthly("nearly", "10"),
+            GoalContribution(id="old", goal_id="stalled", amount=Decimal("50"),
+                             contribution_date=TODAY - timedelta(days=200)),
+        ])
+        await session.commit()
+
+    statements = []
+    event.listen(
+        engine.sync_engine, "before_cursor_execute",
+        lambda conn, cursor, statement, *args: statements.append(statement.split()[0].upper())
+    )
+
+    async def factory():
+        return sessionmaker()
+
+    yield factory, statements
+    await engine.dispose()
+
+
+async def stored_insights(session_factory):
+    async with await session_factory() as session:
+        result = await session.execute(select(GoalInsight.goal_id, GoalInsight.insight_type))
+        return set(result.all())
+
+
+@pytest.mark.unit
+class TestGoalProjections:
+    """Test projecting all of a user's goals at once."""
+
+    @pytest.mark.asyncio
+    async def test_all_goals_are_projected_from_one_query(self, database):
+        """Test rates, schedule status and completion dates for every active goal."""
+        # Arrange
+        session_factory, statements = database
+        engine = GoalInsightEngine(session_factory=session_factory)
+
+        # Act
+        projections = {p.goal_id: p for p in await engine.project_user("u1", today=TODAY)}
+
+        # Assert
+        assert statements == ["SELECT"]
+        assert set(projections) == {"ahead", "behind", "stalled", "nearly"}
+
+        ahead = projections["ahead"]
+        assert ahead.monthly_rate == Decimal("100.00")
+        assert ahead.contribution_count == 3
+        assert ahead.months_to_completion == 6.0
+        assert ahead.projected_completion == TODAY + timedelta(days=180)
+        assert ahead.is_on_track and not ahead.is_behind_schedule
+
+        behind = projections["behind"]
+        assert behind.required_monthly == Decimal("550.00")
+        assert not behind.is_on_track and behind.is_behind_schedule
+        assert behind.completion_probability == 0.18
+
+        stalled = projections["stalled"]
+        assert stalled.monthly_rate == Decimal("0.00") and stalled.projected_completion is None
+        assert not stalled.is_on_track and not stalled.is_behind_schedule
+
+    @pytest.mark.asyncio
+    async def test_single_goal_projection_includes_inactive_goals(self, database):
+        """Test that analysis of one goal does not depend on its status."""
+        # Arrange
+        session_factory, _ = database
+        engine = GoalInsightEngine(session_factory=session_factory)
+
+        # Act
+        paused = await engine.project_user("u1", goal_id="paused", today=TODAY)
+        foreign = await engine.project_user("u1", goal_id="other", today=TODAY)
+
+        # Assert
+        assert [p.goal_id for p in paused] == ["paused"]
+        assert foreign == []
+
+
+@pytest.mark.unit
+class TestGoalInsights:
+    """Test storing, refreshing and acting on insights."""
+
+    @pytest.mark.asyncio
+    async def test_refresh_stores_insights_for_every_user(self, database):
+        """Test that the nightly refresh writes each situation's insight once."""
+        # Arrange
+        session_factory, _ = database
+        engine = GoalInsightEngine(session_factory=session_factory, user_batch_size=1)
+
+        # Act
+        result = await engine.refresh_all(today=TODAY)
+        await engine.refresh_all(today=TODAY)
+
+        # Assert
+        assert result.users == 2 and result.goals == 5
+        assert await stored_insights(session_factory) == {
+            ("ahead", "ahead_of_schedule"),
+            ("behind", "behind_schedule"),
+            ("stalled", "stalled"),
+            ("nearly", "almost_there"),
+            ("other", "behind_schedule"),
+            ("other", "stalled"),
+        }
+
+    @pytest.mark.asyncio
+    async def test_read_and_dismissed_state_survives_refresh(self, database):
+        """Test that refreshes keep flags on insights that still apply and drop stale ones."""
+        # Arrange
+        session_factory, _ = database
+        engine = GoalInsightEngine(session_factory=session_factory)
+        await engine.refresh_users(["u1"], today=TODAY)
+        insights = {i.insight_type: i for i in await engine.get_insights("u1", limit=10)}
+
+        # Act
+        assert await engine.mark_read(insights["behind_schedule"].id, "u1")
+        assert await engine.dismiss(insights["stalled"].id, "u1")
+        assert not await engine.mark_read(insights["behind_schedule"].id, "u2")
+        async with await session_factory() as session:
+            nearly = await session.get(Goal, "nearly")
+            nearly.current_amount = Decimal("1000")
+            await session.commit()
+        await engine.refresh_users(["u1"], today=TODAY)
+
+        # Assert
+        refreshed = await engine.get_insights("u1", limit=10)
+        assert [i.insight_type for i in refreshed] == ["behind_schedule", "ahead_of_schedule"]
+        assert refreshed[0].id == insights["behind_schedule"].id and refreshed[0].is_read
+        assert [i.insight_type for i in await engine.get_insights("u1", unread_only=True)] == ["ahead_of_schedule"]
+        assert ("nearly", "almost_there") not in await stored_insights(session_factory)
+
+    @pytest.mark.asyncio
+    async def test_first_read_computes_insights(self, database):
+        """Test that a user who has never been refreshed gets insights on read."""
+        # Arrange
+        session_factory, _ = database
+        engine = GoalInsightEngine(session_factory=session_factory)
+
+        # Act
+        insights = await engine.get_insights("u2")
+
+        # Assert
+        assert [i.priority for i in insights] == ["high", "medium"]  # Most urgent first
+        assert insights[1].insight_type == "stalled"
+        assert insights[1].suggested_actions == ["Make a contribution", "Enable auto-save"]
+
+    @pytest.mark.asyncio
+    async def test_user_without_insights_is_refreshed_once(self, database):
+        """Test that a refresh producing no insights still stops reads from refreshing again."""
+        # Arrange
+        session_factory, statements = database
+        engine = GoalInsightEngine(session_factory=session_factory)
+        engine.refresh_users = AsyncMock(wraps=engine.refresh_users)
+
+        # Act
+        first = await engine.get_insights("u3")
+        statements.clear()
+        second = await engine.get_insights("u3")
+
+        # Assert
+        assert first == second == []
+        engine.refresh_users.assert_awaited_once_with(["u3"])
+        assert statements == ["SELECT", "SELECT"]
@@ -0,0 +1,166 @@
+"""Unit tests for goal list projections and keyset-paginated contributions."""
+import pytest
+from datetime import date, timedelta
+from decimal import Decimal
+
+from sqlalchemy import event, select
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from src.exceptions import ValidationError
+from src.goals.models import Goal, GoalContribution, GoalMilestone, GoalStatus, GoalType
+from src.goals.projections import (
+    GoalProjectionReader,
+    contribution_stats_subquery,
+    decode_cursor,
+    encode_cursor,
+    parse_expand
+)
+
+TODAY = date.today()
+
+
+@pytest.fixture
+async def database():
+    """In-memory SQLite database with goals and contributions, counting statements."""
+    engine = create_async_engine("sqlite+aiosqlite://")
+    async with engine.begin() as connection:
+        await connection.run_sync(
+            lambda sync_connection: Goal.metadata.create_all(
+                sync_connection,
+                tables=[Goal.__table__, GoalMilestone.__table__, GoalContribution.__table__]
+            )
+        )
+
+    sessionmaker = async_sessionmaker(engine, expire_on_commit=False)
+    async with sessionmaker() as session:
+        session.add_all([
+            Goal(id="g1", name="Emergency Fund", goal_type=GoalType.EMERGENCY_FUND, target_amount=Decimal("1000"),
+                 current_amount=Decimal("160"), start_date=TODAY - timedelta(days=200), user_id="u1", created_by="u1"),
+            Goal(id="g2", name="Vacation", goal_type=GoalType.TRAVEL, target_amount=Decimal("500"),
+                 start_date=TODAY, status=GoalStatus.PAUSED, user_id="u1", created_by="u1"),
+            Goal(id="g3", name="Other user", goal_type=GoalType.SAVINGS, target_amount=Decimal("500"),
+                 start_date=TODAY, user_id="u2", created_by="u2"),
+            GoalContribution(id="c1", goal_id="g1", amount=Decimal("100"), contribution_date=TODAY - timedelta(days=120)),
+            GoalContribution(id="c2", goal_id="g1", amount=Decimal("20"), contribution_date=TODAY - timedelta(days=10)),
+            GoalContribution(id="c3", goal_id="g1", amount=Decimal("30"), contribution_date=TODAY - timedelta(days=10)),
+            GoalContribution(id="c4", goal_id="g1", amount=Decimal("10"), contribution_date=TODAY),
+        ])
+        await session.commit()
+
+    statements = []
+    event.listen(
+        engine.sync_engine, "before_cursor_execute",
+        lambda conn, cursor, statement, *args: statements.append(statement)
+    )
+
+    async def factory():
+        return sessionmaker()
+
+    yield GoalProjectionReader(session_factory=factory), statements
+    await engine.dispose()
+
+
+@pytest.mark.unit
+class TestGoalListProjection:
+    """Test goal lists with contribution stats."""
+
+    @pytest.mark.asyncio
+    async def test_list_goals_aggregates_contributions_in_one_query(self, database):
+        """Test that stats are computed by the database without loading contributions."""
+        # Arrange
+        reader, statements = database
+
+        # Act
+        rows = await reader.list_goals("u1", order_by="name")
+
+        # Assert
+        assert len(statements) == 1
+        assert [goal.id for goal, _ in rows] == ["g1", "g2"]
+        goal, stats = rows[0]
+        assert "contributions" not in goal.__dict__ and "milestones" not in goal.__dict__
+        assert stats == {
+            "contribution_count": 4,
+            "total_contributed": Decimal("160"),
+            "last_contribution_date": TODAY,
+            "contributed_90d": Decimal("60"),
+            "average_contribution_90d": Decimal("20.00")
+        }
+        assert rows[1][1]["contribution_count"] == 0
+        assert rows[1][1]["total_contributed"] == Decimal(0)
+
+    @pytest.mark.asyncio
+    async def test_list_goals_filters(self, database):
+        """Test status and name filters."""
+        # Arrange
+        reader, _ = database
+
+        # Act
+        paused = await reader.list_goals("u1", filters={"status": GoalStatus.PAUSED})
+        named = await reader.list_goals("u1", filters={"name_ilike": "%emergency%"})
+
+        # Assert
+        assert [goal.id for goal, _ in paused] == ["g2"]
+        assert [goal.id for goal, _ in named] == ["g1"]
+
+    @pytest.mark.asyncio
+    async def test_get_goal_is_scoped_to_user(self, database):
+        """Test that another user's goal is not returned."""
+        # Arrange
+        reader, _ = database
+
+        # Act & Assert
+        assert (await reader.get_goal("g1", "u1"))[0].id == "g1"
+        assert await reader.get_goal("g3", "u1") is None
+
+
+    @pytest.mark.asyncio
+    async def test_contribution_stats_are_scoped_to_given_goals(self, database):
+        """Test that the stats subquery only aggregates contributions of the goals it is given."""
+        # Arrange
+        reader, _ = database
+        other_user_goals = select(Goal.id).where(Goal.user_id == "u2")
+
+        # Act
+        async with await reader.session_factory() as session:
+            scoped = (await session.execute(select(contribution_stats_subquery(other_user_goals)))).all()
+            listed = (await session.execute(select(contribution_stats_subquery(["g1"])))).all()
+
+        # Assert
+        assert scoped == []
+        assert [row.goal_id for row in listed] == ["g1"]
+
+
+@pytest.mark.unit
+class TestContributionPages:
+    """Test keyset pagination of contributions."""
+
+    @pytest.mark.asyncio
+    async def test_pages_follow_cursor_without_gaps(self, database):
+        """Test that walking pages returns every contribution once, newest first."""
+        # Arrange
+        reader, _ = database
+        seen, cursor = [], None
+
+        # Act
+        while True:
+            page = await reader.contributions_page("g1", limit=2, cursor=cursor)
+            seen.extend(contribution.id for contribution in page.contributions)
+            if not page.has_more:
+                break
+            cursor = page.next_cursor
+
+        # Assert
+        assert seen == ["c4", "c3", "c2", "c1"]
+
+    def test_cursor_round_trip(self):
+        """Test that cursors decode to the date and id they were built from."""
+        # Act & Assert
+        assert decode_cursor(encode_cursor(TODAY, "c3")) == (TODAY, "c3")
+        with pytest.raises(ValidationError):
+            decode_cursor("not-a-cursor")
+
+    def test_parse_expand(self):
+        """Test that expansions may be repeated or comma-separated."""
+        # Act & Assert
+        assert parse_expand(["contributions,milestones"]) == ["milestones", "contributions"]
+        assert parse_expand(None) == []
@@ -0,0 +1,104 @@
+"""Regression tests for index-friendly period filters."""
+import pytest
+from datetime import date
+
+from sqlalchemy import create_engine, extract, func, select
+
+from src.database import TenantBase
+from src.goals.models import Goal, GoalContribution
+from src.shared.repository import period_bounds, period_filter, period_overlap_filter
+from src.tithing.models import TithingGoal, TithingPayment
+from src.users import models as user_models  # noqa: F401  Registers the users table for foreign keys
+
+payments = TithingPayment.__table__
+contributions = GoalContribution.__table__
+tithing_goals = TithingGoal.__table__
+
+
+@pytest.fixture(scope="module")
+def engine():
+    """In-memory SQLite database with the tables' real indexes."""
+    engine = create_engine("sqlite://")
+    TenantBase.metadata.create_all(
+        engine, tables=[payments, tithing_goals, Goal.__table__, contributions]
+    )
+    yield engine
+    engine.dispose()
+
+
+def query_plan(engine, query) -> str:
+    """SQLite's plan for ``query`` as one string."""
+    compiled = query.compile(engine, compile_kwargs={"literal_binds": True})
+    with engine.connect() as connection:
+        rows = connection.exec_driver_sql(f"EXPLAIN QUERY PLAN {compiled}").all()
+    return " | ".join(row[-1] for row in rows)
+
+
+@pytest.mark.unit
+class TestPeriodBounds:
+    """Test calendar period bounds."""
+
+    def test_bounds_are_half_open(self):
+        """Test that each period ends where the next one starts."""
+        # Act & Assert
+        assert period_bounds(2024) == (date(2024, 1, 1), date(2025, 1, 1))
+        assert period_bounds(2024, 2) == (date(2024, 2, 1), date(2024, 3, 1))
+        assert period_bounds(2024, 12) == (date(2024, 12, 1), date(2025, 1, 1))
+
+
+@pytest.mark.unit
+class TestPeriodFilterIndexUsage:
+    """Test that period filters range-scan the composite owner/date indexes."""
+
+    def test_yearly_payment_total_range_scans_user_date_index(self, engine):
+        """Test the query shape of the yearly tithing total."""
+        # Arrange
+        query = select(func.sum(payments.c.amount)).where(
+            payments.c.user_id == "u1", period_filter(payments.c.date, 2024)
+        )
+
+        # Act
+        plan = query_plan(engine, query)
+
+        # Assert
+        assert "USING INDEX idx_tithing_payments_user_date (user_id=? AND date>? AND date<?)" in plan
+
+    def test_extract_filter_cannot_range_scan(self, engine):
+        """Test the filter being replaced, so the assertion above stays meaningful."""
+        # Arrange
+        query = select(func.sum(payments.c.amount)).where(
+            payments.c.user_id == "u1", extract("year", payments.c.date) == 2024
+        )
+
+        # Act
+        plan = query_plan(engine, query)
+
+        # Assert
+        assert "date>?" not in plan
+
+    def test_monthly_contributions_range_scan_goal_date_index(self, engine):
+        """Test a month of a goal's contributions."""
+        # Arrange
+        query = select(contributions.c.amount).where(
+            contributions.c.goal_id == "g1", period_filter(contributions.c.contribution_date, 2024, 6)
+        )
+
+        # Act
+        plan = query_plan(engine, query)
+
+        # Assert
+        assert "idx_goal_contributions_goal_date (goal_id=? AND contribution_date>? AND contribution_date<?)" in plan
+
+    def test_goals_overlapping_a_year_use_user_period_index(self, engine):
+        """Test the lookup of tithing goals active during a year."""
+        # Arrange
+        query = select(tithing_goals.c.id).where(
+            tithing_goals.c.user_id == "u1",
+            period_overlap_filter(tithing_goals.c.start_date, tithing_goals.c.end_date, 2024)
+        )
+
+        # Act
+        plan = query_plan(engine, query)
+
+        # Assert
+        assert "idx_tithing_goals_user_period (user_id=? AND start_date<?)" in plan
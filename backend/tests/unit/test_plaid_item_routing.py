@@ -0,0 +1,123 @@
+"""Unit tests for the Plaid item to tenant routing index."""
+import pytest
+from unittest.mock import AsyncMock
+
+from src.tenant.routing import PlaidItemRoutingIndex
+
+
+class FakeRedis:
+    """In-memory stand-in for RedisClient get/set/delete."""
+
+    def __init__(self):
+        self.values = {}
+        self.ttls = {}
+
+    async def get(self, key):
+        return self.values.get(key)
+
+    async def set(self, key, value, ttl=None, **kwargs):
+        self.values[key] = value
+        self.ttls[key] = ttl
+        return True
+
+    async def delete(self, *keys):
+        return sum(1 for key in keys if self.values.pop(key, None) is not None)
+
+
+@pytest.fixture
+def item_index():
+    """Routing index with an in-memory cache and a mocked global database."""
+    index = PlaidItemRoutingIndex(redis_client=FakeRedis(), cache_ttl=3600, negative_cache_ttl=30)
+    index._lookup = AsyncMock(return_value="tenant-1")
+    index._upsert = AsyncMock()
+    index._delete = AsyncMock(return_value=True)
+    return index
+
+
+@pytest.mark.unit
+class TestPlaidItemRoutingIndex:
+    """Test read-through caching and index maintenance."""
+
+    @pytest.mark.asyncio
+    async def test_lookup_reads_through_cache(self, item_index):
+        """Test that only the first lookup reaches the global database."""
+        # Act
+        first = await item_index.get_tenant_id("item-1")
+        second = await item_index.get_tenant_id("item-1")
+
+        # Assert
+        assert first == second == "tenant-1"
+        item_index._lookup.assert_awaited_once_with("item-1")
+        assert item_index.redis_client.ttls["plaid:item_tenant:item-1"] == 3600
+
+    @pytest.mark.asyncio
+    async def test_unknown_item_is_negatively_cached(self, item_index):
+        """Test that misses are cached briefly to protect the database."""
+        # Arrange
+        item_index._lookup.return_value = None
+
+        # Act
+        first = await item_index.get_tenant_id("item-x")
+        second = await item_index.get_tenant_id("item-x")
+
+        # Assert
+        assert first is None and second is None
+        item_index._lookup.assert_awaited_once()
+        assert item_index.redis_client.ttls["plaid:item_tenant:item-x"] == 30
+
+    @pytest.mark.asyncio
+    async def test_register_overrides_cached_miss(self, item_index):
+        """Test that a newly linked item routes immediately."""
+        # Arrange
+        item_index._lookup.return_value = None
+        await item_index.get_tenant_id("item-2")
+
+        # Act
+        await item_index.register("item-2", "tenant-2", user_id="user-1")
+
+        # Assert
+        assert await item_index.get_tenant_id("item-2") == "tenant-2"
+        item_index._upsert.assert_awaited_once_with(
+            [{"plaid_item_id": "item-2", "tenant_id": "tenant-2", "user_id": "user-1"}]
+        )
+
+    @pytest.mark.asyncio
+    async def test_remove_evicts_cache(self, item_index):
+        """Test that removed items stop resolving from the cache."""
+        # Arrange
+        await item_index.get_tenant_id("item-1")
+        item_index._lookup.return_value = None
+
+        # Act
+        removed = await item_index.remove("item-1")
+
+        # Assert
+        assert removed is True
+        assert await item_index.get_tenant_id("item-1") is None
+
+    @pytest.mark.asyncio
+    async def test_register_many_writes_once(self, item_index):
+        """Test that a tenant backfill is a single upsert."""
+        # Act
+        count = await item_index.register_many("tenant-3", [
+            {"plaid_item_id": "item-a", "user_id": "u1"},
+            {"plaid_item_id": "item-b", "user_id": "u2"},
+        ])
+
+        # Assert
+        assert count == 2
+        item_index._upsert.assert_awaited_once()
+        assert await item_index.get_tenant_id("item-b") == "tenant-3"
+
+    @pytest.mark.asyncio
+    async def test_cache_outage_falls_back_to_database(self, item_index):
+        """Test that Redis errors do not break routing."""
+        # Arrange
+        item_index.redis_client.get = AsyncMock(side_effect=Exception("redis down"))
+        item_index.redis_client.set = AsyncMock(side_effect=Exception("redis down"))
+
+        # Act
+        tenant_id = await item_index.get_tenant_id("item-1")
+
+        # Assert
+        assert tenant_id == "tenant-1"
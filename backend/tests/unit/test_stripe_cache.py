@@ -0,0 +1,220 @@
+"""Unit tests for the cached, pooled Stripe client."""
+import asyncio
+import threading
+
+import pytest
+import stripe
+from unittest.mock import AsyncMock
+
+from src.services.stripe.cache import StripeObjectCache, CATALOG_SCOPE
+from src.services.stripe.client import StripeClient
+
+
+class FakeRedis:
+    """In-memory stand-in for the RedisClient key and hash commands."""
+
+    def __init__(self):
+        self.values = {}
+        self.hashes = {}
+        self.ttls = {}
+
+    async def get(self, key):
+        return self.values.get(key)
+
+    async def set(self, key, value, ttl=None, **kwargs):
+        self.values[key] = value
+        self.ttls[key] = ttl
+        return True
+
+    async def delete(self, *keys):
+        removed = 0
+        for key in keys:
+            removed += (self.values.pop(key, None) is not None) + (self.hashes.pop(key, None) is not None)
+        return removed
+
+    async def hget(self, name, key):
+        return self.hashes.get(name, {}).get(key)
+
+    async def hset(self, name, mapping):
+        self.hashes.setdefault(name, {}).update(mapping)
+        return len(mapping)
+
+    async def expire(self, key, seconds):
+        self.ttls[key] = seconds
+        return True
+
+
+@pytest.fixture
+def cache():
+    """Stripe object cache backed by in-memory Redis."""
+    return StripeObjectCache(redis_client=FakeRedis(), catalog_ttl=3600, object_ttl=300)
+
+
+@pytest.fixture
+def stripe_client(cache):
+    """Stripe client with a mocked request layer."""
+    client = StripeClient(api_key="sk_test_123", cache=cache)
+    client._make_request = AsyncMock(
+        side_effect=lambda operation, func, *args, **kwargs: stripe.convert_to_stripe_object(
+            {"id": args[0] if args else operation, "object": operation, "metadata": {"tenant_id": "t1"}}
+        )
+    )
+    return client
+
+
+@pytest.mark.unit
+class TestStripeObjectCache:
+    """Test read-through caching, coalescing and invalidation."""
+
+    @pytest.mark.asyncio
+    async def test_concurrent_reads_are_coalesced(self, cache):
+        """Test that identical in-flight reads share one Stripe request."""
+        # Arrange
+        calls = 0
+
+        async def fetch():
+            nonlocal calls
+            calls += 1
+            await asyncio.sleep(0.01)
+            return stripe.convert_to_stripe_object({"id": "cus_1", "object": "customer"})
+
+        # Act
+        results = await asyncio.gather(*(cache.get_or_fetch("customer", "cus_1", fetch) for _ in range(5)))
+
+        # Assert
+        assert calls == 1
+        assert all(result.id == "cus_1" for result in results)
+        assert cache.coalesced == 4
+        assert cache.get_stats()["in_flight"] == 0
+
+    @pytest.mark.asyncio
+    async def test_cached_object_round_trips(self, cache):
+        """Test that cache hits return typed Stripe objects."""
+        # Arrange
+        fetch = AsyncMock(return_value=stripe.convert_to_stripe_object({
+            "id": "sub_1",
+            "object": "subscription",
+            "items": {"object": "list", "data": [{"id": "si_1", "price": {"id": "price_1", "unit_amount": 999}}]}
+        }))
+        await cache.get_or_fetch("subscription", "sub_1", fetch)
+
+        # Act
+        cached = await cache.get_or_fetch("subscription", "sub_1", fetch)
+
+        # Assert
+        fetch.assert_awaited_once()
+        assert isinstance(cached, stripe.Subscription)
+        assert cached["items"].data[0].price.unit_amount == 999
+        assert cache.redis_client.ttls["stripe:subscription:sub_1"] == 300
+
+    @pytest.mark.asyncio
+    async def test_failed_fetch_is_not_cached(self, cache):
+        """Test that errors propagate to every waiter and are retried next time."""
+        # Arrange
+        fetch = AsyncMock(side_effect=[Exception("stripe down"), {"id": "cus_1"}])
+
+        # Act
+        with pytest.raises(Exception, match="stripe down"):
+            await cache.get_or_fetch("customer", "cus_1", fetch)
+        result = await cache.get_or_fetch("customer", "cus_1", fetch)
+
+        # Assert
+        assert result["id"] == "cus_1"
+        assert fetch.await_count == 2
+
+    @pytest.mark.asyncio
+    async def test_event_invalidates_object_and_customer_billing(self, cache):
+        """Test that a webhook event drops the object and its customer's invoices."""
+        # Arrange
+        redis_client = cache.redis_client
+        redis_client.values["stripe:invoice:in_1"] = "{}"
+        redis_client.values["stripe:upcoming_invoice:cus_1"] = "{}"
+        redis_client.hashes["stripe:invoices:cus_1"] = {"abc": "{}"}
+        redis_client.values["stripe:customer:cus_1"] = "{}"
+
+        # Act
+        await cache.invalidate_for_event({
+            "type": "invoice.payment_succeeded",
+            "data": {"object": {"object": "invoice", "id": "in_1", "customer": "cus_1"}}
+        })
+
+        # Assert
+        assert redis_client.values == {"stripe:customer:cus_1": "{}"}
+        assert redis_client.hashes == {}
+
+    @pytest.mark.asyncio
+    async def test_price_event_invalidates_catalog(self, cache):
+        """Test that price changes drop cached price lists."""
+        # Arrange
+        cache.redis_client.hashes[f"stripe:prices:{CATALOG_SCOPE}"] = {"abc": "{}"}
+
+        # Act
+        await cache.invalidate_for_event({
+            "type": "price.updated",
+            "data": {"object": {"object": "price", "id": "price_1"}}
+        })
+
+        # Assert
+        assert cache.redis_client.hashes == {}
+
+    @pytest.mark.asyncio
+    async def test_redis_outage_falls_back_to_stripe(self, cache):
+        """Test that Redis errors degrade to a live fetch."""
+        # Arrange
+        cache.redis_client.get = AsyncMock(side_effect=Exception("redis down"))
+        cache.redis_client.set = AsyncMock(side_effect=Exception("redis down"))
+        fetch = AsyncMock(return_value={"id": "cus_1"})
+
+        # Act
+        result = await cache.get_or_fetch("customer", "cus_1", fetch)
+
+        # Assert
+        assert result["id"] == "cus_1"
+
+
+@pytest.mark.unit
+class TestStripeClientCaching:
+    """Test client reads, writes and transport."""
+
+    @pytest.mark.asyncio
+    async def test_list_calls_are_cached_per_parameters(self, stripe_client):
+        """Test that list results are cached by their parameters."""
+        # Act
+        await stripe_client.list_invoices("cus_1", limit=10)
+        await stripe_client.list_invoices("cus_1", limit=10)
+        await stripe_client.list_invoices("cus_1", limit=5)
+
+        # Assert
+        assert stripe_client._make_request.await_count == 2
+        assert len(stripe_client.cache.redis_client.hashes["stripe:invoices:cus_1"]) == 2
+
+    @pytest.mark.asyncio
+    async def test_update_invalidates_cached_customer(self, stripe_client):
+        """Test that our own writes do not serve stale reads."""
+        # Arrange
+        await stripe_client.get_customer("cus_1")
+
+        # Act
+        await stripe_client.update_customer("cus_1", name="New")
+        await stripe_client.get_customer("cus_1")
+
+        # Assert
+        operations = [call.args[0] for call in stripe_client._make_request.await_args_list]
+        assert operations == ["get_customer", "update_customer", "get_customer"]
+
+    @pytest.mark.asyncio
+    async def test_requests_run_off_the_event_loop(self):
+        """Test that blocking SDK calls run on the Stripe thread pool."""
+        # Arrange
+        client = StripeClient(api_key="sk_test_123", cache=StripeObjectCache(redis_client=FakeRedis()))
+
+        def blocking_call(value, **kwargs):
+            return threading.current_thread().name, value, kwargs
+
+        # Act
+        thread_name, value, kwargs = await client._make_request("test", blocking_call, 1, flag=True)
+
+        # Assert
+        assert thread_name.startswith("stripe")
+        assert value == 1
+        assert kwargs == {"flag": True}
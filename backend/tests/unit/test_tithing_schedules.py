@@ -0,0 +1,162 @@
+"""Unit tests for batch processing of due tithing schedules."""
+import pytest
+from datetime import date
+from decimal import Decimal
+
+from sqlalchemy import event, func, insert, select, update
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from src.database import TenantBase
+from src.tithing.models import TithingGoal, TithingPayment, TithingSchedule, TithingSummary
+from src.tithing.schedules import TithingScheduleProcessor, execution_dates
+from src.users import models as user_models  # noqa: F401  Registers the users table for foreign keys
+
+# Statements go through the Core tables, as the processor's do
+payments = TithingPayment.__table__
+schedules = TithingSchedule.__table__
+summaries = TithingSummary.__table__
+
+PROCESS_DATE = date(2024, 3, 10)
+
+
+def schedule(schedule_id, user_id="u1", frequency="monthly", next_execution=date(2024, 2, 1), **fields):
+    row = dict(id=schedule_id, user_id=user_id, name=schedule_id.title(), amount=Decimal("100"),
+               frequency=frequency, start_date=date(2024, 1, 1), end_date=None, method="online",
+               recipient="First Church", is_active=True, auto_process=True,
+               next_execution_date=next_execution)
+    row.update(fields)
+    return row
+
+
+@pytest.fixture
+async def session():
+    """In-memory SQLite session with schedules in several states, counting statements."""
+    engine = create_async_engine("sqlite+aiosqlite://")
+    async with engine.begin() as connection:
+        await connection.run_sync(
+            lambda sync_connection: TenantBase.metadata.create_all(
+                sync_connection,
+                tables=[payments, schedules, summaries, TithingGoal.__table__]
+            )
+        )
+
+    async with async_sessionmaker(engine, expire_on_commit=False)() as session:
+        await session.execute(insert(schedules), [
+            # Two monthly executions missed: Feb 1 and Mar 1
+            schedule("monthly"),
+            schedule("weekly", user_id="u2", frequency="weekly", next_execution=date(2024, 3, 4)),
+            # Ends after its Feb 1 execution
+            schedule("ending", end_date=date(2024, 2, 15)),
+            schedule("future", next_execution=date(2024, 4, 1)),
+            schedule("manual", auto_process=False),
+            schedule("inactive", is_active=False),
+        ])
+        await session.commit()
+
+        statements = []
+        event.listen(
+            engine.sync_engine, "before_cursor_execute",
+            lambda conn, cursor, statement, *args: statements.append(statement.split()[0].upper())
+        )
+        session.info["statements"] = statements
+        yield session
+    await engine.dispose()
+
+
+async def schedule_state(session):
+    result = await session.execute(
+        select(schedules.c.id, schedules.c.next_execution_date, schedules.c.execution_count)
+    )
+    return {row.id: (row.next_execution_date, row.execution_count) for row in result}
+
+
+async def payment_dates(session):
+    result = await session.execute(
+        select(payments.c.schedule_id, payments.c.date).order_by(payments.c.schedule_id, payments.c.date)
+    )
+    return [tuple(row) for row in result]
+
+
+@pytest.mark.unit
+class TestExecutionDates:
+    """Test expanding a schedule into its missed execution dates."""
+
+    def test_dates_stop_at_process_and_end_dates(self):
+        """Test that neither the processing date nor the end date is passed."""
+        # Act & Assert
+        assert execution_dates(date(2024, 1, 31), "monthly", None, date(2024, 4, 30)) == [
+            date(2024, 1, 31), date(2024, 2, 29), date(2024, 3, 29), date(2024, 4, 29)
+        ]
+        assert execution_dates(date(2024, 1, 1), "biweekly", date(2024, 1, 20), PROCESS_DATE) == [
+            date(2024, 1, 1), date(2024, 1, 15)
+        ]
+        assert execution_dates(date(2024, 1, 1), "unknown", None, PROCESS_DATE) == [date(2024, 1, 1)]
+
+
+@pytest.mark.unit
+class TestTithingScheduleProcessor:
+    """Test turning due schedules into payments in bulk."""
+
+    @pytest.mark.asyncio
+    async def test_due_schedules_are_processed_in_bulk(self, session):
+        """Test payments, schedule advancement and summaries for a whole tenant."""
+        # Arrange
+        statements = session.info["statements"]
+        processor = TithingScheduleProcessor(session)
+
+        # Act
+        result = await processor.process_due(PROCESS_DATE)
+
+        # Assert
+        assert statements[:3] == ["SELECT", "INSERT", "UPDATE"]
+        assert statements.count("INSERT") == 3  # Payments, then one summary per affected (user, year)
+        assert (result.schedules, result.payments, result.duplicates) == (3, 4, 0)
+        assert result.affected_years == {("u1", 2024), ("u2", 2024)}
+        assert await payment_dates(session) == [
+            ("ending", date(2024, 2, 1)),
+            ("monthly", date(2024, 2, 1)),
+            ("monthly", date(2024, 3, 1)),
+            ("weekly", date(2024, 3, 4)),
+        ]
+        state = await schedule_state(session)
+        assert state["monthly"] == (date(2024, 4, 1), 2)
+        assert state["weekly"] == (date(2024, 3, 11), 1)
+        assert state["ending"] == (date(2024, 3, 1), 1)
+        assert state["future"] == (date(2024, 4, 1), 0)
+        assert state["manual"] == (date(2024, 2, 1), 0)
+        total = await session.scalar(
+            select(summaries.c.total_tithe_paid).where(summaries.c.user_id == "u1", summaries.c.year == 2024)
+        )
+        assert total == Decimal("300")
+
+    @pytest.mark.asyncio
+    async def test_rerun_after_crash_creates_no_duplicates(self, session):
+        """Test that executions which already have a payment are skipped on a rerun."""
+        # Arrange
+        processor = TithingScheduleProcessor(session)
+        await processor.process_due(PROCESS_DATE)
+        # Simulate a run that wrote payments but died before advancing the schedule
+        await session.execute(
+            update(schedules).where(schedules.c.id == "monthly").values(next_execution_date=date(2024, 2, 1))
+        )
+        await session.commit()
+
+        # Act
+        result = await processor.process_due(PROCESS_DATE)
+        again = await processor.process_due(PROCESS_DATE)
+
+        # Assert
+        assert (result.schedules, result.payments, result.duplicates) == (1, 0, 2)
+        assert again.schedules == 0
+        assert await session.scalar(select(func.count()).select_from(payments)) == 4
+        assert (await schedule_state(session))["monthly"] == (date(2024, 4, 1), 2)
+
+    @pytest.mark.asyncio
+    async def test_processing_can_be_limited_to_one_user(self, session):
+        """Test the per-user path used by the API."""
+        # Act
+        result = await TithingScheduleProcessor(session).process_due(PROCESS_DATE, user_id="u2")
+
+        # Assert
+        assert result.payments == 1
+        assert await payment_dates(session) == [("weekly", date(2024, 3, 4))]
@@ -31,6 +31,8 @@ def tithing_service(mock_session):
     service.schedule_repo = AsyncMock()
     service.summary_repo = AsyncMock()
     service.goal_repo = AsyncMock()
+    service.summary_maintainer = AsyncMock()
+    service.schedule_processor = AsyncMock()
     return service
 
 
@@ -0,0 +1,157 @@
+"""Unit tests for incremental tithing summary maintenance."""
+import pytest
+from datetime import date
+from decimal import Decimal
+from uuid import uuid4
+
+from sqlalchemy import delete, event, insert, select
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from src.database import TenantBase
+from src.tithing.models import TithingGoal, TithingPayment, TithingSummary
+from src.tithing.summaries import TithingSummaryMaintainer
+from src.users import models as user_models  # noqa: F401  Registers the users table for foreign keys
+
+# Statements go through the Core tables, as the maintainer's do
+payments = TithingPayment.__table__
+summaries = TithingSummary.__table__
+goals = TithingGoal.__table__
+
+
+@pytest.fixture
+async def session():
+    """In-memory SQLite session with the tithing tables, counting statements."""
+    engine = create_async_engine("sqlite+aiosqlite://")
+    async with engine.begin() as connection:
+        await connection.run_sync(
+            lambda sync_connection: TenantBase.metadata.create_all(
+                sync_connection,
+                tables=[payments, summaries, goals]
+            )
+        )
+
+    async with async_sessionmaker(engine, expire_on_commit=False)() as session:
+        await session.execute(insert(goals), [
+            dict(id="year", user_id="u1", name="2024", start_date=date(2024, 1, 1), end_date=date(2024, 12, 31),
+                 target_percentage=Decimal("12"), target_amount=Decimal("500")),
+            dict(id="spring", user_id="u1", name="Spring", start_date=date(2024, 3, 1), end_date=date(2024, 5, 31),
+                 target_percentage=Decimal("12"), target_amount=None),
+        ])
+        await session.commit()
+
+        statements = []
+        event.listen(
+            engine.sync_engine, "before_cursor_execute",
+            lambda conn, cursor, statement, *args: statements.append(statement.split()[0].upper())
+        )
+        session.info["statements"] = statements
+        yield session
+    await engine.dispose()
+
+
+async def record(session, amount, day, method="online", recipient="First Church", user_id="u1"):
+    """Insert a payment and apply it the way the service does."""
+    result = await session.execute(
+        insert(payments)
+        .values(id=str(uuid4()), user_id=user_id, amount=Decimal(amount), date=day, method=method,
+                recipient=recipient)
+        .returning(payments)
+    )
+    payment = result.one()
+    await TithingSummaryMaintainer(session).apply_payment(payment)
+    await session.commit()
+    return payment
+
+
+async def summary_for(session, year, user_id="u1"):
+    result = await session.execute(
+        select(summaries).where(summaries.c.user_id == user_id, summaries.c.year == year)
+    )
+    return result.one_or_none()
+
+
+async def goal_amounts(session):
+    result = await session.execute(select(goals.c.id, goals.c.current_amount, goals.c.is_completed))
+    return {goal_id: (amount, completed) for goal_id, amount, completed in result.all()}
+
+
+@pytest.mark.unit
+class TestIncrementalSummary:
+    """Test applying payments as deltas."""
+
+    @pytest.mark.asyncio
+    async def test_payments_are_applied_without_reading_payments(self, session):
+        """Test totals, maps and goals after several payments, using only writes."""
+        # Arrange
+        statements = session.info["statements"]
+
+        # Act
+        await record(session, "100", date(2024, 1, 7))
+        await record(session, "250", date(2024, 4, 7), method="check")
+        statements.clear()
+        await record(session, "150", date(2024, 4, 14), recipient="Mission Fund")
+
+        # Assert
+        assert "SELECT" not in statements
+        summary = await summary_for(session, 2024)
+        assert summary.total_tithe_paid == Decimal("500")
+        assert summary.payment_count == 3
+        assert summary.average_payment == Decimal("166.67")
+        assert summary.largest_payment == Decimal("250")
+        assert summary.payment_methods == {"online": 250, "check": 250}
+        assert summary.recipients == {"First Church": 350, "Mission Fund": 150}
+        assert await goal_amounts(session) == {
+            "year": (Decimal("500"), True),
+            "spring": (Decimal("400"), False),
+        }
+
+    @pytest.mark.asyncio
+    async def test_summaries_are_per_user_and_year(self, session):
+        """Test that each payment lands in its own user's year."""
+        # Act
+        await record(session, "80", date(2023, 12, 31))
+        await record(session, "40", date(2024, 1, 1), user_id="u2")
+
+        # Assert
+        assert (await summary_for(session, 2023)).total_tithe_paid == Decimal("80")
+        assert (await summary_for(session, 2024, user_id="u2")).total_tithe_paid == Decimal("40")
+        assert await summary_for(session, 2024) is None
+
+
+@pytest.mark.unit
+class TestSummaryRebuild:
+    """Test rebuilding summaries after payments change."""
+
+    @pytest.mark.asyncio
+    async def test_rebuild_after_delete_matches_remaining_payments(self, session):
+        """Test that a rebuild drops a deleted payment, including from the largest payment."""
+        # Arrange
+        await record(session, "100", date(2024, 3, 7))
+        largest = await record(session, "300", date(2024, 4, 7), method="check")
+        await session.execute(delete(payments).where(payments.c.id == largest.id))
+
+        # Act
+        await TithingSummaryMaintainer(session).rebuild_years("u1", [2024])
+        await session.commit()
+
+        # Assert
+        summary = await summary_for(session, 2024)
+        assert summary.total_tithe_paid == Decimal("100")
+        assert summary.payment_count == 1
+        assert summary.largest_payment == Decimal("100")
+        assert summary.average_payment == Decimal("100")
+        assert summary.payment_methods == {"online": 100}
+        assert (await goal_amounts(session))["spring"] == (Decimal("100"), False)
+
+    @pytest.mark.asyncio
+    async def test_rebuild_of_empty_year_creates_zero_summary(self, session):
+        """Test rebuilding a year without payments."""
+        # Act
+        await TithingSummaryMaintainer(session).rebuild_years("u1", [2022])
+        await session.commit()
+
+        # Assert
+        summary = await summary_for(session, 2022)
+        assert summary.total_tithe_paid == Decimal("0")
+        assert summary.payment_count == 0
+        assert summary.recipients == {}
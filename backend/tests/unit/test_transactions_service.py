@@ -586,4 +586,73 @@ class TestTransactionServiceEdgeCases:
             base_data.update(case)
             
             with pytest.raises((ValidationError, ValueError, TypeError)):
-                await transaction_service.create_transaction(TransactionCreate(**base_data))
\ No newline at end of file
+                await transaction_service.create_transaction(TransactionCreate(**base_data))
+
+@pytest.mark.unit
+class TestTransactionBudgetSync:
+    """Test that manual transaction writes re-sync the user's budgets."""
+    
+    @pytest.fixture
+    def service(self):
+        """TransactionService with a mocked repository and dashboard cache."""
+        service = TransactionService()
+        service.transaction_repo = AsyncMock()
+        service.family_dashboard_cache = AsyncMock()
+        return service
+    
+    @pytest.fixture
+    def tenant_context(self):
+        return TenantContext(
+            tenant_id="test-tenant",
+            tenant_slug="test-tenant",
+            database_url="sqlite:///:memory:",
+            user_id="test-user-123"
+        )
+    
+    @pytest.mark.asyncio
+    async def test_delete_requests_full_budget_sync(self, service, tenant_context):
+        """Test that a delete re-sums the user's budgets, which an incremental sync would miss."""
+        # Arrange
+        service.transaction_repo.get_by_id_for_user.return_value = Mock(id="t1")
+        service.transaction_repo.delete.return_value = True
+        
+        # Act
+        with patch('src.transactions.service.get_tenant_context', return_value=tenant_context), \
+             patch('src.services.background.tasks.sync_budget_spending') as sync_task:
+            assert await service.delete_transaction("t1", "user-1") is True
+        
+        # Assert
+        sync_task.delay.assert_called_once_with("test-tenant", ["user-1"], full=True)
+        service.family_dashboard_cache.invalidate_for_users.assert_awaited_once_with("user-1")
+    
+    @pytest.mark.asyncio
+    async def test_update_requests_full_budget_sync(self, service, tenant_context):
+        """Test that an edit re-sums the user's budgets."""
+        # Arrange
+        service.transaction_repo.get_by_id_for_user.return_value = Mock(id="t1")
+        service.transaction_repo.update.return_value = Mock(id="t1")
+        
+        # Act
+        with patch('src.transactions.service.get_tenant_context', return_value=tenant_context), \
+             patch('src.transactions.service.TransactionResponse.model_validate'), \
+             patch('src.services.background.tasks.sync_budget_spending') as sync_task:
+            await service.update_transaction("t1", "user-1", TransactionUpdate(category="dining"))
+        
+        # Assert
+        sync_task.delay.assert_called_once_with("test-tenant", ["user-1"], full=True)
+    
+    @pytest.mark.asyncio
+    async def test_no_budget_sync_without_changes_or_tenant(self, service, tenant_context):
+        """Test that nothing is dispatched when nothing was written or there is no tenant."""
+        # Arrange
+        service.transaction_repo.get_by_id_for_user.return_value = None
+        
+        # Act
+        with patch('src.services.background.tasks.sync_budget_spending') as sync_task:
+            with patch('src.transactions.service.get_tenant_context', return_value=tenant_context):
+                assert await service.delete_transaction("missing", "user-1") is False
+            with patch('src.transactions.service.get_tenant_context', return_value=None):
+                await service._transactions_changed("user-1")
+        
+        # Assert
+        sync_task.delay.assert_not_called()
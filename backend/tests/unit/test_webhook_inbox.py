@@ -0,0 +1,431 @@
+"""Unit tests for the webhook inbox (fast acknowledgement, dedupe and per-tenant draining)."""
+import json
+from datetime import datetime
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, Mock
+
+import pytest
+
+from src.exceptions import DatabaseError, PlaidError, StripeError, ValidationError
+from src.services.webhook_inbox import (
+    PENDING_TENANTS_KEY,
+    UNROUTED_TENANT,
+    InboxEvent,
+    WebhookInbox,
+    plaid_event_id,
+)
+from src.tenant.context import TenantContext, get_tenant_context
+
+
+class FakeRedis:
+    """In-memory stand-in for the subset of RedisClient used by the inbox."""
+
+    def __init__(self):
+        self.values = {}
+        self.lists = {}
+        self.sets = {}
+
+    async def set(self, key, value, ttl=None, nx=False, **kwargs):
+        if nx and key in self.values:
+            return None
+        self.values[key] = value
+        return True
+
+    async def get(self, key):
+        return self.values.get(key)
+
+    async def delete(self, *keys):
+        return sum(1 for key in keys if self.values.pop(key, None) is not None)
+
+    async def exists(self, *keys):
+        return sum(1 for key in keys if key in self.values)
+
+    async def lpush(self, name, *values):
+        items = self.lists.setdefault(name, [])
+        for value in values:
+            items.insert(0, value)
+        return len(items)
+
+    async def rpop(self, name, count=None):
+        items = self.lists.get(name, [])
+        if count is None:
+            return items.pop() if items else None
+        popped = [items.pop() for _ in range(min(count, len(items)))]
+        return popped or None
+
+    async def llen(self, name):
+        return len(self.lists.get(name, []))
+
+    async def sadd(self, name, *values):
+        self.sets.setdefault(name, set()).update(values)
+        return len(values)
+
+    async def srem(self, name, *values):
+        self.sets.get(name, set()).difference_update(values)
+        return len(values)
+
+    async def smembers(self, name):
+        return set(self.sets.get(name, set()))
+
+
+def stripe_payload(event_id="evt_1", event_type="invoice.payment_succeeded", tenant_id="tenant-1"):
+    """Raw Stripe webhook body."""
+    metadata = {"tenant_id": tenant_id} if tenant_id else {}
+    return json.dumps({
+        "id": event_id,
+        "type": event_type,
+        "created": 1700000000,
+        "data": {"object": {"id": "in_1", "metadata": metadata}}
+    }).encode()
+
+
+@pytest.fixture
+def stripe_service():
+    """Stripe webhook service with signature checks and handlers mocked."""
+    service = Mock()
+    service.verify_webhook = Mock()
+    service.get_metadata_tenant_id = lambda data: data.get("metadata", {}).get("tenant_id")
+    service._extract_tenant_id = Mock(return_value=None)
+    service.handle_event = AsyncMock(return_value={"status": "ok"})
+    return service
+
+
+@pytest.fixture
+def plaid_service():
+    """Plaid webhook service with handlers mocked."""
+    service = Mock()
+    service.resolve_tenant_id = AsyncMock(return_value="tenant-1")
+    service.handle_event = AsyncMock(return_value={"status": "ok"})
+    return service
+
+
+@pytest.fixture
+def event_repository():
+    """Subscription event repository that records rows in memory."""
+    repository = Mock()
+    recorded = {}
+
+    async def record_webhook_event(stripe_event_id, event_type, event_data, subscription_id=None):
+        if stripe_event_id in recorded:
+            return None
+        recorded[stripe_event_id] = SimpleNamespace(id=f"row-{stripe_event_id}")
+        return recorded[stripe_event_id]
+
+    repository.record_webhook_event = AsyncMock(side_effect=record_webhook_event)
+    repository.mark_events_processed = AsyncMock(return_value=1)
+    repository.record_event_error = AsyncMock(return_value=True)
+    repository.get_unprocessed_events = AsyncMock(return_value=[])
+    return repository
+
+
+@pytest.fixture
+def inbox(stripe_service, plaid_service, event_repository):
+    """Webhook inbox wired to in-memory Redis and a recording dispatcher."""
+    webhook_inbox = WebhookInbox(
+        redis_client=FakeRedis(),
+        stripe_service=stripe_service,
+        plaid_service=plaid_service,
+        event_repository=event_repository,
+        dispatcher=Mock()
+    )
+
+    async def load_tenant_context(tenant_id):
+        if tenant_id.startswith("tenant-"):
+            return TenantContext(
+                tenant_id=tenant_id,
+                tenant_slug=tenant_id,
+                database_url="sqlite+aiosqlite:///:memory:",
+                auth_token="dev-token"
+            )
+        return None
+
+    webhook_inbox._load_tenant_context = load_tenant_context
+    return webhook_inbox
+
+
+@pytest.mark.unit
+class TestWebhookIngestion:
+    """Test the request-path half of the inbox."""
+
+    @pytest.mark.asyncio
+    async def test_stripe_event_is_persisted_and_queued_without_handling(self, inbox, stripe_service, event_repository):
+        """Test that accepting an event does no handler work."""
+        # Act
+        receipt = await inbox.accept_stripe(stripe_payload(), "sig")
+
+        # Assert
+        assert receipt == {
+            "event_id": "evt_1",
+            "event_type": "invoice.payment_succeeded",
+            "duplicate": False,
+            "queued": True
+        }
+        stripe_service.verify_webhook.assert_called_once()
+        stripe_service.handle_event.assert_not_awaited()
+        event_repository.record_webhook_event.assert_awaited_once()
+        assert await inbox.redis_client.llen("webhook:queue:tenant-1") == 1
+        inbox.dispatcher.assert_called_once_with("tenant-1")
+
+    @pytest.mark.asyncio
+    async def test_invalid_signature_is_rejected(self, inbox, stripe_service):
+        """Test that unverified payloads never reach the queue."""
+        # Arrange
+        stripe_service.verify_webhook.side_effect = StripeError("Invalid webhook signature")
+
+        # Act & Assert
+        with pytest.raises(StripeError):
+            await inbox.accept_stripe(stripe_payload(), "bad")
+
+        assert await inbox.redis_client.llen("webhook:queue:tenant-1") == 0
+
+    @pytest.mark.asyncio
+    async def test_redelivered_event_is_deduplicated(self, inbox, event_repository):
+        """Test that a retried event is acknowledged but not queued again."""
+        # Act
+        await inbox.accept_stripe(stripe_payload(), "sig")
+        receipt = await inbox.accept_stripe(stripe_payload(), "sig")
+
+        # Assert
+        assert receipt["duplicate"] is True
+        assert event_repository.record_webhook_event.await_count == 1
+        assert await inbox.redis_client.llen("webhook:queue:tenant-1") == 1
+
+    @pytest.mark.asyncio
+    async def test_unique_row_deduplicates_when_redis_key_is_gone(self, inbox):
+        """Test that the stripe_event_id row catches duplicates after the Redis key expires."""
+        # Arrange
+        await inbox.accept_stripe(stripe_payload(), "sig")
+        inbox.redis_client.values.clear()
+
+        # Act
+        receipt = await inbox.accept_stripe(stripe_payload(), "sig")
+
+        # Assert
+        assert receipt["duplicate"] is True
+        assert await inbox.redis_client.llen("webhook:queue:tenant-1") == 1
+
+    @pytest.mark.asyncio
+    async def test_persist_failure_releases_dedupe_key(self, inbox, event_repository):
+        """Test that a failed write lets the provider's retry through."""
+        # Arrange
+        event_repository.record_webhook_event.side_effect = DatabaseError("db down")
+
+        # Act & Assert
+        with pytest.raises(DatabaseError):
+            await inbox.accept_stripe(stripe_payload(), "sig")
+
+        assert await inbox.redis_client.get("webhook:seen:stripe:evt_1") is None
+
+    @pytest.mark.asyncio
+    async def test_inline_fallback_failure_releases_dedupe_key(self, inbox, plaid_service):
+        """Test that a failed inline fallback lets the provider's retry through."""
+        # Arrange
+        payload = {"webhook_type": "TRANSACTIONS", "webhook_code": "DEFAULT_UPDATE", "item_id": "item-1"}
+        inbox.redis_client.lpush = AsyncMock(side_effect=ConnectionError("redis down"))
+        plaid_service.handle_event.side_effect = PlaidError("sync failed")
+
+        # Act & Assert
+        with pytest.raises(PlaidError):
+            await inbox.accept_plaid(payload)
+
+        assert await inbox.redis_client.get(f"webhook:seen:plaid:{plaid_event_id(payload)}") is None
+
+    @pytest.mark.asyncio
+    async def test_event_without_tenant_goes_to_unrouted_queue(self, inbox, event_repository):
+        """Test that tenant lookups needing API calls are deferred to the worker."""
+        # Act
+        await inbox.accept_stripe(stripe_payload(tenant_id=None), "sig")
+
+        # Assert
+        event_repository.record_webhook_event.assert_not_awaited()
+        assert await inbox.redis_client.llen(f"webhook:queue:{UNROUTED_TENANT}") == 1
+
+    @pytest.mark.asyncio
+    async def test_plaid_retry_has_same_event_id(self, inbox):
+        """Test that identical Plaid bodies are deduplicated."""
+        # Arrange
+        payload = {"webhook_type": "TRANSACTIONS", "webhook_code": "DEFAULT_UPDATE", "item_id": "item-1"}
+
+        # Act
+        first = await inbox.accept_plaid(dict(payload))
+        second = await inbox.accept_plaid(dict(reversed(list(payload.items()))))
+
+        # Assert
+        assert first["event_id"] == plaid_event_id(payload)
+        assert second["duplicate"] is True
+
+    @pytest.mark.asyncio
+    async def test_plaid_requires_type_and_code(self, inbox):
+        """Test that malformed Plaid payloads are rejected."""
+        with pytest.raises(ValidationError):
+            await inbox.accept_plaid({"item_id": "item-1"})
+
+
+@pytest.mark.unit
+class TestWebhookDraining:
+    """Test the worker-path half of the inbox."""
+
+    @pytest.mark.asyncio
+    async def test_drain_processes_in_arrival_order_and_marks_batch(self, inbox, stripe_service, event_repository):
+        """Test FIFO handling and a single bulk processed UPDATE."""
+        # Arrange
+        for event_id in ("evt_1", "evt_2", "evt_3"):
+            await inbox.accept_stripe(stripe_payload(event_id=event_id), "sig")
+        seen_tenants = []
+        stripe_service.handle_event.side_effect = lambda event, tenant_id: seen_tenants.append(
+            get_tenant_context().tenant_id
+        ) or {}
+
+        # Act
+        result = await inbox.drain("tenant-1")
+
+        # Assert
+        handled = [call.args[0]["id"] for call in stripe_service.handle_event.await_args_list]
+        assert handled == ["evt_1", "evt_2", "evt_3"]
+        assert seen_tenants == ["tenant-1"] * 3
+        event_repository.mark_events_processed.assert_awaited_once_with(
+            ["row-evt_1", "row-evt_2", "row-evt_3"]
+        )
+        assert result.processed == 3
+        assert result.remaining == 0
+        assert "tenant-1" not in await inbox.redis_client.smembers(PENDING_TENANTS_KEY)
+        assert get_tenant_context() is None
+
+    @pytest.mark.asyncio
+    async def test_drain_respects_batch_size(self, inbox):
+        """Test that a drain only takes one batch."""
+        # Arrange
+        for event_id in ("evt_1", "evt_2", "evt_3"):
+            await inbox.accept_stripe(stripe_payload(event_id=event_id), "sig")
+
+        # Act
+        result = await inbox.drain("tenant-1", batch_size=2)
+
+        # Assert
+        assert result.processed == 2
+        assert result.remaining == 1
+
+    @pytest.mark.asyncio
+    async def test_drain_skips_when_tenant_is_locked(self, inbox, stripe_service):
+        """Test that only one worker drains a tenant queue at a time."""
+        # Arrange
+        await inbox.accept_stripe(stripe_payload(), "sig")
+        await inbox.redis_client.set("webhook:lock:tenant-1", "other-worker")
+
+        # Act
+        result = await inbox.drain("tenant-1")
+
+        # Assert
+        assert result.locked is True
+        stripe_service.handle_event.assert_not_awaited()
+        assert await inbox.redis_client.llen("webhook:queue:tenant-1") == 1
+
+    @pytest.mark.asyncio
+    async def test_failed_event_is_left_for_recovery(self, inbox, stripe_service, event_repository):
+        """Test that a handler failure records the error and does not mark the row processed."""
+        # Arrange
+        await inbox.accept_stripe(stripe_payload(event_id="evt_1"), "sig")
+        await inbox.accept_stripe(stripe_payload(event_id="evt_2"), "sig")
+        stripe_service.handle_event.side_effect = [Exception("boom"), {}]
+
+        # Act
+        result = await inbox.drain("tenant-1")
+
+        # Assert
+        assert result.failed == 1
+        assert result.processed == 1
+        event_repository.record_event_error.assert_awaited_once_with("row-evt_1", "boom")
+        event_repository.mark_events_processed.assert_awaited_once_with(["row-evt_2"])
+
+    @pytest.mark.asyncio
+    async def test_plaid_transaction_updates_are_coalesced(self, inbox, plaid_service):
+        """Test that repeated sync webhooks for one item run the handler once."""
+        # Arrange
+        for count in (1, 2, 3):
+            await inbox.accept_plaid({
+                "webhook_type": "TRANSACTIONS",
+                "webhook_code": "DEFAULT_UPDATE",
+                "item_id": "item-1",
+                "new_transactions": count
+            })
+
+        # Act
+        result = await inbox.drain("tenant-1")
+
+        # Assert
+        assert plaid_service.handle_event.await_count == 1
+        assert result.coalesced == 2
+
+    @pytest.mark.asyncio
+    async def test_unrouted_events_are_moved_to_tenant_queue(self, inbox, stripe_service, event_repository):
+        """Test that the worker resolves the tenant and re-queues the event."""
+        # Arrange
+        await inbox.accept_stripe(stripe_payload(tenant_id=None), "sig")
+        stripe_service._extract_tenant_id.return_value = "tenant-2"
+
+        # Act
+        result = await inbox.drain(UNROUTED_TENANT)
+
+        # Assert
+        assert result.rerouted == 1
+        event_repository.record_webhook_event.assert_awaited_once()
+        assert await inbox.redis_client.llen("webhook:queue:tenant-2") == 1
+
+
+@pytest.mark.unit
+class TestWebhookRecovery:
+    """Test recovery of events that were persisted but never processed."""
+
+    @pytest.mark.asyncio
+    async def test_recover_requeues_unprocessed_rows(self, inbox, event_repository):
+        """Test that get_unprocessed_events feeds the tenant queue."""
+        # Arrange
+        event_repository.get_unprocessed_events.return_value = [
+            SimpleNamespace(
+                id="row-evt_9",
+                stripe_event_id="evt_9",
+                event_type="invoice.payment_failed",
+                event_data={"id": "evt_9", "type": "invoice.payment_failed", "data": {"object": {}}},
+                created_at=datetime(2024, 1, 1)
+            )
+        ]
+
+        # Act
+        recovered = await inbox.recover("tenant-1")
+
+        # Assert
+        assert recovered == 1
+        kwargs = event_repository.get_unprocessed_events.await_args.kwargs
+        assert kwargs["event_source"] == "stripe"
+        assert kwargs["created_before"] > kwargs["created_after"]
+        queued = InboxEvent.from_json(inbox.redis_client.lists["webhook:queue:tenant-1"][0])
+        assert queued.record_id == "row-evt_9"
+        inbox.dispatcher.assert_called_once_with("tenant-1")
+
+    @pytest.mark.asyncio
+    async def test_recover_skips_tenant_with_queued_events(self, inbox, event_repository):
+        """Test that recovery never double-queues events still waiting in Redis."""
+        # Arrange
+        await inbox.accept_stripe(stripe_payload(), "sig")
+
+        # Act
+        recovered = await inbox.recover("tenant-1")
+
+        # Assert
+        assert recovered == 0
+        event_repository.get_unprocessed_events.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_dispatch_pending_clears_empty_queues(self, inbox):
+        """Test that the sweep only dispatches tenants with queued events."""
+        # Arrange
+        await inbox.accept_stripe(stripe_payload(), "sig")
+        await inbox.redis_client.sadd(PENDING_TENANTS_KEY, "tenant-empty")
+        inbox.dispatcher.reset_mock()
+
+        # Act
+        dispatched = await inbox.dispatch_pending()
+
+        # Assert
+        assert dispatched == ["tenant-1"]
+        assert "tenant-empty" not in await inbox.redis_client.smembers(PENDING_TENANTS_KEY)